@@ -0,0 +1,105 @@
+"""Microbenchmark of the decoding of stored sound event geometries.
+
+Compares the previous decoding of geometries, which loaded the JSON
+into a dictionary before validating it, with `decode_geometry`. Every
+row is decoded twice: once with a cold cache, as when a page is first
+loaded, and once more, as when the same rows are loaded again.
+
+Usage::
+
+    python benchmarks/geometry_decoding.py --rows 1000000
+"""
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from soundevent import data
+
+from whombat.models.base import decode_geometry
+
+
+def generate_rows(rows: int, seed: int = 0) -> list[str]:
+    """Generate stored geometries with the usual mix of types."""
+    rng = random.Random(seed)
+    values = []
+    for _ in range(rows):
+        start = rng.uniform(0, 600)
+        duration = rng.uniform(0.01, 2)
+        low = rng.uniform(0, 50_000)
+        high = low + rng.uniform(100, 20_000)
+        kind = rng.random()
+        if kind < 0.6:
+            geometry = data.BoundingBox(
+                coordinates=[start, low, start + duration, high]
+            )
+        elif kind < 0.8:
+            geometry = data.TimeInterval(
+                coordinates=[start, start + duration],
+            )
+        elif kind < 0.9:
+            geometry = data.TimeStamp(coordinates=start)
+        else:
+            geometry = data.Polygon(
+                coordinates=[
+                    [
+                        [start, low],
+                        [start + duration / 2, high],
+                        [start + duration, low],
+                        [start, low],
+                    ]
+                ]
+            )
+        values.append(geometry.model_dump_json())
+    return values
+
+
+def measure(decode: Callable[[str], data.Geometry], values: list[str]):
+    """Time the decoding of all the values, in seconds."""
+    start = time.perf_counter()
+    for value in values:
+        decode(value)
+    return time.perf_counter() - start
+
+
+def validate(value: str) -> data.Geometry:
+    return data.geometry_validate(value, mode="json")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    values = generate_rows(args.rows)
+
+    # A page of sound events fits in the cache, so the second pass over
+    # a page is served from memory.
+    page = values[: decode_geometry.cache_info().maxsize]  # type: ignore
+
+    results = [
+        ("geometry_validate", measure(validate, values)),
+        ("decode_geometry (cold)", measure(decode_geometry, values)),
+    ]
+    decode_geometry.cache_clear()
+    measure(decode_geometry, page)
+    results.append(
+        (
+            "decode_geometry (warm)",
+            measure(decode_geometry, page) * len(values) / len(page),
+        )
+    )
+
+    baseline = results[0][1]
+    print(f"Decoding {args.rows:,} geometries")
+    for name, seconds in results:
+        print(
+            f"{name:<24} {seconds:8.2f} s "
+            f"{seconds / args.rows * 1e6:8.2f} us/row "
+            f"{baseline / seconds:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
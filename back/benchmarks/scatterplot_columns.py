@@ -0,0 +1,139 @@
+"""Benchmark of the scatter plot data of sound event annotations.
+
+Fills a temporary SQLite database with annotations, each with a few
+geometric features, a tag and a tagged recording. It then times reading
+all of them as columnar frames, and reading a sample of them with the
+JSON scatter plot data for comparison.
+
+Usage::
+
+    python benchmarks/scatterplot_columns.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import datetime
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from uuid import uuid4
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from whombat import models
+from whombat.api.scatterplots.columns import encode_columns
+from whombat.api.scatterplots.sound_event_annotations import (
+    get_scatterplot_data,
+    iter_scatterplot_columns,
+)
+
+FEATURES = ["duration", "low_freq", "high_freq", "bandwidth"]
+RECORDINGS = 1000
+SPECIES = 50
+
+
+def populate(path: Path, rows: int) -> None:
+    """Fill the database with annotations."""
+    engine = create_engine(f"sqlite:///{path}")
+    models.Base.metadata.create_all(engine)
+    engine.dispose()
+
+    now = datetime.datetime.now().isoformat(" ")
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        "INSERT INTO tag (id, key, value, created_on) VALUES (?, ?, ?, ?)",
+        [(id, "species", f"species {id}", now) for id in range(SPECIES)]
+        + [(SPECIES, "site", "forest", now)],
+    )
+    connection.executemany(
+        "INSERT INTO feature_name (id, name, created_on) VALUES (?, ?, ?)",
+        [(id, name, now) for id, name in enumerate(FEATURES)],
+    )
+    connection.executemany(
+        "INSERT INTO recording (id, uuid, hash, path, duration, samplerate, "
+        "channels, time_expansion, created_on) "
+        "VALUES (?, ?, ?, ?, 60, 48000, 1, 1, ?)",
+        [
+            (id, str(uuid4()), f"hash{id}", f"recording{id}.wav", now)
+            for id in range(RECORDINGS)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO recording_tag (recording_id, tag_id, created_on) "
+        "VALUES (?, ?, ?)",
+        [(id, SPECIES, now) for id in range(RECORDINGS)],
+    )
+    connection.executemany(
+        "INSERT INTO clip (id, uuid, recording_id, start_time, end_time, "
+        "created_on) VALUES (?, ?, ?, 0, 60, ?)",
+        [(id, str(uuid4()), id, now) for id in range(RECORDINGS)],
+    )
+    connection.executemany(
+        "INSERT INTO clip_annotation (id, uuid, clip_id, created_on) "
+        "VALUES (?, ?, ?, ?)",
+        [(id, str(uuid4()), id, now) for id in range(RECORDINGS)],
+    )
+    connection.executemany(
+        "INSERT INTO sound_event (id, uuid, recording_id, geometry_type, "
+        "geometry, created_on) VALUES (?, ?, ?, 'TimeInterval', "
+        '\'{"type": "TimeInterval", "coordinates": [0, 1]}\', ?)',
+        ((id, str(uuid4()), id % RECORDINGS, now) for id in range(rows)),
+    )
+    connection.executemany(
+        "INSERT INTO sound_event_annotation (id, uuid, clip_annotation_id, "
+        "sound_event_id, created_on) VALUES (?, ?, ?, ?, ?)",
+        ((id, str(uuid4()), id % RECORDINGS, id, now) for id in range(rows)),
+    )
+    connection.executemany(
+        "INSERT INTO sound_event_feature (sound_event_id, feature_name_id, "
+        "value, created_on) VALUES (?, ?, ?, ?)",
+        (
+            (id, feature, id % 97 + feature, now)
+            for id in range(rows)
+            for feature in range(len(FEATURES))
+        ),
+    )
+    connection.executemany(
+        "INSERT INTO sound_event_annotation_tag (sound_event_annotation_id, "
+        "tag_id, created_on) VALUES (?, ?, ?)",
+        ((id, id % SPECIES, now) for id in range(rows)),
+    )
+    connection.commit()
+    connection.close()
+
+
+async def run(path: Path, rows: int) -> None:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    async with AsyncSession(engine) as session:
+        start = time.perf_counter()
+        size = 0
+        async for columns in iter_scatterplot_columns(session):
+            size += len(encode_columns(columns))
+        columns_time = time.perf_counter() - start
+
+        sample = min(rows, 20_000)
+        start = time.perf_counter()
+        await get_scatterplot_data(session, limit=sample)
+        json_time = (time.perf_counter() - start) * rows / sample
+
+    await engine.dispose()
+    print(f"Scatter plot data of {rows:,} annotations")
+    print(f"columnar frames  {columns_time:8.2f} s  {size / 1e6:8.1f} MB")
+    print(f"json (estimated) {json_time:8.2f} s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "benchmark.db"
+        populate(path, args.rows)
+        asyncio.run(run(path, args.rows))
+
+
+if __name__ == "__main__":
+    main()
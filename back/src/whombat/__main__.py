@@ -1,16 +1,45 @@
 """Main entry point for whombat.
 
-This module is used to run the app using uvicorn.
+This module is used to run the app using uvicorn, or to run a worker of
+background jobs with `python -m whombat worker`.
 """
 
+import argparse
+import asyncio
+import logging.config
+
 import uvicorn
 
 from whombat.system import get_logging_config, get_settings
 
 
-def main():
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(prog="whombat")
+    subparsers = parser.add_subparsers(dest="command")
+    subparsers.add_parser("serve", help="Run the application (default).")
+    worker_parser = subparsers.add_parser(
+        "worker",
+        help="Run background jobs submitted to the application.",
+    )
+    worker_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Number of jobs to run at the same time.",
+    )
+    args = parser.parse_args(argv)
+
     settings = get_settings()
     config = get_logging_config(settings)
+
+    if args.command == "worker":
+        # NOTE: Import the worker here to avoid circular imports
+        from whombat.system.jobs import run_worker
+
+        logging.config.dictConfig(config)
+        asyncio.run(run_worker(settings, concurrency=args.concurrency))
+        return
+
     uvicorn.run(
         "whombat.app:app",
         host=settings.host,
@@ -11,6 +11,7 @@ from whombat.api.datasets import datasets
 from whombat.api.evaluation_sets import evaluation_sets
 from whombat.api.evaluations import evaluations
 from whombat.api.features import features, find_feature, find_feature_value
+from whombat.api.jobs import jobs
 from whombat.api.model_runs import model_runs
 from whombat.api.notes import notes
 from whombat.api.recordings import recordings
@@ -19,7 +20,16 @@ from whombat.api.sound_event_annotations import sound_event_annotations
 from whombat.api.sound_event_evaluations import sound_event_evaluations
 from whombat.api.sound_event_predictions import sound_event_predictions
 from whombat.api.sound_events import sound_events
-from whombat.api.spectrograms import compute_spectrogram
+from whombat.api.spectrograms import (
+    build_spectrogram_pyramid,
+    compute_spectrogram,
+    compute_spectrogram_image,
+    get_spectrogram_key,
+    get_spectrogram_pyramid,
+    get_tile_bounds,
+    get_tile_count,
+    get_tile_padding,
+)
 from whombat.api.tags import find_tag, find_tag_value, tags
 from whombat.api.user_runs import user_runs
 from whombat.api.users import users
@@ -27,11 +37,13 @@ from whombat.api.users import users
 __all__ = [
     "annotation_projects",
     "annotation_tasks",
+    "build_spectrogram_pyramid",
     "clip_annotations",
     "clip_evaluations",
     "clip_predictions",
     "clips",
     "compute_spectrogram",
+    "compute_spectrogram_image",
     "create_session",
     "datasets",
     "evaluation_sets",
@@ -41,6 +53,12 @@ __all__ = [
     "find_feature_value",
     "find_tag",
     "find_tag_value",
+    "get_spectrogram_key",
+    "get_spectrogram_pyramid",
+    "get_tile_bounds",
+    "get_tile_count",
+    "get_tile_padding",
+    "jobs",
     "load_audio",
     "load_clip_bytes",
     "model_runs",
@@ -1,6 +1,9 @@
 """API functions to load audio."""
 
+import functools
+import os
 import struct
+from dataclasses import dataclass
 from pathlib import Path
 
 import soundfile as sf
@@ -9,8 +12,11 @@ from soundevent.arrays import extend_dim
 from soundevent.audio.io import audio_to_bytes
 
 from whombat import schemas
+from whombat.core.file_pool import SoundFilePool
 
 __all__ = [
+    "PCMLayout",
+    "get_pcm_layout",
     "load_audio",
     "load_clip_bytes",
 ]
@@ -121,9 +127,14 @@ def load_clip_bytes(
     start_time: float | None = None,
     end_time: float | None = None,
     bit_depth: int = 16,
+    pool: SoundFilePool | None = None,
 ) -> tuple[bytes, int, int, int]:
     """Load audio.
 
+    When the file is a PCM WAV file with the requested bit depth, the
+    samples are copied straight from the file. Otherwise the audio is
+    decoded and converted to the requested bit depth.
+
     Parameters
     ----------
     path
@@ -143,6 +154,10 @@ def load_clip_bytes(
         The time in seconds at which to stop reading the audio.
     bit_depth
         The bit depth of the resulting audio. By default, it is 16 bits.
+    pool
+        A pool of open audio files. If provided, audio files that need
+        decoding are read through an open handle from the pool instead of
+        being opened on every call.
 
     Returns
     -------
@@ -155,43 +170,43 @@ def load_clip_bytes(
     filesize
         Total size of clip in bytes.
     """
-    with sf.SoundFile(path) as sf_file:
-        samplerate = int(sf_file.samplerate * time_expansion)
-        channels = sf_file.channels
-
-        # Calculate start and end frames based on start and end times
-        # to ensure that the requested piece of audio is loaded.
-        if start_time is None:
-            start_time = 0
-        start_frame = int(start_time * samplerate)
-
-        end_frame = sf_file.frames
-        if end_time is not None:
-            end_frame = int(end_time * samplerate)
-
-        # Calculate the total number of frames and the size of the audio
-        # data in bytes.
-        total_frames = end_frame - start_frame
-        bytes_per_frame = channels * bit_depth // 8
-        filesize = total_frames * bytes_per_frame
-
-        # Compute the offset, which is the frame at which to start reading
-        # the audio data.
-        offset = start_frame
-        if start != 0:
-            # When the start byte is not 0, calculate the offset in frames
-            # and add it to the start frame. Note that we need to
-            # remove the size of the header from the start byte to correctly
-            # calculate the offset in frames.
-            offset_frames = (start - HEADER_SIZE) // bytes_per_frame
-            offset += offset_frames
-
-        # Make sure that the number of frames to read is not greater than
-        # the number of frames requested.
-        frames = min(frames, end_frame - offset)
-
-        sf_file.seek(offset)
-        audio_data = sf_file.read(frames, fill_value=0, always_2d=True)
+    layout = get_pcm_layout(path)
+    if layout is not None and layout.bit_depth == bit_depth:
+        # The samples are stored exactly as they will be sent, so they
+        # can be copied from the file without decoding.
+        samplerate = int(layout.samplerate * time_expansion)
+        channels = layout.channels
+        offset, frames, filesize = _get_clip_frames(
+            start=start,
+            frames=frames,
+            samplerate=samplerate,
+            num_frames=layout.frames,
+            bytes_per_frame=layout.bytes_per_frame,
+            start_time=start_time,
+            end_time=end_time,
+        )
+        audio_bytes = _read_pcm_bytes(path, layout, offset, frames)
+    else:
+        if pool is None:
+            context = sf.SoundFile(path)
+        else:
+            context = pool.open(path)
+
+        with context as sf_file:
+            samplerate = int(sf_file.samplerate * time_expansion)
+            channels = sf_file.channels
+            offset, frames, filesize = _get_clip_frames(
+                start=start,
+                frames=frames,
+                samplerate=samplerate,
+                num_frames=sf_file.frames,
+                bytes_per_frame=channels * bit_depth // 8,
+                start_time=start_time,
+                end_time=end_time,
+            )
+
+            sf_file.seek(offset)
+            audio_data = sf_file.read(frames, fill_value=0, always_2d=True)
 
         # Convert the audio data to raw bytes
         audio_bytes = audio_to_bytes(
@@ -200,23 +215,216 @@ def load_clip_bytes(
             bit_depth=bit_depth,
         )
 
-        # Generate the WAV header if the start byte is 0 and
-        # append to the start of the audio data.
-        if start == 0:
-            header = generate_wav_header(
-                samplerate=int(samplerate * speed),
-                channels=channels,
-                data_size=filesize,
-                bit_depth=bit_depth,
-            )
-            audio_bytes = header + audio_bytes
-
-        return (
-            audio_bytes,
-            start,
-            start + len(audio_bytes),
-            filesize + HEADER_SIZE,
+    # Generate the WAV header if the start byte is 0 and
+    # append to the start of the audio data.
+    if start == 0:
+        header = generate_wav_header(
+            samplerate=int(samplerate * speed),
+            channels=channels,
+            data_size=filesize,
+            bit_depth=bit_depth,
         )
+        audio_bytes = header + audio_bytes
+
+    return (
+        audio_bytes,
+        start,
+        start + len(audio_bytes),
+        filesize + HEADER_SIZE,
+    )
+
+
+def _get_clip_frames(
+    start: int,
+    frames: int,
+    samplerate: int,
+    num_frames: int,
+    bytes_per_frame: int,
+    start_time: float | None = None,
+    end_time: float | None = None,
+) -> tuple[int, int, int]:
+    """Compute which frames of the file correspond to a byte range.
+
+    Returns
+    -------
+    offset
+        The frame at which to start reading.
+    frames
+        The number of frames to read.
+    filesize
+        The size in bytes of the audio data of the whole clip, without
+        the header.
+    """
+    # Calculate start and end frames based on start and end times
+    # to ensure that the requested piece of audio is loaded.
+    if start_time is None:
+        start_time = 0
+    start_frame = int(start_time * samplerate)
+
+    end_frame = num_frames
+    if end_time is not None:
+        end_frame = int(end_time * samplerate)
+
+    # Calculate the total number of frames and the size of the audio
+    # data in bytes.
+    total_frames = end_frame - start_frame
+    filesize = total_frames * bytes_per_frame
+
+    # Compute the offset, which is the frame at which to start reading
+    # the audio data.
+    offset = start_frame
+    if start != 0:
+        # When the start byte is not 0, calculate the offset in frames
+        # and add it to the start frame. Note that we need to
+        # remove the size of the header from the start byte to correctly
+        # calculate the offset in frames.
+        offset_frames = (start - HEADER_SIZE) // bytes_per_frame
+        offset += offset_frames
+
+    # Make sure that the number of frames to read is not greater than
+    # the number of frames requested.
+    frames = min(frames, end_frame - offset)
+    return offset, frames, filesize
+
+
+@dataclass(frozen=True)
+class PCMLayout:
+    """Location and encoding of the samples of a PCM WAV file."""
+
+    samplerate: int
+    """Sample rate in Hz."""
+
+    channels: int
+    """Number of channels."""
+
+    bit_depth: int
+    """Number of bits per sample."""
+
+    data_offset: int
+    """Position in bytes of the first sample within the file."""
+
+    frames: int
+    """Number of frames stored in the file."""
+
+    @property
+    def bytes_per_frame(self) -> int:
+        """Size in bytes of a frame."""
+        return self.channels * self.bit_depth // 8
+
+
+WAVE_FORMAT_PCM = 0x0001
+WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+PCM_BIT_DEPTHS = (16, 24, 32)
+"""Bit depths of signed little-endian PCM that can be sent unchanged.
+
+8-bit WAV files store unsigned samples and are always decoded.
+"""
+
+
+def get_pcm_layout(path: Path) -> PCMLayout | None:
+    """Get the layout of the samples of a PCM WAV file.
+
+    The header of the file is parsed once and the result is cached until
+    the file is modified.
+
+    Parameters
+    ----------
+    path
+        The path to the audio file.
+
+    Returns
+    -------
+    PCMLayout | None
+        The layout of the samples or None if the file is not a WAV file
+        with signed integer PCM samples of 16, 24 or 32 bits.
+    """
+    stat = os.stat(path)
+    return _read_pcm_layout(str(path), stat.st_mtime_ns, stat.st_size)
+
+
+@functools.lru_cache(maxsize=1024)
+def _read_pcm_layout(
+    path: str,
+    mtime_ns: int,
+    size: int,
+) -> PCMLayout | None:
+    fmt = None
+
+    with open(path, "rb") as file:
+        riff = file.read(12)
+        if len(riff) < 12 or riff[:4] != b"RIFF" or riff[8:] != b"WAVE":
+            return None
+
+        while True:
+            chunk = file.read(8)
+            if len(chunk) < 8:
+                return None
+
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk)
+
+            if chunk_id == b"fmt ":
+                fmt = file.read(chunk_size)
+                file.seek(chunk_size % 2, os.SEEK_CUR)
+                continue
+
+            if chunk_id == b"data":
+                break
+
+            # Chunks are padded to an even number of bytes.
+            file.seek(chunk_size + chunk_size % 2, os.SEEK_CUR)
+
+        data_offset = file.tell()
+
+    if fmt is None or len(fmt) < 16:
+        return None
+
+    format_tag, channels, samplerate, _, _, bit_depth = struct.unpack(
+        "<HHIIHH", fmt[:16]
+    )
+
+    if format_tag == WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        # The actual format is given by the first bytes of the subformat.
+        (format_tag,) = struct.unpack("<H", fmt[24:26])
+
+    if format_tag != WAVE_FORMAT_PCM or bit_depth not in PCM_BIT_DEPTHS:
+        return None
+
+    bytes_per_frame = channels * bit_depth // 8
+
+    # NOTE: Files that were not closed properly may declare a wrong data
+    # size, so the size of the file is used as an upper bound.
+    data_size = min(chunk_size, size - data_offset)
+
+    return PCMLayout(
+        samplerate=samplerate,
+        channels=channels,
+        bit_depth=bit_depth,
+        data_offset=data_offset,
+        frames=data_size // bytes_per_frame,
+    )
+
+
+def _read_pcm_bytes(
+    path: Path,
+    layout: PCMLayout,
+    offset: int,
+    frames: int,
+) -> bytes:
+    """Read the raw bytes of a range of frames of a PCM WAV file.
+
+    Frames outside of the file are filled with zeros.
+    """
+    available = max(min(frames, layout.frames - offset), 0)
+
+    with open(path, "rb") as file:
+        file.seek(layout.data_offset + offset * layout.bytes_per_frame)
+        data = file.read(available * layout.bytes_per_frame)
+
+    missing = max(frames, 0) * layout.bytes_per_frame - len(data)
+    if missing > 0:
+        data += bytes(missing)
+
+    return data
 
 
 def generate_wav_header(
@@ -7,11 +7,12 @@ from uuid import UUID
 from soundevent import data
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.clips import clips
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.notes import notes
 from whombat.api.sound_event_annotations import sound_event_annotations
 from whombat.api.tags import tags
@@ -33,6 +34,34 @@ class ClipAnnotationAPI(
 ):
     _model = models.ClipAnnotation
     _schema = schemas.ClipAnnotation
+    _profiles = {
+        "summary": LoadingProfile(
+            schema=schemas.ClipAnnotationSummary,
+            options=(
+                joinedload(models.ClipAnnotation.clip).options(
+                    *clips.get_profile("summary").options
+                ),
+                selectinload(models.ClipAnnotation.tags),
+                raiseload("*"),
+            ),
+        ),
+        "detail": LoadingProfile(
+            schema=schemas.ClipAnnotation,
+            options=(
+                joinedload(models.ClipAnnotation.clip).options(
+                    *clips.get_profile("detail").options
+                ),
+                selectinload(models.ClipAnnotation.tags),
+                selectinload(models.ClipAnnotation.notes).joinedload(
+                    models.Note.created_by
+                ),
+                selectinload(models.ClipAnnotation.sound_events).options(
+                    *sound_event_annotations.get_profile("detail").options
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
@@ -156,6 +185,52 @@ class ClipAnnotationAPI(
         self._update_cache(obj)
         return obj
 
+    async def add_tags(
+        self,
+        session: AsyncSession,
+        uuids: Sequence[UUID],
+        tags: Sequence[schemas.Tag],
+        user: schemas.SimpleUser | None = None,
+        return_objects: bool = False,
+    ) -> schemas.BulkUpdate[schemas.ClipAnnotation]:
+        """Add several tags to several clip annotations.
+
+        All tags are added with a single statement. Tags that an
+        annotation already has are skipped.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        uuids
+            The UUIDs of the clip annotations to tag.
+        tags
+            The tags to add.
+        user
+            The user adding the tags, by default None
+        return_objects
+            Whether to load and return the updated clip annotations.
+
+        Returns
+        -------
+        schemas.BulkUpdate
+            The number of tags added, and the updated clip annotations if
+            requested.
+        """
+        count = await common.add_tags_to_objects(
+            session,
+            models.ClipAnnotation,
+            self._get_pks_condition(uuids),
+            [tag.id for tag in tags],
+            created_by_id=user.id if user else None,
+        )
+        return await self._get_bulk_update(
+            session,
+            uuids,
+            count,
+            return_objects,
+        )
+
     async def add_note(
         self,
         session: AsyncSession,
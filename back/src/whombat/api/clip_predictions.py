@@ -6,11 +6,12 @@ from uuid import UUID
 from soundevent import data
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.clips import clips
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.sound_event_predictions import sound_event_predictions
 from whombat.api.tags import tags
 
@@ -31,6 +32,35 @@ class ClipPredictionAPI(
 ):
     _model = models.ClipPrediction
     _schema = schemas.ClipPrediction
+    _profiles = {
+        "summary": LoadingProfile(
+            schema=schemas.ClipPredictionSummary,
+            options=(
+                joinedload(models.ClipPrediction.clip).options(
+                    *clips.get_profile("summary").options
+                ),
+                selectinload(models.ClipPrediction.tags).joinedload(
+                    models.ClipPredictionTag.tag
+                ),
+                raiseload("*"),
+            ),
+        ),
+        "detail": LoadingProfile(
+            schema=schemas.ClipPrediction,
+            options=(
+                joinedload(models.ClipPrediction.clip).options(
+                    *clips.get_profile("detail").options
+                ),
+                selectinload(models.ClipPrediction.tags).joinedload(
+                    models.ClipPredictionTag.tag
+                ),
+                selectinload(models.ClipPrediction.sound_events).options(
+                    *sound_event_predictions.get_profile("detail").options
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
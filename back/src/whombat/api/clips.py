@@ -7,10 +7,11 @@ from uuid import UUID
 from soundevent import data
 from sqlalchemy import and_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.features import features
 from whombat.api.recordings import recordings
 
@@ -33,6 +34,30 @@ class ClipAPI(
 ):
     _model = models.Clip
     _schema = schemas.Clip
+    _cache_enabled = True
+    _profiles = {
+        "summary": LoadingProfile(
+            schema=schemas.ClipSummary,
+            options=(
+                joinedload(models.Clip.recording).options(
+                    *recordings.get_profile("summary").options
+                ),
+                raiseload("*"),
+            ),
+        ),
+        "detail": LoadingProfile(
+            schema=schemas.Clip,
+            options=(
+                joinedload(models.Clip.recording).options(
+                    *recordings.get_profile("detail").options
+                ),
+                selectinload(models.Clip.features).joinedload(
+                    models.ClipFeature.feature_name
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
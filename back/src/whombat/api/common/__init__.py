@@ -1,10 +1,15 @@
 """Common API functions."""
 
 from whombat.api.common.base import BaseAPI
+from whombat.api.common.counts import CountMode, count_objects
+from whombat.api.common.profiles import LoadingProfile, LoadingProfileName
+from whombat.api.common.upserts import upsert_objects
 from whombat.api.common.utils import (
     add_feature_to_object,
+    add_features_to_objects,
     add_note_to_object,
     add_tag_to_object,
+    add_tags_to_objects,
     create_object,
     create_objects,
     create_objects_without_duplicates,
@@ -12,6 +17,7 @@ from whombat.api.common.utils import (
     get_count,
     get_object,
     get_objects,
+    get_objects_by_cursor,
     get_objects_from_query,
     get_or_create_object,
     insert_batched,
@@ -25,9 +31,15 @@ from whombat.api.common.utils import (
 
 __all__ = [
     "BaseAPI",
+    "CountMode",
+    "LoadingProfile",
+    "LoadingProfileName",
     "add_feature_to_object",
+    "add_features_to_objects",
     "add_note_to_object",
     "add_tag_to_object",
+    "add_tags_to_objects",
+    "count_objects",
     "create_object",
     "create_objects",
     "create_objects_without_duplicates",
@@ -35,6 +47,7 @@ __all__ = [
     "get_count",
     "get_object",
     "get_objects",
+    "get_objects_by_cursor",
     "get_objects_from_query",
     "get_or_create_object",
     "insert_batched",
@@ -44,4 +57,5 @@ __all__ = [
     "select_batched",
     "update_feature_on_object",
     "update_object",
+    "upsert_objects",
 ]
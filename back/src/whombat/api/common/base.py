@@ -1,16 +1,31 @@
 """Base API interface."""
 
 from abc import ABC
-from typing import Any, Generic, Hashable, Sequence, TypeVar
+from typing import (
+    Any,
+    ClassVar,
+    Generic,
+    Hashable,
+    Mapping,
+    Sequence,
+    TypeVar,
+    cast,
+)
 
-import cachetools
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql import ColumnExpressionArgument
 from sqlalchemy.sql.expression import ColumnElement
 
-from whombat import models
+from whombat import models, schemas
+from whombat.api.common.cache import (
+    ObjectCache,
+    get_cache_namespace,
+    object_cache,
+)
+from whombat.api.common.counts import CountMode
+from whombat.api.common.profiles import LoadingProfile, LoadingProfileName
 from whombat.api.common.utils import (
     create_object,
     create_objects,
@@ -19,6 +34,7 @@ from whombat.api.common.utils import (
     find_object,
     get_object,
     get_objects,
+    get_objects_by_cursor,
     update_object,
 )
 from whombat.filters.base import Filter
@@ -42,15 +58,55 @@ class BaseAPI(
 ):
     _schema: type[WhombatSchema]
     _model: type[WhombatModel]
-    _cache: cachetools.LRUCache
+    _cache: ObjectCache
+
+    _cache_enabled: ClassVar[bool] = False
+    """Whether objects fetched with `get` are cached.
+
+    Only enable the cache for objects that embed no collections of
+    related objects that can be modified through other APIs, as adding
+    an item to such a collection does not invalidate the cached object.
+    """
+
+    _profiles: ClassVar[Mapping[LoadingProfileName, LoadingProfile]] = {}
+    """Loading profiles supported by this API.
+
+    Objects requested with a profile that is not listed are loaded with
+    the "detail" profile instead. APIs without a "detail" profile use the
+    default loading strategies of the model and the main schema of the
+    API.
+    """
 
     def __init__(self):
-        self._cache = cachetools.LRUCache(maxsize=1000)
+        self._cache = object_cache
+
+    def get_profile(
+        self,
+        profile: LoadingProfileName = "detail",
+    ) -> LoadingProfile:
+        """Get a loading profile of this API.
+
+        Parameters
+        ----------
+        profile
+            The name of the profile, by default "detail".
+
+        Returns
+        -------
+        LoadingProfile
+            The requested profile, or the "detail" profile if this API
+            does not declare it.
+        """
+        for name in (profile, "detail"):
+            if name in self._profiles:
+                return self._profiles[name]
+        return LoadingProfile(schema=self._schema)
 
     async def get(
         self,
         session: AsyncSession,
         pk: PrimaryKey,
+        profile: LoadingProfileName = "detail",
     ) -> WhombatSchema:
         """Get an object by primary key.
 
@@ -60,6 +116,9 @@ class BaseAPI(
             The database session to use.
         pk
             The primary key.
+        profile
+            The loading profile to use, by default "detail". The "summary"
+            profile returns a lighter schema if the API declares one.
 
         Returns
         -------
@@ -71,16 +130,26 @@ class BaseAPI(
         NotFoundError
             If the object could not be found.
         """
-        if self._is_in_cache(pk):
-            return self._get_from_cache(pk)
+        loading = self.get_profile(profile)
+        key = self._get_cache_key(session, pk, loading.schema)
+        if key is not None:
+            cached = self._cache.get(key)
+            if cached is not None:
+                return cached  # type: ignore
+
+        version = self._cache.version
 
         obj = await get_object(
             session,
             self._model,
             self._get_pk_condition(pk),
+            options=loading.options,
         )
-        data = self._schema.model_validate(obj)
-        self._update_cache(data)
+        data = cast(WhombatSchema, loading.schema.model_validate(obj))
+
+        if key is not None:
+            self._cache.set(key, data, pk, version=version)
+
         return data
 
     async def find(
@@ -104,6 +173,8 @@ class BaseAPI(
         offset: int | None = 0,
         filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
         sort_by: ColumnExpressionArgument | str | None = "-created_on",
+        count_mode: CountMode = "exact",
+        profile: LoadingProfileName = "detail",
     ) -> tuple[Sequence[WhombatSchema], int]:
         """Get many objects.
 
@@ -119,6 +190,13 @@ class BaseAPI(
             A list of filters to apply, by default None
         sort_by
             The column to sort by, by default None
+        count_mode
+            How to count the total number of objects, by default "exact".
+            Cached and estimated counts avoid counting all matching rows
+            on every request.
+        profile
+            The loading profile to use, by default "detail". The "summary"
+            profile returns a lighter schema if the API declares one.
 
         Returns
         -------
@@ -128,15 +206,104 @@ class BaseAPI(
             The total number of objects. This is the number of objects that
             would have been returned if no limit or offset was applied.
         """
+        loading = self.get_profile(profile)
         objs, count = await get_objects(
             session,
             self._model,
             limit=limit,
             offset=offset,
             filters=filters,
+            options=loading.options,
             sort_by=sort_by,
+            count_mode=count_mode,
+        )
+        return [loading.schema.model_validate(obj) for obj in objs], count  # type: ignore
+
+    async def get_page(
+        self,
+        session: AsyncSession,
+        *,
+        limit: int = 1000,
+        offset: int = 0,
+        cursor: str | None = None,
+        filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+        sort_by: str | None = "-created_on",
+        count_mode: CountMode | None = None,
+        profile: LoadingProfileName = "detail",
+    ) -> schemas.Page[WhombatSchema]:
+        """Get a page of objects.
+
+        By default pages are addressed by offset, as with `get_many`. If a
+        cursor is given, keyset pagination is used instead: the page
+        starts right after the last object of the page that returned the
+        cursor, and the offset is ignored. The first page of a keyset
+        paginated listing is requested with an empty cursor. Unlike
+        offsets, fetching a page with a cursor takes the same time no
+        matter how deep the page is.
+
+        Parameters
+        ----------
+        session
+            The SQLAlchemy AsyncSession of the database to use.
+        limit
+            The maximum number of objects to return, by default 1000
+        offset
+            The offset to use, by default 0. Ignored when using a cursor.
+        cursor
+            The cursor of the page to get, by default None. An empty
+            string requests the first page.
+        filters
+            A list of filters to apply, by default None
+        sort_by
+            The column to sort by, by default "-created_on"
+        count_mode
+            How to count the total number of objects. By default, pages
+            addressed by offset are counted exactly and pages addressed by
+            a cursor are not counted.
+        profile
+            The loading profile to use, by default "detail".
+
+        Returns
+        -------
+        page : schemas.Page
+            The page of objects.
+        """
+        if cursor is None:
+            objs, total = await self.get_many(
+                session,
+                limit=limit,
+                offset=offset,
+                filters=filters,
+                sort_by=sort_by,
+                count_mode=count_mode or "exact",
+                profile=profile,
+            )
+            return schemas.Page(
+                items=objs,
+                total=total,
+                limit=limit,
+                offset=offset,
+            )
+
+        loading = self.get_profile(profile)
+        db_objs, next_cursor, total = await get_objects_by_cursor(
+            session,
+            self._model,
+            limit=limit,
+            cursor=cursor or None,
+            options=loading.options,
+            filters=filters,
+            sort_by=sort_by,
+            count_mode=count_mode,
+        )
+        items = [loading.schema.model_validate(obj) for obj in db_objs]
+        return schemas.Page(
+            items=cast(list[WhombatSchema], items),
+            total=total,
+            limit=limit,
+            offset=0,
+            next_cursor=next_cursor,
         )
-        return [self._schema.model_validate(obj) for obj in objs], count
 
     async def _create(
         self,
@@ -304,66 +471,94 @@ class BaseAPI(
         self._update_cache(obj)
         return obj
 
-    def _is_in_cache(self, pk: PrimaryKey) -> bool:
-        """Check if an object is in the cache.
-
-        Parameters
-        ----------
-        pk
-            The primary key.
+    def _get_cache_key(
+        self,
+        session: AsyncSession,
+        pk: PrimaryKey,
+        schema: type[BaseModel] | None = None,
+    ) -> Hashable | None:
+        """Get the key under which an object is cached.
 
         Returns
         -------
-        bool
-            Whether the object is in the cache.
+        Hashable | None
+            The key, or None if objects of this API are not cached.
         """
-        # TODO: Disabled cache for now, as it is not working properly
-        # with related objects
-        return False
-        # return pk in self._cache
-
-    def _get_from_cache(self, pk: PrimaryKey) -> WhombatSchema:
-        """Get an object from the cache.
+        if not self._cache_enabled:
+            return None
 
-        Parameters
-        ----------
-        pk
-            The primary key.
+        namespace = get_cache_namespace(session)
+        if namespace is None:
+            return None
 
-        Returns
-        -------
-        WhombatSchema
-            The object.
-        """
-        return self._cache[pk]
+        schema = schema or self._schema
+        return (namespace, schema.__name__, pk)
 
     def _update_cache(self, obj: WhombatSchema) -> None:
-        """Update the cache.
+        """Update the cache after an object has been modified.
+
+        The cached copy of the object, and of any object that embeds it,
+        is evicted. The object is cached again the next time it is
+        fetched, once the changes are visible in the database.
 
         Parameters
         ----------
         obj
-            The object to update the cache with.
+            The modified object.
         """
-        # TODO: Disabled cache for now, as it is not working properly
-        # with related objects
-        return
-        # pk = self._get_pk_from_obj(obj)
-        # self._cache[pk] = obj
+        self._cache.invalidate(self._get_pk_from_obj(obj))
 
     def _clear_from_cache(self, obj: WhombatSchema) -> None:
         """Clear an object from the cache.
 
+        Any cached object that embeds it is also evicted.
+
         Parameters
         ----------
         obj
             The object to clear from the cache.
         """
-        # TODO: Disabled cache for now, as it is not working properly
-        # with related objects
-        return
-        pk = self._get_pk_from_obj(obj)
-        self._cache.pop(pk, None)
+        self._cache.invalidate(self._get_pk_from_obj(obj))
+
+    async def _get_bulk_update(
+        self,
+        session: AsyncSession,
+        pks: Sequence[PrimaryKey],
+        count: int,
+        return_objects: bool = False,
+    ) -> schemas.BulkUpdate[WhombatSchema]:
+        """Build the result of an update of several objects.
+
+        The cached copies of the objects are evicted, and the objects are
+        only loaded from the database if requested.
+
+        Parameters
+        ----------
+        session
+            The SQLAlchemy AsyncSession of the database to use.
+        pks
+            The primary keys of the updated objects.
+        count
+            The number of rows created by the update.
+        return_objects
+            Whether to load the updated objects.
+
+        Returns
+        -------
+        schemas.BulkUpdate
+            The number of created rows and, if requested, the objects.
+        """
+        self._cache.invalidate_many(pks)
+
+        if not return_objects:
+            return schemas.BulkUpdate(count=count)
+
+        objs, _ = await self.get_many(
+            session,
+            limit=-1,
+            filters=[self._get_pks_condition(pks)],
+        )
+        return schemas.BulkUpdate(count=count, items=objs)
 
     def _get_pk_condition(self, pk: PrimaryKey) -> ColumnExpressionArgument:
         column = getattr(self._model, "uuid", None)
@@ -374,6 +569,18 @@ class BaseAPI(
             )
         return column == pk
 
+    def _get_pks_condition(
+        self,
+        pks: Sequence[PrimaryKey],
+    ) -> ColumnExpressionArgument:
+        column = getattr(self._model, "uuid", None)
+        if not column:
+            raise NotImplementedError(
+                f"The model {self._model.__name__} does not have a column named"
+                " uuid"
+            )
+        return column.in_(pks)
+
     def _get_pk_from_obj(self, obj: WhombatSchema) -> PrimaryKey:
         pk = getattr(obj, "uuid", None)
         if not pk:
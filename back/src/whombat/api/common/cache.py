@@ -0,0 +1,364 @@
+"""Identity cache of API objects.
+
+Objects returned by the API embed copies of related objects, for example
+a clip embeds its recording. The cache therefore keeps track, for every
+cached object, of the primary keys of all objects embedded in it: the
+UUID of most objects, the id of users, the key and value of tags and the
+name of features. Invalidating an object evicts it together with every
+cached object that embeds it, so that modifying a recording also evicts
+the clips of that recording.
+
+Objects are invalidated explicitly by the API methods that modify them
+and, as a safety net, whenever the database session flushes changes to
+an object. A rollback clears the whole cache, since cached objects may
+reflect changes that were never committed.
+
+Invalidation happens when a change is written, before it is committed.
+Until the commit, other sessions still read the previous version of the
+object, so objects are only cached if no write was in progress while
+they were loaded.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Iterator
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
+from sqlalchemy.exc import UnboundExecutionError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, SessionTransaction
+
+from whombat import models, schemas
+
+__all__ = [
+    "CacheStats",
+    "ObjectCache",
+    "object_cache",
+]
+
+
+@dataclass
+class CacheStats:
+    """Usage counters of the object cache."""
+
+    size: int
+    """Number of cached objects."""
+
+    maxsize: int
+    """Maximum number of cached objects."""
+
+    hits: int
+    """Number of lookups served from the cache."""
+
+    misses: int
+    """Number of lookups that required a database query."""
+
+    evictions: int
+    """Number of objects removed because the cache was full or stale."""
+
+    invalidations: int
+    """Number of objects removed because they, or an object they embed,
+    were modified."""
+
+
+@dataclass
+class _Entry:
+    obj: BaseModel
+    dependencies: frozenset[Hashable]
+    expires_at: float
+
+
+class ObjectCache:
+    """Least-recently-used cache of API objects with dependency tracking.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of cached objects. A value of zero disables the
+        cache.
+    ttl
+        Seconds after which a cached object is discarded. This bounds
+        how long changes made by other processes can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+        self._dependents: dict[Hashable, set[Hashable]] = {}
+        self._version = 0
+        self._writers: set[Hashable] = set()
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        """Change the size and time to live of the cache and clear it."""
+        self.clear()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> BaseModel | None:
+        """Get a cached object.
+
+        Returns
+        -------
+        BaseModel | None
+            The cached object or None if it is not cached or has expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at < time.monotonic():
+            self._remove(key)
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.obj
+
+    @property
+    def version(self) -> int:
+        """Counter that changes whenever a cached object may become stale.
+
+        Read it before loading an object from the database and pass it
+        to `set`, so that the object is not cached if it was modified
+        while it was loaded.
+        """
+        return self._version
+
+    def set(
+        self,
+        key: Hashable,
+        obj: BaseModel,
+        pk: Hashable,
+        version: int | None = None,
+    ) -> None:
+        """Cache an object.
+
+        Parameters
+        ----------
+        key
+            The key under which the object is cached.
+        obj
+            The object to cache.
+        pk
+            The primary key of the object. Invalidating it evicts the
+            cached object.
+        version
+            The `version` of the cache before the object was loaded. If
+            given, the object is not cached if the version changed since
+            then or if a write has not been committed yet, as the object
+            could be out of date.
+        """
+        if self.maxsize <= 0:
+            return
+
+        if version is not None and (version != self._version or self._writers):
+            return
+
+        self._remove(key)
+
+        dependencies = frozenset({pk, *get_embedded_keys(obj)})
+        self._entries[key] = _Entry(
+            obj=obj,
+            dependencies=dependencies,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        for dependency in dependencies:
+            self._dependents.setdefault(dependency, set()).add(key)
+
+        while len(self._entries) > self.maxsize:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def invalidate(self, pk: Hashable) -> None:
+        """Evict an object and every cached object that embeds it."""
+        self._version += 1
+        for key in self._dependents.pop(pk, set()):
+            if key in self._entries:
+                self._remove(key)
+                self.invalidations += 1
+
+    def invalidate_many(self, pks: Iterable[Hashable]) -> None:
+        """Evict several objects and the cached objects that embed them."""
+        for pk in pks:
+            self.invalidate(pk)
+
+    def begin_write(self, writer: Hashable) -> None:
+        """Record that a writer has uncommitted changes.
+
+        Objects loaded while any writer has uncommitted changes are not
+        cached.
+        """
+        self._writers.add(writer)
+
+    def end_write(self, writer: Hashable) -> None:
+        """Record that the changes of a writer were committed or undone."""
+        if writer in self._writers:
+            self._writers.discard(writer)
+            self._version += 1
+
+    def clear(self) -> None:
+        """Remove all cached objects."""
+        self._version += 1
+        self._entries.clear()
+        self._dependents.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get the usage counters of the cache."""
+        return CacheStats(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        for dependency in entry.dependencies:
+            dependents = self._dependents.get(dependency)
+            if dependents is None:
+                continue
+
+            dependents.discard(key)
+            if not dependents:
+                del self._dependents[dependency]
+
+
+def get_dependency_key(obj: Any) -> Hashable | None:
+    """Get the key under which an object is invalidated.
+
+    The key is the primary key used by the API of the object, so that
+    invalidating it through the API also evicts the objects that embed
+    it. Works both with API objects and with database models.
+
+    Returns
+    -------
+    Hashable | None
+        The key, or None if the object is not tracked.
+    """
+    if isinstance(obj, (schemas.Tag, models.Tag)):
+        return (obj.key, obj.value)
+
+    if isinstance(
+        obj, (schemas.FeatureName, schemas.Feature, models.FeatureName)
+    ):
+        return obj.name
+
+    # NOTE: Users are identified by a UUID in their id.
+    for attribute in ("uuid", "id"):
+        value = getattr(obj, attribute, None)
+        if isinstance(value, UUID):
+            return value
+
+    return None
+
+
+def get_embedded_keys(obj: Any) -> set[Hashable]:
+    """Get the dependency keys of all objects embedded in an object."""
+    keys: set[Hashable] = set()
+    stack = [obj]
+
+    while stack:
+        value = stack.pop()
+
+        if isinstance(value, BaseModel):
+            key = get_dependency_key(value)
+            if key is not None:
+                keys.add(key)
+
+            stack.extend(value.__dict__.values())
+
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            stack.extend(value)
+
+    return keys
+
+
+def get_cache_namespace(session: AsyncSession) -> str | None:
+    """Get the namespace of the objects loaded with a session.
+
+    Objects from different databases are cached separately.
+    """
+    try:
+        bind = session.get_bind()
+    except UnboundExecutionError:
+        return None
+
+    return str(bind.engine.url)
+
+
+object_cache = ObjectCache()
+"""Cache shared by all the API objects."""
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed_objects(session: Session, _) -> None:
+    """Invalidate the cached copies of modified or deleted objects."""
+    object_cache.begin_write(id(session))
+    object_cache.invalidate_many(
+        key
+        for obj in [*session.dirty, *session.deleted]
+        for key in _get_flushed_keys(obj)
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def track_bulk_writes(state: ORMExecuteState) -> None:
+    """Record the writes made with insert, update and delete statements."""
+    if state.is_insert or state.is_update or state.is_delete:
+        object_cache.begin_write(id(state.session))
+
+
+@event.listens_for(Session, "after_transaction_end")
+def end_writes(session: Session, transaction: SessionTransaction) -> None:
+    """Record the end of the writes of a session once its transaction ends."""
+    if transaction.parent is None:
+        object_cache.end_write(id(session))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def clear_after_rollback(session: Session, _) -> None:
+    """Clear the cache when a transaction is rolled back."""
+    object_cache.clear()
+
+
+def _get_flushed_keys(obj: Any) -> Iterator[Hashable]:
+    key = get_dependency_key(obj)
+    if key is not None:
+        yield key
+
+    # Tags and feature names are keyed by columns that can be modified,
+    # so the objects cached under their previous values are evicted too.
+    if isinstance(obj, models.Tag):
+        yield (
+            _get_previous_value(obj, "key"),
+            _get_previous_value(obj, "value"),
+        )
+
+    if isinstance(obj, models.FeatureName):
+        yield _get_previous_value(obj, "name")
+
+
+def _get_previous_value(obj: Any, attribute: str) -> Any:
+    history = inspect(obj).attrs[attribute].history
+    if history.deleted:
+        return history.deleted[0]
+    return getattr(obj, attribute)
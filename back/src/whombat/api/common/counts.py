@@ -0,0 +1,342 @@
+"""Counting the objects of paginated listings.
+
+Counting the rows that match a filtered listing requires visiting all of
+them, which for large tables can cost as much as fetching the page
+itself. Counts can be computed in one of three modes:
+
+- ``exact``: The count is computed by the database on every request.
+- ``cached``: Exact counts are kept in memory for a while. A cached count
+  is discarded as soon as one of the tables it was computed from is
+  written to through a session of this process.
+- ``estimated``: The count is estimated from the statistics of the
+  database. On PostgreSQL the estimate of the query planner is used. On
+  SQLite, the row count gathered by ``ANALYZE`` is used for unfiltered
+  listings. When no estimate is available, the cached count is used.
+"""
+
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable, Iterable, Literal
+
+from sqlalchemy import Select, Table, event, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql import ClauseElement, Executable, visitors
+
+from whombat import models
+from whombat.api.common.cache import CacheStats, get_cache_namespace
+
+__all__ = [
+    "CountCache",
+    "CountMode",
+    "count_cache",
+    "count_objects",
+]
+
+CountMode = Literal["exact", "cached", "estimated"]
+
+
+@dataclass
+class _Entry:
+    count: int
+    tables: frozenset[str]
+    expires_at: float
+
+
+class CountCache:
+    """Least-recently-used cache of query counts.
+
+    Each count is stored together with the names of the tables it was
+    computed from, so that writing to a table invalidates every count
+    that depends on it.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of cached counts. A value of zero disables the
+        cache.
+    ttl
+        Seconds after which a cached count is discarded. This bounds how
+        long changes made by other processes can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int = 1000, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        """Change the size and time to live of the cache and clear it."""
+        self.clear()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> int | None:
+        """Get a cached count.
+
+        Returns
+        -------
+        int | None
+            The cached count or None if it is not cached or has expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.count
+
+    def set(self, key: Hashable, count: int, tables: frozenset[str]) -> None:
+        """Cache a count computed from the given tables."""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = _Entry(
+            count=count,
+            tables=tables,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate_tables(self, tables: Iterable[str]) -> None:
+        """Evict the counts computed from any of the given tables."""
+        tables = set(tables)
+        if not tables:
+            return
+
+        stale = [
+            key
+            for key, entry in self._entries.items()
+            if not entry.tables.isdisjoint(tables)
+        ]
+        for key in stale:
+            del self._entries[key]
+
+        self.invalidations += len(stale)
+
+    def clear(self) -> None:
+        """Remove all cached counts."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get the usage counters of the cache."""
+        return CacheStats(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+
+count_cache = CountCache()
+"""Cache shared by all the paginated listings."""
+
+
+async def count_objects(
+    session: AsyncSession,
+    model: type[models.Base],
+    query: Select,
+    mode: CountMode = "exact",
+) -> int:
+    """Count the objects selected by a query.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    model
+        The model of the selected objects.
+    query
+        The query that selects the objects.
+    mode
+        How to compute the count, by default "exact". See the module
+        documentation for the available modes.
+
+    Returns
+    -------
+    int
+        The number of objects, or an estimate of it.
+    """
+    if mode == "estimated":
+        estimate = await _estimate_count(session, model, query)
+        if estimate is not None:
+            return estimate
+
+        mode = "cached"
+
+    pk = inspect(model).primary_key[0]  # type: ignore
+    count_q = query.with_only_columns(func.count(pk)).order_by(None)
+
+    if mode == "exact":
+        return await _execute_count(session, count_q)
+
+    key = _get_cache_key(session, count_q)
+    count = count_cache.get(key)
+    if count is None:
+        count = await _execute_count(session, count_q)
+        count_cache.set(key, count, _get_tables(count_q))
+
+    return count
+
+
+async def _execute_count(session: AsyncSession, count_q: Select) -> int:
+    result = await session.execute(count_q)
+    count = result.scalar()
+
+    if count is None:
+        return 0
+
+    if not isinstance(count, int):
+        raise TypeError("Count query did not return an integer")
+
+    return count
+
+
+def _get_cache_key(session: AsyncSession, query: Select) -> Hashable:
+    bind = session.bind
+    compiled = query.compile(dialect=bind.dialect if bind else None)
+    params = tuple(
+        (name, _freeze(value))
+        for name, value in sorted(compiled.params.items())
+    )
+    return (get_cache_namespace(session), str(compiled), params)
+
+
+def _freeze(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _get_tables(statement: ClauseElement) -> frozenset[str]:
+    return frozenset(
+        element.name
+        for element in visitors.iterate(statement)
+        if isinstance(element, Table)
+    )
+
+
+async def _estimate_count(
+    session: AsyncSession,
+    model: type[models.Base],
+    query: Select,
+) -> int | None:
+    bind = session.bind
+    if bind is None:
+        return None
+
+    dialect = bind.dialect.name
+
+    if dialect == "postgresql":
+        pk = inspect(model).primary_key[0]  # type: ignore
+        result = await session.execute(
+            _Explain(query.with_only_columns(pk).order_by(None))
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])  # type: ignore
+
+    if dialect == "sqlite":
+        froms = query.get_final_froms()
+        if (
+            query.whereclause is not None
+            or len(froms) != 1
+            or not isinstance(froms[0], Table)
+        ):
+            return None
+
+        result = await session.execute(
+            text(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name = 'sqlite_stat1'"
+            )
+        )
+        if result.scalar() is None:
+            return None
+
+        # NOTE: The first number of each statistic is the number of rows
+        # of the table, or of the rows covered by the index.
+        result = await session.execute(
+            text(
+                "SELECT max(CAST(stat AS INTEGER)) FROM sqlite_stat1 "
+                "WHERE tbl = :table"
+            ),
+            {"table": froms[0].name},
+        )
+        return result.scalar()
+
+    return None
+
+
+class _Explain(Executable, ClauseElement):
+    """EXPLAIN statement that returns the query plan as JSON."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler, **kwargs) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(
+        element.statement,
+        **kwargs,
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed_counts(session: Session, _) -> None:
+    """Invalidate the counts of the tables of flushed objects."""
+    count_cache.invalidate_tables(
+        {
+            table.name
+            for obj in [*session.new, *session.dirty, *session.deleted]
+            for table in inspect(obj).mapper.tables
+        }
+    )
+
+
+@event.listens_for(Session, "do_orm_execute")
+def invalidate_modified_counts(state: ORMExecuteState) -> None:
+    """Invalidate the counts of the tables written by bulk statements."""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+
+    if not isinstance(state.statement, ClauseElement):
+        # The written tables are unknown, so no count can be trusted.
+        count_cache.clear()
+        return
+
+    count_cache.invalidate_tables(_get_tables(state.statement))
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def clear_counts_after_rollback(session: Session, _) -> None:
+    """Clear the cached counts when a transaction is rolled back."""
+    count_cache.clear()
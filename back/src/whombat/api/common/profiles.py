@@ -0,0 +1,50 @@
+"""Loading profiles of API objects.
+
+Most models eagerly load their related objects with joins, so that any
+object fetched from the database can be serialized without further
+queries. Loading an object that embeds several collections this way
+joins all of them at once, and the number of rows fetched grows with
+the product of the collection sizes.
+
+A loading profile names a way of fetching objects for a particular use:
+
+- ``summary``: The few fields shown in listings. Objects are serialized
+  with a lighter schema and any relationship not needed by it is never
+  loaded.
+- ``detail``: The full schema of the object. Collections are loaded with
+  separate ``SELECT ... IN`` queries instead of joins.
+- ``export``: The full schema of the object, loaded for bulk exports.
+
+Each API declares the profiles it supports. Profiles that an API does
+not declare fall back to its ``detail`` profile, and objects of APIs
+without profiles are fetched with the default loading strategies of
+their model.
+"""
+
+from dataclasses import dataclass, field
+from typing import Literal, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy.orm.strategy_options import _AbstractLoad
+
+__all__ = [
+    "LoadingProfile",
+    "LoadingProfileName",
+]
+
+LoadingProfileName = Literal["summary", "detail", "export"]
+
+
+@dataclass(frozen=True)
+class LoadingProfile:
+    """How to load and serialize objects for a particular use."""
+
+    schema: type[BaseModel]
+    """Schema used to serialize the loaded objects."""
+
+    options: Sequence[_AbstractLoad] = field(default_factory=tuple)
+    """Loader options added to the queries that fetch the objects.
+
+    Options of one profile can be nested in those of another with
+    `Load.options`, to load related objects with their own profile.
+    """
@@ -0,0 +1,467 @@
+"""Bulk creation of objects with dialect-native upserts.
+
+Importing a batch of objects used to take three round trips: a query for
+the keys that already exist, an insert of the missing rows and a second
+query to get the ids of everything. On PostgreSQL and SQLite the rows are
+instead written with ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, so
+a single statement creates the missing rows and returns their ids. Only
+the keys that conflicted with existing rows need to be queried
+afterwards.
+
+Statements are split into batches that fit within the limit on bound
+parameters of the database. On PostgreSQL, large loads are streamed into
+a temporary table with ``COPY`` and moved into the target table with a
+single ``INSERT ... SELECT``.
+
+Rows that should overwrite existing ones, such as recomputed feature
+values, are written with ``INSERT ... ON CONFLICT DO UPDATE`` instead.
+
+The cached API objects that written rows belong to, such as the
+recording of a recording tag, are evicted from the object cache.
+"""
+
+import sqlite3
+from typing import Any, Literal, Sequence
+from uuid import uuid4
+
+from sqlalchemy import (
+    Column,
+    Dialect,
+    Table,
+    UniqueConstraint,
+    bindparam,
+    column,
+    insert,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.dml import Insert
+from sqlalchemy.sql.expression import TableClause
+
+from whombat import models
+from whombat.api.common.cache import object_cache
+from whombat.api.common.utils import (
+    _add_defaults,
+    _get_defaults,
+    batched,
+    select_batched,
+)
+
+__all__ = [
+    "COPY_THRESHOLD",
+    "upsert_objects",
+]
+
+COPY_THRESHOLD = 5000
+"""Minimum number of rows loaded with ``COPY`` on PostgreSQL."""
+
+MAX_BATCH_ROWS = 1000
+"""Maximum number of rows written by a single statement."""
+
+OnConflict = Literal["ignore", "raise", "update"]
+
+
+async def upsert_objects(
+    session: AsyncSession,
+    model: type[models.Base],
+    values: Sequence[dict],
+    keys: Sequence[InstrumentedAttribute],
+    returning: InstrumentedAttribute | None = None,
+    on_conflict: OnConflict = "ignore",
+    copy_threshold: int | None = COPY_THRESHOLD,
+    update_columns: Sequence[InstrumentedAttribute] | None = None,
+) -> dict[Any, Any]:
+    """Create multiple objects, skipping those that already exist.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    model
+        The model of the objects to create.
+    values
+        The column values of each object. Missing values are filled with
+        the defaults of the model.
+    keys
+        The columns that identify each object. When these columns are
+        not covered by a unique constraint, the existing keys are queried
+        before inserting.
+    returning
+        A column to return for every object, usually its id. If not
+        given, nothing is returned.
+    on_conflict
+        What to do with objects that conflict with existing rows.
+        ``ignore`` skips them, ``update`` overwrites the
+        ``update_columns`` of the existing rows, while ``raise`` lets the
+        database raise an ``IntegrityError``. Duplicated keys within
+        ``values`` are removed unless conflicts raise.
+    copy_threshold
+        Minimum number of rows to load with ``COPY`` on PostgreSQL. Set
+        to None to always use ``INSERT`` statements.
+    update_columns
+        The columns overwritten when conflicts are updated.
+
+    Returns
+    -------
+    dict
+        Mapping from the key of each object to its ``returning`` column,
+        for both created and existing objects. Keys of a single column
+        are returned as scalars, otherwise as tuples. Objects that could
+        not be created are not included.
+
+    Raises
+    ------
+    NotImplementedError
+        If conflicts are updated on a database without native upserts,
+        or the keys are not covered by a unique constraint.
+    """
+    if not values:
+        return {}
+
+    table = _get_table(model)
+    key_names = [key.key for key in keys]
+    values = _prepare_values(model, table, values)
+
+    if on_conflict != "raise":
+        values = list(
+            {_get_key(value, key_names): value for value in values}.values()
+        )
+
+    dialect = session.get_bind().dialect
+    mapping: dict[Any, Any] = {}
+    native = dialect.name in ("postgresql", "sqlite")
+
+    if on_conflict == "update" and (
+        not native or not _is_unique(table, key_names)
+    ):
+        raise NotImplementedError(
+            "Conflicts can only be updated on PostgreSQL and SQLite, and "
+            "when the keys are covered by a unique constraint."
+        )
+
+    if on_conflict == "ignore" and (
+        not native or not _is_unique(table, key_names)
+    ):
+        existing = await _select_existing(
+            session,
+            table,
+            key_names,
+            [_get_key(value, key_names) for value in values],
+            returning,
+            dialect,
+        )
+        values = [
+            value
+            for value in values
+            if _get_key(value, key_names) not in existing
+        ]
+        if returning is not None:
+            mapping.update(existing)
+
+    if not values:
+        return mapping
+
+    statement = _insert(table, dialect)
+    if on_conflict == "ignore" and native:
+        statement = statement.on_conflict_do_nothing()  # type: ignore
+
+    if on_conflict == "update":
+        statement = statement.on_conflict_do_update(  # type: ignore
+            index_elements=[table.c[name] for name in key_names],
+            set_={
+                column.key: statement.excluded[column.key]  # type: ignore
+                for column in update_columns or []
+            },
+        )
+
+    returned_columns = []
+    if returning is not None:
+        returned_columns = [
+            *[table.c[name] for name in key_names],
+            table.c[returning.key],
+        ]
+
+    if (
+        copy_threshold is not None
+        and len(values) >= copy_threshold
+        and _supports_copy(dialect, values)
+    ):
+        rows = await _copy_insert(
+            session,
+            table,
+            statement,
+            values,
+            returned_columns,
+        )
+    else:
+        rows = []
+        num_columns = len({name for value in values for name in value})
+        batch_size = _get_batch_size(dialect, num_columns)
+        for batch in batched(values, batch_size):
+            stmt = statement.values(batch)
+            if returned_columns:
+                stmt = stmt.returning(*returned_columns)
+            result = await session.execute(stmt)
+            if returned_columns:
+                rows.extend(result.all())
+
+    await _invalidate_cached_objects(session, table, values)
+
+    if returning is None:
+        return {}
+
+    mapping.update(_rows_to_mapping(rows, len(key_names)))
+
+    conflicts = [
+        key
+        for key in (_get_key(value, key_names) for value in values)
+        if key not in mapping
+    ]
+    if conflicts:
+        mapping.update(
+            await _select_existing(
+                session,
+                table,
+                key_names,
+                conflicts,
+                returning,
+                dialect,
+            )
+        )
+
+    return mapping
+
+
+async def _invalidate_cached_objects(
+    session: AsyncSession,
+    table: Table,
+    values: list[dict],
+) -> None:
+    """Evict the cached objects that the written rows belong to.
+
+    Rows of association tables, such as the tags of a recording, are
+    part of the cached copy of the object they reference, so that
+    object is evicted along with the objects that embed it.
+    """
+    if not object_cache.stats.size:
+        return
+
+    if "uuid" in table.c:
+        object_cache.invalidate_many(
+            value["uuid"] for value in values if "uuid" in value
+        )
+
+    for foreign_key in table.foreign_keys:
+        parent = foreign_key.column.table
+        if "uuid" not in parent.c:
+            continue
+
+        name = foreign_key.parent.key
+        ids = list(
+            {value[name] for value in values if value.get(name) is not None}
+        )
+        if not ids:
+            continue
+
+        rows = await select_batched(
+            session,
+            select(parent.c.uuid).where(
+                foreign_key.column.in_(bindparam("ids", expanding=True))
+            ),
+            ids,
+            parameter="ids",
+            batch_size=MAX_BATCH_ROWS,
+        )
+        object_cache.invalidate_many(uuid for (uuid,) in rows)
+
+
+def _get_max_parameters(dialect: Dialect) -> int:
+    """Get the maximum number of bound parameters of a statement."""
+    if dialect.name == "postgresql":
+        return 32767
+
+    if dialect.name == "sqlite" and sqlite3.sqlite_version_info >= (3, 32):
+        return 32766
+
+    return 999
+
+
+def _get_batch_size(dialect: Dialect, num_columns: int) -> int:
+    rows = _get_max_parameters(dialect) // max(num_columns, 1)
+    return max(1, min(rows, MAX_BATCH_ROWS))
+
+
+def _get_table(model: type[models.Base]) -> Table:
+    return model.__table__  # type: ignore
+
+
+def _get_key(value: dict, key_names: list[str]) -> Any:
+    if len(key_names) == 1:
+        return value[key_names[0]]
+    return tuple(value[name] for name in key_names)
+
+
+def _prepare_values(
+    model: type[models.Base],
+    table: Table,
+    values: Sequence[dict],
+) -> list[dict]:
+    defaults, default_factories = _get_defaults(model)
+    columns = set(table.c.keys())
+    return [
+        {
+            name: value
+            for name, value in _add_defaults(
+                dict(row),
+                defaults,
+                default_factories,
+            ).items()
+            if name in columns
+        }
+        for row in values
+    ]
+
+
+def _is_unique(table: Table, key_names: list[str]) -> bool:
+    """Check if the key columns are covered by a unique constraint."""
+    keys = set(key_names)
+
+    candidates = [{col.name for col in table.primary_key.columns}]
+    candidates.extend(
+        {col.name for col in constraint.columns}
+        for constraint in table.constraints
+        if isinstance(constraint, UniqueConstraint)
+    )
+    candidates.extend(
+        {col.name for col in index.columns}
+        for index in table.indexes
+        if index.unique
+    )
+    candidates.extend({col.name} for col in table.columns if col.unique)
+    return any(candidate and candidate <= keys for candidate in candidates)
+
+
+def _insert(table: Table, dialect: Dialect) -> Insert:
+    if dialect.name == "postgresql":
+        return postgresql.insert(table)
+
+    if dialect.name == "sqlite":
+        return sqlite.insert(table)
+
+    return insert(table)
+
+
+def _rows_to_mapping(rows: Sequence[Any], num_keys: int) -> dict[Any, Any]:
+    if num_keys == 1:
+        return {row[0]: row[1] for row in rows}
+    return {tuple(row[:num_keys]): row[num_keys] for row in rows}
+
+
+async def _select_existing(
+    session: AsyncSession,
+    table: Table,
+    key_names: list[str],
+    keys: list[Any],
+    returning: InstrumentedAttribute | None,
+    dialect: Dialect,
+) -> dict[Any, Any]:
+    key_columns: list[Column] = [table.c[name] for name in key_names]
+    key_expr = (
+        key_columns[0] if len(key_columns) == 1 else tuple_(*key_columns)
+    )
+    value_column = (
+        key_columns[0] if returning is None else table.c[returning.key]
+    )
+    rows = await select_batched(
+        session,
+        select(*key_columns, value_column).where(
+            key_expr.in_(bindparam("keys", expanding=True))
+        ),
+        keys,
+        parameter="keys",
+        batch_size=_get_batch_size(dialect, len(key_columns)),
+    )
+    return _rows_to_mapping(rows, len(key_columns))
+
+
+def _supports_copy(dialect: Dialect, values: list[dict]) -> bool:
+    if dialect.name != "postgresql" or dialect.driver != "asyncpg":
+        return False
+
+    # COPY writes every column of every row, so rows that rely on
+    # different defaults cannot be loaded together.
+    first = values[0].keys()
+    return all(value.keys() == first for value in values)
+
+
+async def _copy_insert(
+    session: AsyncSession,
+    target: Table,
+    statement: Insert,
+    values: list[dict],
+    returned_columns: list[Column],
+) -> list[Any]:
+    dialect = session.get_bind().dialect
+    columns = list(values[0])
+    name = f"upsert_{uuid4().hex}"
+    quoted = dialect.identifier_preparer.quote(name)
+    source = ", ".join(
+        dialect.identifier_preparer.quote(column_name)
+        for column_name in columns
+    )
+
+    # NOTE: The temporary table is created through the session so that
+    # the transaction of the connection has started before the raw
+    # driver connection is used.
+    await session.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {quoted} ON COMMIT DROP AS "
+            f"SELECT {source} FROM "
+            f"{dialect.identifier_preparer.format_table(target)} "
+            "WITH NO DATA"
+        )
+    )
+
+    processors = [
+        target.c[column_name].type.bind_processor(dialect)
+        for column_name in columns
+    ]
+    records = [
+        tuple(
+            value[column_name]
+            if processor is None
+            else processor(value[column_name])
+            for column_name, processor in zip(
+                columns,
+                processors,
+                strict=True,
+            )
+        )
+        for value in values
+    ]
+
+    connection = await session.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver = raw_connection.driver_connection
+    await driver.copy_records_to_table(  # type: ignore
+        name,
+        records=records,
+        columns=columns,
+    )
+
+    temporary = TableClause(
+        name,
+        *[column(column_name) for column_name in columns],
+    )
+    stmt = statement.from_select(columns, select(*temporary.c))
+    if returned_columns:
+        stmt = stmt.returning(*returned_columns)
+    result = await session.execute(stmt)
+    rows = list(result.all()) if returned_columns else []
+
+    await session.execute(text(f"DROP TABLE {quoted}"))
+    return rows
@@ -1,20 +1,37 @@
 """Common API functions."""
 
+import base64
+import binascii
+import json
 import re
 from dataclasses import MISSING, fields
 from typing import Any, Callable, Generator, Iterable, Sequence, TypeVar
 
-from pydantic import BaseModel
-from sqlalchemy import Result, Select, func, insert, select
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from pydantic_core import to_json
+from sqlalchemy import (
+    Float,
+    Result,
+    Select,
+    and_,
+    exists,
+    false,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.inspection import inspect
-from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.orm import InstrumentedAttribute, aliased
 from sqlalchemy.sql import ColumnExpressionArgument
 from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.expression import ColumnElement
 
 from whombat import exceptions, models
+from whombat.api.common.counts import CountMode, count_objects
 from whombat.core.common import remove_duplicates
 from whombat.filters.base import Filter
 
@@ -39,8 +56,10 @@ except ImportError:
 
 __all__ = [
     "add_feature_to_object",
+    "add_features_to_objects",
     "add_note_to_object",
     "add_tag_to_object",
+    "add_tags_to_objects",
     "create_object",
     "create_objects",
     "create_objects_without_duplicates",
@@ -48,6 +67,7 @@ __all__ = [
     "get_count",
     "get_object",
     "get_objects",
+    "get_objects_by_cursor",
     "get_objects_from_query",
     "get_or_create_object",
     "remove_feature_from_object",
@@ -75,18 +95,7 @@ async def get_count(
 
     Modified from https://gist.github.com/hest/8798884.
     """
-    pk = inspect(model).primary_key[0]  # type: ignore
-    count_q = q.with_only_columns(func.count(pk)).order_by(None)
-    result = await session.execute(count_q)
-    count = result.scalar()
-
-    if count is None:
-        return 0
-
-    if not isinstance(count, int):
-        raise TypeError("Count query did not return an integer")
-
-    return count
+    return await count_objects(session, model, q, mode="exact")
 
 
 def _to_snake_case(name: str) -> str:
@@ -133,6 +142,7 @@ async def get_object(
     session: AsyncSession,
     model: type[A],
     condition: ColumnExpressionArgument,
+    options: Sequence[ExecutableOption] | None = None,
 ) -> A:
     """Get an object by some condition.
 
@@ -144,6 +154,8 @@ async def get_object(
         The model to query.
     condition : ColumnExpressionArgument
         The condition to use.
+    options : Sequence[ExecutableOption], optional
+        Loader options to apply to the query, by default None.
 
     Returns
     -------
@@ -156,6 +168,10 @@ async def get_object(
         If the object was not found.
     """
     query = select(model).where(condition)
+
+    if options is not None:
+        query = query.options(*options)
+
     result = await session.execute(query)
     obj = result.unique().scalar_one_or_none()
 
@@ -261,6 +277,7 @@ async def get_objects_from_query(
     filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
     sort_by: ColumnExpressionArgument | str | None = None,
     group_by: ColumnExpressionArgument | None = None,
+    count_mode: CountMode = "exact",
 ) -> tuple[Result[Any], int]:
     """Get a list of objects from a query.
 
@@ -280,6 +297,8 @@ async def get_objects_from_query(
         A list of filters to apply, by default None
     sort_by
         The column to sort by, by default None
+    count_mode
+        How to count the total number of objects, by default "exact".
 
     Returns
     -------
@@ -295,14 +314,14 @@ async def get_objects_from_query(
         else:
             query = query.where(filter_)
 
-    if options is not None:
-        for option in options:
-            query = query.options(option)
-
     if group_by is not None:
         query = query.group_by(group_by)
 
-    count = await get_count(session, model, query)
+    count = await count_objects(session, model, query, mode=count_mode)
+
+    if options is not None:
+        for option in options:
+            query = query.options(option)
 
     if sort_by is not None:
         if isinstance(sort_by, str):
@@ -328,6 +347,7 @@ async def get_objects(
     filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
     options: Sequence[ExecutableOption] | None = None,
     sort_by: ColumnExpressionArgument | str | None = None,
+    count_mode: CountMode = "exact",
 ) -> tuple[Sequence[A], int]:
     """Get all objects.
 
@@ -345,6 +365,8 @@ async def get_objects(
         A list of filters to apply, by default None
     sort_by
         The column to sort by, by default None
+    count_mode
+        How to count the total number of objects, by default "exact".
 
     Returns
     -------
@@ -364,10 +386,228 @@ async def get_objects(
         offset=offset,
         filters=filters,
         sort_by=sort_by,
+        count_mode=count_mode,
     )
     return result.unique().scalars().all(), count
 
 
+async def get_objects_by_cursor(
+    session: AsyncSession,
+    model: type[A],
+    query: Select | None = None,
+    *,
+    limit: int | None = 1000,
+    cursor: str | None = None,
+    options: Sequence[ExecutableOption] | None = None,
+    filters: Sequence[Filter | ColumnExpressionArgument] | None = None,
+    sort_by: str | None = None,
+    count_mode: CountMode | None = None,
+) -> tuple[Sequence[A], str | None, int | None]:
+    """Get a page of objects using keyset pagination.
+
+    Objects are sorted by the given column and then by primary key, so
+    that the order is total. Instead of skipping a number of rows with an
+    offset, each page starts right after the sort key of the last object
+    of the previous page, which the database can seek to with an index.
+    Fetching a page therefore takes the same time no matter how deep it
+    is.
+
+    Rows with a null sort key are placed last, regardless of the sort
+    direction. Any ordering added by the filters, such as the ranking of
+    a search filter, is ignored, since the cursor only records the sort
+    key.
+
+    Parameters
+    ----------
+    session
+        The database session to use.
+    model
+        The model to query.
+    query
+        The query to use to get the objects. By default, all objects of
+        the model are selected.
+    limit
+        The maximum number of objects to return, by default 1000. If None
+        or negative, all remaining objects are returned.
+    cursor
+        The cursor returned with the previous page. If None, the first
+        page is returned.
+    options
+        Loader options to apply to the query, by default None.
+    filters
+        A list of filters to apply, by default None.
+    sort_by
+        The name of the column to sort by. If a "-" is prepended, the
+        objects are sorted in descending order. By default, objects are
+        sorted by primary key.
+    count_mode
+        How to count the total number of objects. By default the objects
+        are not counted, since an exact count requires visiting all
+        matching rows.
+
+    Returns
+    -------
+    objs : list[A]
+        The objects.
+    next_cursor : str | None
+        The cursor of the next page, or None if this is the last page.
+    count : int | None
+        The total number of objects, if requested.
+
+    Raises
+    ------
+    exceptions.InvalidCursorError
+        If the cursor is malformed or was created with a different sort
+        order.
+    """
+    if query is None:
+        query = select(model)
+
+    for filter_ in filters or []:
+        if isinstance(filter_, Filter):
+            query = filter_.filter(query)
+        else:
+            query = query.where(filter_)
+
+    total = None
+    if count_mode is not None:
+        total = await count_objects(session, model, query, mode=count_mode)
+
+    if options is not None:
+        for option in options:
+            query = query.options(option)
+
+    keys, descending = _get_keyset_columns(model, sort_by)
+
+    if cursor is not None:
+        values = decode_cursor(cursor, keys)
+        query = query.where(_get_keyset_condition(keys, values, descending))
+
+    query = query.order_by(None).order_by(
+        *(
+            (key.desc() if descending else key.asc()).nulls_last()
+            for key in keys
+        )
+    )
+
+    if limit is not None and limit < 0:
+        limit = None
+
+    if limit is not None:
+        # Fetch one more object to find out whether there is a next page.
+        query = query.limit(limit + 1)
+
+    result = await session.execute(query)
+    objs = result.unique().scalars().all()
+
+    next_cursor = None
+    if limit is not None and len(objs) > limit:
+        objs = objs[:limit]
+        next_cursor = encode_cursor(
+            [getattr(objs[-1], key.key) for key in keys]
+        )
+
+    return objs, next_cursor, total
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key of an object into an opaque cursor."""
+    return base64.urlsafe_b64encode(to_json(values)).decode()
+
+
+def decode_cursor(
+    cursor: str,
+    keys: Sequence[InstrumentedAttribute],
+) -> list[Any]:
+    """Decode a cursor into the sort key values of its columns.
+
+    Raises
+    ------
+    exceptions.InvalidCursorError
+        If the cursor is malformed or does not match the given columns.
+    """
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor))
+    except (binascii.Error, ValueError) as error:
+        raise exceptions.InvalidCursorError("Malformed cursor.") from error
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise exceptions.InvalidCursorError(
+            "The cursor does not match the sort order."
+        )
+
+    try:
+        return [
+            value
+            if value is None
+            else TypeAdapter(_get_python_type(key)).validate_python(value)
+            for key, value in zip(keys, values, strict=True)
+        ]
+    except ValidationError as error:
+        raise exceptions.InvalidCursorError(
+            "The cursor does not match the sort order."
+        ) from error
+
+
+def _get_python_type(key: InstrumentedAttribute) -> type:
+    try:
+        return key.type.python_type
+    except NotImplementedError:
+        return Any  # type: ignore
+
+
+def _get_keyset_columns(
+    model: type[A],
+    sort_by: str | None,
+) -> tuple[list[InstrumentedAttribute], bool]:
+    mapper = inspect(model)
+    primary_keys = [
+        getattr(model, mapper.get_property_by_column(column).key)
+        for column in mapper.primary_key
+    ]
+
+    if sort_by is None:
+        return primary_keys, False
+
+    descending = sort_by.startswith("-")
+    name = sort_by.removeprefix("-")
+    column = getattr(model, name, None)
+
+    if not isinstance(column, InstrumentedAttribute):
+        raise ValueError(
+            f"The model {model.__name__} does not have a column named {name}"
+        )
+
+    return [
+        column,
+        *(key for key in primary_keys if key.key != column.key),
+    ], descending
+
+
+def _get_keyset_condition(
+    keys: Sequence[InstrumentedAttribute],
+    values: Sequence[Any],
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Select the rows that come after the given sort key.
+
+    Rows are compared lexicographically, with null values sorted last.
+    """
+    condition: ColumnElement[bool] = false()
+    for key, value in reversed(list(zip(keys, values, strict=True))):
+        if value is None:
+            condition = and_(key.is_(None), condition)
+            continue
+
+        condition = or_(
+            key < value if descending else key > value,
+            key.is_(None),
+            and_(key == value, condition),
+        )
+
+    return condition
+
+
 async def create_object(
     session: AsyncSession,
     model: type[A],
@@ -894,6 +1134,149 @@ async def add_feature_to_object(
     return obj
 
 
+async def add_tags_to_objects(
+    session: AsyncSession,
+    model: type[A],
+    condition: ColumnExpressionArgument,
+    tag_ids: Sequence[int],
+    **values,
+) -> int:
+    """Add several tags to several objects with a single statement.
+
+    The tags are attached with an ``INSERT ... SELECT`` that pairs every
+    matching object with every tag, so no object is loaded into the
+    session. Pairs that already exist are skipped.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        The database session to use.
+
+    model : type[A]
+        The model of the objects to update.
+
+    condition : ColumnExpressionArgument
+        The condition that selects the objects to update.
+
+    tag_ids : Sequence[int]
+        The ids of the tags to add.
+
+    **values
+        Extra column values of the created associations, such as the
+        user that added the tags.
+
+    Returns
+    -------
+    int
+        The number of tags added.
+    """
+    if not tag_ids:
+        return 0
+
+    # NOTE: As in `add_tag_to_object`, we assume that the tag association
+    # models and their foreign keys are named after the model.
+    foreign_key = f"{_to_snake_case(model.__name__)}_id"
+    association_model = getattr(models, f"{model.__name__}Tag")
+    existing = aliased(association_model)
+
+    columns = _get_constant_columns(association_model, values)
+    query = (
+        select(
+            model.id.label(foreign_key),  # type: ignore
+            models.Tag.id.label("tag_id"),
+            *columns.values(),
+        )
+        .where(
+            condition,
+            models.Tag.id.in_(tag_ids),
+            ~exists().where(
+                getattr(existing, foreign_key) == model.id,  # type: ignore
+                existing.tag_id == models.Tag.id,
+            ),
+        )
+        .distinct()
+    )
+    result = await session.execute(
+        insert(association_model).from_select(
+            [foreign_key, "tag_id", *columns],
+            query,
+        )
+    )
+    return result.rowcount  # type: ignore
+
+
+async def add_features_to_objects(
+    session: AsyncSession,
+    model: type[A],
+    condition: ColumnExpressionArgument,
+    features: Sequence[tuple[int, float]],
+) -> int:
+    """Add several features to several objects with a single statement.
+
+    Objects that already have a feature with the same name keep their
+    current value.
+
+    Parameters
+    ----------
+    session : AsyncSession
+        The database session to use.
+
+    model : type[A]
+        The model of the objects to update.
+
+    condition : ColumnExpressionArgument
+        The condition that selects the objects to update.
+
+    features : Sequence[tuple[int, float]]
+        The id of the feature name and the value of each feature to add.
+
+    Returns
+    -------
+    int
+        The number of features added.
+    """
+    features = list(dict(features).items())
+    if not features:
+        return 0
+
+    foreign_key = f"{_to_snake_case(model.__name__)}_id"
+    association_model = getattr(models, f"{model.__name__}Feature")
+    existing = aliased(association_model)
+
+    # NOTE: The features are selected as a union of literal rows since
+    # SQLite does not support naming the columns of a VALUES clause.
+    source = union_all(
+        *[
+            select(
+                literal(feature_name_id).label("feature_name_id"),
+                literal(value, Float).label("value"),
+            )
+            for feature_name_id, value in features
+        ]
+    ).subquery("features")
+
+    columns = _get_constant_columns(association_model, {})
+    query = select(
+        model.id.label(foreign_key),  # type: ignore
+        source.c.feature_name_id,
+        source.c.value,
+        *columns.values(),
+    ).where(
+        condition,
+        ~exists().where(
+            getattr(existing, foreign_key) == model.id,  # type: ignore
+            existing.feature_name_id == source.c.feature_name_id,
+        ),
+    )
+    result = await session.execute(
+        insert(association_model).from_select(
+            [foreign_key, "feature_name_id", "value", *columns],
+            query,
+        )
+    )
+    return result.rowcount  # type: ignore
+
+
 async def update_feature_on_object(
     session: AsyncSession,
     model: type[A],
@@ -1118,6 +1501,39 @@ async def remove_feature_from_object(
     return obj
 
 
+def _get_constant_columns(
+    model: type[A],
+    values: dict,
+) -> dict[str, ColumnElement]:
+    """Get literal columns for the values shared by all new rows.
+
+    Parameters
+    ----------
+    model : type[A]
+        The model of the rows to insert.
+    values : dict
+        The values given by the caller. Missing values are filled with
+        the defaults of the model.
+
+    Returns
+    -------
+    dict[str, ColumnElement]
+        Labelled literals of the given values and defaults, by column
+        name.
+    """
+    defaults, default_factories = _get_defaults(model)
+    columns = model.__table__.c  # type: ignore
+    return {
+        name: literal(value, columns[name].type).label(name)
+        for name, value in _add_defaults(
+            dict(values),
+            defaults,
+            default_factories,
+        ).items()
+        if name in columns
+    }
+
+
 def _get_defaults(model: type[A]):
     """Get the default values from a model.
 
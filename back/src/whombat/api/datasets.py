@@ -1,22 +1,24 @@
 """API functions for interacting with datasets."""
 
+import asyncio
 import datetime
 import uuid
 import warnings
 from pathlib import Path
-from typing import BinaryIO, Sequence
+from typing import BinaryIO, Callable, Sequence
 
 import pandas as pd
 from soundevent import data
+from soundevent.audio import compute_md5_checksum
 from soundevent.io.aoef import AOEFObject, to_aeof
-from sqlalchemy import select, tuple_
+from sqlalchemy import delete, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
 from whombat.api.common import BaseAPI
 from whombat.api.io import aoef
-from whombat.api.recordings import recordings
+from whombat.api.recordings import DEFAULT_BATCH_SIZE, recordings
 from whombat.core import files
 from whombat.filters.base import Filter
 from whombat.filters.recordings import DatasetFilter
@@ -24,9 +26,13 @@ from whombat.system import get_settings
 
 __all__ = [
     "DatasetAPI",
+    "RegistrationCallback",
     "datasets",
 ]
 
+RegistrationCallback = Callable[[schemas.DatasetRegistration], None]
+"""Function called with the progress of a file registration."""
+
 
 class DatasetAPI(
     BaseAPI[
@@ -40,6 +46,10 @@ class DatasetAPI(
     _model = models.Dataset
     _schema = schemas.Dataset
 
+    def __init__(self):
+        super().__init__()
+        self._registrations: dict[uuid.UUID, schemas.DatasetRegistration] = {}
+
     async def update(
         self,
         session: AsyncSession,
@@ -400,6 +410,7 @@ class DatasetAPI(
         session: AsyncSession,
         obj: schemas.Dataset,
         audio_dir: Path | None = None,
+        quick: bool = False,
     ) -> list[schemas.DatasetFile]:
         """Compute the state of the dataset recordings.
 
@@ -414,6 +425,17 @@ class DatasetAPI(
         - ``unregistered``: A file is not registered in the database but is
             present in the dataset directory.
 
+        - ``modified``: A file is registered in the database but its contents
+            differ from the registered recording.
+
+        By default the manifest of the dataset is updated with
+        `update_manifest`, so only the files that changed since the last
+        scan are read to check whether their contents changed. In quick
+        mode the size and modification time of the files are compared to
+        the manifest instead, so no file is read and the manifest is left
+        untouched. Registered files that changed since the last scan are
+        then reported as modified even if their contents are the same.
+
         Parameters
         ----------
         session
@@ -423,6 +445,9 @@ class DatasetAPI(
         audio_dir
             The root audio directory, by default None. If None, the root audio
             directory from the settings will be used.
+        quick
+            Whether to only compare the files to the manifest, by default
+            False.
 
         Returns
         -------
@@ -431,51 +456,218 @@ class DatasetAPI(
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
-        # Get the files in the dataset directory.
-        file_list = files.get_audio_files_in_folder(
-            audio_dir / obj.audio_dir,
-            relative=True,
+        registered = await self._get_registered_hashes(session, obj)
+
+        if quick:
+            scanned = await asyncio.to_thread(
+                files.scan_audio_files,
+                audio_dir / obj.audio_dir,
+            )
+            manifest = {
+                entry.path: entry
+                for entry in await self.get_manifest(session, obj)
+            }
+            present = {stat.path for stat in scanned}
+            modified = {
+                stat.path
+                for stat in scanned
+                if stat.path in registered
+                and (entry := manifest.get(stat.path)) is not None
+                and (entry.size, entry.mtime_ns) != (stat.size, stat.mtime_ns)
+            }
+        else:
+            entries = await self.update_manifest(
+                session,
+                obj,
+                audio_dir=audio_dir,
+            )
+            present = {entry.path for entry in entries}
+            modified = {
+                entry.path
+                for entry in entries
+                if entry.path in registered
+                and entry.hash is not None
+                and entry.hash != registered[entry.path]
+            }
+
+        states = {
+            schemas.FileState.REGISTERED: (present & registered.keys())
+            - modified,
+            schemas.FileState.MODIFIED: modified,
+            schemas.FileState.MISSING: registered.keys() - present,
+            schemas.FileState.UNREGISTERED: present - registered.keys(),
+        }
+        return [
+            schemas.DatasetFile(path=path, state=state)
+            for state, paths in states.items()
+            for path in paths
+        ]
+
+    async def get_manifest(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+    ) -> list[schemas.DatasetManifestEntry]:
+        """Get the manifest of the files of a dataset.
+
+        The manifest lists the audio files found in the dataset directory
+        the last time it was scanned with `update_manifest`.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The dataset to get the manifest of.
+
+        Returns
+        -------
+        entries : list[schemas.DatasetManifestEntry]
+        """
+        query = select(models.DatasetManifestEntry).where(
+            models.DatasetManifestEntry.dataset_id == obj.id
         )
+        result = await session.execute(query)
+        return [
+            schemas.DatasetManifestEntry.model_validate(entry)
+            for entry in result.scalars().all()
+        ]
 
-        # NOTE: Better to use this query than reusing the get_recordings
-        # function because we don't need to retrieve all information about the
-        # recordings.
-        query = select(models.DatasetRecording.path).where(
-            models.DatasetRecording.dataset_id == obj.id
+    async def update_manifest(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        audio_dir: Path | None = None,
+    ) -> list[schemas.DatasetManifestEntry]:
+        """Scan the dataset directory and update the manifest of its files.
+
+        The directory is walked without reading the files, and the size
+        and modification time of each file are compared to the manifest.
+        Only files that changed since the last scan and whose hash was
+        known are hashed again. The hash of registered files that are not
+        yet in the manifest is taken from their recording, so the first
+        scan of an existing dataset does not read every file.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The dataset to scan.
+        audio_dir
+            The root audio directory, by default None. If None, the root audio
+            directory from the settings will be used.
+
+        Returns
+        -------
+        entries : list[schemas.DatasetManifestEntry]
+            The updated manifest.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        dataset_dir = audio_dir / obj.audio_dir
+        scanned = await asyncio.to_thread(files.scan_audio_files, dataset_dir)
+        registered = await self._get_registered_hashes(session, obj)
+
+        query = select(models.DatasetManifestEntry).where(
+            models.DatasetManifestEntry.dataset_id == obj.id
         )
         result = await session.execute(query)
-        db_files = [Path(path) for path in result.scalars().all()]
-
-        existing_files = set(file_list) & set(db_files)
-        missing_files = set(db_files) - set(file_list)
-        unregistered_files = set(file_list) - set(db_files)
-
-        ret = []
-        for path in existing_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.REGISTERED,
+        stored = {entry.path: entry for entry in result.scalars().all()}
+
+        entries = []
+        to_hash = []
+        for stat in scanned:
+            entry = stored.pop(stat.path, None)
+
+            if entry is None:
+                entry = models.DatasetManifestEntry(
+                    dataset_id=obj.id,
+                    path=stat.path,
+                    size=stat.size,
+                    mtime_ns=stat.mtime_ns,
+                    hash=registered.get(stat.path),
                 )
-            )
+                session.add(entry)
 
-        for path in missing_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.MISSING,
+            elif (entry.size, entry.mtime_ns) != (stat.size, stat.mtime_ns):
+                entry.size = stat.size
+                entry.mtime_ns = stat.mtime_ns
+                if entry.hash is not None:
+                    to_hash.append(entry)
+
+            elif entry.hash is None:
+                entry.hash = registered.get(stat.path)
+
+            entries.append(entry)
+
+        if to_hash:
+            hashes = await asyncio.to_thread(
+                _compute_hashes,
+                [dataset_dir / entry.path for entry in to_hash],
+            )
+            for entry, hash in zip(to_hash, hashes, strict=True):
+                entry.hash = hash
+
+        removed = [entry.id for entry in stored.values()]
+        for start in range(0, len(removed), DEFAULT_BATCH_SIZE):
+            await session.execute(
+                delete(models.DatasetManifestEntry).where(
+                    models.DatasetManifestEntry.id.in_(
+                        removed[start : start + DEFAULT_BATCH_SIZE]
+                    )
                 )
             )
 
-        for path in unregistered_files:
-            ret.append(
-                schemas.DatasetFile(
-                    path=path,
-                    state=schemas.FileState.UNREGISTERED,
-                )
+        await session.flush()
+        return [
+            schemas.DatasetManifestEntry.model_validate(entry)
+            for entry in entries
+        ]
+
+    async def _set_manifest_hashes(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        dataset_recordings: Sequence[schemas.DatasetRecording],
+    ) -> None:
+        # NOTE: Files that were not registered when the manifest was updated
+        # have no hash, so they would never be hashed again when they
+        # change. Their hash is known once their recording is created.
+        hashes = {dr.path: dr.recording.hash for dr in dataset_recordings}
+        paths = list(hashes)
+        for start in range(0, len(paths), DEFAULT_BATCH_SIZE):
+            query = select(models.DatasetManifestEntry).where(
+                models.DatasetManifestEntry.dataset_id == obj.id,
+                models.DatasetManifestEntry.path.in_(
+                    paths[start : start + DEFAULT_BATCH_SIZE]
+                ),
             )
+            result = await session.execute(query)
+            for entry in result.scalars().all():
+                entry.hash = hashes[Path(entry.path)]
 
-        return ret
+        await session.flush()
+
+    async def _get_registered_hashes(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+    ) -> dict[Path, str]:
+        # NOTE: Better to use this query than reusing the get_recordings
+        # function because we don't need to retrieve all information about the
+        # recordings.
+        query = (
+            select(models.DatasetRecording.path, models.Recording.hash)
+            .join(
+                models.Recording,
+                models.DatasetRecording.recording_id == models.Recording.id,
+            )
+            .where(models.DatasetRecording.dataset_id == obj.id)
+        )
+        result = await session.execute(query)
+        return {Path(path): hash for path, hash in result.all()}
 
     async def from_soundevent(
         self,
@@ -575,6 +767,7 @@ class DatasetAPI(
         dataset_dir: Path,
         description: str | None = None,
         audio_dir: Path | None = None,
+        on_progress: RegistrationCallback | None = None,
         **kwargs,
     ) -> schemas.Dataset:
         """Create a dataset.
@@ -583,6 +776,9 @@ class DatasetAPI(
         files found in the given directory. It will look recursively for audio
         files within the directory.
 
+        The files are registered with `register_files`, which commits the
+        session after every batch of registered files.
+
         Parameters
         ----------
         session
@@ -596,6 +792,9 @@ class DatasetAPI(
         audio_dir
             The root audio directory, by default None. If None, the root audio
             directory from the settings will be used.
+        on_progress
+            Called with the progress of the registration of the files after
+            every batch of registered files.
         **kwargs
             Additional keyword arguments to pass to the creation function.
 
@@ -637,30 +836,147 @@ class DatasetAPI(
             **kwargs,
         )
 
-        file_list = files.get_audio_files_in_folder(
-            dataset_dir,
-            relative=False,
-        )
-
-        recording_list = await recordings.create_many(
+        return await self.register_files(
             session,
-            [dict(path=file) for file in file_list],
+            obj,
             audio_dir=audio_dir,
+            on_progress=on_progress,
         )
 
-        if recording_list is None:
-            raise RuntimeError("No recordings were created.")
+    async def register_files(
+        self,
+        session: AsyncSession,
+        obj: schemas.Dataset,
+        audio_dir: Path | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        processes: int | None = None,
+        on_progress: RegistrationCallback | None = None,
+    ) -> schemas.Dataset:
+        """Register the unregistered audio files of a dataset.
+
+        Files are processed in parallel and registered in batches. The
+        session is committed after each batch, so the registered files act
+        as a checkpoint: if the registration is interrupted, calling this
+        function again only processes the files that were not registered.
+        The hashes of the registered files are stored in the manifest, so
+        later changes to the files are detected.
+
+        The progress can be followed with `get_registration`.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The dataset to register the files of.
+        audio_dir
+            The root audio directory, by default None. If None, the root audio
+            directory from the settings will be used.
+        batch_size
+            The number of files to register at a time.
+        processes
+            The number of worker processes used to read the files. By
+            default, the number of CPUs.
+        on_progress
+            Called with the progress of the registration after every batch
+            of registered files.
+
+        Returns
+        -------
+        dataset : schemas.Dataset
+            The dataset with the updated recording count.
+        """
+        if audio_dir is None:
+            audio_dir = get_settings().audio_dir
+
+        dataset_dir = audio_dir / obj.audio_dir
 
-        dataset_recordigns = await self.add_recordings(
-            session, obj, recording_list
+        query = select(models.DatasetRecording.path).where(
+            models.DatasetRecording.dataset_id == obj.id
         )
+        result = await session.execute(query)
+        registered = {Path(path) for path in result.scalars().all()}
 
-        obj = obj.model_copy(
-            update=dict(recording_count=len(dataset_recordigns))
+        manifest = await self.update_manifest(session, obj, audio_dir)
+        await session.commit()
+
+        file_list = [
+            dataset_dir / entry.path
+            for entry in manifest
+            if entry.path not in registered
+        ]
+
+        progress = schemas.DatasetRegistration(
+            dataset_uuid=obj.uuid,
+            total_files=len(file_list),
         )
-        self._update_cache(obj)
+        self._registrations[obj.uuid] = progress
+
+        try:
+            async for batch in recordings.iter_create_many(
+                session,
+                (dict(path=path) for path in file_list),
+                audio_dir=audio_dir,
+                batch_size=batch_size,
+                processes=processes,
+            ):
+                dataset_recordings = await self.add_recordings(
+                    session, obj, batch.recordings
+                )
+                await self._set_manifest_hashes(
+                    session, obj, dataset_recordings
+                )
+                await session.commit()
+
+                obj = obj.model_copy(
+                    update=dict(
+                        recording_count=obj.recording_count
+                        + len(dataset_recordings)
+                    )
+                )
+                progress.processed_files += batch.processed
+                progress.registered_files += len(dataset_recordings)
+
+                if on_progress is not None:
+                    on_progress(progress)
+        except Exception as error:
+            progress.status = "failed"
+            progress.error = str(error)
+            progress.finished_on = datetime.datetime.now(datetime.UTC)
+            raise
+
+        progress.status = "completed"
+        progress.finished_on = datetime.datetime.now(datetime.UTC)
         return obj
 
+    def get_registration(
+        self,
+        obj: schemas.Dataset,
+    ) -> schemas.DatasetRegistration:
+        """Get the progress of the latest file registration of a dataset.
+
+        Parameters
+        ----------
+        obj
+            The dataset.
+
+        Returns
+        -------
+        registration : schemas.DatasetRegistration
+
+        Raises
+        ------
+        exceptions.NotFoundError
+            If no registration of the dataset files has been started by
+            this process.
+        """
+        try:
+            return self._registrations[obj.uuid]
+        except KeyError as error:
+            raise exceptions.NotFoundError(
+                f"No file registration found for dataset {obj.uuid}."
+            ) from error
+
     async def to_dataframe(
         self,
         session: AsyncSession,
@@ -737,12 +1053,14 @@ class DatasetAPI(
         dataset: Path | BinaryIO | str,
         dataset_audio_dir: Path,
         audio_dir: Path | None = None,
+        on_progress: aoef.ProgressCallback | None = None,
     ) -> schemas.Dataset:
         db_dataset = await aoef.import_dataset(
             session,
             dataset,
             dataset_dir=dataset_audio_dir,
             audio_dir=audio_dir or Path.cwd(),
+            on_progress=on_progress,
         )
         await session.commit()
         await session.refresh(db_dataset)
@@ -767,4 +1085,15 @@ class DatasetAPI(
         return to_aeof(soundevent_dataset, audio_dir=dataset_audio_dir)
 
 
+def _compute_hashes(paths: Sequence[Path]) -> list[str | None]:
+    hashes = []
+    for path in paths:
+        try:
+            hashes.append(compute_md5_checksum(path))
+        except OSError:
+            # The file was removed after the directory was scanned.
+            hashes.append(None)
+    return hashes
+
+
 datasets = DatasetAPI()
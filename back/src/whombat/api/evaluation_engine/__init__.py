@@ -0,0 +1,94 @@
+"""Engine to evaluate model runs against evaluation sets.
+
+The engine produces the same evaluations as the tasks of
+`soundevent.evaluation`, without building soundevent objects for the
+whole model run and evaluation set. Annotations and predictions are
+loaded as arrays with a few queries, sound events are matched with
+vectorized overlap computations and the results are stored with bulk
+inserts. The encoded annotations of each clip are cached, so evaluating
+more model runs against the same evaluation set only loads their
+predictions.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import schemas
+from whombat.api.evaluation_engine.cache import (
+    GroundTruthCache,
+    ground_truth_cache,
+)
+from whombat.api.evaluation_engine.loading import (
+    TagEncoder,
+    load_ground_truth,
+    load_predictions,
+)
+from whombat.api.evaluation_engine.storage import store_evaluation
+from whombat.api.evaluation_engine.tasks import (
+    EVALUATION_TASKS,
+    EvaluationResult,
+)
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+__all__ = [
+    "EvaluationResult",
+    "GroundTruthCache",
+    "evaluate",
+    "ground_truth_cache",
+    "store_evaluation",
+]
+
+
+async def evaluate(
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+    cache: GroundTruthCache | None = None,
+) -> EvaluationResult:
+    """Evaluate the predictions of a model run.
+
+    Parameters
+    ----------
+    session
+        The database session.
+    model_run
+        The model run to evaluate.
+    evaluation_set
+        The evaluation set with the annotations and the task to evaluate.
+    cache
+        Cache of the encoded annotations. Defaults to the cache shared
+        by all evaluations.
+
+    Returns
+    -------
+    EvaluationResult
+        The evaluation of every clip prediction of the model run that
+        has an annotation in the evaluation set.
+    """
+    task = PredictionTypes(evaluation_set.task)
+    evaluate_task = EVALUATION_TASKS.get(task)
+
+    if evaluate_task is None:
+        raise ValueError(f"Task {task} not supported.")
+
+    encoder = TagEncoder(evaluation_set.tags)
+    annotations = await load_ground_truth(
+        session,
+        evaluation_set,
+        encoder,
+        cache=cache,
+    )
+    predictions = await load_predictions(
+        session,
+        model_run,
+        evaluation_set,
+        encoder,
+        geometries=task == PredictionTypes.sound_event_detection,
+    )
+    return evaluate_task(
+        [
+            (annotations[prediction.clip_id], prediction)
+            for prediction in predictions
+            if prediction.clip_id in annotations
+        ],
+        encoder.num_classes,
+    )
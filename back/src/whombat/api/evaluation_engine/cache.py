@@ -0,0 +1,185 @@
+"""Cache of the ground truth of evaluation sets.
+
+Model runs are usually evaluated, one after the other, against the same
+evaluation sets. The encoded tags and the buffered geometries of each
+clip annotation are kept in memory so that evaluating another model run
+only needs to load its predictions.
+
+The ground truth is computed from the annotation tables, so the whole
+cache is cleared as soon as a session of this process writes to any of
+them. New sound events and tags do not change existing annotations, so
+inserting them, for example when importing a model run, keeps the cache.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Hashable
+
+from sqlalchemy import event
+from sqlalchemy.inspection import inspect
+from sqlalchemy.orm import ORMExecuteState, Session
+
+from whombat.api.common.cache import CacheStats
+
+__all__ = [
+    "GroundTruthCache",
+    "ground_truth_cache",
+]
+
+_ANNOTATION_TABLES = frozenset(
+    {
+        "clip_annotation_tag",
+        "sound_event_annotation",
+        "sound_event_annotation_tag",
+    }
+)
+"""Tables where any change can modify a cached ground truth."""
+
+_REFERENCED_TABLES = frozenset(
+    {
+        "clip_annotation",
+        "sound_event",
+        "tag",
+    }
+)
+"""Tables where updates and deletions can modify a cached ground truth."""
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+
+
+class GroundTruthCache:
+    """Least-recently-used cache of the ground truth of clip annotations.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of cached clip annotations. A value of zero
+        disables the cache.
+    ttl
+        Seconds after which a cached clip annotation is discarded. This
+        bounds how long changes made by other processes can go unnoticed.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[Hashable, _Entry] = OrderedDict()
+
+    def configure(self, maxsize: int, ttl: float) -> None:
+        """Change the size and time to live of the cache and clear it."""
+        self.clear()
+        self.maxsize = maxsize
+        self.ttl = ttl
+
+    def get(self, key: Hashable) -> Any | None:
+        """Get a cached ground truth.
+
+        Returns
+        -------
+        Any | None
+            The cached value or None if it is not cached or has expired.
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at < time.monotonic():
+            del self._entries[key]
+            self.evictions += 1
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache a ground truth."""
+        if self.maxsize <= 0:
+            return
+
+        self._entries[key] = _Entry(
+            value=value,
+            expires_at=time.monotonic() + self.ttl,
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self) -> None:
+        """Remove all cached values because the annotations changed."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
+
+    def clear(self) -> None:
+        """Remove all cached values."""
+        self._entries.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Get the usage counters of the cache."""
+        return CacheStats(
+            size=len(self._entries),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            invalidations=self.invalidations,
+        )
+
+
+ground_truth_cache = GroundTruthCache()
+"""Cache shared by all the evaluations."""
+
+
+@event.listens_for(Session, "after_flush")
+def invalidate_flushed_ground_truth(session: Session, _) -> None:
+    """Invalidate the ground truth when annotations are flushed."""
+    if not ground_truth_cache._entries:
+        return
+
+    for objects, tables in [
+        (session.new, _ANNOTATION_TABLES),
+        (session.dirty, _ANNOTATION_TABLES | _REFERENCED_TABLES),
+        (session.deleted, _ANNOTATION_TABLES | _REFERENCED_TABLES),
+    ]:
+        for obj in objects:
+            if any(
+                table.name in tables for table in inspect(obj).mapper.tables
+            ):
+                ground_truth_cache.invalidate()
+                return
+
+
+@event.listens_for(Session, "do_orm_execute")
+def invalidate_modified_ground_truth(state: ORMExecuteState) -> None:
+    """Invalidate the ground truth when bulk statements modify annotations."""
+    if not (state.is_insert or state.is_update or state.is_delete):
+        return
+
+    table = getattr(state.statement, "table", None)
+    name = getattr(table, "name", None)
+
+    if name in _ANNOTATION_TABLES or (
+        name in _REFERENCED_TABLES and not state.is_insert
+    ):
+        ground_truth_cache.invalidate()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def clear_ground_truth_after_rollback(session: Session, _) -> None:
+    """Clear the ground truth when a transaction is rolled back."""
+    ground_truth_cache.clear()
@@ -0,0 +1,497 @@
+"""Loading of annotations and predictions as arrays.
+
+Annotations and predictions are read with a few queries that select only
+the columns needed for the evaluation, instead of building complete
+soundevent objects. Tags are encoded into class indices and scores as
+they are read.
+"""
+
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import String, bindparam, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.common import select_batched
+from whombat.api.evaluation_engine.cache import (
+    GroundTruthCache,
+    ground_truth_cache,
+)
+from whombat.api.evaluation_engine.matching import (
+    Geometries,
+    parse_geometries,
+)
+
+__all__ = [
+    "NO_CLASS",
+    "ClipGroundTruth",
+    "ClipPredictions",
+    "TagEncoder",
+    "load_ground_truth",
+    "load_predictions",
+]
+
+NO_CLASS = -1
+"""Class index of objects without any of the evaluated tags."""
+
+
+class TagEncoder:
+    """Map the tags of an evaluation set to class indices.
+
+    Tags are encoded as in `soundevent.evaluation.encoding`. The class of
+    a list of tags is the class of the first evaluated tag in the list.
+    """
+
+    def __init__(self, tags: Sequence[schemas.Tag]):
+        self.key = tuple((tag.key, tag.value) for tag in tags)
+        self.num_classes = len(self.key)
+        self._mapping = {tag: index for index, tag in enumerate(self.key)}
+
+    def encode(self, key: str, value: str) -> int:
+        """Get the class index of a tag, or -1 if it is not evaluated."""
+        return self._mapping.get((key, value), NO_CLASS)
+
+    def encode_class(self, tags: Iterable[tuple[str, str]]) -> int:
+        """Get the class of a list of tags."""
+        for key, value in tags:
+            index = self.encode(key, value)
+            if index != NO_CLASS:
+                return index
+        return NO_CLASS
+
+    def encode_labels(self, tags: Iterable[tuple[str, str]]) -> np.ndarray:
+        """Get the binary multilabel encoding of a list of tags."""
+        labels = np.zeros(self.num_classes, dtype=np.int32)
+        for key, value in tags:
+            index = self.encode(key, value)
+            if index != NO_CLASS:
+                labels[index] = 1
+        return labels
+
+
+@dataclass
+class ClipGroundTruth:
+    """Encoded annotations of a clip."""
+
+    clip_annotation_id: int
+
+    clip_id: int
+
+    true_class: int
+    """Class of the clip, or -1 if it has none."""
+
+    labels: np.ndarray
+    """Binary multilabel encoding of the tags of the clip."""
+
+    sound_event_ids: np.ndarray
+    """Database IDs of the sound event annotations."""
+
+    sound_event_uuids: list[UUID]
+    """UUIDs of the annotated sound events."""
+
+    sound_event_classes: np.ndarray
+    """Class of each sound event annotation, or -1 if it has none."""
+
+    geometries: Geometries
+    """Buffered bounds of the annotated sound events."""
+
+
+@dataclass
+class ClipPredictions:
+    """Encoded predictions of a clip."""
+
+    clip_prediction_id: int
+
+    clip_id: int
+
+    scores: np.ndarray
+    """Predicted score of each class for the clip."""
+
+    sound_event_ids: np.ndarray
+    """Database IDs of the sound event predictions."""
+
+    sound_event_uuids: list[UUID]
+    """UUIDs of the predicted sound events."""
+
+    sound_event_scores: np.ndarray
+    """Array of shape (n, num_classes) with the predicted score of each
+    class for each sound event."""
+
+    geometries: Geometries | None
+    """Buffered bounds of the predicted sound events, if loaded."""
+
+
+async def load_ground_truth(
+    session: AsyncSession,
+    evaluation_set: schemas.EvaluationSet,
+    encoder: TagEncoder,
+    cache: GroundTruthCache | None = None,
+    batch_size: int = 500,
+) -> dict[int, ClipGroundTruth]:
+    """Load the encoded annotations of an evaluation set.
+
+    Parameters
+    ----------
+    session
+        The database session.
+    evaluation_set
+        The evaluation set.
+    encoder
+        The encoder of the tags of the evaluation set.
+    cache
+        Cache of previously loaded clip annotations. Defaults to the
+        cache shared by all evaluations.
+    batch_size
+        Number of clip annotations loaded per query.
+
+    Returns
+    -------
+    dict[int, ClipGroundTruth]
+        The annotations of each annotated clip, by clip ID. If a clip
+        was annotated more than once, the last annotation is used.
+    """
+    if cache is None:
+        cache = ground_truth_cache
+
+    result = await session.execute(
+        select(models.ClipAnnotation.id)
+        .join(
+            models.EvaluationSetAnnotation,
+            models.EvaluationSetAnnotation.clip_annotation_id
+            == models.ClipAnnotation.id,
+        )
+        .where(
+            models.EvaluationSetAnnotation.evaluation_set_id
+            == evaluation_set.id,
+        )
+        .order_by(models.ClipAnnotation.id)
+    )
+    ids = list(result.scalars().all())
+
+    annotations: dict[int, ClipGroundTruth] = {}
+    missing = []
+    for clip_annotation_id in ids:
+        cached = cache.get((clip_annotation_id, encoder.key))
+        if cached is None:
+            missing.append(clip_annotation_id)
+        else:
+            annotations[clip_annotation_id] = cached
+
+    loaded = await _load_clip_annotations(
+        session,
+        missing,
+        encoder,
+        batch_size=batch_size,
+    )
+    for obj in loaded:
+        cache.set((obj.clip_annotation_id, encoder.key), obj)
+        annotations[obj.clip_annotation_id] = obj
+
+    return {
+        annotations[clip_annotation_id].clip_id: annotations[
+            clip_annotation_id
+        ]
+        for clip_annotation_id in ids
+        if clip_annotation_id in annotations
+    }
+
+
+async def load_predictions(
+    session: AsyncSession,
+    model_run: schemas.ModelRun,
+    evaluation_set: schemas.EvaluationSet,
+    encoder: TagEncoder,
+    geometries: bool = True,
+) -> list[ClipPredictions]:
+    """Load the encoded predictions of a model run.
+
+    Only the predictions of clips annotated in the evaluation set are
+    loaded.
+
+    Parameters
+    ----------
+    session
+        The database session.
+    model_run
+        The model run.
+    evaluation_set
+        The evaluation set the model run is evaluated against.
+    encoder
+        The encoder of the tags of the evaluation set.
+    geometries
+        Whether to load the geometries of the predicted sound events.
+
+    Returns
+    -------
+    list[ClipPredictions]
+        The predictions of each clip.
+    """
+    annotated_clips = (
+        select(models.ClipAnnotation.clip_id)
+        .join(
+            models.EvaluationSetAnnotation,
+            models.EvaluationSetAnnotation.clip_annotation_id
+            == models.ClipAnnotation.id,
+        )
+        .where(
+            models.EvaluationSetAnnotation.evaluation_set_id
+            == evaluation_set.id,
+        )
+    )
+    clip_predictions = (
+        select(models.ClipPrediction.id)
+        .join(
+            models.ModelRunPrediction,
+            models.ModelRunPrediction.clip_prediction_id
+            == models.ClipPrediction.id,
+        )
+        .where(
+            models.ModelRunPrediction.model_run_id == model_run.id,
+            models.ClipPrediction.clip_id.in_(annotated_clips),
+        )
+    )
+
+    result = await session.execute(
+        select(models.ClipPrediction.id, models.ClipPrediction.clip_id)
+        .where(models.ClipPrediction.id.in_(clip_predictions))
+        .order_by(models.ClipPrediction.id)
+    )
+    clips = result.all()
+
+    result = await session.execute(
+        select(
+            models.ClipPredictionTag.clip_prediction_id,
+            models.Tag.key,
+            models.Tag.value,
+            models.ClipPredictionTag.score,
+        )
+        .join(models.Tag, models.Tag.id == models.ClipPredictionTag.tag_id)
+        .where(
+            models.ClipPredictionTag.clip_prediction_id.in_(clip_predictions)
+        )
+    )
+    clip_tags = defaultdict(list)
+    for clip_prediction_id, key, value, score in result.all():
+        clip_tags[clip_prediction_id].append((key, value, score))
+
+    columns = [
+        models.SoundEventPrediction.id,
+        models.SoundEventPrediction.clip_prediction_id,
+        models.SoundEvent.uuid,
+    ]
+    if geometries:
+        columns.append(type_coerce(models.SoundEvent.geometry, String))
+
+    result = await session.execute(
+        select(*columns)
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventPrediction.sound_event_id,
+        )
+        .where(
+            models.SoundEventPrediction.clip_prediction_id.in_(
+                clip_predictions
+            )
+        )
+        .order_by(models.SoundEventPrediction.id)
+    )
+    sound_events = defaultdict(list)
+    for row in result.all():
+        sound_events[row[1]].append(row)
+
+    result = await session.execute(
+        select(
+            models.SoundEventPredictionTag.sound_event_prediction_id,
+            models.Tag.key,
+            models.Tag.value,
+            models.SoundEventPredictionTag.score,
+        )
+        .join(
+            models.Tag,
+            models.Tag.id == models.SoundEventPredictionTag.tag_id,
+        )
+        .join(
+            models.SoundEventPrediction,
+            models.SoundEventPrediction.id
+            == models.SoundEventPredictionTag.sound_event_prediction_id,
+        )
+        .where(
+            models.SoundEventPrediction.clip_prediction_id.in_(
+                clip_predictions
+            )
+        )
+    )
+    sound_event_tags = defaultdict(list)
+    for sound_event_prediction_id, key, value, score in result.all():
+        sound_event_tags[sound_event_prediction_id].append((key, value, score))
+
+    predictions = []
+    for clip_prediction_id, clip_id in clips:
+        rows = sound_events[clip_prediction_id]
+        ids = [row[0] for row in rows]
+        predictions.append(
+            ClipPredictions(
+                clip_prediction_id=clip_prediction_id,
+                clip_id=clip_id,
+                scores=_encode_scores(
+                    encoder,
+                    [clip_tags[clip_prediction_id]],
+                )[0],
+                sound_event_ids=np.array(ids, dtype=np.int64),
+                sound_event_uuids=[row[2] for row in rows],
+                sound_event_scores=_encode_scores(
+                    encoder,
+                    [sound_event_tags[id] for id in ids],
+                ),
+                geometries=(
+                    parse_geometries([row[3] for row in rows])
+                    if geometries
+                    else None
+                ),
+            )
+        )
+
+    return predictions
+
+
+async def _load_clip_annotations(
+    session: AsyncSession,
+    ids: list[int],
+    encoder: TagEncoder,
+    batch_size: int,
+) -> list[ClipGroundTruth]:
+    if not ids:
+        return []
+
+    clips = await select_batched(
+        session,
+        select(
+            models.ClipAnnotation.id,
+            models.ClipAnnotation.clip_id,
+        ).where(models.ClipAnnotation.id.in_(bindparam("ids"))),
+        values=ids,
+        parameter="ids",
+        batch_size=batch_size,
+    )
+
+    rows = await select_batched(
+        session,
+        select(
+            models.ClipAnnotationTag.clip_annotation_id,
+            models.Tag.key,
+            models.Tag.value,
+        )
+        .join(models.Tag, models.Tag.id == models.ClipAnnotationTag.tag_id)
+        .where(
+            models.ClipAnnotationTag.clip_annotation_id.in_(bindparam("ids"))
+        )
+        .order_by(models.ClipAnnotationTag.id),
+        values=ids,
+        parameter="ids",
+        batch_size=batch_size,
+    )
+    clip_tags = defaultdict(list)
+    for clip_annotation_id, key, value in rows:
+        clip_tags[clip_annotation_id].append((key, value))
+
+    rows = await select_batched(
+        session,
+        select(
+            models.SoundEventAnnotation.id,
+            models.SoundEventAnnotation.clip_annotation_id,
+            models.SoundEvent.uuid,
+            type_coerce(models.SoundEvent.geometry, String),
+        )
+        .join(
+            models.SoundEvent,
+            models.SoundEvent.id == models.SoundEventAnnotation.sound_event_id,
+        )
+        .where(
+            models.SoundEventAnnotation.clip_annotation_id.in_(
+                bindparam("ids")
+            )
+        )
+        .order_by(models.SoundEventAnnotation.id),
+        values=ids,
+        parameter="ids",
+        batch_size=batch_size,
+    )
+    sound_events = defaultdict(list)
+    for row in rows:
+        sound_events[row[1]].append(row)
+
+    rows = await select_batched(
+        session,
+        select(
+            models.SoundEventAnnotationTag.sound_event_annotation_id,
+            models.Tag.key,
+            models.Tag.value,
+        )
+        .join(
+            models.Tag,
+            models.Tag.id == models.SoundEventAnnotationTag.tag_id,
+        )
+        .join(
+            models.SoundEventAnnotation,
+            models.SoundEventAnnotation.id
+            == models.SoundEventAnnotationTag.sound_event_annotation_id,
+        )
+        .where(
+            models.SoundEventAnnotation.clip_annotation_id.in_(
+                bindparam("ids")
+            )
+        )
+        .order_by(models.SoundEventAnnotationTag.id),
+        values=ids,
+        parameter="ids",
+        batch_size=batch_size,
+    )
+    sound_event_tags = defaultdict(list)
+    for sound_event_annotation_id, key, value in rows:
+        sound_event_tags[sound_event_annotation_id].append((key, value))
+
+    annotations = []
+    for clip_annotation_id, clip_id in clips:
+        rows = sound_events[clip_annotation_id]
+        tags = clip_tags[clip_annotation_id]
+        annotations.append(
+            ClipGroundTruth(
+                clip_annotation_id=clip_annotation_id,
+                clip_id=clip_id,
+                true_class=encoder.encode_class(tags),
+                labels=encoder.encode_labels(tags),
+                sound_event_ids=np.array(
+                    [row[0] for row in rows],
+                    dtype=np.int64,
+                ),
+                sound_event_uuids=[row[2] for row in rows],
+                sound_event_classes=np.array(
+                    [
+                        encoder.encode_class(sound_event_tags[row[0]])
+                        for row in rows
+                    ],
+                    dtype=np.int64,
+                ),
+                geometries=parse_geometries([row[3] for row in rows]),
+            )
+        )
+
+    return annotations
+
+
+def _encode_scores(
+    encoder: TagEncoder,
+    tags: Sequence[Sequence[tuple[str, str, float]]],
+) -> np.ndarray:
+    """Encode the predicted tags of each object into an array of scores."""
+    scores = np.zeros((len(tags), encoder.num_classes), dtype=np.float32)
+    for row, predicted_tags in enumerate(tags):
+        for key, value, score in predicted_tags:
+            index = encoder.encode(key, value)
+            if index != NO_CLASS:
+                scores[row, index] = score
+    return scores
@@ -0,0 +1,244 @@
+"""Vectorized matching of predicted and annotated sound events.
+
+Geometries are matched as in `soundevent.evaluation.match_geometries`:
+every geometry is buffered by a small time and frequency margin, the
+affinity between two geometries is their intersection over union, and
+the pairs are chosen with the Hungarian algorithm to maximize the total
+affinity. Pairs with zero affinity are left unmatched.
+
+Time stamps, time intervals and bounding boxes, which are the bulk of
+all sound events, are reduced to arrays of bounds so that the affinity
+between all predictions and annotations of a clip is computed with a
+handful of array operations. The affinity of any other kind of geometry
+is computed with `soundevent`, one pair at a time.
+"""
+
+import json
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from soundevent import data
+from soundevent.evaluation.affinity import compute_affinity
+from soundevent.geometry import buffer_geometry, compute_bounds
+
+from whombat.models.base import decode_geometry
+
+__all__ = [
+    "DEFAULT_FREQ_BUFFER",
+    "DEFAULT_TIME_BUFFER",
+    "Geometries",
+    "compute_affinity_matrix",
+    "match_geometries",
+    "parse_geometries",
+]
+
+DEFAULT_TIME_BUFFER = 0.01
+"""Seconds added to both sides of a geometry before matching."""
+
+DEFAULT_FREQ_BUFFER = 100
+"""Hertz added above and below a geometry before matching."""
+
+TIME_GEOMETRY = 0
+BOX_GEOMETRY = 1
+OTHER_GEOMETRY = 2
+
+
+@dataclass
+class Geometries:
+    """Buffered bounds of a sequence of geometries."""
+
+    bounds: np.ndarray
+    """Array of shape (n, 4) with the start time, low frequency, end time
+    and high frequency of each buffered geometry."""
+
+    kinds: np.ndarray
+    """Array of shape (n,) telling whether each geometry is a time
+    geometry, a bounding box or any other geometry."""
+
+    raw: Sequence[str] = field(repr=False)
+    """The geometries serialized as JSON, decoded only when needed."""
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def get(self, index: int) -> data.Geometry:
+        """Decode the geometry at the given index."""
+        return decode_geometry(self.raw[index])
+
+
+def parse_geometries(
+    raw: Sequence[str],
+    time_buffer: float = DEFAULT_TIME_BUFFER,
+    freq_buffer: float = DEFAULT_FREQ_BUFFER,
+) -> Geometries:
+    """Compute the buffered bounds of geometries serialized as JSON.
+
+    Parameters
+    ----------
+    raw
+        The geometries as stored in the database.
+    time_buffer
+        Seconds added to both sides of each geometry.
+    freq_buffer
+        Hertz added above and below each bounding box.
+
+    Returns
+    -------
+    Geometries
+        The buffered bounds of the geometries.
+    """
+    bounds = np.zeros((len(raw), 4), dtype=np.float64)
+    kinds = np.zeros(len(raw), dtype=np.int8)
+
+    for index, value in enumerate(raw):
+        geometry = json.loads(value)
+        geometry_type = geometry["type"]
+        coordinates = geometry["coordinates"]
+
+        if geometry_type == "TimeStamp":
+            start_time = end_time = coordinates
+            low_freq, high_freq = 0, data.MAX_FREQUENCY
+            kinds[index] = TIME_GEOMETRY
+        elif geometry_type == "TimeInterval":
+            start_time, end_time = coordinates
+            low_freq, high_freq = 0, data.MAX_FREQUENCY
+            kinds[index] = TIME_GEOMETRY
+        elif geometry_type == "BoundingBox":
+            start_time, low_freq, end_time, high_freq = coordinates
+            low_freq = max(low_freq - freq_buffer, 0)
+            high_freq = min(high_freq + freq_buffer, data.MAX_FREQUENCY)
+            kinds[index] = BOX_GEOMETRY
+        else:
+            buffered = buffer_geometry(
+                decode_geometry(value),
+                time_buffer=time_buffer,
+                freq_buffer=freq_buffer,
+            )
+            bounds[index] = compute_bounds(buffered)
+            kinds[index] = OTHER_GEOMETRY
+            continue
+
+        bounds[index] = (
+            max(start_time - time_buffer, 0),
+            low_freq,
+            end_time + time_buffer,
+            high_freq,
+        )
+
+    return Geometries(bounds=bounds, kinds=kinds, raw=raw)
+
+
+def compute_affinity_matrix(
+    source: Geometries,
+    target: Geometries,
+    time_buffer: float = DEFAULT_TIME_BUFFER,
+    freq_buffer: float = DEFAULT_FREQ_BUFFER,
+) -> np.ndarray:
+    """Compute the affinity between all pairs of source and target geometries.
+
+    Returns
+    -------
+    np.ndarray
+        Array of shape (len(source), len(target)) with the intersection
+        over union of each pair of buffered geometries.
+    """
+    start1, low1, end1, high1 = (
+        source.bounds[:, column, None] for column in range(4)
+    )
+    start2, low2, end2, high2 = (
+        target.bounds[None, :, column] for column in range(4)
+    )
+
+    time_overlap = np.clip(
+        np.minimum(end1, end2) - np.maximum(start1, start2),
+        0,
+        None,
+    )
+    time_union = (end1 - start1) + (end2 - start2) - time_overlap
+
+    freq_overlap = np.clip(
+        np.minimum(high1, high2) - np.maximum(low1, low2),
+        0,
+        None,
+    )
+    area_overlap = time_overlap * freq_overlap
+    area_union = (
+        (end1 - start1) * (high1 - low1)
+        + (end2 - start2) * (high2 - low2)
+        - area_overlap
+    )
+
+    # NOTE: If any of the two geometries only has a time extent, the
+    # affinity is computed in time only.
+    in_time = (source.kinds == TIME_GEOMETRY)[:, None] | (
+        target.kinds == TIME_GEOMETRY
+    )[None, :]
+    affinity = np.where(
+        in_time,
+        _safe_divide(time_overlap, time_union),
+        _safe_divide(area_overlap, area_union),
+    )
+
+    other = ~in_time & (
+        (source.kinds == OTHER_GEOMETRY)[:, None]
+        | (target.kinds == OTHER_GEOMETRY)[None, :]
+    )
+    for row, column in zip(*np.nonzero(other), strict=True):
+        affinity[row, column] = compute_affinity(
+            source.get(row),
+            target.get(column),
+            time_buffer=time_buffer,
+            freq_buffer=freq_buffer,
+        )
+
+    return affinity
+
+
+def match_geometries(
+    affinity: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Select the pairs of geometries that maximize the total affinity.
+
+    Parameters
+    ----------
+    affinity
+        The affinity between all pairs of source and target geometries.
+
+    Returns
+    -------
+    sources : np.ndarray
+        The indices of the matched source geometries.
+    targets : np.ndarray
+        The indices of the target geometries matched to each source.
+    unmatched_sources : np.ndarray
+        The indices of the source geometries without a match.
+    unmatched_targets : np.ndarray
+        The indices of the target geometries without a match.
+    """
+    num_sources, num_targets = affinity.shape
+    sources, targets = linear_sum_assignment(affinity, maximize=True)
+
+    valid = affinity[sources, targets] > 0
+    sources = sources[valid]
+    targets = targets[valid]
+
+    is_unmatched = np.ones(num_sources, dtype=bool)
+    is_unmatched[sources] = False
+    unmatched_sources = np.flatnonzero(is_unmatched)
+
+    is_unmatched = np.ones(num_targets, dtype=bool)
+    is_unmatched[targets] = False
+    unmatched_targets = np.flatnonzero(is_unmatched)
+
+    return sources, targets, unmatched_sources, unmatched_targets
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray):
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(np.broadcast(numerator, denominator).shape),
+        where=denominator > 0,
+    )
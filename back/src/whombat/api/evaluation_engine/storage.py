@@ -0,0 +1,199 @@
+"""Storage of evaluation results with bulk inserts."""
+
+import datetime
+from uuid import uuid4
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models
+from whombat.api.evaluation_engine.tasks import EvaluationResult
+from whombat.api.io.aoef.features import import_feature_names
+
+__all__ = [
+    "store_evaluation",
+]
+
+
+async def store_evaluation(
+    session: AsyncSession,
+    result: EvaluationResult,
+) -> models.Evaluation:
+    """Store the result of an evaluation in the database.
+
+    All rows of each table are written with a single bulk insert.
+
+    Parameters
+    ----------
+    session
+        The database session.
+    result
+        The result of the evaluation.
+
+    Returns
+    -------
+    models.Evaluation
+        The stored evaluation.
+    """
+    now = datetime.datetime.now()
+    evaluation = models.Evaluation(task=result.task, score=result.score)
+    session.add(evaluation)
+    await session.flush()
+
+    feature_names = await import_feature_names(
+        session,
+        list(
+            {
+                *result.metrics,
+                *result.clip_metrics,
+                *result.match_metrics,
+            }
+        ),
+    )
+
+    if result.metrics:
+        await session.execute(
+            insert(models.EvaluationMetric),
+            [
+                {
+                    "evaluation_id": evaluation.id,
+                    "feature_name_id": feature_names[name],
+                    "value": value,
+                    "created_on": now,
+                }
+                for name, value in result.metrics.items()
+            ],
+        )
+
+    if len(result.clip_scores) == 0:
+        return evaluation
+
+    clip_uuids = [uuid4() for _ in range(len(result.clip_scores))]
+    await session.execute(
+        insert(models.ClipEvaluation),
+        [
+            {
+                "uuid": uuid,
+                "evaluation_id": evaluation.id,
+                "clip_annotation_id": clip_annotation_id,
+                "clip_prediction_id": clip_prediction_id,
+                "score": score,
+                "created_on": now,
+            }
+            for uuid, clip_annotation_id, clip_prediction_id, score in zip(
+                clip_uuids,
+                result.clip_annotation_ids.tolist(),
+                result.clip_prediction_ids.tolist(),
+                result.clip_scores.tolist(),
+                strict=True,
+            )
+        ],
+    )
+    rows = await session.execute(
+        select(models.ClipEvaluation.uuid, models.ClipEvaluation.id).where(
+            models.ClipEvaluation.evaluation_id == evaluation.id
+        )
+    )
+    mapping = dict(rows.tuples().all())
+    clip_ids = np.array([mapping[uuid] for uuid in clip_uuids])
+
+    await _insert_metrics(
+        session,
+        models.ClipEvaluationMetric,
+        "clip_evaluation_id",
+        clip_ids,
+        result.clip_metrics,
+        feature_names,
+        now,
+    )
+
+    if len(result.match_clips) == 0:
+        return evaluation
+
+    match_uuids = [uuid4() for _ in range(len(result.match_clips))]
+    await session.execute(
+        insert(models.SoundEventEvaluation),
+        [
+            {
+                "uuid": uuid,
+                "clip_evaluation_id": clip_evaluation_id,
+                "source_id": source_id if source_id >= 0 else None,
+                "target_id": target_id if target_id >= 0 else None,
+                "affinity": affinity,
+                "score": score,
+                "created_on": now,
+            }
+            for (
+                uuid,
+                clip_evaluation_id,
+                source_id,
+                target_id,
+                affinity,
+                score,
+            ) in zip(
+                match_uuids,
+                clip_ids[result.match_clips].tolist(),
+                result.match_sources.tolist(),
+                result.match_targets.tolist(),
+                result.match_affinities.tolist(),
+                result.match_scores.tolist(),
+                strict=True,
+            )
+        ],
+    )
+    rows = await session.execute(
+        select(
+            models.SoundEventEvaluation.uuid, models.SoundEventEvaluation.id
+        )
+        .join(
+            models.ClipEvaluation,
+            models.ClipEvaluation.id
+            == models.SoundEventEvaluation.clip_evaluation_id,
+        )
+        .where(models.ClipEvaluation.evaluation_id == evaluation.id)
+    )
+    mapping = dict(rows.tuples().all())
+
+    await _insert_metrics(
+        session,
+        models.SoundEventEvaluationMetric,
+        "sound_event_evaluation_id",
+        np.array([mapping[uuid] for uuid in match_uuids]),
+        result.match_metrics,
+        feature_names,
+        now,
+    )
+    return evaluation
+
+
+async def _insert_metrics(
+    session: AsyncSession,
+    model: type[models.Base],
+    column: str,
+    ids: np.ndarray,
+    metrics: dict[str, np.ndarray],
+    feature_names: dict[str, int],
+    created_on: datetime.datetime,
+) -> None:
+    values = []
+    for name, metric in metrics.items():
+        valid = ~np.isnan(metric)
+        values.extend(
+            {
+                column: id,
+                "feature_name_id": feature_names[name],
+                "value": value,
+                "created_on": created_on,
+            }
+            for id, value in zip(
+                ids[valid].tolist(),
+                metric[valid].tolist(),
+                strict=True,
+            )
+        )
+
+    if not values:
+        return
+
+    await session.execute(insert(model), values)
@@ -0,0 +1,460 @@
+"""Evaluation of encoded predictions for each prediction task.
+
+Each task reproduces the corresponding task of `soundevent.evaluation`,
+working on the arrays of all clips at once wherever possible. The run
+metrics are computed with the metric functions of `soundevent`.
+"""
+
+from dataclasses import dataclass, field
+from typing import Callable, Mapping, Sequence
+
+import numpy as np
+from soundevent import data, terms
+from soundevent.evaluation import metrics
+
+from whombat.api.evaluation_engine.loading import (
+    NO_CLASS,
+    ClipGroundTruth,
+    ClipPredictions,
+)
+from whombat.api.evaluation_engine.matching import (
+    compute_affinity_matrix,
+    match_geometries,
+)
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+__all__ = [
+    "EVALUATION_TASKS",
+    "EvaluationResult",
+    "evaluate_clip_classification",
+    "evaluate_clip_tagging",
+    "evaluate_sound_event_detection",
+    "evaluate_sound_event_tagging",
+]
+
+Clips = Sequence[tuple[ClipGroundTruth, ClipPredictions]]
+
+
+@dataclass
+class EvaluationResult:
+    """Result of an evaluation, stored as arrays.
+
+    Clip evaluations are stored by row, one row per evaluated clip
+    prediction. Sound event evaluations, or matches, are stored by row
+    too, each referencing the row of its clip evaluation.
+    """
+
+    task: str
+    """Name of the evaluated task, as named by soundevent."""
+
+    num_classes: int
+
+    score: float = 0
+
+    metrics: dict[str, float] = field(default_factory=dict)
+
+    clip_annotation_ids: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+
+    clip_prediction_ids: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+
+    clip_scores: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.float64)
+    )
+
+    clip_metrics: dict[str, np.ndarray] = field(default_factory=dict)
+
+    match_clips: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+    """Row of the clip evaluation of each match."""
+
+    match_sources: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+    """ID of the matched sound event prediction, or -1 if unmatched."""
+
+    match_targets: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.int64)
+    )
+    """ID of the matched sound event annotation, or -1 if unmatched."""
+
+    match_affinities: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.float64)
+    )
+
+    match_scores: np.ndarray = field(
+        default_factory=lambda: np.zeros(0, dtype=np.float64)
+    )
+
+    match_metrics: dict[str, np.ndarray] = field(default_factory=dict)
+    """Metrics of each match. Matches without a metric have NaN values."""
+
+
+def evaluate_sound_event_detection(
+    clips: Clips,
+    num_classes: int,
+) -> EvaluationResult:
+    """Evaluate the detection and classification of sound events.
+
+    Predicted and annotated sound events are matched by the overlap of
+    their geometries. A match is scored with the probability assigned to
+    the true class of the annotation, while unmatched predictions and
+    annotations have a score of zero.
+    """
+    sources = []
+    targets = []
+    affinities = []
+    true_classes = []
+    predicted_scores = []
+    is_matched = []
+    match_clips = []
+
+    for row, (annotations, predictions) in enumerate(clips):
+        assert predictions.geometries is not None
+        affinity = compute_affinity_matrix(
+            predictions.geometries,
+            annotations.geometries,
+        )
+        (
+            matched_sources,
+            matched_targets,
+            unmatched_sources,
+            unmatched_targets,
+        ) = match_geometries(affinity)
+        num_matched = len(matched_sources)
+        num_unmatched = len(unmatched_sources) + len(unmatched_targets)
+
+        sources.extend(
+            [
+                predictions.sound_event_ids[matched_sources],
+                predictions.sound_event_ids[unmatched_sources],
+                np.full(len(unmatched_targets), -1),
+            ]
+        )
+        targets.extend(
+            [
+                annotations.sound_event_ids[matched_targets],
+                np.full(len(unmatched_sources), -1),
+                annotations.sound_event_ids[unmatched_targets],
+            ]
+        )
+        affinities.extend(
+            [
+                affinity[matched_sources, matched_targets],
+                np.zeros(num_unmatched),
+            ]
+        )
+        true_classes.extend(
+            [
+                annotations.sound_event_classes[matched_targets],
+                np.full(len(unmatched_sources), NO_CLASS),
+                annotations.sound_event_classes[unmatched_targets],
+            ]
+        )
+        predicted_scores.extend(
+            [
+                predictions.sound_event_scores[matched_sources],
+                predictions.sound_event_scores[unmatched_sources],
+                np.zeros((len(unmatched_targets), num_classes)),
+            ]
+        )
+        is_matched.extend(
+            [np.ones(num_matched, bool), np.zeros(num_unmatched, bool)]
+        )
+        match_clips.append(np.full(num_matched + num_unmatched, row))
+
+    result = _create_result(
+        "sound_event_detection",
+        clips,
+        num_classes,
+    )
+    if not clips:
+        return result
+
+    result.match_sources = np.concatenate(sources).astype(np.int64)
+    result.match_targets = np.concatenate(targets).astype(np.int64)
+    result.match_affinities = np.concatenate(affinities)
+    result.match_clips = np.concatenate(match_clips).astype(np.int64)
+    y_true = np.concatenate(true_classes).astype(np.int64)
+    y_score = np.concatenate(predicted_scores).astype(np.float32)
+    matched = np.concatenate(is_matched)
+
+    probabilities = _true_class_probability(y_true, y_score)
+    result.match_scores = np.where(matched, probabilities, 0)
+    result.match_metrics = {
+        terms.true_class_probability.name: np.where(
+            matched,
+            probabilities,
+            np.nan,
+        )
+    }
+    result.clip_scores = _mean_by_clip(
+        result.match_clips,
+        result.match_scores,
+        len(clips),
+    )
+    result.score = _mean(result.clip_scores)
+    result.metrics = _compute_run_metrics(
+        [
+            (terms.mean_average_precision, metrics.mean_average_precision),
+            (terms.balanced_accuracy, metrics.balanced_accuracy),
+            (terms.accuracy, metrics.accuracy),
+            (terms.top_3_accuracy, metrics.top_3_accuracy),
+        ],
+        _to_class_list(y_true),
+        y_score,
+    )
+    return result
+
+
+def evaluate_sound_event_tagging(
+    clips: Clips,
+    num_classes: int,
+) -> EvaluationResult:
+    """Evaluate the classification of annotated sound events.
+
+    Each predicted sound event is paired with the annotation of the same
+    sound event, and scored with the probability assigned to the true
+    class of the annotation. Predictions of sound events that were not
+    annotated are ignored.
+    """
+    sources = []
+    targets = []
+    true_classes = []
+    predicted_scores = []
+    match_clips = []
+
+    for row, (annotations, predictions) in enumerate(clips):
+        annotated = {
+            uuid: index
+            for index, uuid in enumerate(annotations.sound_event_uuids)
+        }
+        pairs = [
+            (index, annotated[uuid])
+            for index, uuid in enumerate(predictions.sound_event_uuids)
+            if uuid in annotated
+        ]
+        predicted = np.array([p for p, _ in pairs], dtype=np.int64)
+        annotation = np.array([a for _, a in pairs], dtype=np.int64)
+
+        sources.append(predictions.sound_event_ids[predicted])
+        targets.append(annotations.sound_event_ids[annotation])
+        true_classes.append(annotations.sound_event_classes[annotation])
+        predicted_scores.append(predictions.sound_event_scores[predicted])
+        match_clips.append(np.full(len(pairs), row))
+
+    result = _create_result(
+        "sound_event_classification",
+        clips,
+        num_classes,
+    )
+    if not clips:
+        return result
+
+    result.match_sources = np.concatenate(sources).astype(np.int64)
+    result.match_targets = np.concatenate(targets).astype(np.int64)
+    result.match_clips = np.concatenate(match_clips).astype(np.int64)
+    result.match_affinities = np.ones(len(result.match_clips))
+    y_true = np.concatenate(true_classes).astype(np.int64)
+    y_score = np.concatenate(predicted_scores).astype(np.float32)
+
+    probabilities = _true_class_probability(y_true, y_score)
+    result.match_scores = probabilities
+    result.match_metrics = {terms.true_class_probability.name: probabilities}
+    result.clip_scores = _mean_by_clip(
+        result.match_clips,
+        result.match_scores,
+        len(clips),
+    )
+    result.score = _mean(result.clip_scores)
+    result.metrics = _compute_run_metrics(
+        [
+            (terms.balanced_accuracy, metrics.balanced_accuracy),
+            (terms.accuracy, metrics.accuracy),
+            (terms.top_3_accuracy, metrics.top_3_accuracy),
+        ],
+        _to_class_list(y_true),
+        y_score,
+    )
+    return result
+
+
+def evaluate_clip_classification(
+    clips: Clips,
+    num_classes: int,
+) -> EvaluationResult:
+    """Evaluate the classification of clips.
+
+    Each clip is scored with the probability assigned to its true class.
+    """
+    result = _create_result(
+        "clip_classification",
+        clips,
+        num_classes,
+    )
+    if not clips:
+        return result
+
+    y_true = np.array([a.true_class for a, _ in clips], dtype=np.int64)
+    y_score = np.stack([p.scores for _, p in clips])
+
+    probabilities = _true_class_probability(y_true, y_score)
+    result.clip_scores = probabilities
+    result.clip_metrics = {terms.true_class_probability.name: probabilities}
+    result.score = _mean(result.clip_scores)
+    result.metrics = _compute_run_metrics(
+        [
+            (terms.balanced_accuracy, metrics.balanced_accuracy),
+            (terms.accuracy, metrics.accuracy),
+            (terms.top_3_accuracy, metrics.top_3_accuracy),
+        ],
+        _to_class_list(y_true),
+        y_score,
+    )
+    return result
+
+
+def evaluate_clip_tagging(
+    clips: Clips,
+    num_classes: int,
+) -> EvaluationResult:
+    """Evaluate the multilabel classification of clips."""
+    result = _create_result(
+        "clip_multilabel_classification",
+        clips,
+        num_classes,
+    )
+    if not clips:
+        return result
+
+    y_true = np.stack([a.labels for a, _ in clips])
+    y_score = np.stack([p.scores for _, p in clips])
+
+    # NOTE: The example metrics of soundevent are computed with
+    # scikit-learn one clip at a time.
+    result.clip_scores = np.array(
+        [
+            metrics.multilabel_example_score(labels, scores)
+            for labels, scores in zip(y_true, y_score, strict=True)
+        ]
+    )
+    result.clip_metrics = {
+        term.name: np.array(
+            [
+                metric(labels, scores)
+                for labels, scores in zip(y_true, y_score, strict=True)
+            ]
+        )
+        for term, metric in [
+            (terms.jaccard_index, metrics.jaccard),
+            (terms.average_precision, metrics.average_precision),
+        ]
+    }
+    result.score = _mean(result.clip_scores)
+    result.metrics = _compute_run_metrics(
+        [(terms.mean_average_precision, metrics.mean_average_precision)],
+        y_true,
+        y_score,
+    )
+    return result
+
+
+EVALUATION_TASKS: Mapping[
+    PredictionTypes,
+    Callable[[Clips, int], EvaluationResult],
+] = {
+    PredictionTypes.sound_event_detection: evaluate_sound_event_detection,
+    PredictionTypes.clip_classification: evaluate_clip_classification,
+    PredictionTypes.clip_tagging: evaluate_clip_tagging,
+    PredictionTypes.sound_event_tagging: evaluate_sound_event_tagging,
+}
+"""The evaluation function of each prediction task."""
+
+
+def _create_result(
+    task: str,
+    clips: Clips,
+    num_classes: int,
+) -> EvaluationResult:
+    return EvaluationResult(
+        task=task,
+        num_classes=num_classes,
+        clip_annotation_ids=np.array(
+            [a.clip_annotation_id for a, _ in clips],
+            dtype=np.int64,
+        ),
+        clip_prediction_ids=np.array(
+            [p.clip_prediction_id for _, p in clips],
+            dtype=np.int64,
+        ),
+        clip_scores=np.zeros(len(clips)),
+    )
+
+
+def _true_class_probability(
+    y_true: np.ndarray,
+    y_score: np.ndarray,
+) -> np.ndarray:
+    """Score assigned to the true class of each example.
+
+    Examples without a class are scored with the probability of not
+    belonging to any class.
+    """
+    if len(y_true) == 0:
+        return np.zeros(0, dtype=np.float64)
+
+    probabilities = 1 - y_score.sum(axis=1).astype(np.float64)
+    has_class = y_true != NO_CLASS
+    probabilities[has_class] = y_score[
+        np.flatnonzero(has_class),
+        y_true[has_class],
+    ]
+    return probabilities
+
+
+def _mean_by_clip(
+    clips: np.ndarray,
+    scores: np.ndarray,
+    num_clips: int,
+) -> np.ndarray:
+    totals = np.bincount(clips, weights=scores, minlength=num_clips)
+    counts = np.bincount(clips, minlength=num_clips)
+    return np.divide(
+        totals,
+        counts,
+        out=np.zeros(num_clips),
+        where=counts > 0,
+    )
+
+
+def _mean(scores: np.ndarray) -> float:
+    if len(scores) == 0:
+        return 0.0
+
+    score = float(np.mean(scores))
+    if np.isnan(score):
+        return 0.0
+
+    return score
+
+
+def _to_class_list(y_true: np.ndarray) -> list[int | None]:
+    return [None if c == NO_CLASS else int(c) for c in y_true]
+
+
+def _compute_run_metrics(
+    run_metrics: Sequence[tuple[data.Term, metrics.Metric]],
+    y_true,
+    y_score: np.ndarray,
+) -> dict[str, float]:
+    if len(y_score) == 0:
+        return {}
+
+    return {
+        term.name: float(metric(y_true, y_score))
+        for term, metric in run_metrics
+    }
@@ -6,11 +6,11 @@ from uuid import UUID
 
 from soundevent import data
 from soundevent import evaluation as evaluate
-from soundevent.io.aoef import EvaluationObject, to_aeof
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
+from whombat.api import evaluation_engine
 from whombat.api.clip_evaluations import clip_evaluations
 from whombat.api.common import (
     BaseAPI,
@@ -18,10 +18,7 @@ from whombat.api.common import (
     delete_object,
     update_object,
 )
-from whombat.api.evaluation_sets import evaluation_sets
 from whombat.api.features import features
-from whombat.api.io.aoef.evaluations import import_evaluation
-from whombat.api.model_runs import model_runs
 from whombat.filters.base import Filter
 from whombat.filters.clip_evaluations import EvaluationFilter
 from whombat.schemas.evaluation_sets import PredictionTypes
@@ -307,31 +304,35 @@ class EvaluationAPI(
         session: AsyncSession,
         model_run: schemas.ModelRun,
         evaluation_set: schemas.EvaluationSet,
-        audio_dir: Path,
-        user: schemas.SimpleUser,
     ) -> schemas.Evaluation:
-        model_run_se = await model_runs.to_soundevent(
+        """Evaluate a model run against an evaluation set.
+
+        Parameters
+        ----------
+        session
+            SQLAlchemy AsyncSession.
+        model_run
+            The model run to evaluate.
+        evaluation_set
+            The evaluation set to evaluate the model run against.
+
+        Returns
+        -------
+        schemas.Evaluation
+            The created evaluation.
+
+        Notes
+        -----
+        The evaluation is computed by the evaluation engine, which loads
+        the annotations and predictions as arrays and stores the results
+        with bulk inserts. See `whombat.api.evaluation_engine`.
+        """
+        result = await evaluation_engine.evaluate(
             session,
             model_run,
-        )
-        evaluation_set_se = await evaluation_sets.to_soundevent(
-            session,
             evaluation_set,
         )
-        evaluation = evaluate_predictions(
-            model_run_se.clip_predictions,
-            evaluation_set_se.clip_annotations,
-            evaluation_set_se.evaluation_tags,
-            evaluation_set.task,
-        )
-        obj: EvaluationObject = to_aeof(evaluation)  # type: ignore
-        db_eval = await import_evaluation(
-            session,
-            obj.model_dump(),
-            audio_dir=audio_dir,
-            base_audio_dir=audio_dir,
-            imported_by=user,
-        )
+        db_eval = await evaluation_engine.store_evaluation(session, result)
 
         # Create model run evaluation
         model_run_eval = models.ModelRunEvaluation(
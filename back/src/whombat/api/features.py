@@ -1,12 +1,12 @@
 """API functions to interact with feature names."""
 
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 
 from soundevent import data
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, upsert_objects
 
 __all__ = [
     "FeatureNameAPI",
@@ -29,6 +29,7 @@ class FeatureNameAPI(
 
     _model = models.FeatureName
     _schema = schemas.FeatureName
+    _cache_enabled = True
 
     async def create(
         self,
@@ -85,6 +86,57 @@ class FeatureNameAPI(
             self._update_cache(obj)
             return obj
 
+    async def get_ids(
+        self,
+        session: AsyncSession,
+        names: Iterable[str],
+    ) -> dict[str, int]:
+        """Get the ids of many feature names, creating the missing ones.
+
+        Feature names are looked up in the cache first, and all the names
+        that are not cached are created or fetched with a single upsert.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        names
+            The names of the features.
+
+        Returns
+        -------
+        dict[str, int]
+            Mapping from feature name to its database id.
+        """
+        ids: dict[str, int] = {}
+        missing = []
+        for name in set(names):
+            key = self._get_cache_key(session, name)
+            cached = self._cache.get(key) if key is not None else None
+            if cached is None:
+                missing.append(name)
+            else:
+                ids[name] = cached.id  # type: ignore
+
+        if not missing:
+            return ids
+
+        created = await upsert_objects(
+            session,
+            models.FeatureName,
+            [{"name": name} for name in missing],
+            keys=[models.FeatureName.name],
+            returning=models.FeatureName.id,
+        )
+        for name, id in created.items():
+            key = self._get_cache_key(session, name)
+            if key is not None:
+                obj = schemas.FeatureName(id=id, name=name)
+                self._cache.set(key, obj, name)
+            ids[name] = id
+
+        return ids
+
     async def get_feature(
         self,
         session: AsyncSession,
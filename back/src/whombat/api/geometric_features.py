@@ -0,0 +1,145 @@
+"""Vectorized computation of the geometric features of sound events.
+
+`soundevent.geometry.compute_geometric_features` computes the features
+of a single geometry, building a shapely geometry and a `Feature` object
+for each of them along the way. Here the bounds of many geometries are
+gathered into one array instead, and the features of all of them are
+computed with a handful of array operations. Only geometries other than
+time stamps, time intervals, points and bounding boxes need to go
+through `soundevent` to get their bounds.
+
+The features and their values are the same as those computed by
+`soundevent`: every geometry has a duration, geometries with frequency
+information also have low and high frequencies and a bandwidth, and
+geometries with several parts have their number of segments.
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, Sequence
+
+import numpy as np
+from soundevent import data, terms
+from soundevent.geometry import compute_bounds
+
+__all__ = [
+    "FEATURE_NAMES",
+    "GeometricFeatures",
+    "compute_geometric_features",
+]
+
+FEATURE_NAMES: tuple[str, ...] = (
+    terms.duration.name,
+    terms.low_freq.name,
+    terms.high_freq.name,
+    terms.bandwidth.name,
+    terms.num_segments.name,
+)
+"""Names of the geometric features, in the order of the columns."""
+
+MULTI_GEOMETRIES = {"MultiPoint", "MultiLineString", "MultiPolygon"}
+
+
+@dataclass
+class GeometricFeatures:
+    """Geometric features of a sequence of geometries."""
+
+    values: np.ndarray
+    """Array of shape (n, len(FEATURE_NAMES)) with the value of each
+    feature of each geometry, or NaN where a feature does not apply."""
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the features computed for any of the geometries."""
+        present = np.asarray(~np.isnan(self.values).all(axis=0))
+        return [
+            name
+            for name, has_values in zip(
+                FEATURE_NAMES,
+                present.tolist(),
+                strict=True,
+            )
+            if has_values
+        ]
+
+    def get(self, index: int) -> list[tuple[str, float]]:
+        """Get the features of the geometry at the given index."""
+        return [
+            (name, value)
+            for name, value in zip(
+                FEATURE_NAMES,
+                self.values[index].tolist(),
+                strict=True,
+            )
+            if not np.isnan(value)
+        ]
+
+    def items(self) -> Iterator[tuple[int, str, float]]:
+        """Iterate over the geometry index, name and value of every feature.
+
+        The features are sorted by geometry, and then in the order of
+        `FEATURE_NAMES`.
+        """
+        rows, columns = np.nonzero(~np.isnan(self.values))
+        return zip(
+            rows.tolist(),
+            [FEATURE_NAMES[column] for column in columns.tolist()],
+            self.values[rows, columns].tolist(),
+            strict=True,
+        )
+
+
+def compute_geometric_features(
+    geometries: Sequence[data.Geometry],
+) -> GeometricFeatures:
+    """Compute the geometric features of many geometries at once.
+
+    Parameters
+    ----------
+    geometries
+        The geometries.
+
+    Returns
+    -------
+    GeometricFeatures
+        The features of each geometry.
+    """
+    size = len(geometries)
+    bounds = np.zeros((size, 4), dtype=np.float64)
+    has_freq = np.ones(size, dtype=bool)
+    segments = np.full(size, np.nan, dtype=np.float64)
+
+    for index, geometry in enumerate(geometries):
+        geometry_type = geometry.type
+        coordinates = geometry.coordinates
+
+        if geometry_type == "TimeStamp":
+            bounds[index, 0] = bounds[index, 2] = coordinates
+            has_freq[index] = False
+        elif geometry_type == "TimeInterval":
+            bounds[index, 0], bounds[index, 2] = coordinates  # type: ignore
+            has_freq[index] = False
+        elif geometry_type == "BoundingBox":
+            bounds[index] = coordinates
+        elif geometry_type == "Point":
+            time, freq = coordinates  # type: ignore
+            bounds[index] = (time, freq, time, freq)
+        else:
+            bounds[index] = compute_bounds(geometry)
+            if geometry_type in MULTI_GEOMETRIES:
+                segments[index] = len(coordinates)  # type: ignore
+
+    start_time, low_freq, end_time, high_freq = bounds.T
+    no_freq = np.where(has_freq, 0, np.nan)
+    values = np.column_stack(
+        [
+            end_time - start_time,
+            low_freq + no_freq,
+            high_freq + no_freq,
+            high_freq - low_freq + no_freq,
+            segments,
+        ]
+    )
+    return GeometricFeatures(values=values)
@@ -5,13 +5,20 @@ For more details on the AOEF format, see
 https://mbsantiago.github.io/soundevent/
 """
 
-from whombat.api.io.aoef.annotation_projects import import_annotation_project
+from whombat.api.io.aoef.annotation_projects import (
+    export_annotation_project,
+    import_annotation_project,
+)
 from whombat.api.io.aoef.datasets import import_dataset
 from whombat.api.io.aoef.evaluation_sets import import_evaluation_set
 from whombat.api.io.aoef.evaluations import import_evaluation
 from whombat.api.io.aoef.model_runs import import_model_run
+from whombat.api.io.aoef.staging import ImportProgress, ProgressCallback
 
 __all__ = [
+    "ImportProgress",
+    "ProgressCallback",
+    "export_annotation_project",
     "import_dataset",
     "import_annotation_project",
     "import_evaluation_set",
@@ -1,27 +1,69 @@
+import asyncio
 import datetime
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, AsyncIterator, BinaryIO, Sequence
+from uuid import UUID
 
-from soundevent.io.aoef import AnnotationProjectObject
-from sqlalchemy import select, tuple_
+from pydantic_core import to_json
+from soundevent import data
+from soundevent.io.aoef import AOEF_VERSION, AnnotationProjectObject
+from soundevent.io.aoef.annotation_task import (
+    AnnotationTaskObject,
+    StatusBadgeObject,
+)
+from soundevent.io.aoef.clip import ClipObject
+from soundevent.io.aoef.clip_annotations import ClipAnnotationsObject
+from soundevent.io.aoef.note import NoteObject
+from soundevent.io.aoef.recording import RecordingObject
+from soundevent.io.aoef.sound_event import SoundEventObject
+from soundevent.io.aoef.sound_event_annotation import (
+    SoundEventAnnotationObject,
+)
+from soundevent.io.aoef.tag import TagObject
+from soundevent.io.aoef.user import UserObject
+from sqlalchemy import Row, Select, select, union
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    joinedload,
+    load_only,
+    raiseload,
+    selectinload,
+)
 
-from whombat import exceptions, models
-from whombat.api.common import utils
-from whombat.api.io.aoef.annotation_tasks import get_annotation_tasks
-from whombat.api.io.aoef.clip_annotations import get_clip_annotations
-from whombat.api.io.aoef.clips import get_clips
-from whombat.api.io.aoef.common import parse_aoef_object
-from whombat.api.io.aoef.features import get_feature_names
-from whombat.api.io.aoef.recordings import get_recordings
+from whombat import exceptions, models, schemas
+from whombat.api.common import upsert_objects
+from whombat.api.io.aoef.annotation_tasks import import_annotation_task
+from whombat.api.io.aoef.clip_annotations import import_clip_annotations
+from whombat.api.io.aoef.clips import import_clips
+from whombat.api.io.aoef.common import validate_aoef_object
+from whombat.api.io.aoef.features import get_batch_feature_names
+from whombat.api.io.aoef.recordings import import_recordings
 from whombat.api.io.aoef.sound_event_annotations import (
-    get_sound_event_annotations,
+    import_sound_event_annotations,
+)
+from whombat.api.io.aoef.sound_events import import_sound_events
+from whombat.api.io.aoef.staging import (
+    DEFAULT_BATCH_SIZE,
+    AOEFStage,
+    ImportProgress,
+    ProgressCallback,
+    commit_batch,
+    stage_aoef_document,
 )
-from whombat.api.io.aoef.sound_events import get_sound_events
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 from whombat.schemas.users import SimpleUser
 
+_PROJECT_KEYS = [
+    "recordings",
+    "clips",
+    "sound_events",
+    "clip_annotations",
+    "sound_event_annotations",
+    "tasks",
+]
+
 
 async def import_annotation_project(
     session: AsyncSession,
@@ -29,74 +71,228 @@ async def import_annotation_project(
     audio_dir: Path,
     base_audio_dir: Path,
     imported_by: SimpleUser,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
 ) -> models.AnnotationProject:
-    obj = parse_aoef_object(src)
-
-    if obj.data.collection_type != "annotation_project":
-        raise exceptions.DataFormatError(
-            message=(
-                "Invalid Annotation Project file. "
-                "The provided file is a valid AOEF object, but it is not an "
-                "Annotation Project. Detected object type: "
-                f"'{obj.data.collection_type}'. "
-                "Please ensure you provided the correct file or convert it "
-                "to an Annotation Project."
-            ),
-            format="aoef-annotation-project",
+    """Import an annotation project.
+
+    The file is read incrementally and its objects are imported in
+    batches of `batch_size`, committing the session after each batch.
+    Importing the same file again skips the objects that were already
+    imported.
+    """
+    with AOEFStage() as stage:
+        obj = validate_aoef_object(
+            await asyncio.to_thread(stage_aoef_document, src, stage)
         )
 
-    imported_data = obj.data
-    project = await get_or_create_annotation_project(session, imported_data)
-    tags = await import_tags(session, imported_data.tags or [])
-    users = await import_users(session, imported_data.users or [])
-    feature_names = await get_feature_names(session, imported_data)
-    recordings = await get_recordings(
-        session,
-        imported_data,
-        tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=audio_dir,
-        base_audio_dir=base_audio_dir,
-        should_import=False,
-    )
-    clips = await get_clips(
-        session,
-        imported_data,
-        recordings=recordings,
-        feature_names=feature_names,
-    )
-    sound_events = await get_sound_events(
-        session,
-        imported_data,
-        recordings=recordings,
-        feature_names=feature_names,
-    )
-    clip_annotations = await get_clip_annotations(
-        session,
-        imported_data,
-        clips=clips,
-        users=users,
-        tags=tags,
-        user=imported_by,
-    )
-    await get_sound_event_annotations(
-        session,
-        imported_data,
-        sound_events=sound_events,
-        clip_annotations=clip_annotations,
-        users=users,
-        tags=tags,
-        user=imported_by,
-    )
-    await get_annotation_tasks(
-        session,
-        imported_data,
-        clips=clips,
-        annotation_projects={project.uuid: project.id},
-        users=users,
-        clip_annotations=clip_annotations,
-    )
+        if obj.data.collection_type != "annotation_project":
+            raise exceptions.DataFormatError(
+                message=(
+                    "Invalid Annotation Project file. "
+                    "The provided file is a valid AOEF object, but it is not "
+                    "an Annotation Project. Detected object type: "
+                    f"'{obj.data.collection_type}'. "
+                    "Please ensure you provided the correct file or convert "
+                    "it to an Annotation Project."
+                ),
+                format="aoef-annotation-project",
+            )
+
+        imported_data = obj.data
+        project = await get_or_create_annotation_project(
+            session,
+            imported_data,
+        )
+        tags = await import_tags(session, imported_data.tags or [])
+        users = await import_users(session, imported_data.users or [])
+        await session.commit()
+
+        progress = ImportProgress(
+            totals={key: stage.count(key) for key in _PROJECT_KEYS}
+        )
+
+        for recordings in stage.iter_batches(
+            "recordings",
+            RecordingObject,
+            batch_size,
+        ):
+            mapping = await import_recordings(
+                session,
+                recordings,
+                tags=tags,
+                users=users,
+                feature_names=await get_batch_feature_names(
+                    session,
+                    recordings,
+                ),
+                audio_dir=audio_dir,
+                base_audio_dir=base_audio_dir,
+            )
+            stage.set_ids("recordings", mapping)
+            await commit_batch(
+                session,
+                progress,
+                "recordings",
+                len(recordings),
+                on_progress,
+            )
+
+        for clips in stage.iter_batches("clips", ClipObject, batch_size):
+            mapping = await import_clips(
+                session,
+                clips,
+                recordings=await stage.get_ids(
+                    session,
+                    "recordings",
+                    models.Recording,
+                    {clip.recording for clip in clips},
+                ),
+                feature_names=await get_batch_feature_names(session, clips),
+            )
+            stage.set_ids("clips", mapping)
+            await commit_batch(
+                session,
+                progress,
+                "clips",
+                len(clips),
+                on_progress,
+            )
+
+        for sound_events in stage.iter_batches(
+            "sound_events",
+            SoundEventObject,
+            batch_size,
+        ):
+            mapping = await import_sound_events(
+                session,
+                sound_events,
+                recordings=await stage.get_ids(
+                    session,
+                    "recordings",
+                    models.Recording,
+                    {sound_event.recording for sound_event in sound_events},
+                ),
+                feature_names=await get_batch_feature_names(
+                    session,
+                    sound_events,
+                ),
+            )
+            stage.set_ids("sound_events", mapping)
+            await commit_batch(
+                session,
+                progress,
+                "sound_events",
+                len(sound_events),
+                on_progress,
+            )
+
+        for clip_annotations in stage.iter_batches(
+            "clip_annotations",
+            ClipAnnotationsObject,
+            batch_size,
+        ):
+            mapping = await import_clip_annotations(
+                session,
+                clip_annotations,
+                clips=await stage.get_ids(
+                    session,
+                    "clips",
+                    models.Clip,
+                    {annotation.clip for annotation in clip_annotations},
+                ),
+                users=users,
+                tags=tags,
+                imported_by=imported_by,
+            )
+            stage.set_ids("clip_annotations", mapping)
+            await commit_batch(
+                session,
+                progress,
+                "clip_annotations",
+                len(clip_annotations),
+                on_progress,
+            )
+
+        for sound_event_annotations in stage.iter_batches(
+            "sound_event_annotations",
+            SoundEventAnnotationObject,
+            batch_size,
+        ):
+            parents = stage.get_parents(
+                "sound_event_annotations",
+                {annotation.uuid for annotation in sound_event_annotations},
+            )
+            children = [
+                annotation
+                for annotation in sound_event_annotations
+                if annotation.uuid in parents
+            ]
+            await import_sound_event_annotations(
+                session,
+                children,
+                [parents[annotation.uuid] for annotation in children],
+                sound_events=await stage.get_ids(
+                    session,
+                    "sound_events",
+                    models.SoundEvent,
+                    {annotation.sound_event for annotation in children},
+                ),
+                clip_annotations=await stage.get_ids(
+                    session,
+                    "clip_annotations",
+                    models.ClipAnnotation,
+                    set(parents.values()),
+                ),
+                users=users,
+                tags=tags,
+                imported_by=imported_by,
+            )
+            await commit_batch(
+                session,
+                progress,
+                "sound_event_annotations",
+                len(sound_event_annotations),
+                on_progress,
+            )
+
+        for tasks in stage.iter_batches(
+            "tasks",
+            AnnotationTaskObject,
+            batch_size,
+        ):
+            clip_annotation_mapping = stage.get_parents(
+                "clips",
+                {task.clip for task in tasks},
+            )
+            await import_annotation_task(
+                session,
+                tasks,
+                [project.uuid] * len(tasks),
+                clips=await stage.get_ids(
+                    session,
+                    "clips",
+                    models.Clip,
+                    {task.clip for task in tasks},
+                ),
+                annotation_projects={project.uuid: project.id},
+                users=users,
+                clip_annotations=await stage.get_ids(
+                    session,
+                    "clip_annotations",
+                    models.ClipAnnotation,
+                    set(clip_annotation_mapping.values()),
+                ),
+                clip_annotation_mapping=clip_annotation_mapping,
+            )
+            await commit_batch(
+                session,
+                progress,
+                "tasks",
+                len(tasks),
+                on_progress,
+            )
+
     await add_annotation_tags(
         session,
         imported_data,
@@ -136,11 +332,11 @@ async def add_annotation_tags(
     project: AnnotationProjectObject,
     project_id: int,
     tags: dict[int, int],
-) -> list[models.AnnotationProjectTag]:
+) -> None:
     """Add annotation tags to a project."""
     proj_tags = project.project_tags or []
     if not proj_tags:
-        return []
+        return
 
     values = [
         {
@@ -153,17 +349,411 @@ async def add_annotation_tags(
     ]
 
     if not values:
-        return []
+        return
 
-    return await utils.create_objects_without_duplicates(
+    await upsert_objects(
         session,
         models.AnnotationProjectTag,
         values,
-        key=lambda x: (x["annotation_project_id"], x["tag_id"]),
-        key_column=(
-            tuple_(
-                models.AnnotationProjectTag.annotation_project_id,
-                models.AnnotationProjectTag.tag_id,
-            )
+        keys=[
+            models.AnnotationProjectTag.annotation_project_id,
+            models.AnnotationProjectTag.tag_id,
+        ],
+    )
+
+
+async def export_annotation_project(
+    session: AsyncSession,
+    project: schemas.AnnotationProject,
+    batch_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Export an annotation project as a stream of AOEF JSON chunks.
+
+    The objects of the project are fetched in batches, walking the
+    primary key of each table, and every batch is serialized as soon as
+    it is loaded. Only the tags and users referenced by the project are
+    kept until the end of the export, so memory use does not grow with
+    the number of tasks, annotations or recordings.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    project
+        The annotation project to export.
+    batch_size
+        Maximum number of objects fetched per query, by default 1000.
+
+    Yields
+    ------
+    bytes
+        Consecutive chunks of the AOEF JSON document.
+    """
+    references = _References()
+
+    project_tags = [references.tag_id(tag) for tag in project.tags]
+    header = {
+        "version": AOEF_VERSION,
+        "created_on": datetime.datetime.now(),
+    }
+    fields = {
+        "collection_type": "annotation_project",
+        "uuid": project.uuid,
+        "name": project.name,
+        "description": project.description,
+        "instructions": project.annotation_instructions,
+        "created_on": project.created_on,
+        "project_tags": project_tags or None,
+    }
+    yield (
+        b"{"
+        + b",".join(_dump_field(key, value) for key, value in header.items())
+        + b',"data":{'
+        + b",".join(_dump_field(key, value) for key, value in fields.items())
+    )
+
+    task_ids = select(models.AnnotationTask.id).where(
+        models.AnnotationTask.annotation_project_id == project.id
+    )
+    clip_annotation_ids = select(
+        models.AnnotationTask.clip_annotation_id
+    ).where(models.AnnotationTask.annotation_project_id == project.id)
+    sound_event_ids = select(models.SoundEventAnnotation.sound_event_id).where(
+        models.SoundEventAnnotation.clip_annotation_id.in_(clip_annotation_ids)
+    )
+    clip_ids = union(
+        select(models.AnnotationTask.clip_id).where(
+            models.AnnotationTask.id.in_(task_ids)
+        ),
+        select(models.ClipAnnotation.clip_id).where(
+            models.ClipAnnotation.id.in_(clip_annotation_ids)
+        ),
+    )
+    recording_ids = union(
+        select(models.Clip.recording_id).where(models.Clip.id.in_(clip_ids)),
+        select(models.SoundEvent.recording_id).where(
+            models.SoundEvent.id.in_(sound_event_ids)
         ),
     )
+
+    passes: list[tuple[str, Select, InstrumentedAttribute, Any]] = [
+        (
+            "tasks",
+            select(models.AnnotationTask, models.Clip.uuid)
+            .join(models.Clip, models.Clip.id == models.AnnotationTask.clip_id)
+            .where(models.AnnotationTask.id.in_(task_ids))
+            .options(
+                selectinload(models.AnnotationTask.status_badges).joinedload(
+                    models.AnnotationStatusBadge.user
+                ),
+                raiseload("*"),
+            ),
+            models.AnnotationTask.id,
+            references.task,
+        ),
+        (
+            "clip_annotations",
+            select(models.ClipAnnotation, models.Clip.uuid)
+            .join(models.Clip, models.Clip.id == models.ClipAnnotation.clip_id)
+            .where(models.ClipAnnotation.id.in_(clip_annotation_ids))
+            .options(
+                selectinload(models.ClipAnnotation.tags),
+                selectinload(models.ClipAnnotation.notes).joinedload(
+                    models.Note.created_by
+                ),
+                selectinload(models.ClipAnnotation.sound_events).options(
+                    load_only(models.SoundEventAnnotation.uuid),
+                ),
+                raiseload("*"),
+            ),
+            models.ClipAnnotation.id,
+            references.clip_annotation,
+        ),
+        (
+            "sound_event_annotations",
+            select(models.SoundEventAnnotation, models.SoundEvent.uuid)
+            .join(
+                models.SoundEvent,
+                models.SoundEvent.id
+                == models.SoundEventAnnotation.sound_event_id,
+            )
+            .where(
+                models.SoundEventAnnotation.clip_annotation_id.in_(
+                    clip_annotation_ids
+                )
+            )
+            .options(
+                joinedload(models.SoundEventAnnotation.created_by),
+                selectinload(models.SoundEventAnnotation.tags),
+                selectinload(models.SoundEventAnnotation.notes).joinedload(
+                    models.Note.created_by
+                ),
+                raiseload("*"),
+            ),
+            models.SoundEventAnnotation.id,
+            references.sound_event_annotation,
+        ),
+        (
+            "sound_events",
+            select(models.SoundEvent, models.Recording.uuid)
+            .join(
+                models.Recording,
+                models.Recording.id == models.SoundEvent.recording_id,
+            )
+            .where(models.SoundEvent.id.in_(sound_event_ids))
+            .options(
+                selectinload(models.SoundEvent.features).joinedload(
+                    models.SoundEventFeature.feature_name
+                ),
+                raiseload("*"),
+            ),
+            models.SoundEvent.id,
+            references.sound_event,
+        ),
+        (
+            "clips",
+            select(models.Clip, models.Recording.uuid)
+            .join(
+                models.Recording,
+                models.Recording.id == models.Clip.recording_id,
+            )
+            .where(models.Clip.id.in_(clip_ids))
+            .options(
+                selectinload(models.Clip.features).joinedload(
+                    models.ClipFeature.feature_name
+                ),
+                raiseload("*"),
+            ),
+            models.Clip.id,
+            references.clip,
+        ),
+        (
+            "recordings",
+            select(models.Recording)
+            .where(models.Recording.id.in_(recording_ids))
+            .options(
+                selectinload(models.Recording.tags),
+                selectinload(models.Recording.features).joinedload(
+                    models.RecordingFeature.feature_name
+                ),
+                selectinload(models.Recording.notes).joinedload(
+                    models.Note.created_by
+                ),
+                selectinload(models.Recording.owners),
+                raiseload("*"),
+            ),
+            models.Recording.id,
+            references.recording,
+        ),
+    ]
+
+    for key, query, id_column, convert in passes:
+        yield b',"' + key.encode() + b'":['
+        separator = b""
+        async for rows in _iter_batches(session, query, id_column, batch_size):
+            yield separator + b",".join(to_json(convert(*row)) for row in rows)
+            separator = b","
+        yield b"]"
+
+    for key, values in [
+        ("tags", references.tags.values()),
+        ("users", references.users.values()),
+    ]:
+        yield (
+            b',"'
+            + key.encode()
+            + b'":['
+            + b",".join(to_json(value) for value in values)
+            + b"]"
+        )
+
+    yield b"}}"
+
+
+async def _iter_batches(
+    session: AsyncSession,
+    query: Select,
+    id_column: InstrumentedAttribute,
+    batch_size: int,
+) -> AsyncIterator[Sequence[Row]]:
+    last_id = None
+    while True:
+        stmt = query.order_by(id_column).limit(batch_size)
+        if last_id is not None:
+            stmt = stmt.where(id_column > last_id)
+
+        result = await session.execute(stmt)
+        rows = result.all()
+        if not rows:
+            return
+
+        yield rows
+
+        if len(rows) < batch_size:
+            return
+
+        last_id = rows[-1][0].id
+
+
+def _dump_field(key: str, value: Any) -> bytes:
+    return to_json(key) + b":" + to_json(value)
+
+
+def _key(name: str) -> str:
+    return data.key_from_term(data.term_from_key(name))
+
+
+def _features(features: Sequence[Any]) -> dict[str, float] | None:
+    if not features:
+        return None
+    return {
+        _key(feature.feature_name.name): feature.value for feature in features
+    }
+
+
+class _References:
+    """Tags and users referenced by the exported objects."""
+
+    def __init__(self):
+        self.tags: dict[tuple[str, str], TagObject] = {}
+        self.users: dict[UUID, UserObject] = {}
+
+    def tag_id(self, tag: models.Tag | schemas.Tag) -> int:
+        key = (_key(tag.key), tag.value)
+        if key not in self.tags:
+            self.tags[key] = TagObject(
+                id=len(self.tags),
+                key=key[0],
+                value=key[1],
+            )
+        return self.tags[key].id
+
+    def tag_ids(self, tags: Sequence[models.Tag]) -> list[int] | None:
+        return [self.tag_id(tag) for tag in tags] or None
+
+    def user_uuid(self, user: models.User) -> UUID:
+        if user.id not in self.users:
+            self.users[user.id] = UserObject(
+                uuid=user.id,
+                username=user.username,
+                email=user.email,
+                name=user.name,
+            )
+        return user.id
+
+    def notes(self, notes: Sequence[models.Note]) -> list[NoteObject] | None:
+        return [
+            NoteObject(
+                uuid=note.uuid,
+                message=note.message,
+                created_by=self.user_uuid(note.created_by),
+                is_issue=note.is_issue,
+                created_on=note.created_on,
+            )
+            for note in notes
+        ] or None
+
+    def task(
+        self,
+        task: models.AnnotationTask,
+        clip_uuid: UUID,
+    ) -> AnnotationTaskObject:
+        return AnnotationTaskObject(
+            uuid=task.uuid,
+            clip=clip_uuid,
+            status_badges=[
+                StatusBadgeObject(
+                    state=badge.state,
+                    owner=(
+                        self.user_uuid(badge.user)
+                        if badge.user is not None
+                        else None
+                    ),
+                    created_on=badge.created_on,
+                )
+                for badge in task.status_badges
+            ]
+            or None,
+            created_on=task.created_on,
+        )
+
+    def clip_annotation(
+        self,
+        clip_annotation: models.ClipAnnotation,
+        clip_uuid: UUID,
+    ) -> ClipAnnotationsObject:
+        return ClipAnnotationsObject(
+            uuid=clip_annotation.uuid,
+            clip=clip_uuid,
+            tags=self.tag_ids(clip_annotation.tags),
+            sound_events=[
+                sound_event.uuid
+                for sound_event in clip_annotation.sound_events
+            ]
+            or None,
+            notes=self.notes(clip_annotation.notes),
+            created_on=clip_annotation.created_on,
+        )
+
+    def sound_event_annotation(
+        self,
+        sound_event_annotation: models.SoundEventAnnotation,
+        sound_event_uuid: UUID,
+    ) -> SoundEventAnnotationObject:
+        return SoundEventAnnotationObject(
+            uuid=sound_event_annotation.uuid,
+            sound_event=sound_event_uuid,
+            notes=self.notes(sound_event_annotation.notes),
+            tags=[self.tag_id(tag) for tag in sound_event_annotation.tags],
+            created_by=(
+                self.user_uuid(sound_event_annotation.created_by)
+                if sound_event_annotation.created_by is not None
+                else None
+            ),
+            created_on=sound_event_annotation.created_on,
+        )
+
+    def sound_event(
+        self,
+        sound_event: models.SoundEvent,
+        recording_uuid: UUID,
+    ) -> SoundEventObject:
+        return SoundEventObject(
+            uuid=sound_event.uuid,
+            recording=recording_uuid,
+            geometry=sound_event.geometry,
+            features=_features(sound_event.features),
+        )
+
+    def clip(self, clip: models.Clip, recording_uuid: UUID) -> ClipObject:
+        return ClipObject(
+            uuid=clip.uuid,
+            recording=recording_uuid,
+            start_time=clip.start_time,
+            end_time=clip.end_time,
+            features=_features(clip.features),
+        )
+
+    def recording(self, recording: models.Recording) -> RecordingObject:
+        return RecordingObject(
+            uuid=recording.uuid,
+            path=recording.path,
+            duration=recording.duration,
+            channels=recording.channels,
+            samplerate=recording.samplerate,
+            time_expansion=(
+                recording.time_expansion
+                if recording.time_expansion != 1.0
+                else None
+            ),
+            hash=recording.hash,
+            date=recording.date,
+            time=recording.time,
+            latitude=recording.latitude,
+            longitude=recording.longitude,
+            tags=self.tag_ids(recording.tags),
+            features=_features(recording.features),
+            notes=self.notes(recording.notes),
+            owners=[self.user_uuid(owner) for owner in recording.owners],
+            rights=recording.rights,
+        )
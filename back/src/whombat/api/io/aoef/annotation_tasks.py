@@ -3,12 +3,11 @@ from uuid import UUID
 
 from soundevent.io.aoef import AnnotationProjectObject
 from soundevent.io.aoef.annotation_task import AnnotationTaskObject
-from sqlalchemy import insert, tuple_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models
-from whombat.api.common import create_objects_without_duplicates
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 
 
@@ -134,8 +133,14 @@ async def _create_annotation_tasks(
         return mapping
 
     try:
-        stmt = insert(models.AnnotationTask).values(values)
-        await session.execute(stmt)
+        created = await upsert_objects(
+            session,
+            models.AnnotationTask,
+            values,
+            keys=[models.AnnotationTask.uuid],
+            returning=models.AnnotationTask.id,
+            on_conflict="raise",
+        )
     except IntegrityError as e:
         raise exceptions.DataIntegrityError(
             "Duplicated tasks: Failed to create annotation tasks because "
@@ -143,12 +148,7 @@ async def _create_annotation_tasks(
             "to duplicates in the imported file."
         ) from e
 
-    # Get the IDs of the newly created annotations.
-    created = await get_mapping(
-        session, {v["uuid"] for v in values}, models.AnnotationTask
-    )
     mapping.update(created)
-
     return mapping
 
 
@@ -179,14 +179,13 @@ async def _create_annotation_badges(
                 }
             )
 
-    await create_objects_without_duplicates(
+    await upsert_objects(
         session,
         models.AnnotationStatusBadge,
         values,
-        key=lambda v: (v["annotation_task_id"], v["state"], v["user_id"]),
-        key_column=tuple_(
+        keys=[
             models.AnnotationStatusBadge.annotation_task_id,
             models.AnnotationStatusBadge.state,
             models.AnnotationStatusBadge.user_id,
-        ),
+        ],
     )
@@ -3,10 +3,10 @@ from uuid import UUID
 
 from soundevent.io.aoef import AnnotationSetObject, EvaluationObject
 from soundevent.io.aoef.clip_annotations import ClipAnnotationsObject
-from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 from whombat.api.io.aoef.notes import import_notes
 from whombat.schemas.users import SimpleUser
@@ -91,19 +91,8 @@ async def _create_clip_annotations(
     clips: dict[UUID, int],
 ) -> dict[UUID, int]:
     """Create clip annotations."""
-    # Get existing by UUID
-    stmt = select(models.ClipAnnotation.id, models.ClipAnnotation.uuid).where(
-        models.ClipAnnotation.uuid.in_({a.uuid for a in clip_annotations})
-    )
-    result = await session.execute(stmt)
-    mapping = {r[1]: r[0] for r in result.all()}
-
-    missing = [s for s in clip_annotations if s.uuid not in mapping]
-    if not missing:
-        return mapping
-
     values = []
-    for annotation in missing:
+    for annotation in clip_annotations:
         clip_db_id = clips.get(annotation.clip)
         if clip_db_id is None:
             continue
@@ -116,22 +105,13 @@ async def _create_clip_annotations(
             }
         )
 
-    # If values is empty, then all possilbe annotations already exist in the
-    # database.
-    if not values:
-        return mapping
-
-    stmt = insert(models.ClipAnnotation).values(values)
-    result = await session.execute(stmt)
-
-    # Get the IDs of the newly created annotations.
-    stmt = select(models.ClipAnnotation.id, models.ClipAnnotation.uuid).where(
-        models.ClipAnnotation.uuid.in_({v["uuid"] for v in values})
+    return await upsert_objects(
+        session,
+        models.ClipAnnotation,
+        values,
+        keys=[models.ClipAnnotation.uuid],
+        returning=models.ClipAnnotation.id,
     )
-    result = await session.execute(stmt)
-    mapping.update({r[1]: r[0] for r in result.all()})
-
-    return mapping
 
 
 async def _create_clip_annotation_notes(
@@ -174,8 +154,15 @@ async def _create_clip_annotation_notes(
     if not values:
         return
 
-    stmt = insert(models.ClipAnnotationNote).values(values)
-    await session.execute(stmt)
+    await upsert_objects(
+        session,
+        models.ClipAnnotationNote,
+        values,
+        keys=[
+            models.ClipAnnotationNote.clip_annotation_id,
+            models.ClipAnnotationNote.note_id,
+        ],
+    )
 
 
 async def _create_clip_annotation_tags(
@@ -213,5 +200,13 @@ async def _create_clip_annotation_tags(
     if not values:
         return
 
-    stmt = insert(models.ClipAnnotationTag).values(values)
-    await session.execute(stmt)
+    await upsert_objects(
+        session,
+        models.ClipAnnotationTag,
+        values,
+        keys=[
+            models.ClipAnnotationTag.clip_annotation_id,
+            models.ClipAnnotationTag.tag_id,
+            models.ClipAnnotationTag.created_by_id,
+        ],
+    )
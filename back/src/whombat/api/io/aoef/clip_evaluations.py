@@ -3,10 +3,10 @@ from uuid import UUID
 
 from soundevent.io.aoef import EvaluationObject
 from soundevent.io.aoef.clip_evaluation import ClipEvaluationObject
-from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 from whombat.api.io.aoef.features import import_feature_names
 
@@ -84,24 +84,12 @@ async def _create_clip_evaluations(
     clip_predictions: dict[UUID, int],
     evaluations: dict[UUID, int],
 ) -> dict[UUID, int]:
-    mapping = await get_mapping(
-        session,
-        {clip_eval.uuid for clip_eval in clip_evaluations},
-        models.Evaluation,
-    )
-
-    missing = [
-        (clip_evals, eval_uuid)
-        for clip_evals, eval_uuid in zip(
-            clip_evaluations, evaluations_uuids, strict=False
-        )
-        if clip_evals.uuid not in mapping
-    ]
-    if not missing:
-        return mapping
-
     values = []
-    for clip_eval, eval_uuid in missing:
+    for clip_eval, eval_uuid in zip(
+        clip_evaluations,
+        evaluations_uuids,
+        strict=False,
+    ):
         db_eval_id = evaluations.get(eval_uuid)
         if db_eval_id is None:
             continue
@@ -125,20 +113,13 @@ async def _create_clip_evaluations(
             }
         )
 
-    if not values:
-        return mapping
-
-    stmt = insert(models.ClipEvaluation)
-    await session.execute(stmt, values)
-
-    created = await get_mapping(
+    return await upsert_objects(
         session,
-        {v["uuid"] for v in values},
         models.ClipEvaluation,
+        values,
+        keys=[models.ClipEvaluation.uuid],
+        returning=models.ClipEvaluation.id,
     )
-    mapping.update(created)
-
-    return mapping
 
 
 async def _create_clip_evaluation_metrics(
@@ -180,26 +161,12 @@ async def _create_clip_evaluation_metrics(
         for v in values
     ]
 
-    stmt = select(
-        models.ClipEvaluationMetric.clip_evaluation_id,
-        models.ClipEvaluationMetric.feature_name_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.ClipEvaluationMetric,
+        values,
+        keys=[
             models.ClipEvaluationMetric.clip_evaluation_id,
             models.ClipEvaluationMetric.feature_name_id,
-        ).in_((v["clip_evaluation_id"], v["feature_name_id"]) for v in values)
+        ],
     )
-    results = await session.execute(stmt)
-    existing = {(r[0], r[1]) for r in results.scalars().all()}
-
-    missing = [
-        v
-        for v in values
-        if (v["clip_evaluation_id"], v["feature_name_id"]) not in existing
-    ]
-
-    if not missing:
-        return
-
-    stmt = insert(models.ClipEvaluationMetric)
-    await session.execute(stmt, missing)
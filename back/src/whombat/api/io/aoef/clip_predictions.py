@@ -3,10 +3,10 @@ from uuid import UUID
 
 from soundevent.io.aoef import EvaluationObject, PredictionSetObject
 from soundevent.io.aoef.clip_predictions import ClipPredictionsObject
-from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 
 
@@ -71,18 +71,8 @@ async def _create_clip_predictions(
     clips: dict[UUID, int],
 ) -> dict[UUID, int]:
     """Create clip predictions."""
-    mapping = await get_mapping(
-        session,
-        {a.uuid for a in clip_predictions},
-        models.ClipPrediction,
-    )
-
-    missing = [s for s in clip_predictions if s.uuid not in mapping]
-    if not missing:
-        return mapping
-
     values = []
-    for prediction in missing:
+    for prediction in clip_predictions:
         clip_db_id = clips.get(prediction.clip)
         if clip_db_id is None:
             continue
@@ -95,19 +85,13 @@ async def _create_clip_predictions(
             }
         )
 
-    if not values:
-        return mapping
-
-    stmt = insert(models.ClipPrediction)
-    await session.execute(stmt, values)
-
-    created = await get_mapping(
+    return await upsert_objects(
         session,
-        {v["uuid"] for v in values},
         models.ClipPrediction,
+        values,
+        keys=[models.ClipPrediction.uuid],
+        returning=models.ClipPrediction.id,
     )
-    mapping.update(created)
-    return mapping
 
 
 async def _create_clip_prediction_tags(
@@ -144,26 +128,12 @@ async def _create_clip_prediction_tags(
     if not values:
         return
 
-    stmt = select(
-        models.ClipPredictionTag.clip_prediction_id,
-        models.ClipPredictionTag.tag_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.ClipPredictionTag,
+        values,
+        keys=[
             models.ClipPredictionTag.clip_prediction_id,
             models.ClipPredictionTag.tag_id,
-        ).in_({(v["clip_prediction_id"], v["tag_id"]) for v in values})
+        ],
     )
-    result = await session.execute(stmt)
-    existing = set(result.all())
-
-    missing = [
-        v
-        for v in values
-        if (v["clip_prediction_id"], v["tag_id"]) not in existing
-    ]
-
-    if not missing:
-        return
-
-    stmt = insert(models.ClipPredictionTag)
-    await session.execute(stmt, missing)
@@ -7,7 +7,6 @@ from soundevent.io.aoef import (
     PredictionSetObject,
 )
 from soundevent.io.aoef.clip import ClipObject
-from sqlalchemy import tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
@@ -61,19 +60,13 @@ async def import_clips(
     recordings: dict[UUID, int],
     feature_names: dict[str, int],
 ) -> dict[UUID, int]:
-    mapping = await get_mapping(session, {c.uuid for c in clips}, models.Clip)
-
-    missing = [c for c in clips if c.uuid not in mapping]
-    if not missing:
-        return mapping
-
     values = []
-    for clip in missing:
-        if clip.uuid in mapping:
-            continue
+    keys = {}
+    for clip in clips:
         recording_db_id = recordings.get(clip.recording)
         if recording_db_id is None:
             continue
+        keys[clip.uuid] = (recording_db_id, clip.start_time, clip.end_time)
         values.append(
             {
                 "uuid": clip.uuid,
@@ -83,23 +76,25 @@ async def import_clips(
             }
         )
 
-    # TODO: What if a clip already exists with the same start/end time and
-    # recording but different UUID? This is possible if the same clip is
-    # imported twice with different UUIDs. While this is unlikely, it is
-    # possible, and it would be nice to handle it gracefully.
-
-    db_clips = await common.create_objects_without_duplicates(
+    # NOTE: Clips are identified by their recording and time span, so a
+    # clip that already exists with a different UUID is mapped to the
+    # existing clip.
+    ids = await common.upsert_objects(
         session,
         models.Clip,
         values,
-        key=lambda x: (x["recording_id"], x["start_time"], x["end_time"]),
-        key_column=tuple_(
+        keys=[
             models.Clip.recording_id,
             models.Clip.start_time,
             models.Clip.end_time,
-        ),
+        ],
+        returning=models.Clip.id,
     )
-    mapping.update({clip.uuid: clip.id for clip in db_clips})
+    mapping = {uuid: ids[key] for uuid, key in keys.items() if key in ids}
+
+    unmapped = {clip.uuid for clip in clips if clip.uuid not in mapping}
+    if unmapped:
+        mapping.update(await get_mapping(session, unmapped, models.Clip))
 
     await _create_clip_features(session, clips, mapping, feature_names)
 
@@ -135,12 +130,9 @@ async def _create_clip_features(
                 }
             )
 
-    await common.create_objects_without_duplicates(
+    await common.upsert_objects(
         session,
         models.ClipFeature,
         values,
-        key=lambda x: (x["clip_id"], x["feature_name_id"]),
-        key_column=tuple_(
-            models.ClipFeature.clip_id, models.ClipFeature.feature_name_id
-        ),
+        keys=[models.ClipFeature.clip_id, models.ClipFeature.feature_name_id],
     )
@@ -1,6 +1,6 @@
 import json
 from pathlib import Path
-from typing import BinaryIO
+from typing import Any, BinaryIO
 from uuid import UUID
 
 from pydantic import ValidationError
@@ -39,6 +39,10 @@ def parse_aoef_object(src: Path | BinaryIO | str) -> AOEFObject:
             details=str(e),
         ) from e
 
+    return validate_aoef_object(data)
+
+
+def validate_aoef_object(data: Any) -> AOEFObject:
     try:
         obj = AOEFObject.model_validate(data)
     except ValidationError as e:
@@ -1,14 +1,23 @@
+import asyncio
 from pathlib import Path
 from typing import BinaryIO
 
-from sqlalchemy import tuple_
+from soundevent.io.aoef.recording import RecordingObject
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models
 from whombat.api import common
-from whombat.api.io.aoef.common import parse_aoef_object
-from whombat.api.io.aoef.features import get_feature_names
+from whombat.api.io.aoef.common import validate_aoef_object
+from whombat.api.io.aoef.features import get_batch_feature_names
 from whombat.api.io.aoef.recordings import import_recordings
+from whombat.api.io.aoef.staging import (
+    DEFAULT_BATCH_SIZE,
+    AOEFStage,
+    ImportProgress,
+    ProgressCallback,
+    commit_batch,
+    stage_aoef_document,
+)
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 
@@ -18,93 +27,122 @@ async def import_dataset(
     src: Path | BinaryIO | str,
     dataset_dir: Path,
     audio_dir: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
 ) -> models.Dataset:
-    obj = parse_aoef_object(src)
-
-    if obj.data.collection_type != "dataset":
-        raise exceptions.DataFormatError(
-            message=(
-                "Invalid Dataset file. "
-                "The provided file is a valid AOEF object, but it is not an "
-                "Dataset. Detected object type: "
-                f"'{obj.data.collection_type}'. "
-                "Please ensure you provided the correct file or convert it "
-                "to a Dataset."
-            ),
-            format="aoef-dataset",
+    """Import a dataset.
+
+    The file is read incrementally and its recordings are imported in
+    batches of `batch_size`, committing the session after each batch.
+    Importing the same file again skips the recordings that were already
+    imported.
+    """
+    with AOEFStage() as stage:
+        obj = validate_aoef_object(
+            await asyncio.to_thread(
+                stage_aoef_document,
+                src,
+                stage,
+                keys={"recordings"},
+            )
         )
 
-    dataset_object = obj.data
-
-    if not dataset_dir.is_absolute():
-        # Assume relative to audio_dir
-        dataset_dir = audio_dir / dataset_dir
-
-    if not dataset_dir.is_relative_to(audio_dir):
-        raise ValueError(
-            f"Dataset directory {dataset_dir} is not relative "
-            f"to audio directory {audio_dir}"
-        )
-
-    tags = await import_tags(session, dataset_object.tags or [])
-
-    users = await import_users(session, dataset_object.users or [])
-
-    feature_names = await get_feature_names(
-        session,
-        dataset_object,
-    )
-
-    recordings = await import_recordings(
-        session,
-        dataset_object.recordings or [],
-        tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=dataset_dir,
-        base_audio_dir=audio_dir,
-    )
-
-    try:
-        dataset = await common.get_object(
-            session,
-            models.Dataset,
-            models.Dataset.uuid == dataset_object.uuid,
-        )
-    except exceptions.NotFoundError:
-        dataset = await common.create_object(
-            session,
-            models.Dataset,
-            name=dataset_object.name,
-            description=dataset_object.description,
-            audio_dir=dataset_dir.relative_to(audio_dir),
-            uuid=dataset_object.uuid,
+        if obj.data.collection_type != "dataset":
+            raise exceptions.DataFormatError(
+                message=(
+                    "Invalid Dataset file. "
+                    "The provided file is a valid AOEF object, but it is not "
+                    "an Dataset. Detected object type: "
+                    f"'{obj.data.collection_type}'. "
+                    "Please ensure you provided the correct file or convert "
+                    "it to a Dataset."
+                ),
+                format="aoef-dataset",
+            )
+
+        dataset_object = obj.data
+
+        if not dataset_dir.is_absolute():
+            # Assume relative to audio_dir
+            dataset_dir = audio_dir / dataset_dir
+
+        if not dataset_dir.is_relative_to(audio_dir):
+            raise ValueError(
+                f"Dataset directory {dataset_dir} is not relative "
+                f"to audio directory {audio_dir}"
+            )
+
+        tags = await import_tags(session, dataset_object.tags or [])
+
+        users = await import_users(session, dataset_object.users or [])
+
+        try:
+            dataset = await common.get_object(
+                session,
+                models.Dataset,
+                models.Dataset.uuid == dataset_object.uuid,
+            )
+        except exceptions.NotFoundError:
+            dataset = await common.create_object(
+                session,
+                models.Dataset,
+                name=dataset_object.name,
+                description=dataset_object.description,
+                audio_dir=dataset_dir.relative_to(audio_dir),
+                uuid=dataset_object.uuid,
+            )
+
+        await session.commit()
+
+        progress = ImportProgress(
+            totals={"recordings": stage.count("recordings")}
         )
 
-    path_mapping = {
-        recording.uuid: normalize_path(recording.path, dataset_dir)
-        for recording in dataset_object.recordings or []
-    }
-
-    # Create dataset recordings
-    values = [
-        {
-            "recording_id": recording_id,
-            "dataset_id": dataset.id,
-            "path": path_mapping[recording_uuid],
-        }
-        for recording_uuid, recording_id in recordings.items()
-    ]
-    await common.create_objects_without_duplicates(
-        session,
-        models.DatasetRecording,
-        values,
-        key=lambda x: (x["recording_id"], x["dataset_id"]),
-        key_column=tuple_(
-            models.DatasetRecording.recording_id,
-            models.DatasetRecording.dataset_id,
-        ),
-    )
+        for batch in stage.iter_batches(
+            "recordings",
+            RecordingObject,
+            batch_size,
+        ):
+            recordings = await import_recordings(
+                session,
+                batch,
+                tags=tags,
+                users=users,
+                feature_names=await get_batch_feature_names(session, batch),
+                audio_dir=dataset_dir,
+                base_audio_dir=audio_dir,
+            )
+
+            path_mapping = {
+                recording.uuid: normalize_path(recording.path, dataset_dir)
+                for recording in batch
+            }
+
+            # Create dataset recordings
+            values = [
+                {
+                    "recording_id": recording_id,
+                    "dataset_id": dataset.id,
+                    "path": path_mapping[recording_uuid],
+                }
+                for recording_uuid, recording_id in recordings.items()
+            ]
+            await common.upsert_objects(
+                session,
+                models.DatasetRecording,
+                values,
+                keys=[
+                    models.DatasetRecording.recording_id,
+                    models.DatasetRecording.dataset_id,
+                ],
+            )
+            await commit_batch(
+                session,
+                progress,
+                "recordings",
+                len(batch),
+                on_progress,
+            )
 
     return dataset
 
@@ -3,10 +3,11 @@ from pathlib import Path
 from uuid import UUID
 
 from soundevent.io.aoef import EvaluationSetObject
-from sqlalchemy import insert, select, tuple_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.clip_annotations import get_clip_annotations
 from whombat.api.io.aoef.clips import get_clips
 from whombat.api.io.aoef.features import get_feature_names
@@ -152,28 +153,15 @@ async def add_evaluation_tags(
             }
         )
 
-    stmt = select(
-        models.EvaluationSetTag.evaluation_set_id,
-        models.EvaluationSetTag.tag_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.EvaluationSetTag,
+        values,
+        keys=[
             models.EvaluationSetTag.evaluation_set_id,
             models.EvaluationSetTag.tag_id,
-        ).in_([(v["evaluation_set_id"], v["tag_id"]) for v in values])
+        ],
     )
-    result = await session.execute(stmt)
-    existing = set(result.all())
-
-    missing = [
-        v
-        for v in values
-        if (v["evaluation_set_id"], v["tag_id"]) not in existing
-    ]
-    if not missing:
-        return
-
-    stmt = insert(models.EvaluationSetTag).values(missing)
-    await session.execute(stmt)
 
 
 async def add_clip_annotations(
@@ -200,27 +188,12 @@ async def add_clip_annotations(
             }
         )
 
-    stmt = select(
-        models.EvaluationSetAnnotation.evaluation_set_id,
-        models.EvaluationSetAnnotation.clip_annotation_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.EvaluationSetAnnotation,
+        values,
+        keys=[
             models.EvaluationSetAnnotation.evaluation_set_id,
             models.EvaluationSetAnnotation.clip_annotation_id,
-        ).in_(
-            [(v["evaluation_set_id"], v["clip_annotation_id"]) for v in values]
-        )
+        ],
     )
-    result = await session.execute(stmt)
-    existing = set(result.all())
-
-    missing = [
-        v
-        for v in values
-        if (v["evaluation_set_id"], v["clip_annotation_id"]) not in existing
-    ]
-    if not missing:
-        return
-
-    stmt = insert(models.EvaluationSetAnnotation)
-    await session.execute(stmt, missing)
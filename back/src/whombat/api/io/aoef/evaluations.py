@@ -2,10 +2,11 @@ import datetime
 from pathlib import Path
 
 from soundevent.io.aoef import EvaluationObject
-from sqlalchemy import insert, select, tuple_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.clip_annotations import get_clip_annotations
 from whombat.api.io.aoef.clip_evaluations import get_clip_evaluations
 from whombat.api.io.aoef.clip_predictions import get_clip_predictions
@@ -197,33 +198,12 @@ async def add_evaluation_metrics(
         for v in values
     ]
 
-    stmt = select(
-        models.EvaluationMetric.feature_name_id,
-        models.EvaluationMetric.evaluation_id,
-    ).where(
-        tuple_(
-            models.EvaluationMetric.feature_name_id,
+    await upsert_objects(
+        session,
+        models.EvaluationMetric,
+        values,
+        keys=[
             models.EvaluationMetric.evaluation_id,
-        ).in_(
-            {
-                (
-                    v["feature_name_id"],
-                    v["evaluation_id"],
-                )
-                for v in values
-            }
-        )
+            models.EvaluationMetric.feature_name_id,
+        ],
     )
-    result = await session.execute(stmt)
-    existing = {r for r in result.all()}
-
-    missing = [
-        v
-        for v in values
-        if (v["feature_name_id"], v["evaluation_id"]) not in existing
-    ]
-    if not missing:
-        return
-
-    stmt = insert(models.EvaluationMetric)
-    await session.execute(stmt, missing)
@@ -1,4 +1,5 @@
 import datetime
+from typing import Sequence
 
 from soundevent.io.aoef import (
     AnnotationSetObject,
@@ -6,10 +7,13 @@ from soundevent.io.aoef import (
     PredictionSetObject,
     RecordingSetObject,
 )
-from sqlalchemy import insert, select
+from soundevent.io.aoef.clip import ClipObject
+from soundevent.io.aoef.recording import RecordingObject
+from soundevent.io.aoef.sound_event import SoundEventObject
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 
 
 async def get_feature_names(
@@ -53,6 +57,14 @@ async def get_feature_names(
     return await import_feature_names(session, list(names))
 
 
+async def get_batch_feature_names(
+    session: AsyncSession,
+    objs: Sequence[RecordingObject | ClipObject | SoundEventObject],
+) -> dict[str, int]:
+    names = {name for obj in objs for name in obj.features or {}}
+    return await import_feature_names(session, list(names))
+
+
 async def import_feature_names(
     session: AsyncSession,
     names: list[str],
@@ -61,30 +73,11 @@ async def import_feature_names(
     if not names:
         return {}
 
-    # get existing feature names
-    stmt = select(models.FeatureName.id, models.FeatureName.name).where(
-        models.FeatureName.name.in_(names)
-    )
-    result = await session.execute(stmt)
-    mapping = {r[1]: r[0] for r in result.all()}
-
-    # create missing feature names
-    missing = [name for name in names if name not in mapping]
-    if not missing:
-        return mapping
-
-    values = [
-        {"name": name, "created_on": datetime.datetime.now()}
-        for name in missing
-    ]
-    stmt = insert(models.FeatureName).values(values)
-    await session.execute(stmt)
-
-    # get new feature names
-    stmt = select(models.FeatureName.id, models.FeatureName.name).where(
-        models.FeatureName.name.in_(missing)
+    now = datetime.datetime.now()
+    return await upsert_objects(
+        session,
+        models.FeatureName,
+        [{"name": name, "created_on": now} for name in names],
+        keys=[models.FeatureName.name],
+        returning=models.FeatureName.id,
     )
-    result = await session.execute(stmt)
-    mapping.update({r[1]: r[0] for r in result.all()})
-
-    return mapping
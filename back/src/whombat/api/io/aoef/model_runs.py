@@ -1,98 +1,181 @@
+import asyncio
 import datetime
-import json
 from pathlib import Path
 from typing import BinaryIO
 from uuid import UUID
 
 from soundevent.io.aoef import ModelRunObject
-from sqlalchemy import insert, select, tuple_
+from soundevent.io.aoef.clip_predictions import ClipPredictionsObject
+from soundevent.io.aoef.sound_event import SoundEventObject
+from soundevent.io.aoef.sound_event_prediction import (
+    SoundEventPredictionObject,
+)
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
-from whombat.api.io.aoef.clip_predictions import get_clip_predictions
-from whombat.api.io.aoef.clips import get_clips
-from whombat.api.io.aoef.features import get_feature_names
-from whombat.api.io.aoef.recordings import get_recordings
+from whombat.api.common import upsert_objects
+from whombat.api.io.aoef.clip_predictions import import_clip_predictions
+from whombat.api.io.aoef.features import get_batch_feature_names
 from whombat.api.io.aoef.sound_event_predictions import (
-    get_sound_event_predictions,
+    import_sound_event_predictions,
+)
+from whombat.api.io.aoef.sound_events import import_sound_events
+from whombat.api.io.aoef.staging import (
+    DEFAULT_BATCH_SIZE,
+    AOEFStage,
+    ImportProgress,
+    ProgressCallback,
+    commit_batch,
+    stage_aoef_document,
 )
-from whombat.api.io.aoef.sound_events import get_sound_events
 from whombat.api.io.aoef.tags import import_tags
 from whombat.api.io.aoef.users import import_users
 
+_MODEL_RUN_KEYS = [
+    "sound_events",
+    "clip_predictions",
+    "sound_event_predictions",
+]
+
 
 async def import_model_run(
     session: AsyncSession,
     src: Path | BinaryIO | str,
     audio_dir: Path,
     base_audio_dir: Path,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    on_progress: ProgressCallback | None = None,
 ) -> models.ModelRun:
-    """Import model run."""
-    if isinstance(src, (Path, str)):
-        with open(src, "r") as file:
-            data = json.load(file)
-    else:
-        data = json.loads(src.read())
-
-    if not isinstance(data, dict):
-        raise TypeError(f"Expected dict, got {type(data)}")
+    """Import model run.
+
+    The file is read incrementally and its predictions are imported in
+    batches of `batch_size`, committing the session after each batch.
+    Importing the same file again skips the objects that were already
+    imported.
+    """
+    with AOEFStage() as stage:
+        data = await asyncio.to_thread(
+            stage_aoef_document,
+            src,
+            stage,
+            keys=_MODEL_RUN_KEYS,
+        )
 
-    if "data" not in data:
-        raise ValueError("Missing 'data' key")
+        if "data" not in data:
+            raise ValueError("Missing 'data' key")
 
-    obj = ModelRunObject.model_validate(data["data"])
+        obj = ModelRunObject.model_validate(data["data"])
 
-    model_run = await get_or_create_model_run(session, obj)
+        model_run = await get_or_create_model_run(session, obj)
+        tags = await import_tags(session, obj.tags or [])
+        await import_users(session, obj.users or [])
+        await session.commit()
 
-    tags = await import_tags(session, obj.tags or [])
-    users = await import_users(session, obj.users or [])
-    feature_names = await get_feature_names(
-        session,
-        obj,
-    )
-    recordings = await get_recordings(
-        session,
-        obj,
-        tags=tags,
-        users=users,
-        feature_names=feature_names,
-        audio_dir=audio_dir,
-        base_audio_dir=base_audio_dir,
-        should_import=False,
-    )
-    clips = await get_clips(
-        session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
-        should_import=False,
-    )
-    sound_events = await get_sound_events(
-        session,
-        obj,
-        recordings=recordings,
-        feature_names=feature_names,
-    )
-    clip_predictions = await get_clip_predictions(
-        session,
-        obj,
-        clips=clips,
-        tags=tags,
-    )
-    await get_sound_event_predictions(
-        session,
-        obj,
-        sound_events=sound_events,
-        clip_predictions=clip_predictions,
-        tags=tags,
-    )
+        progress = ImportProgress(
+            totals={key: stage.count(key) for key in _MODEL_RUN_KEYS}
+        )
 
-    await _create_model_run_predictions(
-        session,
-        obj,
-        model_run,
-        clip_predictions,
-    )
+        for sound_events in stage.iter_batches(
+            "sound_events",
+            SoundEventObject,
+            batch_size,
+        ):
+            recordings = await stage.get_ids(
+                session,
+                "recordings",
+                models.Recording,
+                {sound_event.recording for sound_event in sound_events},
+            )
+            mapping = await import_sound_events(
+                session,
+                sound_events,
+                recordings=recordings,
+                feature_names=await get_batch_feature_names(
+                    session,
+                    sound_events,
+                ),
+            )
+            stage.set_ids("sound_events", mapping)
+            await commit_batch(
+                session,
+                progress,
+                "sound_events",
+                len(sound_events),
+                on_progress,
+            )
+
+        for clip_predictions in stage.iter_batches(
+            "clip_predictions",
+            ClipPredictionsObject,
+            batch_size,
+        ):
+            clips = await stage.get_ids(
+                session,
+                "clips",
+                models.Clip,
+                {clip_prediction.clip for clip_prediction in clip_predictions},
+            )
+            mapping = await import_clip_predictions(
+                session,
+                clip_predictions,
+                clips=clips,
+                tags=tags,
+            )
+            stage.set_ids("clip_predictions", mapping)
+            await _create_model_run_predictions(
+                session,
+                clip_predictions,
+                model_run,
+                mapping,
+            )
+            await commit_batch(
+                session,
+                progress,
+                "clip_predictions",
+                len(clip_predictions),
+                on_progress,
+            )
+
+        for sound_event_predictions in stage.iter_batches(
+            "sound_event_predictions",
+            SoundEventPredictionObject,
+            batch_size,
+        ):
+            parents = stage.get_parents(
+                "sound_event_predictions",
+                {prediction.uuid for prediction in sound_event_predictions},
+            )
+            children = [
+                prediction
+                for prediction in sound_event_predictions
+                if prediction.uuid in parents
+            ]
+            await import_sound_event_predictions(
+                session,
+                children,
+                [parents[prediction.uuid] for prediction in children],
+                sound_events=await stage.get_ids(
+                    session,
+                    "sound_events",
+                    models.SoundEvent,
+                    {prediction.sound_event for prediction in children},
+                ),
+                clip_predictions=await stage.get_ids(
+                    session,
+                    "clip_predictions",
+                    models.ClipPrediction,
+                    set(parents.values()),
+                ),
+                tags=tags,
+            )
+            await commit_batch(
+                session,
+                progress,
+                "sound_event_predictions",
+                len(sound_event_predictions),
+                on_progress,
+            )
 
     return model_run
 
@@ -121,17 +204,16 @@ async def get_or_create_model_run(
 
 async def _create_model_run_predictions(
     session: AsyncSession,
-    obj: ModelRunObject,
+    clip_predictions: list[ClipPredictionsObject],
     model_run: models.ModelRun,
-    clip_predictions: dict[UUID, int],
+    mapping: dict[UUID, int],
 ):
-    evalset_clip_predictions = obj.clip_predictions or []
-    if not evalset_clip_predictions:
+    if not clip_predictions:
         return
 
     values = []
-    for clip_prediction in evalset_clip_predictions:
-        clip_prediction_db_id = clip_predictions.get(clip_prediction.uuid)
+    for clip_prediction in clip_predictions:
+        clip_prediction_db_id = mapping.get(clip_prediction.uuid)
 
         if not clip_prediction_db_id:
             continue
@@ -147,26 +229,12 @@ async def _create_model_run_predictions(
     if not values:
         return
 
-    stmt = select(
-        models.ModelRunPrediction.model_run_id,
-        models.ModelRunPrediction.clip_prediction_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.ModelRunPrediction,
+        values,
+        keys=[
             models.ModelRunPrediction.model_run_id,
             models.ModelRunPrediction.clip_prediction_id,
-        ).in_({(v["model_run_id"], v["clip_prediction_id"]) for v in values})
+        ],
     )
-    result = await session.execute(stmt)
-    existing = set(result.all())
-
-    missing = [
-        v
-        for v in values
-        if (v["model_run_id"], v["clip_prediction_id"]) not in existing
-    ]
-
-    if not missing:
-        return
-
-    stmt = insert(models.ModelRunPrediction)
-    await session.execute(stmt, missing)
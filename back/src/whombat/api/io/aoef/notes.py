@@ -4,7 +4,7 @@ from soundevent.io.aoef.note import NoteObject
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
-from whombat.api.common import create_objects_without_duplicates
+from whombat.api.common import upsert_objects
 
 
 async def import_notes(
@@ -38,11 +38,10 @@ async def import_notes(
 
         values.append(value)
 
-    db_notes = await create_objects_without_duplicates(
+    return await upsert_objects(
         session,
         models.Note,
         values,
-        key=lambda x: x["uuid"],
-        key_column=models.Note.uuid,
+        keys=[models.Note.uuid],
+        returning=models.Note.id,
     )
-    return {note.uuid: note.id for note in db_notes}
@@ -9,11 +9,11 @@ from soundevent.io.aoef import (
     PredictionSetObject,
 )
 from soundevent.io.aoef.recording import RecordingObject
-from sqlalchemy import select, tuple_
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
-from whombat.api.common import create_objects_without_duplicates
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 from whombat.api.io.aoef.notes import import_notes
 
@@ -244,14 +244,13 @@ async def _create_recordings(
         }
         for rec in recordings
     ]
-    recs = await create_objects_without_duplicates(
+    return await upsert_objects(
         session,
         models.Recording,
         values,
-        key=lambda x: x["uuid"],
-        key_column=models.Recording.uuid,
+        keys=[models.Recording.uuid],
+        returning=models.Recording.id,
     )
-    return {rec.uuid: rec.id for rec in recs}
 
 
 async def _create_recording_tags(
@@ -281,14 +280,11 @@ async def _create_recording_tags(
 
             values.append({"recording_id": rec_db_id, "tag_id": tag_db_id})
 
-    await create_objects_without_duplicates(
+    await upsert_objects(
         session,
         models.RecordingTag,
         values,
-        key=lambda x: (x["recording_id"], x["tag_id"]),
-        key_column=tuple_(
-            models.RecordingTag.recording_id, models.RecordingTag.tag_id
-        ),
+        keys=[models.RecordingTag.recording_id, models.RecordingTag.tag_id],
     )
 
 
@@ -325,15 +321,11 @@ async def _create_recording_notes(
 
             values.append({"recording_id": rec_db_id, "note_id": note_db_id})
 
-    await create_objects_without_duplicates(
+    await upsert_objects(
         session,
         models.RecordingNote,
         values,
-        key=lambda x: (x["recording_id"], x["note_id"]),
-        key_column=tuple_(
-            models.RecordingNote.recording_id,
-            models.RecordingNote.note_id,
-        ),
+        keys=[models.RecordingNote.recording_id, models.RecordingNote.note_id],
     )
 
 
@@ -369,15 +361,14 @@ async def _create_recording_features(
                 }
             )
 
-    await create_objects_without_duplicates(
+    await upsert_objects(
         session,
         models.RecordingFeature,
         values,
-        key=lambda x: (x["recording_id"], x["feature_name_id"]),
-        key_column=tuple_(
+        keys=[
             models.RecordingFeature.recording_id,
             models.RecordingFeature.feature_name_id,
-        ),
+        ],
     )
 
 
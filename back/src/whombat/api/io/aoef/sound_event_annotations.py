@@ -6,7 +6,6 @@ from soundevent.io.aoef.clip_annotations import ClipAnnotationsObject
 from soundevent.io.aoef.sound_event_annotation import (
     SoundEventAnnotationObject,
 )
-from sqlalchemy import bindparam, insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
@@ -183,14 +182,12 @@ async def _create_sound_event_annotations(
     if not values:
         return mapping
 
-    stmt = insert(models.SoundEventAnnotation)
-    await session.execute(stmt, values)
-
-    # Get the IDs of the newly created annotations.
-    created = await get_mapping(
+    created = await common.upsert_objects(
         session,
-        {v["uuid"] for v in values},
         models.SoundEventAnnotation,
+        values,
+        keys=[models.SoundEventAnnotation.uuid],
+        returning=models.SoundEventAnnotation.id,
     )
     mapping.update(created)
 
@@ -236,8 +233,15 @@ async def _create_sound_event_notes(
     if not values:
         return
 
-    stmt = insert(models.SoundEventAnnotationNote)
-    await session.execute(stmt, values)
+    await common.upsert_objects(
+        session,
+        models.SoundEventAnnotationNote,
+        values,
+        keys=[
+            models.SoundEventAnnotationNote.sound_event_annotation_id,
+            models.SoundEventAnnotationNote.note_id,
+        ],
+    )
 
 
 async def _create_sound_event_annotation_tags(
@@ -268,8 +272,6 @@ async def _create_sound_event_annotation_tags(
 
             dedups.add((annotation_db_id, tag_db_id))
 
-            print(annotation)
-
             values.append(
                 {
                     "sound_event_annotation_id": annotation_db_id,
@@ -283,32 +285,15 @@ async def _create_sound_event_annotation_tags(
     if not values:
         return
 
-    result = await common.select_batched(
+    await common.upsert_objects(
         session,
-        statement=select(
+        models.SoundEventAnnotationTag,
+        values,
+        keys=[
             models.SoundEventAnnotationTag.sound_event_annotation_id,
             models.SoundEventAnnotationTag.tag_id,
-        ).where(
-            tuple_(
-                models.SoundEventAnnotationTag.sound_event_annotation_id,
-                models.SoundEventAnnotationTag.tag_id,
-            ).in_(bindparam("values"))
-        ),
-        values=[(v["sound_event_annotation_id"], v["tag_id"]) for v in values],
-    )
-
-    missing = [
-        v
-        for v in values
-        if (v["sound_event_annotation_id"], v["tag_id"]) not in result
-    ]
-    if not missing:
-        return
-
-    await common.insert_batched(
-        session,
-        model=models.SoundEventAnnotationTag,
-        values=missing,
+            models.SoundEventAnnotationTag.created_by_id,
+        ],
     )
 
 
@@ -4,10 +4,10 @@ from uuid import UUID
 from soundevent.io.aoef import EvaluationObject
 from soundevent.io.aoef.clip_evaluation import ClipEvaluationObject
 from soundevent.io.aoef.match import MatchObject
-from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 from whombat.api.io.aoef.features import import_feature_names
 
@@ -91,26 +91,12 @@ async def _create_sound_event_evaluations(
     sound_event_predictions: dict[UUID, int],
     sound_event_annotations: dict[UUID, int],
 ) -> dict[UUID, int]:
-    # Get existing by UUID
-    mapping = await get_mapping(
-        session,
-        {match.uuid for match in matches},
-        models.SoundEventEvaluation,
-    )
-
-    missing = [
-        (match, eval_uuid)
-        for match, eval_uuid in zip(
-            matches, clip_evaluation_uuids, strict=False
-        )
-        if match.uuid not in mapping
-    ]
-
-    if not missing:
-        return mapping
-
     values = []
-    for match, eval_uuid in missing:
+    for match, eval_uuid in zip(
+        matches,
+        clip_evaluation_uuids,
+        strict=False,
+    ):
         source_id = (
             None
             if not match.source
@@ -138,19 +124,13 @@ async def _create_sound_event_evaluations(
             }
         )
 
-    if not values:
-        return mapping
-
-    stmt = insert(models.SoundEventEvaluation)
-    await session.execute(stmt, values)
-
-    created = await get_mapping(
+    return await upsert_objects(
         session,
-        {v["uuid"] for v in values},
         models.SoundEventEvaluation,
+        values,
+        keys=[models.SoundEventEvaluation.uuid],
+        returning=models.SoundEventEvaluation.id,
     )
-    mapping.update(created)
-    return mapping
 
 
 async def _create_sound_event_evaluation_metrics(
@@ -192,33 +172,15 @@ async def _create_sound_event_evaluation_metrics(
         for v in values
     ]
 
-    stmt = select(
-        models.SoundEventEvaluationMetric.sound_event_evaluation_id,
-        models.SoundEventEvaluationMetric.feature_name_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.SoundEventEvaluationMetric,
+        values,
+        keys=[
             models.SoundEventEvaluationMetric.sound_event_evaluation_id,
             models.SoundEventEvaluationMetric.feature_name_id,
-        ).in_(
-            (v["sound_event_evaluation_id"], v["feature_name_id"])
-            for v in values
-        )
+        ],
     )
-    results = await session.execute(stmt)
-    existing = {(r[0], r[1]) for r in results.scalars().all()}
-
-    missing = [
-        v
-        for v in values
-        if (v["sound_event_evaluation_id"], v["feature_name_id"])
-        not in existing
-    ]
-
-    if not missing:
-        return
-
-    stmt = insert(models.SoundEventEvaluationMetric)
-    await session.execute(stmt, missing)
 
 
 def get_clip_evaluation_uuids(
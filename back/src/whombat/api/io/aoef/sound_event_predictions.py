@@ -6,10 +6,10 @@ from soundevent.io.aoef.clip_predictions import ClipPredictionsObject
 from soundevent.io.aoef.sound_event_prediction import (
     SoundEventPredictionObject,
 )
-from sqlalchemy import insert, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
+from whombat.api.common import upsert_objects
 from whombat.api.io.aoef.common import get_mapping
 
 
@@ -100,25 +100,12 @@ async def _create_sound_event_predictions(
     sound_events: dict[UUID, int],
     clip_predictions: dict[UUID, int],
 ) -> dict[UUID, int]:
-    # Get existing by UUID
-    mapping = await get_mapping(
-        session,
-        {s.uuid for s in sound_events_predictions},
-        models.SoundEventPrediction,
-    )
-
-    missing = [
-        (s, ca_uuid)
-        for s, ca_uuid in zip(
-            sound_events_predictions, clip_prediction_uuids, strict=False
-        )
-        if s.uuid not in mapping
-    ]
-    if not missing:
-        return mapping
-
     values = []
-    for prediction, clip_prediction_uuid in missing:
+    for prediction, clip_prediction_uuid in zip(
+        sound_events_predictions,
+        clip_prediction_uuids,
+        strict=False,
+    ):
         sound_event_db_id = sound_events.get(prediction.sound_event)
         if sound_event_db_id is None:
             # Skip predictions that do not have a sound event.
@@ -139,22 +126,13 @@ async def _create_sound_event_predictions(
             }
         )
 
-    # If values is empty, then all possilbe predictions already exist in the
-    # database.
-    if not values:
-        return mapping
-
-    stmt = insert(models.SoundEventPrediction)
-    await session.execute(stmt, values)
-
-    # Get the IDs of the newly created predictions.
-    created = await get_mapping(
+    return await upsert_objects(
         session,
-        {v["uuid"] for v in values},
         models.SoundEventPrediction,
+        values,
+        keys=[models.SoundEventPrediction.uuid],
+        returning=models.SoundEventPrediction.id,
     )
-    mapping.update(created)
-    return mapping
 
 
 async def _create_sound_event_prediction_tags(
@@ -190,29 +168,15 @@ async def _create_sound_event_prediction_tags(
     if not values:
         return
 
-    stmt = select(
-        models.SoundEventPredictionTag.sound_event_prediction_id,
-        models.SoundEventPredictionTag.tag_id,
-    ).where(
-        tuple_(
+    await upsert_objects(
+        session,
+        models.SoundEventPredictionTag,
+        values,
+        keys=[
             models.SoundEventPredictionTag.sound_event_prediction_id,
             models.SoundEventPredictionTag.tag_id,
-        ).in_({(v["sound_event_prediction_id"], v["tag_id"]) for v in values})
+        ],
     )
-    result = await session.execute(stmt)
-    existing = set(result.all())
-
-    missing = [
-        v
-        for v in values
-        if (v["sound_event_prediction_id"], v["tag_id"]) not in existing
-    ]
-
-    if not missing:
-        return
-
-    stmt = insert(models.SoundEventPredictionTag)
-    await session.execute(stmt, values)
 
 
 def get_clip_predictions_uuids(
@@ -1,19 +1,20 @@
 import datetime
 from uuid import UUID
 
-from soundevent.geometry import compute_geometric_features
 from soundevent.io.aoef import (
     AnnotationSetObject,
     EvaluationObject,
     PredictionSetObject,
 )
 from soundevent.io.aoef.sound_event import SoundEventObject
-from sqlalchemy import bindparam, select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models
 from whombat.api import common
+from whombat.api.geometric_features import compute_geometric_features
 from whombat.api.io.aoef.common import get_mapping
+from whombat.api.io.aoef.features import import_feature_names
+from whombat.models.sound_event import compute_geometry_bounds
 
 
 async def get_sound_events(
@@ -62,6 +63,9 @@ async def import_sound_events(
             "recording_id": recordings[sound_events.recording],
             "geometry_type": sound_events.geometry.type,
             "geometry": sound_events.geometry,
+            # NOTE: Bounds are only computed automatically for model
+            # instances, so bulk inserted rows must include them.
+            **compute_geometry_bounds(sound_events.geometry),
         }
         for sound_events in sound_events
         # Do not import sound events without geometry
@@ -70,25 +74,17 @@ async def import_sound_events(
         if sound_events.recording in recordings
     ]
 
-    await common.create_objects_without_duplicates(
-        session=session,
-        model=models.SoundEvent,
-        data=values,
-        key=lambda x: x["uuid"],
-        key_column=models.SoundEvent.uuid,
-    )
-
-    # Get existing sound events by UUID
-    result = await common.select_batched(
+    mapping = await common.upsert_objects(
         session,
-        statement=select(models.SoundEvent.id, models.SoundEvent.uuid).where(
-            models.SoundEvent.uuid.in_(bindparam("uuid"))
-        ),
-        parameter="uuid",
-        values=list({s.uuid for s in sound_events}),
+        models.SoundEvent,
+        values,
+        keys=[models.SoundEvent.uuid],
+        returning=models.SoundEvent.id,
     )
 
-    mapping = {r[1]: r[0] for r in result}
+    unmapped = {s.uuid for s in sound_events if s.uuid not in mapping}
+    if unmapped:
+        mapping.update(await get_mapping(session, unmapped, models.SoundEvent))
 
     # Create sound event features
     await _create_sound_event_features(
@@ -107,66 +103,51 @@ async def _create_sound_event_features(
     mapping: dict[UUID, int],
     feature_names: dict[str, int],
 ) -> None:
-    values = []
-    for sound_event in sound_events:
-        if sound_event.geometry is None:
-            continue
-
-        sound_event_db_id = mapping.get(sound_event.uuid)
-        if sound_event_db_id is None:
-            continue
-
-        # Recompute the geometric features to ensure they are up-to-date.
-        geometric_features = compute_geometric_features(sound_event.geometry)
-
-        features = {}
-        if sound_event.features:
-            features.update(sound_event.features)
+    imported = [
+        (mapping[sound_event.uuid], sound_event)
+        for sound_event in sound_events
+        if sound_event.geometry is not None and sound_event.uuid in mapping
+    ]
 
-        for feature in geometric_features:
-            features[feature.name] = feature.value
+    # Recompute the geometric features to ensure they are up-to-date.
+    geometric_features = compute_geometric_features(
+        [sound_event.geometry for _, sound_event in imported]  # type: ignore
+    )
+    missing = [
+        name for name in geometric_features.names if name not in feature_names
+    ]
+    if missing:
+        feature_names = {
+            **feature_names,
+            **await import_feature_names(session, missing),
+        }
 
-        for name, value in features.items():
-            feature_name_db_id = feature_names.get(name)
+    features: dict[tuple[int, str], float] = {}
+    for sound_event_db_id, sound_event in imported:
+        for name, value in (sound_event.features or {}).items():
+            features[(sound_event_db_id, name)] = value
 
-            if feature_name_db_id is None:
-                continue
+    for index, name, value in geometric_features.items():
+        features[(imported[index][0], name)] = value
 
-            values.append(
-                {
-                    "sound_event_id": sound_event_db_id,
-                    "feature_name_id": feature_name_db_id,
-                    "value": value,
-                    "created_on": datetime.datetime.now(),
-                }
-            )
+    now = datetime.datetime.now()
+    values = [
+        {
+            "sound_event_id": sound_event_db_id,
+            "feature_name_id": feature_names[name],
+            "value": value,
+            "created_on": now,
+        }
+        for (sound_event_db_id, name), value in features.items()
+        if name in feature_names
+    ]
 
-    result = await common.select_batched(
+    await common.upsert_objects(
         session,
-        statement=select(
+        models.SoundEventFeature,
+        values,
+        keys=[
             models.SoundEventFeature.sound_event_id,
             models.SoundEventFeature.feature_name_id,
-        ).where(
-            tuple_(
-                models.SoundEventFeature.sound_event_id,
-                models.SoundEventFeature.feature_name_id,
-            ).in_(bindparam("values"))
-        ),
-        parameter="values",
-        values=[(v["sound_event_id"], v["feature_name_id"]) for v in values],
-    )
-
-    existing = set(result)
-    missing = [
-        v
-        for v in values
-        if (v["sound_event_id"], v["feature_name_id"]) not in existing
-    ]
-    if not missing:
-        return
-
-    await common.insert_batched(
-        session,
-        model=models.SoundEventFeature,
-        values=missing,
+        ],
     )
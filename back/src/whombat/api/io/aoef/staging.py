@@ -0,0 +1,569 @@
+"""Incremental reading of AOEF files.
+
+AOEF files of large collections can hold millions of objects, and
+parsing them into a single Pydantic model needs several times the size
+of the file in memory. Instead, the large arrays of the document are
+read one element at a time and staged in a temporary SQLite database on
+disk, while the rest of the document is parsed as usual.
+
+Staged objects can then be imported in batches and in dependency order,
+regardless of the order in which the arrays appear in the file. While
+staging, the references from parent objects to their children (e.g. the
+sound event annotations of a clip annotation) are indexed, so that the
+parent of a child can be found when the child is imported.
+"""
+
+import codecs
+import json
+import re
+import sqlite3
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Collection,
+    Iterable,
+    Iterator,
+    TypeVar,
+)
+from uuid import UUID
+
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import exceptions, models
+from whombat.api.io.aoef.common import get_mapping
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "STAGED_KEYS",
+    "AOEFStage",
+    "ImportProgress",
+    "ProgressCallback",
+    "commit_batch",
+    "stage_aoef_document",
+]
+
+DEFAULT_BATCH_SIZE = 1000
+"""Number of staged objects imported at a time."""
+
+_LIST_ADAPTERS: dict[type[BaseModel], TypeAdapter[Any]] = {}
+"""Adapters that validate lists of staged objects, by object model."""
+
+STAGED_KEYS = frozenset(
+    {
+        "recordings",
+        "clips",
+        "sound_events",
+        "clip_annotations",
+        "sound_event_annotations",
+        "tasks",
+        "clip_predictions",
+        "sound_event_predictions",
+    }
+)
+"""Arrays of the AOEF data that are staged instead of parsed in memory."""
+
+_LINKS: dict[str, list[tuple[str, str]]] = {
+    "clip_annotations": [
+        ("sound_events", "sound_event_annotations"),
+        ("clip", "clips"),
+    ],
+    "clip_predictions": [
+        ("sound_events", "sound_event_predictions"),
+    ],
+}
+"""Fields of staged objects that reference other objects.
+
+For each collection, the field that holds the references and the
+collection of the referenced objects.
+"""
+
+_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+M = TypeVar("M", bound=BaseModel)
+
+
+@dataclass
+class ImportProgress:
+    """Progress of the import of a staged AOEF file."""
+
+    totals: dict[str, int] = field(default_factory=dict)
+    """Number of staged objects of each collection."""
+
+    imported: dict[str, int] = field(default_factory=dict)
+    """Number of objects of each collection processed so far."""
+
+    @property
+    def total(self) -> int:
+        """Total number of staged objects."""
+        return sum(self.totals.values())
+
+    @property
+    def processed(self) -> int:
+        """Number of staged objects processed so far."""
+        return sum(self.imported.values())
+
+
+ProgressCallback = Callable[[ImportProgress], None]
+"""Function called with the progress after each imported batch."""
+
+
+class AOEFStage:
+    """Temporary on-disk storage of the objects of an AOEF file.
+
+    The storage is deleted when the stage is closed.
+    """
+
+    def __init__(self):
+        # NOTE: An empty filename creates a private database in a
+        # temporary file that is deleted when the connection is closed.
+        # The stage can be filled from a worker thread.
+        self._db = sqlite3.connect("", check_same_thread=False)
+        self._db.executescript(
+            """
+            CREATE TABLE objects (
+                id INTEGER PRIMARY KEY,
+                key TEXT NOT NULL,
+                body TEXT NOT NULL
+            );
+            CREATE INDEX objects_key ON objects (key, id);
+            CREATE TABLE links (
+                key TEXT NOT NULL,
+                child TEXT NOT NULL,
+                parent TEXT NOT NULL,
+                PRIMARY KEY (key, child)
+            ) WITHOUT ROWID;
+            CREATE TABLE ids (
+                key TEXT NOT NULL,
+                uuid TEXT NOT NULL,
+                id INTEGER NOT NULL,
+                PRIMARY KEY (key, uuid)
+            ) WITHOUT ROWID;
+            """
+        )
+        self._objects: list[tuple[str, str]] = []
+        self._links: list[tuple[str, str, str]] = []
+
+    def __enter__(self) -> "AOEFStage":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the stage and delete its storage."""
+        self._db.close()
+
+    def add(self, key: str, obj: Any, body: str) -> None:
+        """Stage an object of a collection.
+
+        Parameters
+        ----------
+        key
+            The collection of the object, i.e. the key of its array in
+            the AOEF data.
+        obj
+            The decoded object.
+        body
+            The JSON text of the object.
+        """
+        self._objects.append((key, body))
+
+        if isinstance(obj, dict):
+            parent = obj.get("uuid")
+            for name, child_key in _LINKS.get(key, []):
+                children = obj.get(name)
+                if not isinstance(children, list):
+                    children = [children]
+
+                for child in children:
+                    if parent is not None and child is not None:
+                        self._links.append(
+                            (child_key, _normalize(child), _normalize(parent))
+                        )
+
+        if len(self._objects) >= DEFAULT_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending objects to the storage."""
+        self._db.executemany(
+            "INSERT INTO objects (key, body) VALUES (?, ?)",
+            self._objects,
+        )
+        # NOTE: Later references replace earlier ones, as when the
+        # mapping is built in memory.
+        self._db.executemany(
+            "INSERT OR REPLACE INTO links (key, child, parent) "
+            "VALUES (?, ?, ?)",
+            self._links,
+        )
+        self._objects.clear()
+        self._links.clear()
+
+    def count(self, key: str) -> int:
+        """Count the staged objects of a collection."""
+        self.flush()
+        cursor = self._db.execute(
+            "SELECT count(*) FROM objects WHERE key = ?",
+            (key,),
+        )
+        return cursor.fetchone()[0]
+
+    def iter_batches(
+        self,
+        key: str,
+        model: type[M],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> Iterator[list[M]]:
+        """Iterate over the staged objects of a collection in batches.
+
+        Objects are returned in the order in which they appear in the
+        file.
+
+        Raises
+        ------
+        exceptions.DataFormatError
+            If a staged object is not valid.
+        """
+        self.flush()
+        adapter = _get_list_adapter(model)
+        last_id = 0
+        while True:
+            rows = self._db.execute(
+                "SELECT id, body FROM objects WHERE key = ? AND id > ? "
+                "ORDER BY id LIMIT ?",
+                (key, last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+
+            last_id = rows[-1][0]
+            content = "[" + ",".join(body for _, body in rows) + "]"
+            try:
+                batch = adapter.validate_json(content)
+            except ValidationError as error:
+                raise exceptions.DataFormatError(
+                    message=(
+                        f"Invalid object in '{key}'. "
+                        "Expected a JSON file in AOEF format."
+                    ),
+                    format="aoef",
+                    details=str(error),
+                ) from error
+
+            yield batch
+
+    def get_parents(self, key: str, uuids: Iterable[UUID]) -> dict[UUID, UUID]:
+        """Get the objects that reference the given objects.
+
+        Parameters
+        ----------
+        key
+            The collection of the referenced objects.
+        uuids
+            The UUIDs of the referenced objects.
+
+        Returns
+        -------
+        dict[UUID, UUID]
+            The UUID of the referencing object of each referenced object.
+        """
+        self.flush()
+        return {
+            UUID(child): UUID(parent)
+            for child, parent in self._select(
+                "SELECT child, parent FROM links "
+                "WHERE key = ? AND child IN ({})",
+                key,
+                uuids,
+            )
+        }
+
+    def set_ids(self, key: str, mapping: dict[UUID, int]) -> None:
+        """Remember the database ids of imported objects."""
+        self._db.executemany(
+            "INSERT OR REPLACE INTO ids (key, uuid, id) VALUES (?, ?, ?)",
+            [(key, str(uuid), db_id) for uuid, db_id in mapping.items()],
+        )
+
+    async def get_ids(
+        self,
+        session: AsyncSession,
+        key: str,
+        model: type[models.Base],
+        uuids: Iterable[UUID],
+    ) -> dict[UUID, int]:
+        """Get the database ids of objects.
+
+        Objects imported from this stage are mapped to the ids they were
+        imported with, which might belong to an existing object with a
+        different UUID. Any other object is looked up in the database.
+        """
+        uuids = set(uuids)
+        mapping = {
+            UUID(uuid): db_id
+            for uuid, db_id in self._select(
+                "SELECT uuid, id FROM ids WHERE key = ? AND uuid IN ({})",
+                key,
+                uuids,
+            )
+        }
+        missing = uuids - mapping.keys()
+        if missing:
+            mapping.update(await get_mapping(session, missing, model))
+        return mapping
+
+    def _select(
+        self,
+        query: str,
+        key: str,
+        uuids: Iterable[UUID],
+    ) -> list[tuple[Any, Any]]:
+        values = [str(uuid) for uuid in uuids]
+        rows = []
+        # NOTE: SQLite limits the number of parameters of a statement.
+        for start in range(0, len(values), 900):
+            chunk = values[start : start + 900]
+            rows.extend(
+                self._db.execute(
+                    query.format(", ".join("?" * len(chunk))),
+                    (key, *chunk),
+                ).fetchall()
+            )
+        return rows
+
+
+def stage_aoef_document(
+    src: Path | BinaryIO | str,
+    stage: AOEFStage,
+    keys: Collection[str] = STAGED_KEYS,
+) -> dict[str, Any]:
+    """Read an AOEF file, staging its large arrays.
+
+    Parameters
+    ----------
+    src
+        The path to the file or a binary file object.
+    stage
+        The stage in which to store the elements of the arrays.
+    keys
+        The arrays to stage, by default all of `STAGED_KEYS`. Other
+        arrays listed in `STAGED_KEYS` are read and discarded.
+
+    Returns
+    -------
+    dict[str, Any]
+        The decoded document, where the arrays of `STAGED_KEYS` are
+        replaced by empty lists.
+
+    Raises
+    ------
+    exceptions.DataFormatError
+        If the file is not a valid JSON document.
+    """
+    with ExitStack() as stack:
+        if isinstance(src, (Path, str)):
+            src = stack.enter_context(open(src, "rb"))
+
+        reader = _JSONReader(src)
+        document: dict[str, Any] = {}
+
+        for key in reader.iter_object():
+            if key != "data" or reader.peek() != "{":
+                document[key], _ = reader.value()
+                continue
+
+            data = document[key] = {}
+            for name in reader.iter_object():
+                if name not in STAGED_KEYS or reader.peek() != "[":
+                    data[name], _ = reader.value()
+                    continue
+
+                data[name] = []
+                for obj, body in reader.iter_array():
+                    if name in keys:
+                        stage.add(name, obj, body)
+
+        reader.end()
+
+    stage.flush()
+    return document
+
+
+async def commit_batch(
+    session: AsyncSession,
+    progress: ImportProgress,
+    key: str,
+    size: int,
+    on_progress: ProgressCallback | None = None,
+) -> None:
+    """Commit an imported batch and report the progress.
+
+    Parameters
+    ----------
+    session
+        SQLAlchemy AsyncSession.
+    progress
+        The progress of the import.
+    key
+        The collection of the imported objects.
+    size
+        The number of objects in the batch.
+    on_progress
+        Function to call with the updated progress, if any.
+    """
+    await session.commit()
+    progress.imported[key] = progress.imported.get(key, 0) + size
+    if on_progress is not None:
+        on_progress(progress)
+
+
+def _get_list_adapter(model: type[M]) -> TypeAdapter[list[M]]:
+    adapter = _LIST_ADAPTERS.get(model)
+    if adapter is None:
+        list_type: Any = list.__class_getitem__(model)
+        adapter = _LIST_ADAPTERS[model] = TypeAdapter(list_type)
+    return adapter
+
+
+def _normalize(value: Any) -> str:
+    try:
+        return str(UUID(str(value)))
+    except ValueError:
+        return str(value)
+
+
+class _JSONReader:
+    """Read a JSON document from a file one value at a time."""
+
+    def __init__(self, file: BinaryIO):
+        self._file = file
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def peek(self) -> str:
+        """Get the next non-whitespace character without consuming it."""
+        while True:
+            match = _WHITESPACE.match(self._buffer, self._pos)
+            self._pos = match.end()  # type: ignore
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+
+            if not self._fill():
+                raise self._error("Unexpected end of file.")
+
+    def value(self) -> tuple[Any, str]:
+        """Read a complete JSON value.
+
+        Returns
+        -------
+        tuple[Any, str]
+            The decoded value and its JSON text.
+        """
+        self.peek()
+        while True:
+            try:
+                obj, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as error:
+                # The value might continue in the next chunk.
+                if self._fill():
+                    continue
+                raise self._error(str(error)) from error
+
+            # A number at the end of the buffer might be incomplete.
+            if end == len(self._buffer) and self._fill():
+                continue
+
+            body = self._buffer[self._pos : end]
+            self._pos = end
+            return obj, body
+
+    def iter_object(self) -> Iterator[str]:
+        """Iterate over the keys of an object.
+
+        The value of each key must be consumed before the next key is
+        requested.
+        """
+        self._expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+
+        while True:
+            key, _ = self.value()
+            if not isinstance(key, str):
+                raise self._error("Expected a string key.")
+
+            self._expect(":")
+            yield key
+
+            if self._separator("}"):
+                return
+
+    def iter_array(self) -> Iterator[tuple[Any, str]]:
+        """Iterate over the elements of an array."""
+        self._expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+
+        while True:
+            yield self.value()
+
+            if self._separator("]"):
+                return
+
+    def end(self) -> None:
+        """Check that nothing but whitespace is left in the file."""
+        try:
+            char = self.peek()
+        except exceptions.DataFormatError:
+            return
+        raise self._error(f"Unexpected '{char}' after the end of the file.")
+
+    def _separator(self, closing: str) -> bool:
+        char = self.peek()
+        self._pos += 1
+        if char == closing:
+            return True
+        if char != ",":
+            raise self._error(f"Expected ',' or '{closing}', got '{char}'.")
+        return False
+
+    def _expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise self._error(f"Expected '{char}', got '{found}'.")
+        self._pos += 1
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+
+        chunk = self._file.read(_CHUNK_SIZE)
+        if isinstance(chunk, str):
+            text = chunk
+        else:
+            text = self._decoder.decode(chunk, final=not chunk)
+
+        self._eof = not chunk
+        self._buffer = self._buffer[self._pos :] + text
+        self._pos = 0
+        return True
+
+    def _error(self, details: str) -> exceptions.DataFormatError:
+        return exceptions.DataFormatError(
+            message="Invalid JSON file. Expected a JSON file in AOEF format.",
+            format="json",
+            details=details,
+        )
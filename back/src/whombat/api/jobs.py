@@ -0,0 +1,311 @@
+"""API functions to interact with background jobs.
+
+Jobs are stored in the database, which acts as the queue shared by the
+application and the workers. The functions in this module change the
+state of a job with conditional updates, so that several workers can
+claim jobs from the same table without running a job twice.
+"""
+
+import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.common import BaseAPI
+
+__all__ = [
+    "JobAPI",
+    "jobs",
+]
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled")
+"""The statuses of jobs that are no longer run."""
+
+
+class JobAPI(
+    BaseAPI[
+        UUID,
+        models.Job,
+        schemas.Job,
+        schemas.JobCreate,
+        schemas.JobUpdate,
+    ]
+):
+    _model = models.Job
+    _schema = schemas.Job
+
+    async def submit(
+        self,
+        session: AsyncSession,
+        kind: str,
+        arguments: dict[str, Any] | None = None,
+        created_by: schemas.SimpleUser | None = None,
+        **kwargs,
+    ) -> schemas.Job:
+        """Submit a job to be run by a worker.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        kind
+            The kind of job to run.
+        arguments
+            The arguments passed to the job handler. They must be JSON
+            serializable.
+        created_by
+            The user who submitted the job, if any.
+        **kwargs
+            Additional keyword arguments to use when creating the job,
+            (e.g. `uuid`).
+
+        Returns
+        -------
+        schemas.Job
+            The pending job.
+        """
+        return await self.create_from_data(
+            session,
+            schemas.JobCreate(
+                kind=kind,
+                arguments=arguments or {},
+                created_by_id=created_by.id if created_by else None,
+            ),
+            **kwargs,
+        )
+
+    async def cancel(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+    ) -> schemas.Job:
+        """Cancel a job.
+
+        Pending jobs are cancelled right away. Running jobs are flagged
+        and stopped by the worker running them, which discards the work
+        of the job that has not been committed yet. Finished jobs are
+        left unchanged.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The job to cancel.
+
+        Returns
+        -------
+        schemas.Job
+            The updated job.
+        """
+        result = await session.execute(
+            update(models.Job)
+            .where(
+                models.Job.id == obj.id,
+                models.Job.status == "pending",
+            )
+            .values(
+                status="cancelled",
+                cancel_requested=True,
+                finished_on=_now(),
+            )
+        )
+
+        if result.rowcount == 0:  # type: ignore
+            await session.execute(
+                update(models.Job)
+                .where(
+                    models.Job.id == obj.id,
+                    models.Job.status == "running",
+                )
+                .values(cancel_requested=True)
+            )
+
+        return await self._refresh(session, obj.id)
+
+    async def claim(
+        self,
+        session: AsyncSession,
+        worker: str,
+    ) -> schemas.Job | None:
+        """Claim the oldest pending job.
+
+        Parameters
+        ----------
+        session
+            The database session to use. Commit it to let other workers
+            know that the job has been claimed.
+        worker
+            The name of the worker claiming the job.
+
+        Returns
+        -------
+        schemas.Job | None
+            The claimed job, now running, or None if there are no pending
+            jobs.
+        """
+        query = (
+            select(models.Job.id)
+            .where(models.Job.status == "pending")
+            .order_by(models.Job.created_on, models.Job.id)
+            .limit(1)
+        )
+
+        while True:
+            job_id = (await session.execute(query)).scalar_one_or_none()
+            if job_id is None:
+                return None
+
+            now = _now()
+            result = await session.execute(
+                update(models.Job)
+                .where(
+                    models.Job.id == job_id,
+                    models.Job.status == "pending",
+                )
+                .values(
+                    status="running",
+                    worker=worker,
+                    started_on=now,
+                    heartbeat_on=now,
+                )
+            )
+
+            # Another worker claimed the job in the meantime.
+            if result.rowcount == 1:  # type: ignore
+                return await self._refresh(session, job_id)
+
+    async def report(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        processed: int,
+        total: int,
+    ) -> bool:
+        """Store the progress of a running job.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The running job.
+        processed
+            The number of items processed so far.
+        total
+            The number of items the job has to process.
+
+        Returns
+        -------
+        bool
+            Whether the cancellation of the job has been requested.
+        """
+        await session.execute(
+            update(models.Job)
+            .where(models.Job.id == obj.id)
+            .values(processed=processed, total=total, heartbeat_on=_now())
+        )
+        query = select(models.Job.cancel_requested).where(
+            models.Job.id == obj.id
+        )
+        return bool((await session.execute(query)).scalar_one())
+
+    async def finish(
+        self,
+        session: AsyncSession,
+        obj: schemas.Job,
+        status: schemas.JobStatus,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+        processed: int | None = None,
+        total: int | None = None,
+    ) -> schemas.Job:
+        """Store the outcome of a job.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        obj
+            The job.
+        status
+            The final status of the job.
+        result
+            The result of the job, if it completed.
+        error
+            The error that stopped the job, if it failed.
+        processed
+            The final number of processed items.
+        total
+            The final number of items to process.
+
+        Returns
+        -------
+        schemas.Job
+            The finished job.
+        """
+        data = schemas.JobUpdate(
+            status=status,
+            result=result,
+            error=error,
+            finished_on=_now(),
+        )
+        if processed is not None:
+            data.processed = processed
+        if total is not None:
+            data.total = total
+        return await self.update(session, obj, data)
+
+    async def fail_stale(
+        self,
+        session: AsyncSession,
+        timeout: float,
+    ) -> int:
+        """Mark running jobs whose worker stopped reporting as failed.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        timeout
+            The number of seconds since the last report after which a
+            running job is considered abandoned.
+
+        Returns
+        -------
+        int
+            The number of jobs marked as failed.
+        """
+        now = _now()
+        result = await session.execute(
+            update(models.Job)
+            .where(
+                models.Job.status == "running",
+                models.Job.heartbeat_on
+                < now - datetime.timedelta(seconds=timeout),
+            )
+            .values(
+                status="failed",
+                error="The worker running the job stopped responding.",
+                finished_on=now,
+            )
+        )
+        return result.rowcount  # type: ignore
+
+    async def _refresh(
+        self,
+        session: AsyncSession,
+        job_id: int,
+    ) -> schemas.Job:
+        obj = await session.get(models.Job, job_id, populate_existing=True)
+        return self._schema.model_validate(obj)
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+jobs = JobAPI()
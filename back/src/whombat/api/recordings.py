@@ -1,11 +1,14 @@
 """API functions for interacting with recordings."""
 
+import asyncio
 import datetime
+import itertools
 import logging
+from dataclasses import dataclass
 from functools import partial
 from multiprocessing import Pool
 from pathlib import Path
-from typing import Sequence
+from typing import AsyncGenerator, Iterable, Iterator, Sequence
 from uuid import UUID
 
 import cachetools
@@ -14,25 +17,43 @@ from soundevent import data
 from soundevent.audio import MediaInfo, compute_md5_checksum, get_media_info
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.features import features
 from whombat.api.notes import notes
 from whombat.api.tags import tags
 from whombat.api.users import users
 from whombat.core import files
-from whombat.core.common import remove_duplicates
 from whombat.system import get_settings
 
 __all__ = [
     "RecordingAPI",
+    "RecordingBatch",
     "recordings",
 ]
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BATCH_SIZE = 500
+"""Number of processed files inserted into the database at a time."""
+
+POOL_CHUNK_SIZE = 8
+"""Number of files sent to a worker process at a time."""
+
+
+@dataclass
+class RecordingBatch:
+    """A batch of files processed while creating many recordings."""
+
+    processed: int
+    """Number of files processed in this batch, including skipped files."""
+
+    recordings: list[schemas.Recording]
+    """Recordings created from the files of this batch."""
+
 
 class RecordingAPI(
     BaseAPI[
@@ -45,6 +66,30 @@ class RecordingAPI(
 ):
     _model = models.Recording
     _schema = schemas.Recording
+    _cache_enabled = True
+    _profiles = {
+        "summary": LoadingProfile(
+            schema=schemas.RecordingSummary,
+            options=(
+                selectinload(models.Recording.tags),
+                raiseload("*"),
+            ),
+        ),
+        "detail": LoadingProfile(
+            schema=schemas.Recording,
+            options=(
+                selectinload(models.Recording.tags),
+                selectinload(models.Recording.features).joinedload(
+                    models.RecordingFeature.feature_name
+                ),
+                selectinload(models.Recording.notes).joinedload(
+                    models.Note.created_by
+                ),
+                selectinload(models.Recording.owners),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     def __init__(self):
         super().__init__()
@@ -212,8 +257,10 @@ class RecordingAPI(
     async def create_many(
         self,
         session: AsyncSession,
-        data: Sequence[dict],
+        data: Iterable[dict],
         audio_dir: Path | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        processes: int | None = None,
     ) -> None | Sequence[schemas.Recording]:
         """Create recordings.
 
@@ -230,6 +277,11 @@ class RecordingAPI(
         audio_dir
             The root directory for audio files. If not given, it will
             default to the value of `settings.audio_dir`.
+        batch_size
+            The number of files to insert into the database at a time.
+        processes
+            The number of worker processes used to read the files. By
+            default, the number of CPUs.
 
         Returns
         -------
@@ -245,36 +297,88 @@ class RecordingAPI(
 
         Any files that do not meet these criteria will be silently ignored.
         """
+        created = []
+        async for batch in self.iter_create_many(
+            session,
+            data,
+            audio_dir=audio_dir,
+            batch_size=batch_size,
+            processes=processes,
+        ):
+            created.extend(batch.recordings)
+        return created
+
+    async def iter_create_many(
+        self,
+        session: AsyncSession,
+        data: Iterable[dict],
+        audio_dir: Path | None = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        processes: int | None = None,
+    ) -> AsyncGenerator[RecordingBatch, None]:
+        """Create recordings in batches as their files are processed.
+
+        Hashing and probing the files is done by a pool of worker
+        processes. Results are inserted into the database as soon as
+        `batch_size` files have been processed, so that memory use does not
+        grow with the number of files and the caller can report progress
+        or commit each batch.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        data
+            The data to create the recordings with. It is consumed lazily.
+        audio_dir
+            The root directory for audio files. If not given, it will
+            default to the value of `settings.audio_dir`.
+        batch_size
+            The number of files to insert into the database at a time.
+        processes
+            The number of worker processes used to read the files. By
+            default, the number of CPUs.
+
+        Yields
+        ------
+        RecordingBatch
+            The number of processed files and the created recordings of
+            each batch. Files that are skipped, as described in
+            `create_many`, are counted as processed.
+        """
         if audio_dir is None:
             audio_dir = get_settings().audio_dir
 
-        validated_data = remove_duplicates(
-            [
-                schemas.RecordingCreate.model_validate(recording)
-                for recording in data
-            ],
-            key=lambda x: x.path,
-        )
-
-        with Pool() as pool:
-            results = pool.map_async(
+        with Pool(processes) as pool:
+            results = pool.imap_unordered(
                 partial(_assemble_recording_data, audio_dir=audio_dir),
-                validated_data,
+                _validate_unique(data),
+                chunksize=POOL_CHUNK_SIZE,
             )
-            # NOTE: This will block until all results are ready. Might
-            # want to change this in the future as it could be very
-            # slow for large numbers of files or large files.
-            all_data: list[dict | None] = results.get()
 
-        recordings = await common.create_objects_without_duplicates(
-            session,
-            models.Recording,
-            [rec for rec in all_data if rec is not None],
-            key=lambda recording: recording.get("hash"),
-            key_column=models.Recording.hash,
-        )
+            while True:
+                # NOTE: Waiting for the workers blocks, so it is done in a
+                # thread to keep the event loop responsive.
+                chunk = await asyncio.to_thread(_take, results, batch_size)
+
+                if not chunk:
+                    break
+
+                created = await common.create_objects_without_duplicates(
+                    session,
+                    models.Recording,
+                    [rec for rec in chunk if rec is not None],
+                    key=lambda recording: recording.get("hash"),
+                    key_column=models.Recording.hash,
+                )
 
-        return [schemas.Recording.model_validate(rec) for rec in recordings]
+                yield RecordingBatch(
+                    processed=len(chunk),
+                    recordings=[
+                        schemas.Recording.model_validate(rec)
+                        for rec in created
+                    ],
+                )
 
     async def update(
         self,
@@ -491,6 +595,98 @@ class RecordingAPI(
         self._update_cache(obj)
         return obj
 
+    async def add_tags(
+        self,
+        session: AsyncSession,
+        uuids: Sequence[UUID],
+        tags: Sequence[schemas.Tag],
+        return_objects: bool = False,
+    ) -> schemas.BulkUpdate[schemas.Recording]:
+        """Add several tags to several recordings.
+
+        All tags are added with a single statement. Tags that a recording
+        already has are skipped.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        uuids
+            The UUIDs of the recordings to tag.
+        tags
+            The tags to add.
+        return_objects
+            Whether to load and return the updated recordings.
+
+        Returns
+        -------
+        schemas.BulkUpdate
+            The number of tags added, and the updated recordings if
+            requested.
+        """
+        count = await common.add_tags_to_objects(
+            session,
+            models.Recording,
+            self._get_pks_condition(uuids),
+            [tag.id for tag in tags],
+        )
+        return await self._get_bulk_update(
+            session,
+            uuids,
+            count,
+            return_objects,
+        )
+
+    async def add_features(
+        self,
+        session: AsyncSession,
+        uuids: Sequence[UUID],
+        new_features: Sequence[schemas.Feature],
+        return_objects: bool = False,
+    ) -> schemas.BulkUpdate[schemas.Recording]:
+        """Add several features to several recordings.
+
+        All features are added with a single statement. Recordings that
+        already have a feature with the same name keep their value.
+
+        Parameters
+        ----------
+        session
+            The database session to use.
+        uuids
+            The UUIDs of the recordings to update.
+        new_features
+            The features to add.
+        return_objects
+            Whether to load and return the updated recordings.
+
+        Returns
+        -------
+        schemas.BulkUpdate
+            The number of features added, and the updated recordings if
+            requested.
+        """
+        values = []
+        for feature in new_features:
+            feature_name = await features.get_or_create(
+                session,
+                feature.name,
+            )
+            values.append((feature_name.id, feature.value))
+
+        count = await common.add_features_to_objects(
+            session,
+            models.Recording,
+            self._get_pks_condition(uuids),
+            values,
+        )
+        return await self._get_bulk_update(
+            session,
+            uuids,
+            count,
+            return_objects,
+        )
+
     async def add_owner(
         self,
         session: AsyncSession,
@@ -930,6 +1126,25 @@ def validate_path(
     return path
 
 
+def _validate_unique(
+    data: Iterable[dict],
+) -> Iterator[schemas.RecordingCreate]:
+    """Validate recording data, skipping repeated paths."""
+    seen = set()
+    for recording in data:
+        validated = schemas.RecordingCreate.model_validate(recording)
+
+        if validated.path in seen:
+            continue
+
+        seen.add(validated.path)
+        yield validated
+
+
+def _take(iterator: Iterator, size: int) -> list:
+    return list(itertools.islice(iterator, size))
+
+
 def _assemble_recording_data(
     data: schemas.RecordingCreate,
     audio_dir: Path,
@@ -0,0 +1,186 @@
+"""Columnar encoding of scatter plot data.
+
+Scatter plots can hold millions of points, too many to send as a JSON
+object per point. The points are instead sent as a stream of frames,
+each holding a batch of points as packed typed arrays. Every frame is
+laid out as:
+
+1. The length of the header in bytes, as a little-endian ``uint32``.
+2. The header, a UTF-8 encoded JSON object with:
+
+   * ``rows``: The number of points in the frame.
+   * ``features``: The names of the features, in the order of the rows
+     of the ``features`` buffer.
+   * ``tags``: The ``[key, value]`` pairs added to the tag dictionary by
+     this frame. The dictionary is shared by all the frames of a stream,
+     so tags are only sent the first time they appear.
+   * ``buffers``: The ``name``, ``dtype`` and ``length`` in bytes of
+     each of the buffers that follow, in order. The ``dtype`` is a NumPy
+     array-protocol type string such as ``"<f4"``.
+
+3. The buffers, starting at the first multiple of 8 bytes after the
+   header and each padded with zeros to a multiple of 8 bytes:
+
+   * ``uuid``: The 16 bytes of the UUID of each point.
+   * ``features``: The feature values as a ``(features, rows)`` array of
+     ``float32``, with ``NaN`` for missing values.
+   * ``tags.offsets`` and ``tags.indices``: The tags of each point,
+     dictionary encoded. The indices into the tag dictionary of the tags
+     of the ``i``-th point are ``indices[offsets[i]:offsets[i + 1]]``.
+   * ``recording_tags.offsets`` and ``recording_tags.indices``: The tags
+     of the recording of each point, encoded in the same way.
+"""
+
+import json
+import struct
+from dataclasses import dataclass, field
+from typing import Hashable, Sequence
+
+import numpy as np
+
+__all__ = [
+    "COLUMNS_MEDIA_TYPE",
+    "ScatterPlotColumns",
+    "TagColumn",
+    "TagDictionary",
+    "encode_columns",
+]
+
+COLUMNS_MEDIA_TYPE = "application/vnd.whombat.columns"
+"""Media type of a stream of columnar frames."""
+
+ALIGNMENT = 8
+
+
+@dataclass
+class TagColumn:
+    """Dictionary-encoded tags of a batch of points."""
+
+    offsets: np.ndarray
+    """Array of ``uint32`` with the start of the tags of each point in
+    ``indices``, followed by the total number of tags."""
+
+    indices: np.ndarray
+    """Array of ``uint32`` with the dictionary index of each tag."""
+
+
+@dataclass
+class TagDictionary:
+    """Tag dictionary shared by all the frames of a stream."""
+
+    indices: dict[Hashable, int] = field(default_factory=dict)
+    """Index of each tag, by its database id."""
+
+    def encode(
+        self,
+        row_ids: np.ndarray,
+        tag_ids: Sequence[Hashable],
+        ids: np.ndarray,
+    ) -> tuple[TagColumn, list[Hashable]]:
+        """Encode the tags of a batch of points.
+
+        Parameters
+        ----------
+        row_ids
+            The id of the point of each tag, sorted.
+        tag_ids
+            The database id of each tag.
+        ids
+            The sorted ids of the points in the batch.
+
+        Returns
+        -------
+        column : TagColumn
+            The encoded tags.
+        new_tags : list
+            The ids of the tags added to the dictionary, in order.
+        """
+        new_tags = []
+        indices = np.empty(len(tag_ids), dtype=np.uint32)
+        for position, tag_id in enumerate(tag_ids):
+            index = self.indices.get(tag_id)
+            if index is None:
+                index = self.indices[tag_id] = len(self.indices)
+                new_tags.append(tag_id)
+            indices[position] = index
+
+        counts = np.bincount(
+            np.searchsorted(ids, row_ids),
+            minlength=len(ids),
+        )
+        offsets = np.zeros(len(ids) + 1, dtype=np.uint32)
+        np.cumsum(counts, out=offsets[1:])
+        return TagColumn(offsets=offsets, indices=indices), new_tags
+
+
+@dataclass
+class ScatterPlotColumns:
+    """Scatter plot data of a batch of points."""
+
+    uuids: np.ndarray
+    """Array of shape (rows, 16) with the bytes of each UUID."""
+
+    feature_names: list[str]
+    """Names of the features."""
+
+    features: np.ndarray
+    """Array of shape (features, rows) with the feature values."""
+
+    tags: TagColumn
+    """Tags of each point."""
+
+    recording_tags: TagColumn
+    """Tags of the recording of each point."""
+
+    new_tags: list[tuple[str, str]]
+    """Key and value of the tags added to the dictionary by this batch."""
+
+    def __len__(self) -> int:
+        return len(self.uuids)
+
+
+def encode_columns(columns: ScatterPlotColumns) -> bytes:
+    """Encode a batch of scatter plot data as a frame."""
+    buffers = [
+        ("uuid", np.ascontiguousarray(columns.uuids, dtype=np.uint8)),
+        (
+            "features",
+            np.ascontiguousarray(columns.features, dtype="<f4"),
+        ),
+        ("tags.offsets", columns.tags.offsets.astype("<u4")),
+        ("tags.indices", columns.tags.indices.astype("<u4")),
+        (
+            "recording_tags.offsets",
+            columns.recording_tags.offsets.astype("<u4"),
+        ),
+        (
+            "recording_tags.indices",
+            columns.recording_tags.indices.astype("<u4"),
+        ),
+    ]
+    header = json.dumps(
+        {
+            "rows": len(columns),
+            "features": columns.feature_names,
+            "tags": [list(tag) for tag in columns.new_tags],
+            "buffers": [
+                {
+                    "name": name,
+                    "dtype": array.dtype.str,
+                    "length": array.nbytes,
+                }
+                for name, array in buffers
+            ],
+        }
+    ).encode()
+
+    parts = [struct.pack("<I", len(header)), header]
+    parts.append(_padding(len(header) + 4))
+    for _, array in buffers:
+        parts.append(array.tobytes())
+        parts.append(_padding(array.nbytes))
+    return b"".join(parts)
+
+
+def _padding(length: int) -> bytes:
+    return b"\x00" * (-length % ALIGNMENT)
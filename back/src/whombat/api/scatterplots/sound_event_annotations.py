@@ -1,15 +1,23 @@
 from collections import defaultdict
-from typing import Sequence
+from typing import AsyncIterator, Sequence
 from uuid import UUID
 
+import numpy as np
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import Select, String, bindparam, case, cast, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import models, schemas
-from whombat.api.common.utils import get_count
+from whombat.api.common.utils import get_count, select_batched
+from whombat.api.scatterplots.columns import (
+    ScatterPlotColumns,
+    TagDictionary,
+)
 from whombat.filters.base import Filter
 
+COLUMNS_BATCH_SIZE = 50_000
+"""Number of annotations in each batch of columnar scatter plot data."""
+
 
 class ScatterPlotData(BaseModel):
     """Data for a scatter plot."""
@@ -122,3 +130,199 @@ async def get_scatterplot_data(
         )
         for ann_id in mapping.keys()
     ], count
+
+
+async def iter_scatterplot_columns(
+    session: AsyncSession,
+    filters: Sequence[Filter] | None = None,
+    feature_names: Sequence[str] | None = None,
+    batch_size: int = COLUMNS_BATCH_SIZE,
+) -> AsyncIterator[ScatterPlotColumns]:
+    """Iterate over the scatter plot data in columnar batches.
+
+    The features of the annotations are pivoted in the database, so that
+    each batch takes one query for the features and one for each kind of
+    tag, regardless of the number of features. Batches are read in order
+    of annotation id, using the last id of each batch as the start of the
+    next one.
+
+    Parameters
+    ----------
+    session
+        The database session.
+    filters
+        Filters to select the annotations.
+    feature_names
+        Names of the features to include. By default, all the features of
+        the selected annotations are included.
+    batch_size
+        The maximum number of annotations in each batch.
+
+    Yields
+    ------
+    ScatterPlotColumns
+        The scatter plot data of each batch of annotations.
+    """
+    annotation = models.SoundEventAnnotation
+    selected = select(annotation.id)
+    for filter in filters or []:
+        selected = filter.filter(selected)
+
+    names = await _get_feature_names(session, selected, feature_names)
+    # NOTE: UUIDs are read as text and converted all at once, since
+    # building a UUID object per row would dominate the reading time.
+    pivot = select(
+        annotation.id,
+        cast(annotation.uuid, String),
+        *[
+            func.max(
+                case(
+                    (
+                        models.SoundEventFeature.feature_name_id == id,
+                        models.SoundEventFeature.value,
+                    )
+                )
+            )
+            for id in names.values()
+        ],
+    ).outerjoin(
+        models.SoundEventFeature,
+        models.SoundEventFeature.sound_event_id == annotation.sound_event_id,
+    )
+    dictionary = TagDictionary()
+
+    # NOTE: Rows are read with Core to skip the processing of the ORM.
+    connection = await session.connection()
+
+    last_id = None
+    while True:
+        if last_id is None:
+            batch = pivot.where(annotation.id.in_(selected))
+        else:
+            batch = pivot.where(
+                annotation.id > last_id,
+                annotation.id.in_(selected.where(annotation.id > last_id)),
+            )
+
+        result = await connection.execute(
+            batch.group_by(annotation.id)
+            .order_by(annotation.id)
+            .limit(batch_size)
+        )
+        rows = result.all()
+        if not rows:
+            return
+
+        ids = np.fromiter((row[0] for row in rows), np.int64, len(rows))
+        last_id = int(ids[-1])
+        in_batch = selected.where(
+            annotation.id.between(int(ids[0]), last_id),
+        )
+
+        tag_rows = await connection.execute(
+            select(
+                models.SoundEventAnnotationTag.sound_event_annotation_id,
+                models.SoundEventAnnotationTag.tag_id,
+            )
+            .where(
+                models.SoundEventAnnotationTag.sound_event_annotation_id.in_(
+                    in_batch
+                )
+            )
+            .order_by(models.SoundEventAnnotationTag.sound_event_annotation_id)
+        )
+        tags, new_tags = _encode_tags(dictionary, tag_rows.all(), ids)
+
+        recording_tag_rows = await connection.execute(
+            select(annotation.id, models.RecordingTag.tag_id)
+            .join(
+                models.SoundEvent,
+                models.SoundEvent.id == annotation.sound_event_id,
+            )
+            .join(
+                models.RecordingTag,
+                models.RecordingTag.recording_id
+                == models.SoundEvent.recording_id,
+            )
+            .where(annotation.id.in_(in_batch))
+            .order_by(annotation.id)
+        )
+        recording_tags, new_recording_tags = _encode_tags(
+            dictionary,
+            recording_tag_rows.all(),
+            ids,
+        )
+
+        yield ScatterPlotColumns(
+            uuids=np.frombuffer(
+                bytes.fromhex(
+                    "".join(row[1] for row in rows).replace("-", "")
+                ),
+                dtype=np.uint8,
+            ).reshape(len(rows), 16),
+            feature_names=list(names),
+            features=np.array(
+                [row[2:] for row in rows],
+                dtype=np.float32,
+            )
+            .reshape(len(rows), len(names))
+            .T,
+            tags=tags,
+            recording_tags=recording_tags,
+            new_tags=await _get_tags(
+                session,
+                [*new_tags, *new_recording_tags],
+            ),
+        )
+
+
+async def _get_feature_names(
+    session: AsyncSession,
+    selected: Select,
+    feature_names: Sequence[str] | None,
+) -> dict[str, int]:
+    query = (
+        select(models.FeatureName.name, models.FeatureName.id)
+        .where(
+            models.FeatureName.id.in_(
+                select(models.SoundEventFeature.feature_name_id)
+                .join(
+                    models.SoundEventAnnotation,
+                    models.SoundEventAnnotation.sound_event_id
+                    == models.SoundEventFeature.sound_event_id,
+                )
+                .where(models.SoundEventAnnotation.id.in_(selected))
+            )
+        )
+        .order_by(models.FeatureName.name)
+    )
+    if feature_names is not None:
+        query = query.where(models.FeatureName.name.in_(feature_names))
+
+    result = await session.execute(query)
+    return {name: id for name, id in result.all()}
+
+
+def _encode_tags(dictionary: TagDictionary, rows: Sequence, ids: np.ndarray):
+    row_ids = np.fromiter((row[0] for row in rows), np.int64, len(rows))
+    return dictionary.encode(row_ids, [row[1] for row in rows], ids)
+
+
+async def _get_tags(
+    session: AsyncSession,
+    tag_ids: Sequence,
+) -> list[tuple[str, str]]:
+    if not tag_ids:
+        return []
+
+    rows = await select_batched(
+        session,
+        select(models.Tag.id, models.Tag.key, models.Tag.value).where(
+            models.Tag.id.in_(bindparam("ids", expanding=True))
+        ),
+        tag_ids,
+        parameter="ids",
+        batch_size=500,
+    )
+    tags = {id: (key, value) for id, key, value in rows}
+    return [tags[id] for id in tag_ids]
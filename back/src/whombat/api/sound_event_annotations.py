@@ -1,19 +1,22 @@
 """Python API for sound event annotations."""
 
 from pathlib import Path
+from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.notes import notes
 from whombat.api.sound_events import sound_events
 from whombat.api.tags import tags
 from whombat.api.users import users
+from whombat.filters.sound_events import get_overlap_conditions
 
 __all__ = [
     "SoundEventAnnotationAPI",
@@ -32,6 +35,33 @@ class SoundEventAnnotationAPI(
 ):
     _model = models.SoundEventAnnotation
     _schema = schemas.SoundEventAnnotation
+    _profiles = {
+        "summary": LoadingProfile(
+            schema=schemas.SoundEventAnnotationSummary,
+            options=(
+                joinedload(models.SoundEventAnnotation.created_by),
+                joinedload(models.SoundEventAnnotation.sound_event).options(
+                    *sound_events.get_profile("detail").options
+                ),
+                selectinload(models.SoundEventAnnotation.tags),
+                raiseload("*"),
+            ),
+        ),
+        "detail": LoadingProfile(
+            schema=schemas.SoundEventAnnotation,
+            options=(
+                joinedload(models.SoundEventAnnotation.created_by),
+                joinedload(models.SoundEventAnnotation.sound_event).options(
+                    *sound_events.get_profile("detail").options
+                ),
+                selectinload(models.SoundEventAnnotation.tags),
+                selectinload(models.SoundEventAnnotation.notes).joinedload(
+                    models.Note.created_by
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
@@ -187,6 +217,52 @@ class SoundEventAnnotationAPI(
         self._update_cache(obj)
         return obj
 
+    async def add_tags(
+        self,
+        session: AsyncSession,
+        uuids: Sequence[UUID],
+        tags: Sequence[schemas.Tag],
+        user: schemas.SimpleUser | None = None,
+        return_objects: bool = False,
+    ) -> schemas.BulkUpdate[schemas.SoundEventAnnotation]:
+        """Add several tags to several sound event annotations.
+
+        All tags are added with a single statement. Tags that an
+        annotation already has are skipped.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        uuids
+            The UUIDs of the sound event annotations to tag.
+        tags
+            The tags to add.
+        user
+            The user adding the tags, by default None
+        return_objects
+            Whether to load and return the updated sound event annotations.
+
+        Returns
+        -------
+        schemas.BulkUpdate
+            The number of tags added, and the updated sound event annotations if
+            requested.
+        """
+        count = await common.add_tags_to_objects(
+            session,
+            models.SoundEventAnnotation,
+            self._get_pks_condition(uuids),
+            [tag.id for tag in tags],
+            created_by_id=user.id if user else None,
+        )
+        return await self._get_bulk_update(
+            session,
+            uuids,
+            count,
+            return_objects,
+        )
+
     async def add_note(
         self,
         session: AsyncSession,
@@ -288,6 +364,67 @@ class SoundEventAnnotationAPI(
         self._update_cache(obj)
         return obj
 
+    async def get_overlapping(
+        self,
+        session: AsyncSession,
+        recording: schemas.Recording,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        low_freq: float | None = None,
+        high_freq: float | None = None,
+        limit: int | None = 1000,
+        offset: int | None = 0,
+    ) -> tuple[Sequence[schemas.SoundEventAnnotation], int]:
+        """Get the annotations of a recording that overlap a region.
+
+        Only the annotations whose sound event overlaps the region are
+        loaded, which is what a view of part of a recording needs.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        recording
+            The recording of the annotated sound events.
+        start_time
+            The start time of the region in seconds.
+        end_time
+            The end time of the region in seconds.
+        low_freq
+            The lowest frequency of the region in Hz.
+        high_freq
+            The highest frequency of the region in Hz.
+        limit
+            The maximum number of annotations to return, by default 1000.
+        offset
+            The offset to use, by default 0.
+
+        Returns
+        -------
+        annotations : list[schemas.SoundEventAnnotation]
+            The overlapping annotations.
+        count : int
+            The total number of overlapping annotations.
+        """
+        return await self.get_many(
+            session,
+            limit=limit,
+            offset=offset,
+            filters=[
+                models.SoundEventAnnotation.sound_event_id.in_(
+                    select(models.SoundEvent.id).where(
+                        models.SoundEvent.recording_id == recording.id,
+                        *get_overlap_conditions(
+                            start_time=start_time,
+                            end_time=end_time,
+                            low_freq=low_freq,
+                            high_freq=high_freq,
+                        ),
+                    )
+                )
+            ],
+        )
+
     async def from_soundevent(
         self,
         session: AsyncSession,
@@ -6,10 +6,11 @@ from uuid import UUID
 from soundevent import data
 from sqlalchemy import and_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.sound_events import sound_events
 from whombat.api.tags import tags
 
@@ -30,6 +31,20 @@ class SoundEventPredictionAPI(
 ):
     _model = models.SoundEventPrediction
     _schema = schemas.SoundEventPrediction
+    _profiles = {
+        "detail": LoadingProfile(
+            schema=schemas.SoundEventPrediction,
+            options=(
+                joinedload(models.SoundEventPrediction.sound_event).options(
+                    *sound_events.get_profile("detail").options
+                ),
+                selectinload(models.SoundEventPrediction.tags).joinedload(
+                    models.SoundEventPredictionTag.tag
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
@@ -5,15 +5,21 @@ from typing import Sequence
 from uuid import UUID
 
 from soundevent import data
-from soundevent.geometry import compute_geometric_features
 from sqlalchemy import and_, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 
 from whombat import exceptions, models, schemas
 from whombat.api import common
-from whombat.api.common import BaseAPI
+from whombat.api.common import BaseAPI, LoadingProfile
 from whombat.api.features import features
+from whombat.api.geometric_features import (
+    GeometricFeatures,
+    compute_geometric_features,
+)
 from whombat.api.recordings import recordings
+from whombat.filters.sound_events import get_overlap_conditions
+from whombat.models.sound_event import compute_geometry_bounds
 
 __all__ = [
     "SoundEventAPI",
@@ -32,6 +38,18 @@ class SoundEventAPI(
 ):
     _model = models.SoundEvent
     _schema = schemas.SoundEvent
+    _cache_enabled = True
+    _profiles = {
+        "detail": LoadingProfile(
+            schema=schemas.SoundEvent,
+            options=(
+                selectinload(models.SoundEvent.features).joinedload(
+                    models.SoundEventFeature.feature_name
+                ),
+                raiseload("*"),
+            ),
+        ),
+    }
 
     async def create(
         self,
@@ -100,6 +118,54 @@ class SoundEventAPI(
         obj = await super().update(session, obj, data)
         return await self.update_geometric_features(session, obj)
 
+    async def create_many(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+    ) -> None | Sequence[schemas.SoundEvent]:
+        """Create many sound events.
+
+        The bounding box of each geometry is added to the inserted rows.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        data
+            The data to use for creation of the sound events.
+        """
+        return await super().create_many(session, _with_bounds(data))
+
+    async def create_many_without_duplicates(
+        self,
+        session: AsyncSession,
+        data: Sequence[dict],
+        return_all: bool = False,
+    ) -> Sequence[schemas.SoundEvent]:
+        """Create many sound events, skipping those that already exist.
+
+        The bounding box of each geometry is added to the inserted rows.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        data
+            The data to use for creation of the sound events.
+        return_all
+            Whether to return all sound events, or only those created.
+
+        Returns
+        -------
+        list[schemas.SoundEvent]
+            The sound events.
+        """
+        return await super().create_many_without_duplicates(
+            session,
+            _with_bounds(data),
+            return_all=return_all,
+        )
+
     async def add_feature(
         self,
         session: AsyncSession,
@@ -269,9 +335,13 @@ class SoundEventAPI(
     async def create_geometric_features(
         self,
         session: AsyncSession,
-        sound_events: Sequence[models.SoundEvent],
+        sound_events: Sequence[models.SoundEvent | schemas.SoundEvent],
     ) -> None:
-        """Create sound event features.
+        """Create or update the geometric features of many sound events.
+
+        The features of all sound events are computed at once and
+        written with a single bulk upsert, overwriting the values of any
+        existing geometric features.
 
         Parameters
         ----------
@@ -280,34 +350,13 @@ class SoundEventAPI(
         sound_events
             The sound events.
         """
-        all_features = []
-        for sound_event in sound_events:
-            feats = compute_geometric_features(sound_event.geometry)
-            for feature in feats:
-                all_features.append(
-                    (sound_event.id, feature.name, feature.value)
-                )
-
-        feature_names = {f[1] for f in all_features}
-        feature_mapping = {
-            name: await features.get_or_create(session, name=name)
-            for name in feature_names
-        }
+        if not sound_events:
+            return
 
-        data = [
-            dict(
-                sound_event_id=sound_event_id,
-                feature_name_id=feature_mapping[feature_name].id,
-                value=value,
-            )
-            for sound_event_id, feature_name, value in all_features
-        ]
-
-        await common.create_objects(
-            session,
-            models.SoundEventFeature,
-            data=data,
+        computed = compute_geometric_features(
+            [sound_event.geometry for sound_event in sound_events]
         )
+        await self._write_geometric_features(session, sound_events, computed)
 
     async def update_geometric_features(
         self,
@@ -326,37 +375,23 @@ class SoundEventAPI(
         schemas.SoundEvent
             The updated sound event.
         """
-        geom_features = compute_geometric_features(sound_event.geometry)
-
-        for feature in geom_features:
-            try:
-                sound_event = await self.update_feature(
-                    session,
-                    sound_event,
-                    schemas.Feature(name=feature.name, value=feature.value),
-                )
-            except ValueError:
-                sound_event = await self.add_feature(
-                    session,
-                    sound_event,
-                    schemas.Feature(name=feature.name, value=feature.value),
-                )
-
-        feature_mapping = {
-            f.name: schemas.Feature.model_validate(f) for f in geom_features
-        }
-        sound_event = sound_event.model_copy(
-            update=dict(
-                features=[
-                    (
-                        f
-                        if f.name not in feature_mapping
-                        else feature_mapping[f.name]
-                    )
-                    for f in sound_event.features
-                ]
+        computed = compute_geometric_features([sound_event.geometry])
+        await self._write_geometric_features(session, [sound_event], computed)
+
+        geom_features = dict(computed.get(0))
+        updated = [
+            (
+                schemas.Feature(name=f.name, value=geom_features.pop(f.name))
+                if f.name in geom_features
+                else f
             )
+            for f in sound_event.features
+        ]
+        updated.extend(
+            schemas.Feature(name=name, value=value)
+            for name, value in geom_features.items()
         )
+        sound_event = sound_event.model_copy(update=dict(features=updated))
         self._update_cache(sound_event)
         return sound_event
 
@@ -381,6 +416,65 @@ class SoundEventAPI(
             )
         return schemas.Recording.model_validate(db_recording)
 
+    async def get_overlapping(
+        self,
+        session: AsyncSession,
+        recording: schemas.Recording,
+        start_time: float | None = None,
+        end_time: float | None = None,
+        low_freq: float | None = None,
+        high_freq: float | None = None,
+        limit: int | None = 1000,
+        offset: int | None = 0,
+    ) -> tuple[Sequence[schemas.SoundEvent], int]:
+        """Get the sound events of a recording that overlap a region.
+
+        The region is compared with the bounding box of each sound event,
+        so only the events within view need to be loaded. Bounds that are
+        not given leave the region open on that side.
+
+        Parameters
+        ----------
+        session
+            The database session.
+        recording
+            The recording of the sound events.
+        start_time
+            The start time of the region in seconds.
+        end_time
+            The end time of the region in seconds.
+        low_freq
+            The lowest frequency of the region in Hz.
+        high_freq
+            The highest frequency of the region in Hz.
+        limit
+            The maximum number of sound events to return, by default 1000.
+        offset
+            The offset to use, by default 0.
+
+        Returns
+        -------
+        sound_events : list[schemas.SoundEvent]
+            The overlapping sound events, sorted by start time.
+        count : int
+            The total number of overlapping sound events.
+        """
+        return await self.get_many(
+            session,
+            limit=limit,
+            offset=offset,
+            filters=[
+                models.SoundEvent.recording_id == recording.id,
+                *get_overlap_conditions(
+                    start_time=start_time,
+                    end_time=end_time,
+                    low_freq=low_freq,
+                    high_freq=high_freq,
+                ),
+            ],
+            sort_by=models.SoundEvent.start_time,
+        )
+
     async def from_soundevent(
         self,
         session: AsyncSession,
@@ -452,8 +546,46 @@ class SoundEventAPI(
             features=[features.to_soundevent(f) for f in sound_event.features],
         )
 
+    async def _write_geometric_features(
+        self,
+        session: AsyncSession,
+        sound_events: Sequence[models.SoundEvent | schemas.SoundEvent],
+        computed: GeometricFeatures,
+    ) -> None:
+        feature_ids = await features.get_ids(session, computed.names)
+        values = [
+            dict(
+                sound_event_id=sound_events[index].id,
+                feature_name_id=feature_ids[name],
+                value=value,
+            )
+            for index, name, value in computed.items()
+        ]
+
+        await common.upsert_objects(
+            session,
+            models.SoundEventFeature,
+            values,
+            keys=[
+                models.SoundEventFeature.sound_event_id,
+                models.SoundEventFeature.feature_name_id,
+            ],
+            on_conflict="update",
+            update_columns=[models.SoundEventFeature.value],
+        )
+        self._cache.invalidate_many(
+            sound_event.uuid for sound_event in sound_events
+        )
+
     def _get_pk_column(self):
         return self._model.uuid
 
 
+def _with_bounds(data: Sequence[dict]) -> list[dict]:
+    return [
+        {**values, **compute_geometry_bounds(values["geometry"])}
+        for values in data
+    ]
+
+
 sound_events = SoundEventAPI()
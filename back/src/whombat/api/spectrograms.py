@@ -1,18 +1,66 @@
 """API functions to generate spectrograms."""
 
+import hashlib
+import json
+import math
 from pathlib import Path
 
 import numpy as np
+import xarray as xr
 from soundevent import arrays, audio
 
 import whombat.api.audio as audio_api
 from whombat import schemas
+from whombat.core import images
+from whombat.core.pyramids import PyramidWriter, SpectrogramPyramid
 from whombat.core.spectrograms import normalize_spectrogram
 
 __all__ = [
+    "build_spectrogram_pyramid",
     "compute_spectrogram",
+    "compute_spectrogram_image",
+    "get_spectrogram_key",
+    "get_spectrogram_pyramid",
+    "get_tile_bounds",
+    "get_tile_count",
+    "get_tile_padding",
+    "read_spectrogram_pyramid",
+    "render_spectrogram_image",
 ]
 
+SPECTROGRAM_KEY_VERSION = 2
+"""Version of the spectrogram rendering pipeline.
+
+Increase this number whenever a change in the pipeline modifies the
+output images, so that previously cached images are not reused.
+"""
+
+TILE_BASE_DURATION = 1.0
+"""Duration in seconds of a spectrogram tile at zoom level 0.
+
+Each zoom level doubles the duration of the tiles of the previous one.
+"""
+
+MIN_TILE_LEVEL = -8
+"""Most zoomed in tile level (about 4 ms per tile)."""
+
+MAX_TILE_LEVEL = 12
+"""Most zoomed out tile level (about 68 minutes per tile)."""
+
+PCEN_WARMUP_FRAMES = 64
+"""Number of extra STFT frames computed before a tile when using PCEN.
+
+PCEN is a recursive filter, so its output depends on the frames that
+precede the tile. Computing these extra frames lets the filter settle
+so that adjacent tiles match at their shared edge.
+"""
+
+DEFAULT_MAX_FRAMES = 4096
+"""Default number of STFT frames above which pyramids are used."""
+
+PYRAMID_CHUNK_DURATION = 60.0
+"""Duration in seconds of the audio processed at once to build a pyramid."""
+
 
 def compute_spectrogram(
     recording: schemas.Recording,
@@ -21,6 +69,7 @@ def compute_spectrogram(
     audio_parameters: schemas.AudioParameters,
     spectrogram_parameters: schemas.SpectrogramParameters,
     audio_dir: Path | None = None,
+    padding: float = 0,
 ) -> np.ndarray:
     """Compute a spectrogram for a recording.
 
@@ -36,19 +85,56 @@ def compute_spectrogram(
         The directory where the audio files are stored.
     spectrogram_parameters : SpectrogramParameters
         Spectrogram parameters.
+    padding
+        Extra audio, in seconds, to process on each side of the requested
+        interval. When positive, the STFT frames are aligned to a grid
+        of hops that starts at time zero and the result is cropped to the
+        frames centered within the interval. This makes spectrograms of
+        adjacent intervals join without seams.
 
     Returns
     -------
-    DataArray
+    np.ndarray
         Spectrogram image.
     """
+    spectrogram = _compute_spectrogram(
+        recording,
+        start_time,
+        end_time,
+        audio_parameters,
+        spectrogram_parameters,
+        audio_dir=audio_dir,
+        padding=padding,
+    )
+
+    # Get the underlying numpy array.
+    array = spectrogram.data
+
+    # Remove unncecessary dimensions.
+    return array.squeeze()
+
+
+def _compute_spectrogram(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    audio_dir: Path | None = None,
+    padding: float = 0,
+) -> xr.DataArray:
     if audio_dir is None:
         audio_dir = Path.cwd()
 
+    # The hop size is expressed as a fraction of the window size.
+    hop_size = (
+        1 - spectrogram_parameters.overlap
+    ) * spectrogram_parameters.window_size
+
     wav = audio_api.load_audio(
         recording,
-        start_time,
-        end_time,
+        start_time - padding,
+        end_time + padding,
         audio_parameters=audio_parameters,
         audio_dir=audio_dir,
     )
@@ -56,10 +142,12 @@ def compute_spectrogram(
     # Select channel. Do this early to avoid unnecessary computation.
     wav = wav[dict(channel=[spectrogram_parameters.channel])]
 
-    # The hop size is expressed as a fraction of the window size.
-    hop_size = (
-        1 - spectrogram_parameters.overlap
-    ) * spectrogram_parameters.window_size
+    if padding > 0:
+        wav = _align_to_hop_grid(
+            wav,
+            window_size=spectrogram_parameters.window_size,
+            hop_size=hop_size,
+        )
 
     spectrogram = audio.compute_spectrogram(
         wav,
@@ -81,6 +169,13 @@ def compute_spectrogram(
         max_db=spectrogram_parameters.max_dB,
     )
 
+    # NOTE: Store the amplitude range so that absolute normalization uses
+    # it instead of the range of values in this particular spectrogram.
+    spectrogram.attrs.update(
+        min_dB=spectrogram_parameters.min_dB,
+        max_dB=spectrogram_parameters.max_dB,
+    )
+
     # # Clamp amplitude.
     # spectrogram = audio.clamp_amplitude(
     #     spectrogram,
@@ -88,16 +183,515 @@ def compute_spectrogram(
     #     spectrogram_parameters.max_dB,
     # )
 
+    # Remove the padding frames. This must happen before normalization
+    # so that the padding does not affect the scale. Frames are assigned
+    # to the interval that contains their center, shifted by half a hop,
+    # so that each frame ends up in exactly one of two adjacent intervals.
+    if padding > 0:
+        times = spectrogram.time.values + hop_size / 2
+        spectrogram = spectrogram.isel(
+            time=(times >= start_time) & (times < end_time)
+        )
+
     # Scale to [0, 1]. If normalization is relative, the minimum and maximum
     # values are computed from the spectrogram, otherwise they are taken from
     # the provided min_dB and max_dB.
-    spectrogram = normalize_spectrogram(
+    return normalize_spectrogram(
         spectrogram,
         relative=spectrogram_parameters.normalize,
     )
 
-    # Get the underlying numpy array.
-    array = spectrogram.data
 
-    # Remove unncecessary dimensions.
-    return array.squeeze()
+def compute_spectrogram_image(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    audio_dir: Path | None = None,
+    padding: float = 0,
+    pyramid_dir: Path | None = None,
+    max_frames: int = DEFAULT_MAX_FRAMES,
+    image_format: images.ImageFormat = "png",
+    compression_level: int = 6,
+) -> bytes:
+    """Compute a spectrogram and encode it as an image.
+
+    Parameters
+    ----------
+    recording
+        The recording to compute the spectrogram for.
+    start_time
+        Start time in seconds.
+    end_time
+        End time in seconds.
+    audio_parameters
+        Audio parameters.
+    spectrogram_parameters
+        Spectrogram parameters.
+    audio_dir
+        The directory where the audio files are stored.
+    padding
+        Extra audio to process on each side of the interval. See
+        `compute_spectrogram`.
+    pyramid_dir
+        The directory where spectrogram pyramids are stored. If provided
+        and the interval spans more than `max_frames` STFT frames, the
+        spectrogram is read from a matching pyramid, if there is one,
+        instead of being computed from the audio.
+    max_frames
+        Maximum number of frames to compute from the audio when a
+        pyramid is available.
+    image_format
+        The format of the encoded image.
+    compression_level
+        Compression effort of the encoder, from 0 (fastest) to 9
+        (smallest).
+
+    Returns
+    -------
+    bytes
+        The encoded image.
+    """
+    data = None
+
+    if pyramid_dir is not None:
+        data = read_spectrogram_pyramid(
+            recording,
+            start_time,
+            end_time,
+            audio_parameters,
+            spectrogram_parameters,
+            pyramid_dir=pyramid_dir,
+            max_frames=max_frames,
+        )
+
+    if data is None:
+        data = compute_spectrogram(
+            recording,
+            start_time,
+            end_time,
+            audio_parameters,
+            spectrogram_parameters,
+            audio_dir=audio_dir,
+            padding=padding,
+        )
+
+    return render_spectrogram_image(
+        data,
+        spectrogram_parameters,
+        image_format=image_format,
+        compression_level=compression_level,
+    )
+
+
+def render_spectrogram_image(
+    data: np.ndarray,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    image_format: images.ImageFormat = "png",
+    compression_level: int = 6,
+) -> bytes:
+    """Encode a spectrogram array as an image.
+
+    Parameters
+    ----------
+    data
+        Spectrogram of shape `(frequency, time)` with values in [0, 1].
+    spectrogram_parameters
+        Spectrogram parameters.
+    image_format
+        The format of the encoded image.
+    compression_level
+        Compression effort of the encoder, from 0 (fastest) to 9
+        (smallest).
+
+    Returns
+    -------
+    bytes
+        The encoded image.
+    """
+    # Normalize.
+    if spectrogram_parameters.normalize:
+        data_min = data.min()
+        data_max = data.max()
+        data = data - data_min
+        data_range = data_max - data_min
+        if data_range > 0:
+            data = data / data_range
+
+    image = images.array_to_image(
+        data,
+        cmap=spectrogram_parameters.cmap,
+    )
+
+    buffer = images.image_to_buffer(
+        image,
+        fmt=image_format,
+        compression_level=compression_level,
+    )
+    return buffer.read()
+
+
+def get_spectrogram_key(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    padding: float = 0,
+    image_format: images.ImageFormat = "png",
+    compression_level: int = 6,
+) -> str:
+    """Get a key that uniquely identifies a spectrogram image.
+
+    The key is derived from the content hash of the recording, the
+    requested time window and a canonical representation of the audio
+    and spectrogram parameters. Two requests with the same key will
+    produce the same image, which makes it suitable as a cache key and
+    as an HTTP entity tag.
+
+    Parameters
+    ----------
+    recording
+        The recording to compute the spectrogram for.
+    start_time
+        Start time in seconds.
+    end_time
+        End time in seconds.
+    audio_parameters
+        Audio parameters.
+    spectrogram_parameters
+        Spectrogram parameters.
+    padding
+        Extra audio processed on each side of the interval.
+    image_format
+        The format of the encoded image.
+    compression_level
+        Compression effort of the encoder.
+
+    Returns
+    -------
+    str
+        A hexadecimal digest.
+    """
+    content = json.dumps(
+        {
+            "version": SPECTROGRAM_KEY_VERSION,
+            "recording": recording.hash,
+            # NOTE: The time expansion factor can be edited by the user
+            # and changes how the audio is interpreted.
+            "time_expansion": recording.time_expansion,
+            "start_time": float(start_time),
+            "end_time": float(end_time),
+            "padding": float(padding),
+            "audio": audio_parameters.model_dump(mode="json"),
+            "spectrogram": spectrogram_parameters.model_dump(mode="json"),
+            "image": {
+                "format": image_format,
+                "compression_level": compression_level,
+            },
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def _align_to_hop_grid(
+    wav: xr.DataArray,
+    window_size: float,
+    hop_size: float,
+) -> xr.DataArray:
+    """Trim the start of the audio so that it lies on the hop grid.
+
+    The STFT frames are then centered on samples that are multiples of
+    the hop length (in samples) counted from time zero, regardless of
+    where the audio starts.
+    """
+    samplerate = 1 / arrays.get_dim_step(wav, "time")
+    nperseg = int(window_size * samplerate)
+    noverlap = int((window_size - hop_size) * samplerate)
+    hop_length = max(nperseg - noverlap, 1)
+
+    first_sample = round(float(wav.time.values[0]) * samplerate)
+    offset = -first_sample % hop_length
+    return wav.isel(time=slice(offset, None))
+
+
+def get_tile_bounds(level: int, index: int) -> tuple[float, float]:
+    """Get the time interval covered by a spectrogram tile.
+
+    Tiles form a fixed grid over the time axis. At each zoom level all
+    tiles have the same duration, `TILE_BASE_DURATION * 2 ** level`, and
+    the tile with index `i` starts at `i` times that duration.
+
+    Parameters
+    ----------
+    level
+        Zoom level of the tile.
+    index
+        Position of the tile in the grid.
+
+    Returns
+    -------
+    start_time : float
+        Start time of the tile in seconds.
+    end_time : float
+        End time of the tile in seconds.
+    """
+    if not MIN_TILE_LEVEL <= level <= MAX_TILE_LEVEL:
+        raise ValueError(
+            f"Tile level must be between {MIN_TILE_LEVEL} and "
+            f"{MAX_TILE_LEVEL}, got {level}."
+        )
+
+    if index < 0:
+        raise ValueError(f"Tile index must be non negative, got {index}.")
+
+    duration = TILE_BASE_DURATION * 2**level
+    return index * duration, (index + 1) * duration
+
+
+def get_tile_count(recording: schemas.Recording, level: int) -> int:
+    """Get the number of tiles needed to cover a recording at a level."""
+    _, duration = get_tile_bounds(level, 0)
+    return max(math.ceil(recording.duration / duration), 1)
+
+
+def get_tile_padding(
+    spectrogram_parameters: schemas.SpectrogramParameters,
+) -> float:
+    """Get the padding needed to compute seamless spectrogram tiles.
+
+    Parameters
+    ----------
+    spectrogram_parameters
+        Spectrogram parameters.
+
+    Returns
+    -------
+    float
+        The padding in seconds.
+    """
+    padding = spectrogram_parameters.window_size
+
+    if spectrogram_parameters.pcen:
+        hop_size = (
+            1 - spectrogram_parameters.overlap
+        ) * spectrogram_parameters.window_size
+        padding += PCEN_WARMUP_FRAMES * hop_size
+
+    return padding
+
+
+def get_pyramid_path(
+    recording: schemas.Recording,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    pyramid_dir: Path,
+) -> Path:
+    """Get the location of the spectrogram pyramid of a recording.
+
+    Pyramids are grouped by the content hash of the recording. Within
+    that group, there is one pyramid per combination of parameters that
+    affect the values of the spectrogram. The colormap and the relative
+    normalization are applied when rendering, so they are not part of
+    the key.
+    """
+    content = json.dumps(
+        {
+            "version": SPECTROGRAM_KEY_VERSION,
+            "time_expansion": recording.time_expansion,
+            "audio": audio_parameters.model_dump(mode="json"),
+            "spectrogram": spectrogram_parameters.model_dump(
+                mode="json",
+                exclude={"cmap", "normalize"},
+            ),
+        },
+        sort_keys=True,
+    )
+    key = hashlib.sha256(content.encode()).hexdigest()
+    return pyramid_dir / recording.hash / key
+
+
+def get_spectrogram_pyramid(
+    recording: schemas.Recording,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    pyramid_dir: Path,
+) -> SpectrogramPyramid | None:
+    """Get the spectrogram pyramid of a recording if it has been built.
+
+    Returns
+    -------
+    SpectrogramPyramid | None
+        The pyramid, or None if no pyramid with matching parameters has
+        been built for the recording.
+    """
+    path = get_pyramid_path(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir,
+    )
+
+    if not SpectrogramPyramid.exists(path):
+        return None
+
+    return SpectrogramPyramid(path)
+
+
+def build_spectrogram_pyramid(
+    recording: schemas.Recording,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    pyramid_dir: Path,
+    audio_dir: Path | None = None,
+    chunk_duration: float = PYRAMID_CHUNK_DURATION,
+) -> SpectrogramPyramid:
+    """Build the spectrogram pyramid of a recording.
+
+    The spectrogram of the whole recording is computed in chunks, so
+    memory usage does not depend on the duration of the recording. The
+    chunks are computed like spectrogram tiles, so they join without
+    seams.
+
+    Parameters
+    ----------
+    recording
+        The recording to build the pyramid for.
+    audio_parameters
+        Audio parameters.
+    spectrogram_parameters
+        Spectrogram parameters. The pyramid stores absolute values, so
+        relative normalization is applied when reading from it.
+    pyramid_dir
+        The directory where spectrogram pyramids are stored.
+    audio_dir
+        The directory where the audio files are stored.
+    chunk_duration
+        Duration in seconds of the audio processed at a time.
+
+    Returns
+    -------
+    SpectrogramPyramid
+        The built pyramid. If the pyramid already existed it is returned
+        without being rebuilt.
+    """
+    existing = get_spectrogram_pyramid(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir,
+    )
+    if existing is not None:
+        return existing
+
+    path = get_pyramid_path(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir,
+    )
+    parameters = spectrogram_parameters.model_copy(update={"normalize": False})
+    padding = get_tile_padding(parameters)
+
+    writer: PyramidWriter | None = None
+    try:
+        for start_time in np.arange(0, recording.duration, chunk_duration):
+            end_time = min(start_time + chunk_duration, recording.duration)
+            spectrogram = _compute_spectrogram(
+                recording,
+                float(start_time),
+                float(end_time),
+                audio_parameters,
+                parameters,
+                audio_dir=audio_dir,
+                padding=padding,
+            )
+
+            if writer is None:
+                writer = PyramidWriter(
+                    path,
+                    hop_duration=_get_hop_duration(spectrogram, parameters),
+                )
+
+            writer.append(spectrogram.data.squeeze(axis=-1))
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    if writer is None:
+        raise ValueError("Cannot build a pyramid of an empty recording.")
+
+    return writer.finish()
+
+
+def read_spectrogram_pyramid(
+    recording: schemas.Recording,
+    start_time: float,
+    end_time: float,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    pyramid_dir: Path,
+    max_frames: int = DEFAULT_MAX_FRAMES,
+) -> np.ndarray | None:
+    """Read a zoomed out spectrogram from the pyramid of a recording.
+
+    Parameters
+    ----------
+    recording
+        The recording.
+    start_time
+        Start time in seconds.
+    end_time
+        End time in seconds.
+    audio_parameters
+        Audio parameters.
+    spectrogram_parameters
+        Spectrogram parameters.
+    pyramid_dir
+        The directory where spectrogram pyramids are stored.
+    max_frames
+        Maximum number of frames the result should have.
+
+    Returns
+    -------
+    np.ndarray | None
+        Spectrogram of shape `(frequency, time)`, or None if the interval
+        spans at most `max_frames` frames, in which case the spectrogram
+        should be computed from the audio, or if there is no pyramid.
+    """
+    pyramid = get_spectrogram_pyramid(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir,
+    )
+
+    if pyramid is None:
+        return None
+
+    level = pyramid.get_level_for(start_time, end_time, max_frames)
+    if level == 0:
+        return None
+
+    return pyramid.read(start_time, end_time, level)
+
+
+def _get_hop_duration(
+    spectrogram: xr.DataArray,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+) -> float:
+    """Get the actual time between frames of a spectrogram.
+
+    The hop is rounded to a whole number of samples when computing the
+    STFT, so it can differ slightly from the requested hop size.
+    """
+    times = spectrogram.time.values
+    if len(times) > 1:
+        return float(times[-1] - times[0]) / (len(times) - 1)
+
+    return (
+        1 - spectrogram_parameters.overlap
+    ) * spectrogram_parameters.window_size
@@ -0,0 +1,171 @@
+"""Size bounded, content addressed cache stored on disk."""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DiskCache",
+]
+
+
+class DiskCache:
+    """Least-recently-used cache of binary blobs stored on disk.
+
+    Every entry is stored as a single file named after its key inside
+    `directory`. The cache keeps an in-memory index of the entries and
+    their sizes so that, whenever the total size exceeds `max_size`, the
+    least recently used entries are removed from disk.
+
+    Keys must be safe to use as file names; hexadecimal digests are
+    recommended. Entries are written atomically, so concurrent readers
+    (even from other processes) will never see a partially written file.
+
+    Parameters
+    ----------
+    directory
+        Directory where the cached files are stored. It is created if it
+        does not exist. Existing entries are loaded into the index, in
+        order of last access.
+    max_size
+        Maximum total size of the cache in bytes. A value of zero or less
+        disables the cache.
+    suffix
+        File extension to use for the cached files.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        max_size: int,
+        suffix: str = "",
+    ):
+        self.directory = directory
+        self.max_size = max_size
+        self.suffix = suffix
+        self.size = 0
+        self._index: OrderedDict[str, int] = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._load_index()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache stores any entries."""
+        return self.max_size > 0
+
+    def get(self, key: str) -> bytes | None:
+        """Get the content stored under a key.
+
+        Returns
+        -------
+        bytes | None
+            The stored content or None if the key is not in the cache.
+        """
+        if not self.enabled:
+            return None
+
+        path = self._get_path(key)
+        try:
+            content = path.read_bytes()
+        except FileNotFoundError:
+            # NOTE: The file may have been evicted by another process.
+            with self._lock:
+                self._forget(key)
+            return None
+
+        with self._lock:
+            if key not in self._index:
+                self._remember(key, len(content))
+            self._index.move_to_end(key)
+
+        # Record the access on disk so that the LRU order survives
+        # restarts.
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return content
+
+    def set(self, key: str, content: bytes) -> None:
+        """Store content under a key."""
+        if not self.enabled or len(content) > self.max_size:
+            return
+
+        path = self._get_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(
+            f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        tmp_path.write_bytes(content)
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._forget(key)
+            self._remember(key, len(content))
+            self._evict()
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def clear(self) -> None:
+        """Remove all entries from the cache."""
+        with self._lock:
+            for key in list(self._index):
+                self._remove(key)
+
+    def _get_path(self, key: str) -> Path:
+        # Shard entries in subdirectories to avoid huge directories.
+        return self.directory / key[:2] / f"{key}{self.suffix}"
+
+    def _remember(self, key: str, size: int) -> None:
+        self._index[key] = size
+        self.size += size
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self.size -= size
+
+    def _remove(self, key: str) -> None:
+        self._forget(key)
+        try:
+            self._get_path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def _evict(self) -> None:
+        while self.size > self.max_size and self._index:
+            key = next(iter(self._index))
+            logger.debug("Evicting %s from the disk cache", key)
+            self._remove(key)
+
+    def _load_index(self) -> None:
+        entries = []
+        for path in self.directory.glob(f"*/*{self.suffix}"):
+            if path.name.endswith(".tmp"):
+                continue
+
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+
+            key = path.name[: len(path.name) - len(self.suffix)]
+            entries.append((stat.st_mtime, key, stat.st_size))
+
+        with self._lock:
+            for _, key, size in sorted(entries):
+                self._remember(key, size)
+            self._evict()
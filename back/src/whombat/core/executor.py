@@ -0,0 +1,263 @@
+"""Executor for blocking work called from async code.
+
+Reading audio, filtering, computing FFTs and encoding images are blocking
+operations. Running them directly in an `async def` route blocks the
+event loop, and with it every other request served by the same worker.
+The `TaskExecutor` runs such functions in a thread or process pool while
+limiting how many of them can run at the same time.
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import os
+from concurrent.futures import (
+    Executor,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Literal, TypeVar
+
+from whombat import exceptions
+
+__all__ = [
+    "ExecutorStats",
+    "TaskExecutor",
+]
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["thread", "process"]
+
+ABANDON_CHECK_INTERVAL = 0.1
+"""Seconds between checks of whether a task is still wanted."""
+
+
+@dataclass
+class ExecutorStats:
+    """Usage counters of a task executor."""
+
+    kind: ExecutorKind
+    """Whether tasks run in a thread pool or a process pool."""
+
+    max_workers: int
+    """Number of workers of the pool."""
+
+    max_concurrency: int
+    """Maximum number of tasks that run at the same time."""
+
+    running: int
+    """Number of tasks currently running."""
+
+    queued: int
+    """Number of tasks waiting for a free slot."""
+
+    completed: int
+    """Number of tasks that returned a result."""
+
+    timed_out: int
+    """Number of tasks cancelled because they exceeded their deadline."""
+
+    abandoned: int
+    """Number of tasks cancelled because their result was not needed."""
+
+
+class TaskExecutor:
+    """Run blocking functions in a pool with bounded concurrency.
+
+    Tasks wait in a queue until one of `max_concurrency` slots is free.
+    A task that has not finished before its deadline is cancelled: if it
+    is still queued it never runs, and if it is already running its
+    result is discarded. Note that a function already running in a worker
+    cannot be interrupted and keeps its worker, and its slot, until it
+    returns.
+
+    When using a process pool, the functions and their arguments must be
+    picklable.
+
+    Parameters
+    ----------
+    kind
+        Whether to run tasks in a thread pool or a process pool. Process
+        pools are not limited by the GIL, but arguments and results must
+        be sent between processes.
+    max_workers
+        Number of workers of the pool. Defaults to the default of the
+        corresponding `concurrent.futures` executor.
+    max_concurrency
+        Maximum number of tasks that run at the same time. Defaults to
+        the number of workers.
+    """
+
+    def __init__(
+        self,
+        kind: ExecutorKind = "thread",
+        max_workers: int | None = None,
+        max_concurrency: int | None = None,
+    ):
+        if max_workers is None:
+            max_workers = _get_default_workers(kind)
+
+        if max_concurrency is None:
+            max_concurrency = max_workers
+
+        self.kind: ExecutorKind = kind
+        self.max_workers = max_workers
+        self.max_concurrency = max_concurrency
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.timed_out = 0
+        self.abandoned = 0
+        self._executor = _create_executor(kind, max_workers)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(
+        self,
+        func: Callable[..., T],
+        *args,
+        timeout: float | None = None,
+        is_abandoned: Callable[[], Awaitable[bool]] | None = None,
+        **kwargs,
+    ) -> T:
+        """Run a function in the pool.
+
+        Parameters
+        ----------
+        func
+            The blocking function to run.
+        *args
+            Positional arguments of the function.
+        timeout
+            Seconds, including the time spent in the queue, after which
+            the task is cancelled. If None, the task has no deadline.
+        is_abandoned
+            Coroutine function that is polled while the task is pending.
+            The task is cancelled as soon as it returns True, for example
+            when the client that requested the result has disconnected.
+        **kwargs
+            Keyword arguments of the function.
+
+        Returns
+        -------
+        T
+            The result of the function.
+
+        Raises
+        ------
+        exceptions.TaskTimeoutError
+            If the task did not finish before the deadline.
+        exceptions.TaskCancelledError
+            If the task was abandoned before finishing.
+        """
+        call = functools.partial(func, *args, **kwargs)
+        task = asyncio.ensure_future(self._run(call))
+        watcher = None
+        if is_abandoned is not None:
+            watcher = asyncio.ensure_future(_wait_until(is_abandoned))
+
+        try:
+            done, _ = await asyncio.wait(
+                [task] if watcher is None else [task, watcher],
+                timeout=timeout,
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+
+            if not task.done():
+                task.cancel()
+
+        if task in done:
+            return task.result()
+
+        if watcher is not None and watcher in done:
+            self.abandoned += 1
+            raise exceptions.TaskCancelledError(
+                "The task was abandoned before finishing."
+            )
+
+        self.timed_out += 1
+        raise exceptions.TaskTimeoutError(
+            f"The task did not finish within {timeout} seconds."
+        )
+
+    @property
+    def stats(self) -> ExecutorStats:
+        """Get the usage counters of the executor."""
+        return ExecutorStats(
+            kind=self.kind,
+            max_workers=self.max_workers,
+            max_concurrency=self.max_concurrency,
+            running=self.running,
+            queued=self.queued,
+            completed=self.completed,
+            timed_out=self.timed_out,
+            abandoned=self.abandoned,
+        )
+
+    def shutdown(self) -> None:
+        """Stop the pool, cancelling the tasks that have not started."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, call: Callable[[], T]) -> T:
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._executor, call)
+        except BaseException:
+            self._release()
+            raise
+
+        # NOTE: The slot is held until the function returns in the
+        # worker, even if the task is cancelled while it runs, so that
+        # cancelled tasks do not let more than `max_concurrency` run.
+        future.add_done_callback(lambda _: self._release())
+        result = await asyncio.shield(future)
+        self.completed += 1
+        return result
+
+    def _release(self) -> None:
+        self.running -= 1
+        self._semaphore.release()
+
+
+async def _wait_until(condition: Callable[[], Awaitable[bool]]) -> None:
+    while not await condition():
+        await asyncio.sleep(ABANDON_CHECK_INTERVAL)
+
+
+def _get_default_workers(kind: ExecutorKind) -> int:
+    cpu_count = os.cpu_count() or 1
+
+    if kind == "process":
+        return cpu_count
+
+    # Same default as ThreadPoolExecutor.
+    return min(32, cpu_count + 4)
+
+
+def _create_executor(kind: ExecutorKind, max_workers: int) -> Executor:
+    if kind == "thread":
+        return ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="whombat-worker",
+        )
+
+    if kind == "process":
+        # NOTE: Forking a process with running threads is unsafe, so
+        # workers start from a fresh interpreter.
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    raise ValueError(f"Unknown executor kind: {kind}")
@@ -0,0 +1,164 @@
+"""Pool of open audio file handles."""
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Generator
+
+import soundfile as sf
+
+__all__ = [
+    "PoolStats",
+    "SoundFilePool",
+]
+
+
+@dataclass
+class PoolStats:
+    """Usage counters of a file pool."""
+
+    size: int
+    """Number of open handles in the pool."""
+
+    maxsize: int
+    """Maximum number of open handles."""
+
+    hits: int
+    """Number of requests served with an already open handle."""
+
+    misses: int
+    """Number of requests that required opening the file."""
+
+    evictions: int
+    """Number of handles closed to make room for others."""
+
+
+class _Handle:
+    def __init__(self, path: Path):
+        self.file = sf.SoundFile(path)
+        self.lock = threading.Lock()
+
+    def close(self) -> None:
+        with self.lock:
+            self.file.close()
+
+
+class SoundFilePool:
+    """Bounded least-recently-used pool of open `SoundFile` handles.
+
+    Opening an audio file requires parsing its header and, for
+    compressed formats, setting up a decoder. Streaming a recording to
+    the browser results in many small range requests to the same file,
+    so reusing the open handle across requests saves this work.
+
+    Handles are keyed by the file path and its modification time, so a
+    file that changes on disk is opened again. Each handle has its own
+    lock, since a `SoundFile` keeps a read position and cannot be used by
+    two threads at the same time.
+
+    Parameters
+    ----------
+    maxsize
+        Maximum number of open handles. When the pool is full, the least
+        recently used handle is closed. A value of zero disables pooling.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._handles: OrderedDict[tuple[str, int], _Handle] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def open(self, path: Path) -> Generator[sf.SoundFile, None, None]:
+        """Get an open handle of an audio file.
+
+        The handle is locked for the duration of the context and must not
+        be closed by the caller.
+
+        Parameters
+        ----------
+        path
+            The path to the audio file.
+
+        Yields
+        ------
+        sf.SoundFile
+            The open audio file.
+        """
+        if self.maxsize <= 0:
+            self.misses += 1
+            with sf.SoundFile(path) as sf_file:
+                yield sf_file
+            return
+
+        handle = self._get_handle(path)
+
+        with handle.lock:
+            # NOTE: The handle could have been evicted and closed while
+            # waiting for the lock.
+            if not handle.file.closed:
+                yield handle.file
+                return
+
+        with sf.SoundFile(path) as sf_file:
+            yield sf_file
+
+    @property
+    def stats(self) -> PoolStats:
+        """Get the usage counters of the pool."""
+        return PoolStats(
+            size=len(self._handles),
+            maxsize=self.maxsize,
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+        )
+
+    def clear(self) -> None:
+        """Close all open handles."""
+        with self._lock:
+            handles = list(self._handles.values())
+            self._handles.clear()
+
+        for handle in handles:
+            handle.close()
+
+    def _get_handle(self, path: Path) -> _Handle:
+        key = (str(path), os.stat(path).st_mtime_ns)
+
+        with self._lock:
+            handle = self._handles.get(key)
+            if handle is not None:
+                self.hits += 1
+                self._handles.move_to_end(key)
+                return handle
+
+            self.misses += 1
+
+        handle = _Handle(path)
+
+        to_close = []
+        with self._lock:
+            existing = self._handles.get(key)
+            if existing is not None:
+                # Another thread opened the same file in the meantime.
+                to_close.append(handle)
+                handle = existing
+            else:
+                self._handles[key] = handle
+
+            while len(self._handles) > self.maxsize:
+                _, old = self._handles.popitem(last=False)
+                self.evictions += 1
+                to_close.append(old)
+
+        for old in to_close:
+            old.close()
+
+        return handle
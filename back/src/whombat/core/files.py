@@ -1,8 +1,10 @@
 """File handling functions."""
 
 import logging
+import os
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Iterator
 
 from soundevent.audio import (
     MediaInfo,
@@ -10,13 +12,16 @@ from soundevent.audio import (
     get_media_info,
     is_audio_file,
 )
+from soundevent.audio.files import VALID_AUDIO_EXTENSIONS
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     "get_audio_files_in_folder",
     "get_file_info",
+    "scan_audio_files",
     "FileInfo",
+    "FileStat",
 ]
 
 
@@ -40,12 +45,80 @@ def get_audio_files_in_folder(
     recordings: list[Path]
     """
     return [
-        path.relative_to(audio_dir) if relative else path.absolute()
-        for path in audio_dir.rglob("*")
-        if path.is_file() and is_audio_file(path)
+        Path(os.path.relpath(entry.path, audio_dir))
+        if relative
+        else Path(entry.path).absolute()
+        for entry in _iter_audio_entries(audio_dir)
     ]
 
 
+@dataclass
+class FileStat:
+    """Size and modification time of a file."""
+
+    path: Path
+    """Path to the file."""
+
+    size: int
+    """Size of the file in bytes."""
+
+    mtime_ns: int
+    """Modification time of the file in nanoseconds."""
+
+
+def scan_audio_files(audio_dir: Path) -> list[FileStat]:
+    """Get the size and modification time of all audio files in a directory.
+
+    The directory is walked with `os.scandir`, which gets the type of each
+    entry without an extra system call on most platforms, and the contents
+    of the files are never read. This makes it cheap to find out which
+    files have changed since a previous scan, even on network storage.
+
+    Parameters
+    ----------
+    audio_dir: Path
+        Path to the directory containing the audio files.
+
+    Returns
+    -------
+    files: list[FileStat]
+        The audio files found, with paths relative to `audio_dir`.
+    """
+    ret = []
+    for entry in _iter_audio_entries(audio_dir):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            # The file was removed while scanning.
+            continue
+
+        ret.append(
+            FileStat(
+                path=Path(os.path.relpath(entry.path, audio_dir)),
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+            )
+        )
+    return ret
+
+
+def _iter_audio_entries(audio_dir: Path) -> Iterator[os.DirEntry]:
+    stack = [os.fspath(audio_dir)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+
+                    extension = os.path.splitext(entry.name)[1][1:].lower()
+                    if extension in VALID_AUDIO_EXTENSIONS and entry.is_file():
+                        yield entry
+        except (FileNotFoundError, PermissionError) as error:
+            logger.warning(f"Could not scan directory: {error}")
+
+
 @dataclass
 class FileInfo:
     path: Path
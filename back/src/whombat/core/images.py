@@ -1,6 +1,8 @@
 """Functions to handle images."""
 
+from functools import lru_cache
 from io import BytesIO
+from typing import Literal
 
 import numpy as np
 from matplotlib import colormaps
@@ -8,18 +10,73 @@ from PIL import Image as img
 from PIL.Image import Image
 
 __all__ = [
+    "ImageFormat",
     "array_to_image",
+    "get_colormap_lut",
     "image_to_buffer",
+    "quantize",
 ]
 
+ImageFormat = Literal["png", "webp"]
+
+LUT_SIZE = 256
+"""Number of entries of the colormap lookup tables."""
+
+
+@lru_cache(maxsize=32)
+def get_colormap_lut(cmap: str) -> np.ndarray:
+    """Get the lookup table of a colormap.
+
+    The colormap is evaluated once and cached, so converting an array to
+    an image only requires indexing into the table.
+
+    Parameters
+    ----------
+    cmap : str
+        The name of a matplotlib colormap.
+
+    Returns
+    -------
+    np.ndarray
+        A read-only uint8 array of shape `(256, 4)` with the RGBA color
+        of each quantized value.
+    """
+    colormap = colormaps.get_cmap(cmap)
+
+    # Evaluate the colormap at the center of each quantization bin.
+    lut = np.asarray(
+        colormap((np.arange(LUT_SIZE) + 0.5) / LUT_SIZE) * 255,
+        dtype=np.uint8,
+    )
+    lut.flags.writeable = False
+    return lut
+
+
+def quantize(array: np.ndarray) -> np.ndarray:
+    """Quantize values between 0 and 1 into 256 levels.
+
+    The values are binned in the same way as matplotlib colormaps bin
+    float values, so that indexing a colormap lookup table gives the same
+    colors as evaluating the colormap. NaN values are mapped to 0.
+    """
+    levels = np.nan_to_num(array, nan=0) * LUT_SIZE
+    np.clip(levels, 0, LUT_SIZE - 1, out=levels)
+    return levels.astype(np.uint8)
+
 
 def array_to_image(array: np.ndarray, cmap: str) -> Image:
     """Convert a numpy array to a PIL image.
 
+    Grayscale colormaps produce 8-bit grayscale images and other opaque
+    colormaps produce 8-bit palette images, which are smaller and faster
+    to encode than RGBA images.
+
     Parameters
     ----------
     array : np.ndarray
         The array to convert into an image. It must be a 2D array.
+    cmap : str
+        The name of a matplotlib colormap.
 
     Returns
     -------
@@ -33,18 +90,56 @@ def array_to_image(array: np.ndarray, cmap: str) -> Image:
     if array.ndim != 2:
         raise ValueError("The array must be 2D.")
 
-    # Get the colormap
-    colormap = colormaps.get_cmap(cmap)
+    lut = get_colormap_lut(cmap)
 
     # Flip the array vertically
-    array = np.flipud(array)
+    indices = np.ascontiguousarray(quantize(np.flipud(array)))
+
+    if not (lut[:, 3] == 255).all():
+        return img.fromarray(lut[indices])
 
-    return img.fromarray(np.uint8(colormap(array) * 255))
+    rgb = lut[:, :3]
+    if (rgb == rgb[:, :1]).all():
+        return img.fromarray(rgb[:, 0][indices])
 
+    # NOTE: Setting the palette turns the grayscale image into a palette
+    # image.
+    image = img.fromarray(indices)
+    image.putpalette(rgb.tobytes())
+    return image
 
-def image_to_buffer(image: Image, fmt: str = "png") -> BytesIO:
-    """Convert a PIL image to a BytesIO buffer."""
+
+def image_to_buffer(
+    image: Image,
+    fmt: ImageFormat | str = "png",
+    compression_level: int = 6,
+) -> BytesIO:
+    """Convert a PIL image to a BytesIO buffer.
+
+    Parameters
+    ----------
+    image : Image
+        The image to encode.
+    fmt : str
+        The image format.
+    compression_level : int
+        Compression effort from 0 (fastest) to 9 (smallest). For PNG this
+        is the zlib compression level. WebP images are encoded losslessly
+        and the level is mapped to the encoder method (0 to 6).
+    """
     buffer = BytesIO()
-    image.save(buffer, format=fmt)
+
+    if fmt == "png":
+        image.save(buffer, format=fmt, compress_level=compression_level)
+    elif fmt == "webp":
+        image.save(
+            buffer,
+            format=fmt,
+            lossless=True,
+            method=round(compression_level * 6 / 9),
+        )
+    else:
+        image.save(buffer, format=fmt)
+
     buffer.seek(0)
     return buffer
@@ -0,0 +1,289 @@
+"""Multi-resolution spectrogram pyramids stored on disk.
+
+A spectrogram pyramid stores a precomputed spectrogram of a whole
+recording at several time resolutions. Level 0 holds every STFT frame
+and each subsequent level halves the number of frames by keeping the
+maximum of every pair of frames, so that short sounds remain visible
+when zoomed out.
+
+Each level is stored as a `.npy` file with shape `(frames, bins)` that
+is memory mapped when read, so serving a zoomed out view only touches
+the frames of the requested time window.
+"""
+
+import json
+import logging
+import math
+import os
+import shutil
+import uuid
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "PyramidInfo",
+    "PyramidWriter",
+    "SpectrogramPyramid",
+]
+
+DTYPE = np.float16
+"""Data type of the stored values.
+
+Values are normalized to the [0, 1] range, so half precision is more than
+enough for 8 bit images.
+"""
+
+MIN_LEVEL_FRAMES = 512
+"""Levels are added until the number of frames falls below this value."""
+
+CHUNK_FRAMES = 2**16
+"""Number of frames processed at a time when writing levels."""
+
+INFO_FILE = "info.json"
+
+
+@dataclass
+class PyramidInfo:
+    """Description of a spectrogram pyramid."""
+
+    hop_duration: float
+    """Time in seconds between consecutive frames of level 0."""
+
+    num_frames: int
+    """Number of frames of level 0."""
+
+    num_bins: int
+    """Number of frequency bins of every level."""
+
+    num_levels: int
+    """Number of levels of the pyramid."""
+
+
+class SpectrogramPyramid:
+    """Read access to a spectrogram pyramid stored in a directory."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.info = PyramidInfo(
+            **json.loads((path / INFO_FILE).read_text()),
+        )
+        self._levels: dict[int, np.ndarray] = {}
+
+    @classmethod
+    def exists(cls, path: Path) -> bool:
+        """Check if a complete pyramid is stored at the given path."""
+        return (path / INFO_FILE).is_file()
+
+    def get_level(self, level: int) -> np.ndarray:
+        """Get the memory mapped array of a level.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape `(frames, bins)`.
+        """
+        if not 0 <= level < self.info.num_levels:
+            raise ValueError(
+                f"Level must be between 0 and {self.info.num_levels - 1}, "
+                f"got {level}."
+            )
+
+        if level not in self._levels:
+            self._levels[level] = np.load(
+                self.path / f"level_{level}.npy",
+                mmap_mode="r",
+            )
+
+        return self._levels[level]
+
+    def get_level_for(
+        self,
+        start_time: float,
+        end_time: float,
+        max_frames: int,
+    ) -> int:
+        """Get the finest level that covers an interval in few frames.
+
+        Parameters
+        ----------
+        start_time
+            Start time in seconds.
+        end_time
+            End time in seconds.
+        max_frames
+            Maximum number of frames that should cover the interval.
+
+        Returns
+        -------
+        int
+            The level. If even the coarsest level needs more frames, the
+            coarsest level is returned.
+        """
+        frames = (end_time - start_time) / self.info.hop_duration
+        level = math.ceil(math.log2(max(frames / max_frames, 1)))
+        return min(level, self.info.num_levels - 1)
+
+    def read(
+        self,
+        start_time: float,
+        end_time: float,
+        level: int,
+    ) -> np.ndarray:
+        """Read the spectrogram of a time interval from a level.
+
+        Frames outside of the recording are filled with zeros.
+
+        Returns
+        -------
+        np.ndarray
+            Array of shape `(bins, frames)` with values in [0, 1].
+        """
+        data = self.get_level(level)
+        step = self.info.hop_duration * 2**level
+
+        # NOTE: Frame `i` of level 0 is centered at `i * hop_duration`, so
+        # frame `j` of this level covers the times from
+        # `j * step - hop_duration / 2` to `(j + 1) * step - hop_duration / 2`.
+        offset = self.info.hop_duration / 2
+        start = math.floor((start_time + offset) / step)
+        end = max(math.floor((end_time + offset) / step), start + 1)
+
+        result = np.zeros((end - start, self.info.num_bins), dtype=np.float32)
+        src_start = min(max(start, 0), len(data))
+        src_end = min(max(end, 0), len(data))
+        result[src_start - start : src_end - start] = data[src_start:src_end]
+        return result.T
+
+
+class PyramidWriter:
+    """Incrementally write a spectrogram pyramid to disk.
+
+    Frames are appended in chunks to level 0. Once all frames have been
+    written, `finish` computes the coarser levels and moves the pyramid
+    to its final location, so readers never see incomplete pyramids.
+
+    Parameters
+    ----------
+    path
+        Final location of the pyramid.
+    hop_duration
+        Time in seconds between consecutive frames.
+    """
+
+    def __init__(self, path: Path, hop_duration: float):
+        self.path = path
+        self.hop_duration = hop_duration
+        self.num_frames = 0
+        self.num_bins: int | None = None
+        self._tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        self._tmp_path.mkdir(parents=True)
+        self._raw_path = self._tmp_path / "level_0.raw"
+        self._raw = open(self._raw_path, "wb")
+
+    def append(self, spectrogram: np.ndarray) -> None:
+        """Append frames to level 0.
+
+        Parameters
+        ----------
+        spectrogram
+            Array of shape `(bins, frames)` with values in [0, 1].
+        """
+        if self.num_bins is None:
+            self.num_bins = spectrogram.shape[0]
+
+        if spectrogram.shape[0] != self.num_bins:
+            raise ValueError("All chunks must have the same number of bins.")
+
+        self._raw.write(np.ascontiguousarray(spectrogram.T, dtype=DTYPE))
+        self.num_frames += spectrogram.shape[1]
+
+    def abort(self) -> None:
+        """Discard the partially written pyramid."""
+        self._raw.close()
+        shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+    def finish(self) -> SpectrogramPyramid:
+        """Compute the coarser levels and store the pyramid."""
+        self._raw.close()
+
+        if self.num_bins is None or self.num_frames == 0:
+            self.abort()
+            raise ValueError("Cannot create a pyramid without frames.")
+
+        level_0 = np.lib.format.open_memmap(
+            self._tmp_path / "level_0.npy",
+            mode="w+",
+            dtype=DTYPE,
+            shape=(self.num_frames, self.num_bins),
+        )
+        raw = np.memmap(
+            self._raw_path,
+            dtype=DTYPE,
+            mode="r",
+            shape=(self.num_frames, self.num_bins),
+        )
+        for start in range(0, self.num_frames, CHUNK_FRAMES):
+            level_0[start : start + CHUNK_FRAMES] = raw[
+                start : start + CHUNK_FRAMES
+            ]
+        level_0.flush()
+        del raw
+        self._raw_path.unlink()
+
+        num_levels = 1
+        previous = level_0
+        while len(previous) > MIN_LEVEL_FRAMES:
+            previous = _downsample(
+                previous,
+                self._tmp_path / f"level_{num_levels}.npy",
+            )
+            num_levels += 1
+
+        info = PyramidInfo(
+            hop_duration=self.hop_duration,
+            num_frames=self.num_frames,
+            num_bins=self.num_bins,
+            num_levels=num_levels,
+        )
+        (self._tmp_path / INFO_FILE).write_text(json.dumps(asdict(info)))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.rename(self._tmp_path, self.path)
+        except OSError:
+            # NOTE: Another process finished building the same pyramid.
+            logger.debug("Pyramid %s already exists", self.path)
+            shutil.rmtree(self._tmp_path, ignore_errors=True)
+
+        return SpectrogramPyramid(self.path)
+
+
+def _downsample(
+    array: np.ndarray,
+    path: Path,
+    chunk_size: int = CHUNK_FRAMES,
+) -> np.ndarray:
+    """Halve the number of frames by taking the maximum of each pair."""
+    num_frames = math.ceil(len(array) / 2)
+    result = np.lib.format.open_memmap(
+        path,
+        mode="w+",
+        dtype=array.dtype,
+        shape=(num_frames, array.shape[1]),
+    )
+
+    for start in range(0, len(array), chunk_size):
+        chunk = np.asarray(array[start : start + chunk_size])
+
+        if len(chunk) % 2 == 1:
+            chunk = np.concatenate([chunk, chunk[-1:]])
+
+        pairs = chunk.reshape(-1, 2, chunk.shape[1])
+        result[start // 2 : start // 2 + len(pairs)] = pairs.max(axis=1)
+
+    result.flush()
+    return result
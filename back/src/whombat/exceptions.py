@@ -6,6 +6,9 @@ __all__ = [
     "MissingDatabaseError",
     "DataIntegrityError",
     "DataFormatError",
+    "InvalidCursorError",
+    "TaskCancelledError",
+    "TaskTimeoutError",
 ]
 
 
@@ -50,3 +53,15 @@ class DataFormatError(RuntimeError):
         self.format = format
         self.name = name
         self.details = details
+
+
+class InvalidCursorError(RuntimeError):
+    """Raised when a pagination cursor cannot be used."""
+
+
+class TaskCancelledError(RuntimeError):
+    """Raised when a task is cancelled before it finishes."""
+
+
+class TaskTimeoutError(TaskCancelledError):
+    """Raised when a task does not finish before its deadline."""
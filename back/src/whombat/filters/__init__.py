@@ -17,6 +17,7 @@ from whombat.filters.datasets import DatasetFilter
 from whombat.filters.evaluation_sets import EvaluationSetFilter
 from whombat.filters.evaluations import EvaluationFilter
 from whombat.filters.feature_names import FeatureNameFilter
+from whombat.filters.jobs import JobFilter
 from whombat.filters.model_runs import ModelRunFilter
 from whombat.filters.notes import NoteFilter
 from whombat.filters.recording_notes import RecordingNoteFilter
@@ -48,6 +49,7 @@ __all__ = [
     "EvaluationSetFilter",
     "EvaluationFilter",
     "FeatureNameFilter",
+    "JobFilter",
     "Filter",
     "ModelRunFilter",
     "NoteFilter",
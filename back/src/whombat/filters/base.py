@@ -8,9 +8,10 @@ from uuid import UUID
 
 from pydantic import BaseModel, ConfigDict, create_model
 from pydantic.fields import FieldInfo
-from sqlalchemy import Select, or_
+from sqlalchemy import Select
 from sqlalchemy.orm import InstrumentedAttribute, MappedColumn
 
+from whombat.models import search
 from whombat.models.base import Base
 
 __all__ = [
@@ -359,19 +360,38 @@ class SearchFilter(Filter):
 
     search: str | None = None
 
+    search_rank: bool | None = None
+    """Whether to sort the results by relevance to the search term.
+
+    Ranked results are sorted by relevance before any other sorting.
+    Cursor pagination only sorts by the sort key, so the ranking is
+    ignored there.
+    """
+
 
 def search_filter(
-    fields: list[MappedColumn | InstrumentedAttribute],
+    fields: list[InstrumentedAttribute],
 ) -> type[SearchFilter]:
-    """Create a filter for searching."""
+    """Create a filter for searching.
+
+    The search uses the search index of the table of the fields, see
+    `whombat.models.search`.
+    """
 
     class _SearchFilter(SearchFilter):
         """Filter by a search term."""
 
         def filter(self, query: Select) -> Select:
             """Filter a query."""
-            term = f"%{self.search}%"
-            return query.where(or_(*[field.ilike(term) for field in fields]))
+            if not self.search:
+                return query
+
+            query = query.where(search.match(fields, self.search))
+
+            if self.search_rank:
+                query = query.order_by(search.rank(fields, self.search))
+
+            return query
 
     return _SearchFilter
 
@@ -0,0 +1,27 @@
+"""Filters for Jobs."""
+
+from whombat import models
+from whombat.filters import base
+
+__all__ = [
+    "CreatedOnFilter",
+    "JobFilter",
+    "KindFilter",
+    "StatusFilter",
+]
+
+KindFilter = base.string_filter(models.Job.kind)
+"""Filter jobs by kind."""
+
+StatusFilter = base.string_filter(models.Job.status)
+"""Filter jobs by status."""
+
+CreatedOnFilter = base.date_filter(models.Job.created_on)
+"""Filter jobs by submission date."""
+
+
+JobFilter = base.combine(
+    kind=KindFilter,
+    status=StatusFilter,
+    created_on=CreatedOnFilter,
+)
@@ -6,11 +6,13 @@ from sqlalchemy import Select, select, tuple_
 
 from whombat import models
 from whombat.filters import base
+from whombat.filters.sound_events import get_overlap_conditions
 
 __all__ = [
     "ClipAnnotationFilter",
     "CreatedByFilter",
     "CreatedOnFilter",
+    "OverlapFilter",
     "ProjectFilter",
     "RecordingFilter",
     "SoundEventAnnotationFilter",
@@ -58,6 +60,44 @@ class SoundEventFilter(base.Filter):
         ).where(models.SoundEvent.uuid == self.eq)
 
 
+class OverlapFilter(base.Filter):
+    """Filter for annotations that overlap a region of a recording.
+
+    Only the sound events of the recording are compared with the region,
+    which uses the index on the recording and bounds of sound events.
+    """
+
+    recording: UUID | None = None
+    start_time: float | None = None
+    end_time: float | None = None
+    low_freq: float | None = None
+    high_freq: float | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter the query."""
+        conditions = get_overlap_conditions(
+            start_time=self.start_time,
+            end_time=self.end_time,
+            low_freq=self.low_freq,
+            high_freq=self.high_freq,
+        )
+
+        if self.recording is None and not conditions:
+            return query
+
+        subquery = select(models.SoundEvent.id).where(*conditions)
+
+        if self.recording is not None:
+            subquery = subquery.join(
+                models.Recording,
+                models.Recording.id == models.SoundEvent.recording_id,
+            ).where(models.Recording.uuid == self.recording)
+
+        return query.where(
+            models.SoundEventAnnotation.sound_event_id.in_(subquery)
+        )
+
+
 CreatedByFilter = base.string_filter(
     models.SoundEventAnnotation.created_by_id,
 )
@@ -162,4 +202,5 @@ SoundEventAnnotationFilter = base.combine(
     task=ClipAnnotationFilter,
     tag=TagFilter,
     created_on=CreatedOnFilter,
+    overlaps=OverlapFilter,
 )
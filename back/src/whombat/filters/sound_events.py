@@ -2,7 +2,7 @@
 
 from uuid import UUID
 
-from sqlalchemy import Select
+from sqlalchemy import ColumnElement, Select
 
 from whombat import models
 from whombat.filters import base
@@ -12,7 +12,9 @@ __all__ = [
     "RecordingFilter",
     "GeometryTypeFilter",
     "CreatedOnFilter",
+    "OverlapFilter",
     "UUIDFilter",
+    "get_overlap_conditions",
 ]
 
 
@@ -70,10 +72,60 @@ class FeatureFilter(base.Filter):
         return query.filter(*conditions)
 
 
+def get_overlap_conditions(
+    start_time: float | None = None,
+    end_time: float | None = None,
+    low_freq: float | None = None,
+    high_freq: float | None = None,
+) -> list[ColumnElement[bool]]:
+    """Get the conditions of sound events that overlap a region.
+
+    The region is compared with the bounding box of the geometry of the
+    sound events. Bounds that are not given leave the region open on
+    that side.
+    """
+    conditions = []
+
+    if end_time is not None:
+        conditions.append(models.SoundEvent.start_time <= end_time)
+
+    if start_time is not None:
+        conditions.append(models.SoundEvent.end_time >= start_time)
+
+    if high_freq is not None:
+        conditions.append(models.SoundEvent.low_freq <= high_freq)
+
+    if low_freq is not None:
+        conditions.append(models.SoundEvent.high_freq >= low_freq)
+
+    return conditions
+
+
+class OverlapFilter(base.Filter):
+    """Filter sound events that overlap a time and frequency region."""
+
+    start_time: float | None = None
+    end_time: float | None = None
+    low_freq: float | None = None
+    high_freq: float | None = None
+
+    def filter(self, query: Select) -> Select:
+        """Filter by overlap with the region."""
+        return query.where(
+            *get_overlap_conditions(
+                start_time=self.start_time,
+                end_time=self.end_time,
+                low_freq=self.low_freq,
+                high_freq=self.high_freq,
+            )
+        )
+
+
 SoundEventFilter = base.combine(
     recording=RecordingFilter,
     geometry_type=GeometryTypeFilter,
     created_on=CreatedOnFilter,
     uuid=UUIDFilter,
     feature=FeatureFilter,
+    overlaps=OverlapFilter,
 )
@@ -7,6 +7,7 @@ from sqlalchemy.engine import URL, Connection, engine_from_config
 from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from whombat import models
+from whombat.models.search import is_search_object
 from whombat.system import get_settings
 from whombat.system.database import get_database_url
 
@@ -27,6 +28,11 @@ if config.config_file_name is not None:
 target_metadata = models.Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to) -> bool:
+    """Skip the search indexes, which are not declared in the models."""
+    return not (reflected and compare_to is None and is_search_object(name))
+
+
 # Check if we should run migrations asynchronously
 should_run_async = config.attributes.get("should_run_async", True)
 
@@ -66,6 +72,7 @@ def run_migrations_offline() -> None:
         target_metadata=target_metadata,
         literal_binds=True,
         compare_type=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
         render_as_batch=True,
     )
@@ -79,6 +86,7 @@ def do_run_migrations(connection: Connection) -> None:
         connection=connection,
         target_metadata=target_metadata,
         compare_type=True,
+        include_object=include_object,
     )
 
     with context.begin_transaction():
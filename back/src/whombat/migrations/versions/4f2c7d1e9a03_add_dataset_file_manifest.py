@@ -0,0 +1,54 @@
+"""Add a manifest of the files of each dataset.
+
+Revision ID: 4f2c7d1e9a03
+Revises: a8a44e0eea11
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+import whombat.models.base
+
+# revision identifiers, used by Alembic.
+revision: str = "4f2c7d1e9a03"
+down_revision: Union[str, None] = "a8a44e0eea11"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dataset_manifest_entry",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("dataset_id", sa.Integer(), nullable=False),
+        sa.Column("path", whombat.models.base.PathType(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("mtime_ns", sa.BigInteger(), nullable=False),
+        sa.Column("hash", sa.String(), nullable=True),
+        sa.Column(
+            "created_on",
+            sa.DateTime().with_variant(
+                sa.TIMESTAMP(timezone=True), "postgresql"
+            ),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["dataset_id"],
+            ["dataset.id"],
+            name=op.f("fk_dataset_manifest_entry_dataset_id_dataset"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_dataset_manifest_entry")),
+        sa.UniqueConstraint(
+            "dataset_id",
+            "path",
+            name=op.f("uq_dataset_manifest_entry_dataset_id"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("dataset_manifest_entry")
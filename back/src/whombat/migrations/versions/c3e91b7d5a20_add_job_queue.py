@@ -0,0 +1,72 @@
+"""Add the table of background jobs.
+
+Revision ID: c3e91b7d5a20
+Revises: 4f2c7d1e9a03
+Create Date: 2026-10-18 14:03:27.118452
+
+"""
+
+from typing import Sequence, Union
+
+import fastapi_users_db_sqlalchemy.generics
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c3e91b7d5a20"
+down_revision: Union[str, None] = "4f2c7d1e9a03"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    datetime_type = sa.DateTime().with_variant(
+        sa.TIMESTAMP(timezone=True), "postgresql"
+    )
+    op.create_table(
+        "job",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column(
+            "uuid",
+            fastapi_users_db_sqlalchemy.generics.GUID(),
+            nullable=False,
+        ),
+        sa.Column("kind", sa.String(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("arguments", sa.JSON(), nullable=False),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.String(), nullable=True),
+        sa.Column("total", sa.Integer(), nullable=False),
+        sa.Column("processed", sa.Integer(), nullable=False),
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False),
+        sa.Column("worker", sa.String(), nullable=True),
+        sa.Column(
+            "created_by_id",
+            fastapi_users_db_sqlalchemy.generics.GUID(),
+            nullable=True,
+        ),
+        sa.Column("started_on", datetime_type, nullable=True),
+        sa.Column("heartbeat_on", datetime_type, nullable=True),
+        sa.Column("finished_on", datetime_type, nullable=True),
+        sa.Column("created_on", datetime_type, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["created_by_id"],
+            ["user.id"],
+            name=op.f("fk_job_created_by_id_user"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_job")),
+        sa.UniqueConstraint("uuid", name=op.f("uq_job_uuid")),
+    )
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.create_index(
+            op.f("ix_job_status"),
+            ["status"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job", schema=None) as batch_op:
+        batch_op.drop_index(op.f("ix_job_status"))
+
+    op.drop_table("job")
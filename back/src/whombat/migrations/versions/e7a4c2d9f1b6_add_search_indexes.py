@@ -0,0 +1,44 @@
+"""Add search indexes to the searchable text columns.
+
+Revision ID: e7a4c2d9f1b6
+Revises: c3e91b7d5a20
+Create Date: 2026-10-18 16:21:44.530817
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+from whombat.models.search import SearchIndex, get_search_backend
+
+# revision identifiers, used by Alembic.
+revision: str = "e7a4c2d9f1b6"
+down_revision: Union[str, None] = "c3e91b7d5a20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    SearchIndex("recording", ("path",)),
+    SearchIndex("dataset", ("name", "description")),
+    SearchIndex("tag", ("key", "value")),
+    SearchIndex("feature_name", ("name",)),
+    SearchIndex("annotation_project", ("name", "description")),
+    SearchIndex("evaluation_set", ("name", "description")),
+    SearchIndex("model_run", ("name", "version")),
+]
+
+
+def upgrade() -> None:
+    backend = get_search_backend(op.get_bind().dialect.name)
+    for index in INDEXES:
+        for statement in backend.get_create_statements(index, populate=True):
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    backend = get_search_backend(op.get_bind().dialect.name)
+    for index in INDEXES:
+        for statement in backend.get_drop_statements(index):
+            op.execute(statement)
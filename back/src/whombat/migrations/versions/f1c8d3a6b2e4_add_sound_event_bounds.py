@@ -0,0 +1,104 @@
+"""Add the bounding box of the geometry of sound events.
+
+Revision ID: f1c8d3a6b2e4
+Revises: e7a4c2d9f1b6
+Create Date: 2026-10-18 17:48:09.214365
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from soundevent import data
+from soundevent.geometry import compute_bounds
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c8d3a6b2e4"
+down_revision: Union[str, None] = "e7a4c2d9f1b6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+BATCH_SIZE = 5000
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("sound_event", schema=None) as batch_op:
+        batch_op.add_column(sa.Column("start_time", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("end_time", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("low_freq", sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column("high_freq", sa.Float(), nullable=True))
+
+    sound_event = sa.table(
+        "sound_event",
+        sa.column("id", sa.Integer()),
+        sa.column("geometry", sa.String()),
+        sa.column("start_time", sa.Float()),
+        sa.column("end_time", sa.Float()),
+        sa.column("low_freq", sa.Float()),
+        sa.column("high_freq", sa.Float()),
+    )
+    connection = op.get_bind()
+    statement = (
+        sa.update(sound_event)
+        .where(sound_event.c.id == sa.bindparam("sound_event_id"))
+        .values(
+            start_time=sa.bindparam("start_time"),
+            end_time=sa.bindparam("end_time"),
+            low_freq=sa.bindparam("low_freq"),
+            high_freq=sa.bindparam("high_freq"),
+        )
+    )
+
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(sound_event.c.id, sound_event.c.geometry)
+            .where(sound_event.c.id > last_id)
+            .order_by(sound_event.c.id)
+            .limit(BATCH_SIZE)
+        ).all()
+
+        if not rows:
+            break
+
+        values = []
+        for id, geometry in rows:
+            start_time, low_freq, end_time, high_freq = compute_bounds(
+                data.geometry_validate(geometry, mode="json")
+            )
+            values.append(
+                {
+                    "sound_event_id": id,
+                    "start_time": start_time,
+                    "end_time": end_time,
+                    "low_freq": low_freq,
+                    "high_freq": high_freq,
+                }
+            )
+
+        connection.execute(statement, values)
+        last_id = rows[-1].id
+
+    with op.batch_alter_table("sound_event", schema=None) as batch_op:
+        batch_op.create_index(
+            "ix_sound_event_recording_bounds",
+            [
+                "recording_id",
+                "start_time",
+                "end_time",
+                "low_freq",
+                "high_freq",
+            ],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("sound_event", schema=None) as batch_op:
+        batch_op.drop_index("ix_sound_event_recording_bounds")
+        batch_op.drop_column("high_freq")
+        batch_op.drop_column("low_freq")
+        batch_op.drop_column("end_time")
+        batch_op.drop_column("start_time")
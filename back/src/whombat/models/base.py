@@ -4,6 +4,7 @@ All whombat models should inherit from this class.
 """
 
 import datetime
+import functools
 import uuid
 from pathlib import Path
 
@@ -11,14 +12,39 @@ import sqlalchemy as sa
 import sqlalchemy.orm as orm
 import sqlalchemy.types as types
 from fastapi_users_db_sqlalchemy.generics import GUID
+from pydantic import TypeAdapter
 from soundevent import data
 from sqlalchemy import MetaData
 from sqlalchemy.ext.asyncio import AsyncAttrs
 
 __all__ = [
     "Base",
+    "decode_geometry",
 ]
 
+GEOMETRY_CACHE_SIZE = 65_536
+"""Maximum number of decoded geometries kept in memory."""
+
+_geometry_adapter: TypeAdapter[data.Geometry] = TypeAdapter(data.Geometry)
+
+
+@functools.lru_cache(maxsize=GEOMETRY_CACHE_SIZE)
+def decode_geometry(value: str) -> data.Geometry:
+    """Decode a geometry stored as JSON.
+
+    The JSON is parsed and validated in a single pass by pydantic-core,
+    instead of being loaded into a dictionary first. The most recently
+    decoded geometries are memoized by their raw string, so the same
+    sound events loaded again, such as the pages of a listing, skip the
+    decoding altogether.
+
+    Notes
+    -----
+    Decoded geometries are shared between the rows with the same raw
+    value, so they must not be mutated in place.
+    """
+    return _geometry_adapter.validate_json(value)
+
 
 class PathType(types.TypeDecorator):
     """SqlAlchemy type for Path objects."""
@@ -55,7 +81,7 @@ class GeometryType(types.TypeDecorator):
     ) -> data.Geometry | None:
         if value is None:
             return value
-        return data.geometry_validate(value, mode="json")
+        return decode_geometry(value)
 
 
 class Base(AsyncAttrs, orm.MappedAsDataclass, orm.DeclarativeBase):
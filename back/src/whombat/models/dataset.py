@@ -18,13 +18,21 @@ from pathlib import Path
 from uuid import UUID, uuid4
 
 import sqlalchemy.orm as orm
-from sqlalchemy import ForeignKey, UniqueConstraint, func, inspect, select
+from sqlalchemy import (
+    BigInteger,
+    ForeignKey,
+    UniqueConstraint,
+    func,
+    inspect,
+    select,
+)
 
 from whombat.models.base import Base
 from whombat.models.recording import Recording
 
 __all__ = [
     "Dataset",
+    "DatasetManifestEntry",
     "DatasetRecording",
 ]
 
@@ -82,6 +90,16 @@ class Dataset(Base):
             default_factory=list,
         )
     )
+    manifest_entries: orm.Mapped[list["DatasetManifestEntry"]] = (
+        orm.relationship(
+            "DatasetManifestEntry",
+            init=False,
+            repr=False,
+            back_populates="dataset",
+            cascade="all, delete-orphan",
+            default_factory=list,
+        )
+    )
 
 
 class DatasetRecording(Base):
@@ -137,6 +155,52 @@ class DatasetRecording(Base):
     )
 
 
+class DatasetManifestEntry(Base):
+    """Dataset Manifest Entry Model.
+
+    An entry of the manifest of the audio files found in the dataset
+    directory the last time it was scanned.
+
+    Notes
+    -----
+    The size and modification time of a file are used to find out whether
+    it has changed since the last scan without reading its contents. The
+    hash is only known for files whose contents have been read, and is
+    recomputed only when the file changes.
+    """
+
+    __tablename__ = "dataset_manifest_entry"
+    __table_args__ = (UniqueConstraint("dataset_id", "path"),)
+
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
+    """The database id of the manifest entry."""
+
+    dataset_id: orm.Mapped[int] = orm.mapped_column(
+        ForeignKey("dataset.id"),
+        nullable=False,
+    )
+    """The id of the dataset."""
+
+    path: orm.Mapped[Path]
+    """The path to the file within the dataset."""
+
+    size: orm.Mapped[int] = orm.mapped_column(BigInteger)
+    """The size of the file in bytes."""
+
+    mtime_ns: orm.Mapped[int] = orm.mapped_column(BigInteger)
+    """The modification time of the file in nanoseconds."""
+
+    hash: orm.Mapped[str | None] = orm.mapped_column(default=None)
+    """The MD5 hash of the file contents, if known."""
+
+    # Relations
+    dataset: orm.Mapped[Dataset] = orm.relationship(
+        init=False,
+        repr=False,
+        back_populates="manifest_entries",
+    )
+
+
 # Add a property to the Dataset model that returns the number of recordings
 # associated with the dataset.
 inspect(Dataset).add_property(
@@ -0,0 +1,106 @@
+"""Job model.
+
+A job is a long-running operation, such as importing a file or
+evaluating a model run, that is run by a worker outside of the HTTP
+request that submitted it.
+
+Jobs are stored in the database, which acts as the queue shared by the
+application and any number of workers. A worker claims a pending job,
+runs it, and stores its progress and outcome in the job row, so that
+clients can follow the job and cancel it while it runs.
+"""
+
+import datetime
+from typing import Any
+from uuid import UUID, uuid4
+
+import sqlalchemy as sa
+import sqlalchemy.orm as orm
+from sqlalchemy import ForeignKey
+
+from whombat.models.base import Base
+
+__all__ = [
+    "Job",
+]
+
+
+class Job(Base):
+    """Job model for job table.
+
+    Notes
+    -----
+    The status of a job is one of "pending", "running", "completed",
+    "failed" or "cancelled". Cancelling a running job only sets the
+    `cancel_requested` flag; the worker running it stops the job and
+    sets its status.
+    """
+
+    __tablename__ = "job"
+
+    id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
+    """The database id of the job."""
+
+    uuid: orm.Mapped[UUID] = orm.mapped_column(
+        default_factory=uuid4,
+        unique=True,
+        kw_only=True,
+    )
+    """The UUID of the job."""
+
+    kind: orm.Mapped[str] = orm.mapped_column(nullable=False)
+    """The kind of job, which selects the handler that runs it."""
+
+    status: orm.Mapped[str] = orm.mapped_column(
+        default="pending",
+        index=True,
+    )
+    """The status of the job."""
+
+    arguments: orm.Mapped[dict[str, Any]] = orm.mapped_column(
+        sa.JSON,
+        default_factory=dict,
+    )
+    """The arguments passed to the job handler."""
+
+    result: orm.Mapped[dict[str, Any] | None] = orm.mapped_column(
+        sa.JSON,
+        default=None,
+    )
+    """The result of the job, once completed."""
+
+    error: orm.Mapped[str | None] = orm.mapped_column(default=None)
+    """The error that stopped the job, if it failed."""
+
+    total: orm.Mapped[int] = orm.mapped_column(default=0)
+    """The number of items the job has to process, if known."""
+
+    processed: orm.Mapped[int] = orm.mapped_column(default=0)
+    """The number of items processed so far."""
+
+    cancel_requested: orm.Mapped[bool] = orm.mapped_column(default=False)
+    """Whether the cancellation of the job has been requested."""
+
+    worker: orm.Mapped[str | None] = orm.mapped_column(default=None)
+    """The name of the worker running the job."""
+
+    created_by_id: orm.Mapped[UUID | None] = orm.mapped_column(
+        ForeignKey("user.id"),
+        default=None,
+    )
+    """The id of the user who submitted the job."""
+
+    started_on: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        default=None,
+    )
+    """When a worker started running the job."""
+
+    heartbeat_on: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        default=None,
+    )
+    """When the worker running the job last reported on it."""
+
+    finished_on: orm.Mapped[datetime.datetime | None] = orm.mapped_column(
+        default=None,
+    )
+    """When the job finished."""
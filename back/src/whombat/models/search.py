@@ -0,0 +1,408 @@
+"""Search indexes over the text columns of the models.
+
+Searching with ``ILIKE '%term%'`` cannot use a regular index because of
+the leading wildcard, so every search scans the whole table. The search
+backends in this module make these searches use an index instead:
+
+* On PostgreSQL, every searchable column gets a ``pg_trgm`` GIN index,
+  which the planner uses for ``ILIKE`` patterns with leading wildcards.
+  Results are ranked by trigram word similarity.
+* On SQLite, the searchable columns of a table are copied into an FTS5
+  table with the trigram tokenizer, kept in sync by triggers. Results
+  are ranked with bm25. Terms shorter than a trigram cannot use the
+  index and fall back to ``LIKE``.
+
+Other databases always fall back to ``ILIKE``.
+
+The indexes are created with the tables, and by a migration on existing
+databases. Queries go through the `match` and `rank` expressions, which
+are compiled by the backend of the database that runs them.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Sequence
+
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Connection,
+    Float,
+    Table,
+    column,
+    event,
+    func,
+    literal,
+    or_,
+    select,
+    table,
+    text,
+)
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.expression import ColumnElement
+
+from whombat.models.base import Base
+
+__all__ = [
+    "SEARCH_INDEXES",
+    "SearchBackend",
+    "SearchIndex",
+    "get_search_backend",
+    "is_search_object",
+    "match",
+    "rank",
+]
+
+
+@dataclass(frozen=True)
+class SearchIndex:
+    """The searchable text columns of a table."""
+
+    table: str
+    """Name of the indexed table."""
+
+    columns: tuple[str, ...]
+    """Names of the searchable columns."""
+
+    key: str = "id"
+    """Name of the integer primary key of the table."""
+
+    @property
+    def name(self) -> str:
+        """Name of the search table or index prefix."""
+        return f"{self.table}_search"
+
+
+SEARCH_INDEXES: dict[str, SearchIndex] = {
+    index.table: index
+    for index in [
+        SearchIndex("recording", ("path",)),
+        SearchIndex("dataset", ("name", "description")),
+        SearchIndex("tag", ("key", "value")),
+        SearchIndex("feature_name", ("name",)),
+        SearchIndex("annotation_project", ("name", "description")),
+        SearchIndex("evaluation_set", ("name", "description")),
+        SearchIndex("model_run", ("name", "version")),
+    ]
+}
+"""Search indexes by table name."""
+
+
+class SearchBackend:
+    """Search without an index.
+
+    The base backend matches terms with ``ILIKE`` and does not rank the
+    results. Subclasses create indexes for the searches.
+    """
+
+    def get_create_statements(
+        self,
+        index: SearchIndex,
+        populate: bool = False,
+    ) -> list[str]:
+        """Get the statements that create a search index.
+
+        Parameters
+        ----------
+        index
+            The search index to create.
+        populate
+            Whether to index the rows that are already in the table.
+
+        Returns
+        -------
+        list[str]
+            The DDL statements to run, in order.
+        """
+        return []
+
+    def get_drop_statements(self, index: SearchIndex) -> list[str]:
+        """Get the statements that drop a search index."""
+        return []
+
+    def match(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> ColumnElement[bool]:
+        """Build the condition of the rows that contain the term."""
+        pattern = f"%{term}%"
+        return or_(*[col.ilike(pattern) for col in columns])
+
+    def rank(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> ColumnElement[float]:
+        """Build the rank of a matching row. Lower ranks come first."""
+        return literal(0.0)
+
+
+class TrigramSearchBackend(SearchBackend):
+    """Search with ``pg_trgm`` GIN indexes on PostgreSQL."""
+
+    def get_create_statements(
+        self,
+        index: SearchIndex,
+        populate: bool = False,
+    ) -> list[str]:
+        return [
+            "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+            *[
+                f"CREATE INDEX IF NOT EXISTS ix_{index.name}_{col} "
+                f'ON {index.table} USING gin ("{col}" gin_trgm_ops)'
+                for col in index.columns
+            ],
+        ]
+
+    def get_drop_statements(self, index: SearchIndex) -> list[str]:
+        return [
+            f"DROP INDEX IF EXISTS ix_{index.name}_{col}"
+            for col in index.columns
+        ]
+
+    def rank(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> ColumnElement[float]:
+        return -func.greatest(
+            *[func.word_similarity(term, col) for col in columns]
+        )
+
+
+class FTS5SearchBackend(SearchBackend):
+    """Search with FTS5 trigram tables on SQLite."""
+
+    min_length: int = 3
+    """Terms shorter than a trigram do not match any row in FTS5."""
+
+    def get_create_statements(
+        self,
+        index: SearchIndex,
+        populate: bool = False,
+    ) -> list[str]:
+        name = index.name
+        columns = ", ".join(f'"{col}"' for col in index.columns)
+        new = ", ".join(f'new."{col}"' for col in index.columns)
+        old = ", ".join(f'old."{col}"' for col in index.columns)
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5("
+            f"{columns}, content='{index.table}', "
+            f"content_rowid='{index.key}', tokenize='trigram')",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_insert "
+            f"AFTER INSERT ON {index.table} BEGIN "
+            f"INSERT INTO {name}(rowid, {columns}) "
+            f"VALUES (new.{index.key}, {new}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_delete "
+            f"AFTER DELETE ON {index.table} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {columns}) "
+            f"VALUES ('delete', old.{index.key}, {old}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {name}_update "
+            f"AFTER UPDATE OF {columns} ON {index.table} BEGIN "
+            f"INSERT INTO {name}({name}, rowid, {columns}) "
+            f"VALUES ('delete', old.{index.key}, {old}); "
+            f"INSERT INTO {name}(rowid, {columns}) "
+            f"VALUES (new.{index.key}, {new}); END",
+        ]
+        if populate:
+            statements.append(f"INSERT INTO {name}({name}) VALUES ('rebuild')")
+        return statements
+
+    def get_drop_statements(self, index: SearchIndex) -> list[str]:
+        name = index.name
+        return [
+            f"DROP TRIGGER IF EXISTS {name}_insert",
+            f"DROP TRIGGER IF EXISTS {name}_delete",
+            f"DROP TRIGGER IF EXISTS {name}_update",
+            f"DROP TABLE IF EXISTS {name}",
+        ]
+
+    def match(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> ColumnElement[bool]:
+        if not self._uses_index(index, columns, term):
+            return super().match(index, columns, term)
+
+        search = self._get_table(index)  # type: ignore
+        key = columns[0].table.c[index.key]  # type: ignore
+        return key.in_(
+            select(search.c.rowid).where(
+                search.c[index.name].match(_quote(term))  # type: ignore
+            )
+        )
+
+    def rank(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> ColumnElement[float]:
+        if not self._uses_index(index, columns, term):
+            return super().rank(index, columns, term)
+
+        search = self._get_table(index)  # type: ignore
+        key = columns[0].table.c[index.key]  # type: ignore
+        return (
+            select(search.c.rank)
+            .where(
+                search.c[index.name].match(_quote(term)),  # type: ignore
+                search.c.rowid == key,
+            )
+            .scalar_subquery()
+        )
+
+    def _uses_index(
+        self,
+        index: SearchIndex | None,
+        columns: Sequence[Column],
+        term: str,
+    ) -> bool:
+        return (
+            index is not None
+            and len(term) >= self.min_length
+            and {col.name for col in columns} == set(index.columns)
+        )
+
+    def _get_table(self, index: SearchIndex):
+        return table(
+            index.name,
+            column("rowid"),
+            column("rank"),
+            column(index.name),
+        )
+
+
+def _quote(term: str) -> str:
+    """Quote a term so that FTS5 matches it as a literal substring."""
+    escaped = term.replace('"', '""')
+    return f'"{escaped}"'
+
+
+def _has_fts5_trigram() -> bool:
+    # The trigram tokenizer was added in SQLite 3.34.
+    return sqlite3.sqlite_version_info >= (3, 34)
+
+
+def get_search_backend(dialect_name: str) -> SearchBackend:
+    """Get the search backend of a database dialect."""
+    if dialect_name == "postgresql":
+        return TrigramSearchBackend()
+
+    if dialect_name == "sqlite" and _has_fts5_trigram():
+        return FTS5SearchBackend()
+
+    return SearchBackend()
+
+
+def is_search_object(name: str | None) -> bool:
+    """Check if a database object belongs to a search index.
+
+    The search tables and indexes are not declared in the models, so
+    they must be skipped when comparing the database with the models.
+    """
+    if name is None:
+        return False
+
+    return any(
+        name.startswith(index.name) or name.startswith(f"ix_{index.name}_")
+        for index in SEARCH_INDEXES.values()
+    )
+
+
+class _SearchExpression(ColumnElement):
+    # NOTE: The term is only bound when the expression is compiled, so
+    # statements with search expressions must not be cached.
+    inherit_cache = False
+
+    def __init__(self, columns: Sequence[Column], term: str):
+        self.columns = list(columns)
+        self.term = term
+        self.index = SEARCH_INDEXES.get(self.columns[0].table.name)  # type: ignore
+
+
+class _Match(_SearchExpression):
+    inherit_cache = False
+    type = Boolean()
+
+
+class _Rank(_SearchExpression):
+    inherit_cache = False
+    type = Float()
+
+
+@compiles(_Match)
+def _compile_match(element: _Match, compiler, **kwargs) -> str:
+    backend = get_search_backend(compiler.dialect.name)
+    return compiler.process(
+        backend.match(element.index, element.columns, element.term),
+        **kwargs,
+    )
+
+
+@compiles(_Rank)
+def _compile_rank(element: _Rank, compiler, **kwargs) -> str:
+    backend = get_search_backend(compiler.dialect.name)
+    return compiler.process(
+        backend.rank(element.index, element.columns, element.term),
+        **kwargs,
+    )
+
+
+def _get_columns(
+    fields: Sequence[Column | InstrumentedAttribute],
+) -> list[Column]:
+    return [
+        field.expression if isinstance(field, InstrumentedAttribute) else field  # type: ignore
+        for field in fields
+    ]
+
+
+def match(
+    fields: Sequence[Column | InstrumentedAttribute],
+    term: str,
+) -> ColumnElement[bool]:
+    """Condition of the rows with the term in any of the fields.
+
+    The fields must belong to the same table. The search index of the
+    table is used if it covers exactly these fields.
+    """
+    return _Match(_get_columns(fields), term)
+
+
+def rank(
+    fields: Sequence[Column | InstrumentedAttribute],
+    term: str,
+) -> ColumnElement[float]:
+    """Relevance of a row for the term. Lower ranks are more relevant."""
+    return _Rank(_get_columns(fields), term)
+
+
+def _create_search_index(target: Table, connection: Connection, **_) -> None:
+    index = SEARCH_INDEXES[target.name]
+    backend = get_search_backend(connection.dialect.name)
+    for statement in backend.get_create_statements(index):
+        connection.execute(text(statement))
+
+
+def _drop_search_index(target: Table, connection: Connection, **_) -> None:
+    index = SEARCH_INDEXES[target.name]
+    backend = get_search_backend(connection.dialect.name)
+    for statement in backend.get_drop_statements(index):
+        connection.execute(text(statement))
+
+
+def register_search_indexes() -> None:
+    """Create and drop the search indexes together with their tables."""
+    for name in SEARCH_INDEXES:
+        target = Base.metadata.tables[name]
+        if not event.contains(target, "after_create", _create_search_index):
+            event.listen(target, "after_create", _create_search_index)
+            event.listen(target, "before_drop", _drop_search_index)
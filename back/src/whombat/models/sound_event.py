@@ -35,7 +35,8 @@ from uuid import UUID, uuid4
 
 import sqlalchemy.orm as orm
 from soundevent import Geometry
-from sqlalchemy import ForeignKey, UniqueConstraint
+from soundevent.geometry import compute_bounds
+from sqlalchemy import ForeignKey, Index, UniqueConstraint, event
 from sqlalchemy.ext.associationproxy import AssociationProxy, association_proxy
 
 from whombat.models.base import Base
@@ -49,18 +50,47 @@ if TYPE_CHECKING:
 __all__ = [
     "SoundEvent",
     "SoundEventFeature",
+    "compute_geometry_bounds",
 ]
 
 
+BOUNDS = ("start_time", "low_freq", "end_time", "high_freq")
+"""Bounding box columns, in the order returned by `compute_bounds`."""
+
+
+def compute_geometry_bounds(geometry: Geometry) -> dict[str, float]:
+    """Compute the bounding box columns of a geometry.
+
+    Geometries without frequency information span all frequencies.
+    """
+    return dict(zip(BOUNDS, compute_bounds(geometry), strict=True))
+
+
 class SoundEvent(Base):
     """Sound Event model.
 
     Notes
     -----
     The geometry attribute is stored as a JSON string in the database.
+    Its bounding box is denormalized into the ``start_time``,
+    ``end_time``, ``low_freq`` and ``high_freq`` columns, so that
+    overlap queries can use an index instead of parsing every geometry.
+    The bounds are computed whenever the geometry of an instance is set.
+    Rows inserted from dictionaries must include them, see
+    `compute_geometry_bounds`.
     """
 
     __tablename__ = "sound_event"
+    __table_args__ = (
+        Index(
+            "ix_sound_event_recording_bounds",
+            "recording_id",
+            "start_time",
+            "end_time",
+            "low_freq",
+            "high_freq",
+        ),
+    )
 
     id: orm.Mapped[int] = orm.mapped_column(primary_key=True, init=False)
     """The database id of the sound event."""
@@ -83,6 +113,18 @@ class SoundEvent(Base):
     geometry: orm.Mapped[Geometry] = orm.mapped_column(nullable=False)
     """The geometry of the mark used to mark the RoI of the sound event."""
 
+    start_time: orm.Mapped[Optional[float]] = orm.mapped_column(init=False)
+    """The start time of the bounding box of the geometry."""
+
+    end_time: orm.Mapped[Optional[float]] = orm.mapped_column(init=False)
+    """The end time of the bounding box of the geometry."""
+
+    low_freq: orm.Mapped[Optional[float]] = orm.mapped_column(init=False)
+    """The lowest frequency of the bounding box of the geometry."""
+
+    high_freq: orm.Mapped[Optional[float]] = orm.mapped_column(init=False)
+    """The highest frequency of the bounding box of the geometry."""
+
     # Relations
     recording: orm.Mapped[Recording] = orm.relationship(
         init=False,
@@ -119,6 +161,20 @@ class SoundEvent(Base):
     )
 
 
+@event.listens_for(SoundEvent.geometry, "set")
+def _update_geometry_bounds(
+    target: SoundEvent,
+    value: Geometry | None,
+    *_,
+) -> None:
+    """Keep the bounding box in sync with the geometry of a sound event."""
+    if value is None:
+        return
+
+    for name, bound in compute_geometry_bounds(value).items():
+        setattr(target, name, bound)
+
+
 class SoundEventFeature(Base):
     """Sound Event Feature model."""
 
@@ -14,6 +14,7 @@ from whombat.routes.datasets import dataset_router
 from whombat.routes.evaluation_sets import get_evaluation_sets_router
 from whombat.routes.evaluations import evaluations_router
 from whombat.routes.features import features_router
+from whombat.routes.jobs import jobs_router
 from whombat.routes.model_runs import get_model_runs_router
 from whombat.routes.notes import notes_router
 from whombat.routes.plugins import plugin_router
@@ -29,6 +30,7 @@ from whombat.routes.sound_event_predictions import (
 )
 from whombat.routes.sound_events import sound_events_router
 from whombat.routes.spectrograms import spectrograms_router
+from whombat.routes.system import system_router
 from whombat.routes.tags import tags_router
 from whombat.routes.user_runs import get_user_runs_router
 from whombat.routes.users import get_users_router
@@ -185,6 +187,13 @@ def get_main_router(settings: Settings):
         tags=["Evaluations"],
     )
 
+    # Background jobs
+    main_router.include_router(
+        jobs_router,
+        prefix="/jobs",
+        tags=["Jobs"],
+    )
+
     # Extensions
     main_router.include_router(
         plugin_router,
@@ -192,4 +201,11 @@ def get_main_router(settings: Settings):
         tags=["Plugins"],
     )
 
+    # System
+    main_router.include_router(
+        system_router,
+        prefix="/system",
+        tags=["System"],
+    )
+
     return main_router
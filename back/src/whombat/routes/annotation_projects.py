@@ -1,18 +1,25 @@
 """REST API routes for annotation projects."""
 
-from typing import Annotated
-from uuid import UUID
+import datetime
+import zlib
+from typing import Annotated, AsyncIterator
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Depends, UploadFile
-from fastapi.responses import Response
-from soundevent.io.aoef import to_aeof
+from fastapi import APIRouter, Depends, Query, UploadFile
+from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
 from whombat.api.io import aoef
 from whombat.filters.annotation_projects import AnnotationProjectFilter
-from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.dependencies import (
+    Session,
+    SessionMaker,
+    WhombatSettings,
+    Worker,
+)
 from whombat.routes.dependencies.auth import get_current_user_dependency
-from whombat.routes.types import Limit, Offset
+from whombat.routes.jobs import save_job_file, submit_job
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "get_annotation_projects_router",
@@ -36,19 +43,17 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
     ):
         """Get a page of annotation projects."""
-        projects, total = await api.annotation_projects.get_many(
+        return await api.annotation_projects.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
-        )
-        return schemas.Page(
-            items=projects,
-            total=total,
-            limit=limit,
-            offset=offset,
+            cursor=cursor,
+            count_mode=count,
         )
 
     @annotation_projects_router.post(
@@ -171,45 +176,89 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return project
 
-    @annotation_projects_router.get(
-        "/detail/download/",
-        response_model=schemas.Page[schemas.Recording],
-    )
+    @annotation_projects_router.get("/detail/download/")
     async def download_annotation_project(
         session: Session,
+        session_maker: SessionMaker,
         annotation_project_uuid: UUID,
-        settings: WhombatSettings,
-    ):
-        """Export an annotation project."""
-        audio_dir = settings.audio_dir
+        compress: Annotated[
+            bool,
+            Query(description="Compress the exported file with gzip."),
+        ] = False,
+    ) -> StreamingResponse:
+        """Export an annotation project.
 
-        whombat_project = await api.annotation_projects.get(
+        The project is written in the AOEF format and streamed while it
+        is read from the database, so that large projects can be exported
+        without holding them in memory.
+        """
+        project = await api.annotation_projects.get(
             session,
             annotation_project_uuid,
         )
 
-        base_dir = await api.annotation_projects.get_base_dir(
-            session,
-            whombat_project,
-        )
+        async def content() -> AsyncIterator[bytes]:
+            # NOTE: The session of the request is closed once the response
+            # starts, so the export runs in a session of its own.
+            async with session_maker() as export_session:
+                async for chunk in aoef.export_annotation_project(
+                    export_session,
+                    project,
+                ):
+                    yield chunk
 
-        project = await api.annotation_projects.to_soundevent(
-            session,
-            whombat_project,
-            audio_dir=audio_dir / base_dir,
-        )
+        created_on = datetime.datetime.now().isoformat()
+        filename = f"{project.name}_{created_on}.json"
+        media_type = "application/json"
+        chunks = content()
+
+        if compress:
+            filename = f"{filename}.gz"
+            media_type = "application/gzip"
+            chunks = compress_chunks(chunks)
 
-        obj = to_aeof(project, audio_dir=audio_dir / base_dir)
-        filename = f"{project.name}_{obj.created_on.isoformat()}.json"
-        return Response(
-            obj.model_dump_json(),
-            media_type="application/json",
+        return StreamingResponse(
+            chunks,
+            media_type=media_type,
             status_code=200,
             headers={
                 "Content-Disposition": f"attachment; filename={filename}"
             },
         )
 
+    @annotation_projects_router.post(
+        "/detail/download/job/",
+        response_model=schemas.Job,
+        status_code=202,
+    )
+    async def export_annotation_project_job(
+        session: Session,
+        worker: Worker,
+        annotation_project_uuid: UUID,
+        compress: Annotated[
+            bool,
+            Query(description="Compress the exported file with gzip."),
+        ] = False,
+    ):
+        """Export an annotation project in a background job.
+
+        Download the exported file with `GET /jobs/detail/download/` once
+        the job has completed.
+        """
+        project = await api.annotation_projects.get(
+            session,
+            annotation_project_uuid,
+        )
+        return await submit_job(
+            session,
+            worker,
+            "export_annotation_project",
+            arguments=dict(
+                annotation_project_uuid=str(project.uuid),
+                compress=compress,
+            ),
+        )
+
     @annotation_projects_router.post(
         "/import/",
         response_model=schemas.AnnotationProject,
@@ -232,4 +281,40 @@ def get_annotation_projects_router(settings: WhombatSettings) -> APIRouter:
         await session.refresh(db_project)
         return schemas.AnnotationProject.model_validate(db_project)
 
+    @annotation_projects_router.post(
+        "/import/job/",
+        response_model=schemas.Job,
+        status_code=202,
+    )
+    async def import_annotation_project_job(
+        settings: WhombatSettings,
+        session: Session,
+        worker: Worker,
+        annotation_project: UploadFile,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Import an annotation project in a background job."""
+        job_uuid = uuid4()
+        filename = await save_job_file(settings, job_uuid, annotation_project)
+        return await submit_job(
+            session,
+            worker,
+            "import_annotation_project",
+            arguments=dict(filename=filename),
+            created_by=user,
+            uuid=job_uuid,
+        )
+
     return annotation_projects_router
+
+
+async def compress_chunks(
+    chunks: AsyncIterator[bytes],
+) -> AsyncIterator[bytes]:
+    """Compress a stream of bytes into a gzip stream."""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -11,7 +11,7 @@ from whombat.filters.annotation_tasks import AnnotationTaskFilter
 from whombat.filters.clips import UUIDFilter as ClipUUIDFilter
 from whombat.routes.dependencies import Session, get_current_user_dependency
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "get_annotation_tasks_router",
@@ -76,21 +76,19 @@ def get_annotation_tasks_router(settings: WhombatSettings) -> APIRouter:
         filter: Annotated[AnnotationTaskFilter, Depends(AnnotationTaskFilter)],  # type: ignore
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
         sort_by: str = "-created_on",
     ):
         """Get a page of annotation tasks."""
-        tasks, total = await api.annotation_tasks.get_many(
+        return await api.annotation_tasks.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
             sort_by=sort_by,
-        )
-        return schemas.Page(
-            items=tasks,
-            total=total,
-            limit=limit,
-            offset=offset,
+            cursor=cursor,
+            count_mode=count,
         )
 
     @annotation_tasks_router.delete(
@@ -1,6 +1,7 @@
 """REST API routes for audio."""
 
 from io import BytesIO
+from pathlib import Path
 from typing import Annotated
 from uuid import UUID
 
@@ -9,7 +10,14 @@ from fastapi import APIRouter, Depends, Header, Response
 from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
-from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.core.file_pool import PoolStats
+from whombat.routes.dependencies import (
+    AudioFilePool,
+    Executor,
+    Session,
+    TaskRunner,
+    WhombatSettings,
+)
 
 __all__ = ["audio_router"]
 
@@ -22,6 +30,9 @@ CHUNK_SIZE = 1024 * 256
 async def stream_recording_audio(
     session: Session,
     settings: WhombatSettings,
+    pool: AudioFilePool,
+    executor: Executor,
+    run_task: TaskRunner,
     recording_uuid: UUID,
     start_time: float | None = None,
     end_time: float | None = None,
@@ -59,13 +70,16 @@ async def stream_recording_audio(
     if end_time is not None:
         end_time = end_time * recording.time_expansion
 
-    data, start, end, filesize = api.load_clip_bytes(
+    data, start, end, filesize = await run_task(
+        api.load_clip_bytes,
         path=audio_dir / recording.path,
         start=start,
         frames=CHUNK_SIZE,
         speed=speed * recording.time_expansion,
         start_time=start_time,
         end_time=end_time,
+        # NOTE: Open files cannot be shared with worker processes.
+        pool=pool if executor.kind == "thread" else None,
     )
 
     headers = {
@@ -81,10 +95,21 @@ async def stream_recording_audio(
     )
 
 
+@audio_router.get("/stream/pool/", response_model=PoolStats)
+async def get_audio_file_pool_stats(pool: AudioFilePool) -> PoolStats:
+    """Get the usage counters of the pool of open audio files.
+
+    Use the hit and miss counts to size the pool with the
+    `audio_file_pool_size` setting.
+    """
+    return pool.stats
+
+
 @audio_router.get("/download/")
 async def download_recording_audio(
     session: Session,
     settings: WhombatSettings,
+    run_task: TaskRunner,
     recording_uuid: UUID,
     audio_parameters: Annotated[
         schemas.AudioParameters,  # type: ignore
@@ -120,7 +145,8 @@ async def download_recording_audio(
     """
     recording = await api.recordings.get(session, recording_uuid)
 
-    audio = api.load_audio(
+    content = await run_task(
+        encode_audio,
         recording,
         start_time=start_time,
         end_time=end_time,
@@ -128,18 +154,34 @@ async def download_recording_audio(
         audio_dir=settings.audio_dir,
     )
 
-    # Get the samplerate and recording ID.
-    samplerate = int(1 / audio.time.attrs["step"])
-    id = audio.attrs["recording_id"]
-
-    # Write the audio to a buffer.
-    buffer = BytesIO()
-    sf.write(buffer, audio.data, samplerate, format="WAV")
-    buffer.seek(0)
-
     # Return the audio.
     return StreamingResponse(
-        content=buffer,
+        content=BytesIO(content),
         media_type="audio/wav",
-        headers={"Content-Disposition": f"attachment; filename={id}.wav"},
+        headers={
+            "Content-Disposition": f"attachment; filename={recording.uuid}.wav"
+        },
     )
+
+
+def encode_audio(
+    recording: schemas.Recording,
+    start_time: float | None,
+    end_time: float | None,
+    audio_parameters: schemas.AudioParameters,
+    audio_dir: Path,
+) -> bytes:
+    """Load and process the audio of a recording and encode it as WAV."""
+    audio = api.load_audio(
+        recording,
+        start_time=start_time,
+        end_time=end_time,
+        audio_parameters=audio_parameters,
+        audio_dir=audio_dir,
+    )
+
+    samplerate = int(1 / audio.time.attrs["step"])
+
+    buffer = BytesIO()
+    sf.write(buffer, audio.data, samplerate, format="WAV")
+    return buffer.getvalue()
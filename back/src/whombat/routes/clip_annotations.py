@@ -9,7 +9,7 @@ from whombat import api, schemas
 from whombat.filters.clip_annotations import ClipAnnotationFilter
 from whombat.routes.dependencies import Session, get_current_user_dependency
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset, Profile
 
 __all__ = [
     "get_clip_annotations_router",
@@ -41,7 +41,15 @@ def get_clip_annotations_router(settings: WhombatSettings) -> APIRouter:
 
     @clip_annotations_router.get(
         "/",
-        response_model=schemas.Page[schemas.ClipAnnotation],
+        # NOTE: Items are serialized with the schema of the requested
+        # loading profile.
+        response_model=None,
+        responses={
+            200: {
+                "model": schemas.Page[schemas.ClipAnnotation]
+                | schemas.Page[schemas.ClipAnnotationSummary]
+            }
+        },
     )
     async def get_clip_annotations(
         session: Session,
@@ -51,24 +59,21 @@ def get_clip_annotations_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
+        profile: Profile = "detail",
         sort_by: str = "-created_on",
     ):
         """Get a page of annotation clip_annotations."""
-        (
-            clip_annotations,
-            total,
-        ) = await api.clip_annotations.get_many(
+        return await api.clip_annotations.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
             sort_by=sort_by,
-        )
-        return schemas.Page(
-            items=clip_annotations,
-            total=total,
-            limit=limit,
-            offset=offset,
+            cursor=cursor,
+            count_mode=count,
+            profile=profile,
         )
 
     @clip_annotations_router.get(
@@ -150,6 +155,31 @@ def get_clip_annotations_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return clip_annotation
 
+    @clip_annotations_router.post(
+        "/tags/",
+        response_model=schemas.BulkUpdate[schemas.ClipAnnotation],
+    )
+    async def add_annotations_tags(
+        session: Session,
+        data: schemas.TagsAdd,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+        return_objects: bool = False,
+    ):
+        """Add several tags to several clip annotations."""
+        tags = [
+            await api.tags.get(session, (tag.key, tag.value))
+            for tag in data.tags
+        ]
+        response = await api.clip_annotations.add_tags(
+            session,
+            data.uuids,
+            tags,
+            user,
+            return_objects=return_objects,
+        )
+        await session.commit()
+        return response
+
     @clip_annotations_router.delete(
         "/detail/tags/",
         response_model=schemas.ClipAnnotation,
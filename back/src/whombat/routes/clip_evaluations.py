@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.clip_evaluations import ClipEvaluationFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 clip_evaluations_router = APIRouter()
 
@@ -28,23 +28,18 @@ async def get_clip_evaluations(
         Depends(ClipEvaluationFilter),
     ],
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     limit: Limit = 100,
 ) -> schemas.Page[schemas.ClipEvaluation]:
     """Get a page of clip evaluations."""
-    (
-        clip_evaluations,
-        total,
-    ) = await api.clip_evaluations.get_many(
+    return await api.clip_evaluations.get_page(
         session=session,
         offset=offset,
         limit=limit,
         filters=[filter],
-    )
-    return schemas.Page(
-        items=clip_evaluations,
-        offset=offset,
-        limit=limit,
-        total=total,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
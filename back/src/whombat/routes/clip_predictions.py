@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.clip_predictions import ClipPredictionFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset, Profile
 
 __all__ = [
     "clip_predictions_router",
@@ -51,7 +51,15 @@ async def create_clip_prediction(
 
 @clip_predictions_router.get(
     "/",
-    response_model=schemas.Page[schemas.ClipPrediction],
+    # NOTE: Items are serialized with the schema of the requested
+    # loading profile.
+    response_model=None,
+    responses={
+        200: {
+            "model": schemas.Page[schemas.ClipPrediction]
+            | schemas.Page[schemas.ClipPredictionSummary]
+        }
+    },
 )
 async def get_clip_predictions(
     session: Session,
@@ -61,24 +69,21 @@ async def get_clip_predictions(
     ],
     limit: Limit = 10,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
+    profile: Profile = "detail",
     sort_by: str = "-created_on",
 ):
     """Get a page of clip predictions."""
-    (
-        clip_predictions,
-        total,
-    ) = await api.clip_predictions.get_many(
+    return await api.clip_predictions.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=clip_predictions,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        profile=profile,
     )
 
 
@@ -9,7 +9,7 @@ from whombat import api, schemas
 from whombat.filters.clips import ClipFilter
 from whombat.filters.recordings import UUIDFilter as RecordingUUIDFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset, Profile
 
 __all__ = [
     "clips_router",
@@ -21,7 +21,15 @@ clips_router = APIRouter()
 
 @clips_router.get(
     "/",
-    response_model=schemas.Page[schemas.Clip],
+    # NOTE: Items are serialized with the schema of the requested
+    # loading profile.
+    response_model=None,
+    responses={
+        200: {
+            "model": schemas.Page[schemas.Clip]
+            | schemas.Page[schemas.ClipSummary]
+        }
+    },
 )
 async def get_clips(
     session: Session,
@@ -31,21 +39,21 @@ async def get_clips(
     ],
     limit: Limit = 10,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
+    profile: Profile = "detail",
     sort_by: str = "-created_on",
 ):
     """Get a page of clips."""
-    tasks, total = await api.clips.get_many(
+    return await api.clips.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=tasks,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count_mode=count,
+        profile=profile,
     )
 
 
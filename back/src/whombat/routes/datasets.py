@@ -3,19 +3,27 @@
 import datetime
 import logging
 from io import StringIO
+from pathlib import Path
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from fastapi import APIRouter, Body, Depends, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, UploadFile
 from fastapi.responses import Response, StreamingResponse
 from pydantic import DirectoryPath
 from soundevent.io.aoef import DatasetObject
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from whombat import api, exceptions, schemas
 from whombat.filters.datasets import DatasetFilter
-from whombat.routes.dependencies import Session, WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.dependencies import (
+    Session,
+    SessionMaker,
+    WhombatSettings,
+    Worker,
+)
+from whombat.routes.jobs import save_job_file, submit_job
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "dataset_router",
@@ -50,20 +58,17 @@ async def get_datasets(
     ],
     limit: Limit = 10,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
 ):
     """Get a page of datasets."""
-    datasets, total = await api.datasets.get_many(
+    return await api.datasets.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
-    )
-
-    return schemas.Page(
-        items=datasets,
-        total=total,
-        offset=offset,
-        limit=limit,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
@@ -86,6 +91,34 @@ async def create_dataset(
     return created
 
 
+@dataset_router.post(
+    "/job/",
+    response_model=schemas.Job,
+    status_code=202,
+)
+async def create_dataset_job(
+    session: Session,
+    worker: Worker,
+    dataset: schemas.DatasetCreate,
+):
+    """Create a new dataset in a background job.
+
+    The files of the dataset are registered by the job. Follow its
+    progress with `GET /jobs/detail/`; the uuid of the dataset is part of
+    the result of the job.
+    """
+    return await submit_job(
+        session,
+        worker,
+        "create_dataset",
+        arguments=dict(
+            name=dataset.name,
+            description=dataset.description,
+            audio_dir=str(dataset.audio_dir),
+        ),
+    )
+
+
 @dataset_router.patch(
     "/detail/",
     response_model=schemas.Dataset,
@@ -108,11 +141,93 @@ async def update_dataset(
 )
 async def get_file_state(
     session: Session,
+    settings: WhombatSettings,
+    dataset_uuid: UUID,
+    quick: bool = False,
+):
+    """Get the status of the files in a dataset.
+
+    In quick mode the files are compared to the manifest of the last scan
+    without reading their contents or updating the manifest.
+    """
+    dataset = await api.datasets.get(session, dataset_uuid)
+    state = await api.datasets.get_state(
+        session,
+        dataset,
+        audio_dir=settings.audio_dir,
+        quick=quick,
+    )
+    await session.commit()
+    return state
+
+
+@dataset_router.get(
+    "/detail/registration/",
+    response_model=schemas.DatasetRegistration,
+)
+async def get_dataset_registration(
+    session: Session,
+    dataset_uuid: UUID,
+):
+    """Get the progress of the registration of the files of a dataset."""
+    dataset = await api.datasets.get(session, dataset_uuid)
+    return api.datasets.get_registration(dataset)
+
+
+@dataset_router.post(
+    "/detail/registration/",
+    response_model=schemas.DatasetRegistration,
+    status_code=202,
+)
+async def register_dataset_files(
+    session: Session,
+    session_maker: SessionMaker,
+    settings: WhombatSettings,
+    background_tasks: BackgroundTasks,
     dataset_uuid: UUID,
 ):
-    """Get the status of the files in a dataset."""
+    """Register the unregistered files of a dataset in the background.
+
+    Use this to pick up files added to the dataset directory or to resume
+    a registration that was interrupted. Files that are already
+    registered are not processed again. Follow the progress with
+    `GET /datasets/detail/registration/`.
+    """
     dataset = await api.datasets.get(session, dataset_uuid)
-    return await api.datasets.get_state(session, dataset)
+
+    try:
+        registration = api.datasets.get_registration(dataset)
+        if registration.status == "running":
+            return registration
+    except exceptions.NotFoundError:
+        pass
+
+    background_tasks.add_task(
+        register_files,
+        session_maker,
+        dataset,
+        settings.audio_dir,
+    )
+    return schemas.DatasetRegistration(dataset_uuid=dataset.uuid)
+
+
+async def register_files(
+    session_maker: async_sessionmaker[AsyncSession],
+    dataset: schemas.Dataset,
+    audio_dir: Path,
+) -> None:
+    """Register the files of a dataset with a new session."""
+    async with session_maker() as session:
+        try:
+            await api.datasets.register_files(
+                session,
+                dataset,
+                audio_dir=audio_dir,
+            )
+        except Exception:
+            logger.exception(
+                "Failed to register the files of dataset %s", dataset.uuid
+            )
 
 
 @dataset_router.delete(
@@ -207,3 +322,27 @@ async def import_dataset(
         dataset_audio_dir=audio_dir,
         audio_dir=settings.audio_dir,
     )
+
+
+@dataset_router.post(
+    "/import/job/",
+    response_model=schemas.Job,
+    status_code=202,
+)
+async def import_dataset_job(
+    settings: WhombatSettings,
+    session: Session,
+    worker: Worker,
+    dataset: UploadFile,
+    audio_dir: Annotated[DirectoryPath, Body()],
+):
+    """Import a dataset in a background job."""
+    job_uuid = uuid4()
+    filename = await save_job_file(settings, job_uuid, dataset)
+    return await submit_job(
+        session,
+        worker,
+        "import_dataset",
+        arguments=dict(filename=filename, audio_dir=str(audio_dir)),
+        uuid=job_uuid,
+    )
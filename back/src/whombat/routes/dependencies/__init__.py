@@ -1,13 +1,25 @@
 """Common FastAPI dependencies for whombat."""
 
 from whombat.routes.dependencies.auth import get_current_user_dependency
-from whombat.routes.dependencies.session import Session
+from whombat.routes.dependencies.cache import (
+    AudioFilePool,
+    SpectrogramCache,
+)
+from whombat.routes.dependencies.executor import Executor, TaskRunner
+from whombat.routes.dependencies.jobs import Worker
+from whombat.routes.dependencies.session import Session, SessionMaker
 from whombat.routes.dependencies.settings import WhombatSettings
 from whombat.routes.dependencies.users import get_user_db, get_user_manager
 
 __all__ = [
+    "AudioFilePool",
+    "Executor",
     "Session",
+    "SessionMaker",
+    "SpectrogramCache",
+    "TaskRunner",
     "WhombatSettings",
+    "Worker",
     "get_user_db",
     "get_user_manager",
     "get_current_user_dependency",
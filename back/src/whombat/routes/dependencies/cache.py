@@ -0,0 +1,29 @@
+"""Cache dependencies."""
+
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from whombat.core.disk_cache import DiskCache
+from whombat.core.file_pool import SoundFilePool
+
+__all__ = [
+    "AudioFilePool",
+    "SpectrogramCache",
+]
+
+
+def get_spectrogram_cache(request: Request) -> DiskCache:
+    """Get the spectrogram image cache created on application startup."""
+    return request.app.state.spectrogram_cache
+
+
+SpectrogramCache = Annotated[DiskCache, Depends(get_spectrogram_cache)]
+
+
+def get_audio_file_pool(request: Request) -> SoundFilePool:
+    """Get the pool of open audio files created on application startup."""
+    return request.app.state.audio_file_pool
+
+
+AudioFilePool = Annotated[SoundFilePool, Depends(get_audio_file_pool)]
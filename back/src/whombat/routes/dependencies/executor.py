@@ -0,0 +1,46 @@
+"""Executor dependencies."""
+
+import functools
+from typing import Annotated, Any, Awaitable, Callable
+
+from fastapi import Depends, Request
+
+from whombat.core.executor import TaskExecutor
+from whombat.routes.dependencies.settings import WhombatSettings
+
+__all__ = [
+    "Executor",
+    "TaskRunner",
+]
+
+
+def get_executor(request: Request) -> TaskExecutor:
+    """Get the executor of blocking tasks created on application startup."""
+    return request.app.state.executor
+
+
+Executor = Annotated[TaskExecutor, Depends(get_executor)]
+
+
+def get_task_runner(
+    request: Request,
+    executor: Executor,
+    settings: WhombatSettings,
+) -> Callable[..., Awaitable[Any]]:
+    """Get a function that runs blocking work for the current request.
+
+    The work runs in the application executor with the configured
+    deadline and is cancelled if the client disconnects before it
+    finishes.
+    """
+    return functools.partial(
+        executor.run,
+        timeout=settings.task_timeout,
+        is_abandoned=request.is_disconnected,
+    )
+
+
+TaskRunner = Annotated[
+    Callable[..., Awaitable[Any]],
+    Depends(get_task_runner),
+]
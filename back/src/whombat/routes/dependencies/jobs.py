@@ -0,0 +1,19 @@
+"""Background job dependencies."""
+
+from typing import Annotated
+
+from fastapi import Depends, Request
+
+from whombat.system.jobs import JobWorker
+
+__all__ = [
+    "Worker",
+]
+
+
+def get_job_worker(request: Request) -> JobWorker:
+    """Get the worker of background jobs created on application startup."""
+    return request.app.state.job_worker
+
+
+Worker = Annotated[JobWorker, Depends(get_job_worker)]
@@ -2,27 +2,32 @@
 
 from typing import Annotated, AsyncGenerator
 
-from fastapi import Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import Depends, Request
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.system.database import (
-    create_async_db_engine,
-    get_async_session,
-    get_database_url,
-)
+__all__ = ["Session", "SessionMaker"]
 
-__all__ = ["Session"]
+
+def get_session_maker(request: Request) -> async_sessionmaker[AsyncSession]:
+    """Get the session factory created on application startup."""
+    return request.app.state.session_maker
 
 
 async def async_session(
-    settings: WhombatSettings,
+    session_maker: Annotated[
+        async_sessionmaker[AsyncSession],
+        Depends(get_session_maker),
+    ],
 ) -> AsyncGenerator[AsyncSession, None]:
     """Get an async session for the database."""
-    url = get_database_url(settings)
-    engine = create_async_db_engine(url)
-    async with get_async_session(engine) as session:
+    async with session_maker() as session:
         yield session
 
 
 Session = Annotated[AsyncSession, Depends(async_session)]
+
+
+SessionMaker = Annotated[
+    async_sessionmaker[AsyncSession],
+    Depends(get_session_maker),
+]
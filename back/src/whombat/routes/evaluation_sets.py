@@ -2,7 +2,7 @@
 
 import json
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Body, Depends, UploadFile
 from fastapi.responses import Response
@@ -11,9 +11,10 @@ from soundevent.io.aoef import to_aeof
 from whombat import api, schemas
 from whombat.api.io import aoef
 from whombat.filters.evaluation_sets import EvaluationSetFilter
-from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.dependencies import Session, WhombatSettings, Worker
 from whombat.routes.dependencies.auth import get_current_user_dependency
-from whombat.routes.types import Limit, Offset
+from whombat.routes.jobs import save_job_file, submit_job
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "get_evaluation_sets_router",
@@ -38,19 +39,17 @@ def get_evaluation_sets_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
     ):
         """Get a page of evaluation sets."""
-        projects, total = await api.evaluation_sets.get_many(
+        return await api.evaluation_sets.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
-        )
-        return schemas.Page(
-            items=projects,
-            total=total,
-            limit=limit,
-            offset=offset,
+            cursor=cursor,
+            count_mode=count,
         )
 
     @evaluation_sets_router.post(
@@ -297,4 +296,29 @@ def get_evaluation_sets_router(settings: WhombatSettings) -> APIRouter:
         await session.refresh(db_dataset)
         return schemas.EvaluationSet.model_validate(db_dataset)
 
+    @evaluation_sets_router.post(
+        "/import/job/",
+        response_model=schemas.Job,
+        status_code=202,
+    )
+    async def import_evaluation_set_job(
+        settings: WhombatSettings,
+        session: Session,
+        worker: Worker,
+        evaluation_set: UploadFile,
+        task: Annotated[str, Body()],
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Import an evaluation set in a background job."""
+        job_uuid = uuid4()
+        filename = await save_job_file(settings, job_uuid, evaluation_set)
+        return await submit_job(
+            session,
+            worker,
+            "import_evaluation_set",
+            arguments=dict(filename=filename, task=task),
+            created_by=user,
+            uuid=job_uuid,
+        )
+
     return evaluation_sets_router
@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.evaluations import EvaluationFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 evaluations_router = APIRouter()
 
@@ -28,23 +28,18 @@ async def get_evaluations(
         Depends(EvaluationFilter),
     ],
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     limit: Limit = 100,
 ) -> schemas.Page[schemas.Evaluation]:
     """Get a page of evaluations."""
-    (
-        evaluations,
-        total,
-    ) = await api.evaluations.get_many(
+    return await api.evaluations.get_page(
         session=session,
         offset=offset,
         limit=limit,
         filters=[filter],
-    )
-    return schemas.Page(
-        items=evaluations,
-        offset=offset,
-        limit=limit,
-        total=total,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.feature_names import FeatureNameFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "features_router",
@@ -26,17 +26,22 @@ async def get_features_names(
     ],
     limit: Limit = 100,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
 ) -> schemas.Page[str]:
     """Get list of features names."""
-    feature_names, total = await api.features.get_many(
+    page = await api.features.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
+        cursor=cursor,
+        count_mode=count,
     )
     return schemas.Page(
-        items=[feature_name.name for feature_name in feature_names],
-        total=total,
-        offset=offset,
-        limit=limit,
+        items=[feature_name.name for feature_name in page.items],
+        total=page.total,
+        offset=page.offset,
+        limit=page.limit,
+        next_cursor=page.next_cursor,
     )
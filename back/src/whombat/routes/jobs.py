@@ -0,0 +1,179 @@
+"""REST API routes for background jobs."""
+
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Annotated, Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, UploadFile
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, schemas
+from whombat.api.jobs import FINISHED_STATUSES
+from whombat.filters.jobs import JobFilter
+from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.types import Count, Cursor, Limit, Offset
+from whombat.system.jobs import JobWorker, get_job_directory
+from whombat.system.settings import Settings
+
+__all__ = [
+    "jobs_router",
+    "save_job_file",
+    "submit_job",
+]
+
+jobs_router = APIRouter()
+
+
+@jobs_router.get(
+    "/",
+    response_model=schemas.Page[schemas.Job],
+)
+async def get_jobs(
+    session: Session,
+    filter: Annotated[
+        JobFilter,  # type: ignore
+        Depends(JobFilter),
+    ],
+    limit: Limit = 10,
+    offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
+):
+    """Get a page of jobs."""
+    return await api.jobs.get_page(
+        session,
+        limit=limit,
+        offset=offset,
+        filters=[filter],
+        cursor=cursor,
+        count_mode=count,
+    )
+
+
+@jobs_router.get(
+    "/detail/",
+    response_model=schemas.Job,
+)
+async def get_job(
+    session: Session,
+    job_uuid: UUID,
+):
+    """Get a job by UUID, including its status and progress."""
+    return await api.jobs.get(session, job_uuid)
+
+
+@jobs_router.post(
+    "/detail/cancel/",
+    response_model=schemas.Job,
+)
+async def cancel_job(
+    session: Session,
+    job_uuid: UUID,
+):
+    """Cancel a job.
+
+    Pending jobs are cancelled right away. Running jobs are stopped by
+    their worker shortly after.
+    """
+    job = await api.jobs.get(session, job_uuid)
+    cancelled = await api.jobs.cancel(session, job)
+    await session.commit()
+    return cancelled
+
+
+@jobs_router.get("/detail/download/")
+async def download_job_file(
+    session: Session,
+    settings: WhombatSettings,
+    job_uuid: UUID,
+) -> FileResponse:
+    """Download the file produced by a completed job."""
+    job = await api.jobs.get(session, job_uuid)
+
+    if job.status != "completed" or not job.result or "file" not in job.result:
+        raise exceptions.NotFoundError(
+            f"Job {job_uuid} has not produced a file."
+        )
+
+    path = get_job_directory(settings, job.uuid) / "outputs"
+    return FileResponse(
+        path / job.result["file"],
+        media_type=job.result.get("media_type"),
+        filename=job.result.get("filename"),
+    )
+
+
+@jobs_router.delete(
+    "/detail/",
+    response_model=schemas.Job,
+)
+async def delete_job(
+    session: Session,
+    settings: WhombatSettings,
+    job_uuid: UUID,
+):
+    """Delete a finished job and its files."""
+    job = await api.jobs.get(session, job_uuid)
+
+    if job.status not in FINISHED_STATUSES:
+        raise exceptions.DataIntegrityError(
+            "Cannot delete a job that has not finished. Cancel the job and "
+            "wait for it to stop before deleting it."
+        )
+
+    deleted = await api.jobs.delete(session, job)
+    await session.commit()
+    await asyncio.to_thread(
+        shutil.rmtree,
+        get_job_directory(settings, job.uuid),
+        ignore_errors=True,
+    )
+    return deleted
+
+
+async def submit_job(
+    session: AsyncSession,
+    worker: JobWorker,
+    kind: str,
+    arguments: dict[str, Any] | None = None,
+    created_by: schemas.SimpleUser | None = None,
+    **kwargs,
+) -> schemas.Job:
+    """Submit a job and let the worker of the application know."""
+    job = await api.jobs.submit(
+        session,
+        kind,
+        arguments=arguments,
+        created_by=created_by,
+        **kwargs,
+    )
+    await session.commit()
+    worker.notify()
+    return job
+
+
+async def save_job_file(
+    settings: Settings,
+    job_uuid: UUID,
+    upload: UploadFile,
+) -> str:
+    """Store a file uploaded with a job in the input directory of the job.
+
+    Returns
+    -------
+    str
+        The name of the stored file within the input directory.
+    """
+    input_dir = get_job_directory(settings, job_uuid) / "inputs"
+    filename = "upload" + Path(upload.filename or "").suffix
+
+    def save() -> None:
+        input_dir.mkdir(parents=True, exist_ok=True)
+        with open(input_dir / filename, "wb") as fp:
+            shutil.copyfileobj(upload.file, fp)
+
+    await asyncio.to_thread(save)
+    return filename
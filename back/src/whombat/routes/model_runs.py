@@ -1,16 +1,17 @@
 """REST API routes for model runs."""
 
 from typing import Annotated
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from fastapi import APIRouter, Body, Depends, UploadFile
 
 from whombat import api, schemas
 from whombat.api.io import aoef
 from whombat.filters.model_runs import ModelRunFilter
-from whombat.routes.dependencies import Session, WhombatSettings
+from whombat.routes.dependencies import Session, WhombatSettings, Worker
 from whombat.routes.dependencies.auth import get_current_user_dependency
-from whombat.routes.types import Limit, Offset
+from whombat.routes.jobs import save_job_file, submit_job
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "get_model_runs_router",
@@ -31,19 +32,17 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 100,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
     ) -> schemas.Page[schemas.ModelRun]:
         """Get list of model runs."""
-        model_runs, total = await api.model_runs.get_many(
+        return await api.model_runs.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
-        )
-        return schemas.Page(
-            items=model_runs,
-            total=total,
-            offset=offset,
-            limit=limit,
+            cursor=cursor,
+            count_mode=count,
         )
 
     @model_runs_router.get("/detail/", response_model=schemas.ModelRun)
@@ -97,7 +96,6 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         session: Session,
         model_run_uuid: UUID,
         evaluation_set_uuid: UUID,
-        settings: WhombatSettings,
         user: Annotated[schemas.SimpleUser, Depends(active_user)],
     ) -> schemas.Evaluation:
         model_run = await api.model_runs.get(session, model_run_uuid)
@@ -108,12 +106,38 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
             session,
             model_run,
             evaluation_set,
-            audio_dir=settings.audio_dir,
-            user=user,
         )
         await session.commit()
         return evaluation
 
+    @model_runs_router.post(
+        "/detail/evaluate/job/",
+        response_model=schemas.Job,
+        status_code=202,
+    )
+    async def evaluate_model_run_job(
+        session: Session,
+        worker: Worker,
+        model_run_uuid: UUID,
+        evaluation_set_uuid: UUID,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+    ):
+        """Evaluate a model run in a background job."""
+        model_run = await api.model_runs.get(session, model_run_uuid)
+        evaluation_set = await api.evaluation_sets.get(
+            session, evaluation_set_uuid
+        )
+        return await submit_job(
+            session,
+            worker,
+            "evaluate_model_run",
+            arguments=dict(
+                model_run_uuid=str(model_run.uuid),
+                evaluation_set_uuid=str(evaluation_set.uuid),
+            ),
+            created_by=user,
+        )
+
     @model_runs_router.delete("/detail/", response_model=schemas.ModelRun)
     async def delete_model_run(
         session: Session,
@@ -157,4 +181,34 @@ def get_model_runs_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return data
 
+    @model_runs_router.post(
+        "/import/job/",
+        response_model=schemas.Job,
+        status_code=202,
+    )
+    async def import_model_run_job(
+        session: Session,
+        worker: Worker,
+        model_run: UploadFile,
+        evaluation_set_uuid: Annotated[UUID, Body()],
+        settings: WhombatSettings,
+    ):
+        """Import a model run in a background job."""
+        evaluation_set = await api.evaluation_sets.get(
+            session,
+            evaluation_set_uuid,
+        )
+        job_uuid = uuid4()
+        filename = await save_job_file(settings, job_uuid, model_run)
+        return await submit_job(
+            session,
+            worker,
+            "import_model_run",
+            arguments=dict(
+                filename=filename,
+                evaluation_set_uuid=str(evaluation_set.uuid),
+            ),
+            uuid=job_uuid,
+        )
+
     return model_runs_router
@@ -13,7 +13,7 @@ from whombat.filters.sound_event_annotation_notes import (
     SoundEventAnnotationNoteFilter,
 )
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "notes_router",
@@ -34,21 +34,19 @@ async def get_notes(
     ],
     limit: Limit = 100,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     sort_by: str | None = "-created_on",
 ):
     """Get all tags."""
-    notes, total = await api.notes.get_many(
+    return await api.notes.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=notes,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
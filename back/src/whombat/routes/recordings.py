@@ -9,7 +9,7 @@ from whombat import api, schemas
 from whombat.filters.recordings import RecordingFilter
 from whombat.routes.dependencies import Session, get_current_user_dependency
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset, Profile
 
 __all__ = [
     "get_recording_router",
@@ -24,8 +24,15 @@ def get_recording_router(settings: WhombatSettings) -> APIRouter:
 
     @recording_router.get(
         "/",
-        response_model=schemas.Page[schemas.Recording],
-        response_model_exclude_none=True,
+        # NOTE: Items are serialized with the schema of the requested
+        # loading profile.
+        response_model=None,
+        responses={
+            200: {
+                "model": schemas.Page[schemas.Recording]
+                | schemas.Page[schemas.RecordingSummary]
+            }
+        },
     )
     async def get_recordings(
         session: Session,
@@ -35,21 +42,21 @@ def get_recording_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
+        profile: Profile = "detail",
         sort_by: str = "-created_on",
     ):
         """Get a page of datasets."""
-        datasets, total = await api.recordings.get_many(
+        return await api.recordings.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
             sort_by=sort_by,
-        )
-        return schemas.Page(
-            items=datasets,
-            total=total,
-            offset=offset,
-            limit=limit,
+            cursor=cursor,
+            count_mode=count,
+            profile=profile,
         )
 
     @recording_router.get(
@@ -98,6 +105,30 @@ def get_recording_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return response
 
+    @recording_router.post(
+        "/tags/",
+        response_model=schemas.BulkUpdate[schemas.Recording],
+        response_model_exclude_none=True,
+    )
+    async def add_recordings_tags(
+        session: Session,
+        data: schemas.TagsAdd,
+        return_objects: bool = False,
+    ):
+        """Add several tags to several recordings."""
+        tags = [
+            await api.tags.get(session, (tag.key, tag.value))
+            for tag in data.tags
+        ]
+        response = await api.recordings.add_tags(
+            session,
+            data.uuids,
+            tags,
+            return_objects=return_objects,
+        )
+        await session.commit()
+        return response
+
     @recording_router.delete(
         "/detail/tags/",
         response_model=schemas.Recording,
@@ -178,6 +209,26 @@ def get_recording_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return response
 
+    @recording_router.post(
+        "/features/",
+        response_model=schemas.BulkUpdate[schemas.Recording],
+        response_model_exclude_none=True,
+    )
+    async def add_recordings_features(
+        session: Session,
+        data: schemas.FeaturesAdd,
+        return_objects: bool = False,
+    ):
+        """Add several features to several recordings."""
+        response = await api.recordings.add_features(
+            session,
+            data.uuids,
+            data.features,
+            return_objects=return_objects,
+        )
+        await session.commit()
+        return response
+
     @recording_router.delete(
         "/detail/features/",
         response_model=schemas.Recording,
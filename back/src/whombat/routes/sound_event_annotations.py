@@ -1,19 +1,29 @@
 """REST API routes for sound_event_annotations."""
 
-from typing import Annotated
+from typing import Annotated, AsyncIterator
 from uuid import UUID
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
 
 from whombat import api, schemas
+from whombat.api.scatterplots.columns import (
+    COLUMNS_MEDIA_TYPE,
+    encode_columns,
+)
 from whombat.api.scatterplots.sound_event_annotations import (
     ScatterPlotData,
     get_scatterplot_data,
+    iter_scatterplot_columns,
 )
 from whombat.filters.sound_event_annotations import SoundEventAnnotationFilter
-from whombat.routes.dependencies import Session, get_current_user_dependency
+from whombat.routes.dependencies import (
+    Session,
+    SessionMaker,
+    get_current_user_dependency,
+)
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset, Profile
 
 __all__ = [
     "get_sound_event_annotations_router",
@@ -103,7 +113,15 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
 
     @sound_event_annotations_router.get(
         "/",
-        response_model=schemas.Page[schemas.SoundEventAnnotation],
+        # NOTE: Items are serialized with the schema of the requested
+        # loading profile.
+        response_model=None,
+        responses={
+            200: {
+                "model": schemas.Page[schemas.SoundEventAnnotation]
+                | schemas.Page[schemas.SoundEventAnnotationSummary]
+            }
+        },
     )
     async def get_sound_event_annotations(
         session: Session,
@@ -113,24 +131,21 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
         ],
         limit: Limit = 10,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
+        profile: Profile = "detail",
         sort_by: str = "-created_on",
     ):
         """Get a page of annotation sound_event_annotations."""
-        (
-            sound_event_annotations,
-            total,
-        ) = await api.sound_event_annotations.get_many(
+        return await api.sound_event_annotations.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
             sort_by=sort_by,
-        )
-        return schemas.Page(
-            items=sound_event_annotations,
-            total=total,
-            limit=limit,
-            offset=offset,
+            cursor=cursor,
+            count_mode=count,
+            profile=profile,
         )
 
     @sound_event_annotations_router.patch(
@@ -201,6 +216,31 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
         await session.commit()
         return sound_event_annotation
 
+    @sound_event_annotations_router.post(
+        "/tags/",
+        response_model=schemas.BulkUpdate[schemas.SoundEventAnnotation],
+    )
+    async def add_annotations_tags(
+        session: Session,
+        data: schemas.TagsAdd,
+        user: Annotated[schemas.SimpleUser, Depends(active_user)],
+        return_objects: bool = False,
+    ):
+        """Add several tags to several sound event annotations."""
+        tags = [
+            await api.tags.get(session, (tag.key, tag.value))
+            for tag in data.tags
+        ]
+        response = await api.sound_event_annotations.add_tags(
+            session,
+            data.uuids,
+            tags,
+            user,
+            return_objects=return_objects,
+        )
+        await session.commit()
+        return response
+
     @sound_event_annotations_router.delete(
         "/detail/tags/",
         response_model=schemas.SoundEventAnnotation,
@@ -304,4 +344,35 @@ def get_sound_event_annotations_router(settings: WhombatSettings) -> APIRouter:
             offset=offset,
         )
 
+    @sound_event_annotations_router.get("/scatter_plot/columns/")
+    async def get_scatter_plot_columns(
+        session_maker: SessionMaker,
+        filter: Annotated[
+            SoundEventAnnotationFilter,  # type: ignore
+            Depends(SoundEventAnnotationFilter),
+        ],
+        features: Annotated[
+            list[str] | None,
+            Query(description="Names of the features to include."),
+        ] = None,
+    ) -> StreamingResponse:
+        """Stream the scatter plot data of all the matching annotations.
+
+        The data is sent in a columnar binary format, a frame per batch of
+        annotations, as described in `whombat.api.scatterplots.columns`.
+        """
+
+        async def content() -> AsyncIterator[bytes]:
+            # NOTE: The session of the request is closed once the response
+            # starts, so the data is read in a session of its own.
+            async with session_maker() as columns_session:
+                async for columns in iter_scatterplot_columns(
+                    columns_session,
+                    filters=[filter],
+                    feature_names=features,
+                ):
+                    yield encode_columns(columns)
+
+        return StreamingResponse(content(), media_type=COLUMNS_MEDIA_TYPE)
+
     return sound_event_annotations_router
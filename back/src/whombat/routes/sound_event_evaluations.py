@@ -7,7 +7,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.sound_event_evaluations import SoundEventEvaluationFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 sound_event_evaluations_router = APIRouter()
 
@@ -26,21 +26,16 @@ async def get_sound_event_evaluations(
         SoundEventEvaluationFilter, Depends(SoundEventEvaluationFilter)  # type: ignore
     ],
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     limit: Limit = 100,
 ) -> schemas.Page[schemas.SoundEventEvaluation]:
     """Get a page of sound event evaluations."""
-    (
-        sound_event_evaluations,
-        total,
-    ) = await api.sound_event_evaluations.get_many(
+    return await api.sound_event_evaluations.get_page(
         session=session,
         offset=offset,
         limit=limit,
         filters=[filter],
-    )
-    return schemas.Page(
-        items=sound_event_evaluations,
-        offset=offset,
-        limit=limit,
-        total=total,
+        cursor=cursor,
+        count_mode=count,
     )
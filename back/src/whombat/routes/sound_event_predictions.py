@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.sound_event_predictions import SoundEventPredictionFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "sound_event_predictions_router",
@@ -59,24 +59,19 @@ async def get_sound_event_predictions(
     ],
     limit: Limit = 10,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     sort_by: str = "-created_on",
 ):
     """Get a page of sound event predictions."""
-    (
-        sound_event_predictions,
-        total,
-    ) = await api.sound_event_predictions.get_many(
+    return await api.sound_event_predictions.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=sound_event_predictions,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
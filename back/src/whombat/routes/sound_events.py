@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from whombat import api, schemas
 from whombat.filters.sound_events import SoundEventFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "sound_events_router",
@@ -39,21 +39,19 @@ async def get_sound_events(
     filter: Annotated[SoundEventFilter, Depends(SoundEventFilter)],  # type: ignore
     limit: Limit = 10,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     sort_by: str = "-created_on",
 ):
     """Get a page of sound events."""
-    datasets, total = await api.sound_events.get_many(
+    return await api.sound_events.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=datasets,
-        total=total,
-        offset=offset,
-        limit=limit,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
@@ -1,18 +1,54 @@
 """REST API routes for spectrograms."""
 
+from pathlib import Path
 from typing import Annotated
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Response
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    Header,
+    Query,
+    Response,
+)
 
-from whombat import api, schemas
-from whombat.core import images
-from whombat.routes.dependencies import Session, WhombatSettings
+from whombat import api, exceptions, schemas
+from whombat.api.spectrograms import MAX_TILE_LEVEL, MIN_TILE_LEVEL
+from whombat.core.disk_cache import DiskCache
+from whombat.core.executor import TaskExecutor
+from whombat.core.pyramids import SpectrogramPyramid
+from whombat.routes.dependencies import (
+    Executor,
+    Session,
+    SpectrogramCache,
+    TaskRunner,
+    WhombatSettings,
+)
+from whombat.system.data import get_whombat_pyramid_dir
+from whombat.system.settings import Settings
 
 __all__ = ["spectrograms_router"]
 
 spectrograms_router = APIRouter()
 
+CACHE_CONTROL = "private, no-cache"
+"""Cache-Control header of spectrogram responses.
+
+Browsers may store the images but must revalidate them with the ETag
+before reuse. Revalidation does not require computing the spectrogram.
+"""
+
+MAX_PREFETCH = 16
+"""Maximum number of tiles that can be prefetched in a single request."""
+
+TileLevel = Annotated[
+    int,
+    Query(ge=MIN_TILE_LEVEL, le=MAX_TILE_LEVEL),
+]
+
+TileIndex = Annotated[int, Query(ge=0)]
+
 
 @spectrograms_router.get(
     "/",
@@ -20,6 +56,8 @@ spectrograms_router = APIRouter()
 async def get_spectrogram(
     session: Session,
     settings: WhombatSettings,
+    cache: SpectrogramCache,
+    run_task: TaskRunner,
     recording_uuid: UUID,
     start_time: float,
     end_time: float,
@@ -30,6 +68,7 @@ async def get_spectrogram(
         schemas.SpectrogramParameters,
         Depends(schemas.SpectrogramParameters),
     ],
+    if_none_match: Annotated[str | None, Header()] = None,
 ) -> Response:
     """Get a spectrogram for a recording.
 
@@ -54,32 +93,322 @@ async def get_spectrogram(
     """
     recording = await api.recordings.get(session, recording_uuid)
 
-    data = api.compute_spectrogram(
+    key = api.get_spectrogram_key(
         recording,
         start_time,
         end_time,
         audio_parameters,
         spectrogram_parameters,
-        audio_dir=settings.audio_dir,
+        image_format=settings.spectrogram_image_format,
+        compression_level=settings.spectrogram_compression_level,
     )
+    etag = f'"{key}"'
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
 
-    # Normalize.
-    if spectrogram_parameters.normalize:
-        data_min = data.min()
-        data_max = data.max()
-        data = data - data_min
-        data_range = data_max - data_min
-        if data_range > 0:
-            data = data / data_range
-
-    image = images.array_to_image(
-        data,
-        cmap=spectrogram_parameters.cmap,
+    if _matches_etag(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    content = cache.get(key)
+
+    if content is None:
+        content = await run_task(
+            api.compute_spectrogram_image,
+            recording,
+            start_time,
+            end_time,
+            audio_parameters,
+            spectrogram_parameters,
+            audio_dir=settings.audio_dir,
+            pyramid_dir=get_pyramid_dir(settings),
+            max_frames=settings.spectrogram_max_frames,
+            image_format=settings.spectrogram_image_format,
+            compression_level=settings.spectrogram_compression_level,
+        )
+        cache.set(key, content)
+
+    return Response(
+        content=content,
+        media_type=f"image/{settings.spectrogram_image_format}",
+        headers=headers,
     )
 
-    buffer = images.image_to_buffer(image)
+
+@spectrograms_router.get(
+    "/tiles/",
+)
+async def get_spectrogram_tile(
+    session: Session,
+    settings: WhombatSettings,
+    cache: SpectrogramCache,
+    executor: Executor,
+    run_task: TaskRunner,
+    background_tasks: BackgroundTasks,
+    recording_uuid: UUID,
+    level: TileLevel,
+    index: TileIndex,
+    audio_parameters: Annotated[
+        schemas.AudioParameters, Depends(schemas.AudioParameters)
+    ],
+    spectrogram_parameters: Annotated[
+        schemas.SpectrogramParameters,
+        Depends(schemas.SpectrogramParameters),
+    ],
+    prefetch: Annotated[int, Query(ge=0, le=MAX_PREFETCH)] = 0,
+    if_none_match: Annotated[str | None, Header()] = None,
+) -> Response:
+    """Get a spectrogram tile of a recording.
+
+    Tiles lie on a fixed time grid: at zoom level `level` every tile
+    lasts `2 ** level` seconds and the tile `index` starts at `index`
+    times that duration. Since the tiles do not depend on the viewport,
+    different viewers request the same tiles and can share the cache.
+
+    Tiles are computed with extra audio on each side so that adjacent
+    tiles join without seams. Note that relative normalization
+    (`normalize=true`) scales each tile independently; use absolute
+    normalization for a continuous amplitude scale across tiles.
+
+    Parameters
+    ----------
+    session : Session
+        SQLAlchemy session.
+    recording_uuid : UUID
+        Recording UUID.
+    level : int
+        Zoom level of the tile.
+    index : int
+        Index of the tile within the zoom level.
+    prefetch : int
+        Number of subsequent tiles to compute in the background after the
+        response is sent, so that they are cached when requested.
+
+    Returns
+    -------
+    Response
+        Spectrogram tile image.
+    """
+    recording = await api.recordings.get(session, recording_uuid)
+
+    tile_count = api.get_tile_count(recording, level)
+    if index >= tile_count:
+        raise exceptions.NotFoundError(
+            f"Tile {index} at level {level} is outside the recording."
+        )
+
+    start_time, end_time = api.get_tile_bounds(level, index)
+    padding = api.get_tile_padding(spectrogram_parameters)
+
+    key = api.get_spectrogram_key(
+        recording,
+        start_time,
+        end_time,
+        audio_parameters,
+        spectrogram_parameters,
+        padding=padding,
+        image_format=settings.spectrogram_image_format,
+        compression_level=settings.spectrogram_compression_level,
+    )
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": CACHE_CONTROL,
+        "X-Tile-Count": str(tile_count),
+    }
+
+    if prefetch > 0:
+        background_tasks.add_task(
+            prefetch_tiles,
+            cache,
+            executor,
+            recording,
+            level,
+            range(index + 1, min(index + 1 + prefetch, tile_count)),
+            audio_parameters,
+            spectrogram_parameters,
+            settings,
+        )
+
+    if _matches_etag(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    content = cache.get(key)
+
+    if content is None:
+        content = await run_task(
+            api.compute_spectrogram_image,
+            recording,
+            start_time,
+            end_time,
+            audio_parameters,
+            spectrogram_parameters,
+            audio_dir=settings.audio_dir,
+            padding=padding,
+            pyramid_dir=get_pyramid_dir(settings),
+            max_frames=settings.spectrogram_max_frames,
+            image_format=settings.spectrogram_image_format,
+            compression_level=settings.spectrogram_compression_level,
+        )
+        cache.set(key, content)
 
     return Response(
-        content=buffer.read(),
-        media_type="image/png",
+        content=content,
+        media_type=f"image/{settings.spectrogram_image_format}",
+        headers=headers,
+    )
+
+
+async def prefetch_tiles(
+    cache: DiskCache,
+    executor: TaskExecutor,
+    recording: schemas.Recording,
+    level: int,
+    indices: range,
+    audio_parameters: schemas.AudioParameters,
+    spectrogram_parameters: schemas.SpectrogramParameters,
+    settings: Settings,
+) -> None:
+    """Compute and cache spectrogram tiles that are not yet cached.
+
+    Tiles are computed one at a time in the executor, so prefetching
+    never takes more than one slot away from interactive requests.
+    """
+    padding = api.get_tile_padding(spectrogram_parameters)
+
+    for index in indices:
+        start_time, end_time = api.get_tile_bounds(level, index)
+        key = api.get_spectrogram_key(
+            recording,
+            start_time,
+            end_time,
+            audio_parameters,
+            spectrogram_parameters,
+            padding=padding,
+            image_format=settings.spectrogram_image_format,
+            compression_level=settings.spectrogram_compression_level,
+        )
+
+        if key in cache:
+            continue
+
+        try:
+            content = await executor.run(
+                api.compute_spectrogram_image,
+                recording,
+                start_time,
+                end_time,
+                audio_parameters,
+                spectrogram_parameters,
+                audio_dir=settings.audio_dir,
+                padding=padding,
+                pyramid_dir=get_pyramid_dir(settings),
+                max_frames=settings.spectrogram_max_frames,
+                image_format=settings.spectrogram_image_format,
+                compression_level=settings.spectrogram_compression_level,
+                timeout=settings.task_timeout,
+            )
+        except exceptions.TaskTimeoutError:
+            return
+
+        cache.set(key, content)
+
+
+@spectrograms_router.get(
+    "/pyramids/",
+    response_model=schemas.SpectrogramPyramid,
+)
+async def get_spectrogram_pyramid(
+    session: Session,
+    settings: WhombatSettings,
+    recording_uuid: UUID,
+    audio_parameters: Annotated[
+        schemas.AudioParameters, Depends(schemas.AudioParameters)
+    ],
+    spectrogram_parameters: Annotated[
+        schemas.SpectrogramParameters,
+        Depends(schemas.SpectrogramParameters),
+    ],
+) -> schemas.SpectrogramPyramid:
+    """Get the status of the spectrogram pyramid of a recording."""
+    recording = await api.recordings.get(session, recording_uuid)
+    pyramid = api.get_spectrogram_pyramid(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        get_pyramid_dir(settings),
     )
+    return _get_pyramid_status(pyramid)
+
+
+@spectrograms_router.post(
+    "/pyramids/",
+    response_model=schemas.SpectrogramPyramid,
+    status_code=202,
+)
+async def build_spectrogram_pyramid(
+    session: Session,
+    settings: WhombatSettings,
+    background_tasks: BackgroundTasks,
+    recording_uuid: UUID,
+    audio_parameters: Annotated[
+        schemas.AudioParameters, Depends(schemas.AudioParameters)
+    ],
+    spectrogram_parameters: Annotated[
+        schemas.SpectrogramParameters,
+        Depends(schemas.SpectrogramParameters),
+    ],
+) -> schemas.SpectrogramPyramid:
+    """Build the spectrogram pyramid of a recording in the background.
+
+    Once built, spectrograms of long time windows of the recording that
+    use the same parameters are read from the pyramid instead of being
+    computed from the audio.
+    """
+    recording = await api.recordings.get(session, recording_uuid)
+    pyramid_dir = get_pyramid_dir(settings)
+    pyramid = api.get_spectrogram_pyramid(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir,
+    )
+
+    if pyramid is None:
+        background_tasks.add_task(
+            api.build_spectrogram_pyramid,
+            recording,
+            audio_parameters,
+            spectrogram_parameters,
+            pyramid_dir=pyramid_dir,
+            audio_dir=settings.audio_dir,
+        )
+
+    return _get_pyramid_status(pyramid)
+
+
+def get_pyramid_dir(settings: Settings) -> Path:
+    """Get the directory where spectrogram pyramids are stored."""
+    if settings.spectrogram_pyramid_dir is not None:
+        return settings.spectrogram_pyramid_dir
+
+    return get_whombat_pyramid_dir()
+
+
+def _get_pyramid_status(
+    pyramid: SpectrogramPyramid | None,
+) -> schemas.SpectrogramPyramid:
+    if pyramid is None:
+        return schemas.SpectrogramPyramid()
+
+    return schemas.SpectrogramPyramid(
+        ready=True,
+        num_levels=pyramid.info.num_levels,
+        num_frames=pyramid.info.num_frames,
+        hop_duration=pyramid.info.hop_duration,
+    )
+
+
+def _matches_etag(etag: str, if_none_match: str | None) -> bool:
+    if if_none_match is None:
+        return False
+
+    return etag in [tag.strip() for tag in if_none_match.split(",")]
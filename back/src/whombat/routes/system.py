@@ -0,0 +1,46 @@
+"""REST API routes for the status of the running application."""
+
+from fastapi import APIRouter
+
+from whombat.api.common.cache import CacheStats, object_cache
+from whombat.api.common.counts import count_cache
+from whombat.core.executor import ExecutorStats
+from whombat.routes.dependencies import Executor
+
+__all__ = [
+    "system_router",
+]
+
+system_router = APIRouter()
+
+
+@system_router.get(
+    "/executor/",
+    response_model=ExecutorStats,
+)
+async def get_executor_stats(executor: Executor) -> ExecutorStats:
+    """Get the usage counters of the executor of blocking tasks.
+
+    A persistently non-zero `queued` count means that audio and
+    spectrogram requests wait for a free worker; consider increasing the
+    `executor_workers` and `executor_max_concurrency` settings.
+    """
+    return executor.stats
+
+
+@system_router.get(
+    "/cache/",
+    response_model=CacheStats,
+)
+async def get_object_cache_stats() -> CacheStats:
+    """Get the usage counters of the in-memory API object cache."""
+    return object_cache.stats
+
+
+@system_router.get(
+    "/count_cache/",
+    response_model=CacheStats,
+)
+async def get_count_cache_stats() -> CacheStats:
+    """Get the usage counters of the cache of listing counts."""
+    return count_cache.stats
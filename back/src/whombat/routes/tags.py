@@ -12,7 +12,7 @@ from whombat.filters.sound_event_annotation_tags import (
 )
 from whombat.filters.tags import TagFilter
 from whombat.routes.dependencies import Session
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 tags_router = APIRouter()
 
@@ -23,21 +23,19 @@ async def get_tags(
     filter: Annotated[TagFilter, Depends(TagFilter)],  # type: ignore
     limit: Limit = 100,
     offset: Offset = 0,
+    cursor: Cursor = None,
+    count: Count = None,
     sort_by: str | None = "value",
 ):
     """Get all tags."""
-    tags, total = await api.tags.get_many(
+    return await api.tags.get_page(
         session,
         limit=limit,
         offset=offset,
         filters=[filter],
         sort_by=sort_by,
-    )
-    return schemas.Page(
-        items=tags,
-        total=total,
-        limit=limit,
-        offset=offset,
+        cursor=cursor,
+        count_mode=count,
     )
 
 
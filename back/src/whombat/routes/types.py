@@ -4,9 +4,14 @@ from typing import Annotated
 
 from fastapi import Query
 
+from whombat.api.common import CountMode, LoadingProfileName
+
 __all__ = [
+    "Count",
+    "Cursor",
     "Limit",
     "Offset",
+    "Profile",
 ]
 
 MAX_PAGE_SIZE = 10000
@@ -21,3 +26,38 @@ Offset = Annotated[
     int,
     Query(ge=0),
 ]
+
+
+Cursor = Annotated[
+    str | None,
+    Query(
+        description=(
+            "Cursor returned with the previous page. Pass an empty cursor"
+            " to get the first page using cursor pagination."
+        ),
+    ),
+]
+
+
+Count = Annotated[
+    CountMode | None,
+    Query(
+        description=(
+            "How to count the total number of items. Cached and estimated"
+            " counts are faster on large listings. By default, pages are"
+            " counted exactly, unless using a cursor."
+        ),
+    ),
+]
+
+
+Profile = Annotated[
+    LoadingProfileName,
+    Query(
+        description=(
+            "Which version of the items to return. The summary profile"
+            " returns lighter items that leave out nested collections,"
+            " and is faster to load."
+        ),
+    ),
+]
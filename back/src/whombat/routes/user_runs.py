@@ -9,7 +9,7 @@ from whombat import api, schemas
 from whombat.filters.user_runs import UserRunFilter
 from whombat.routes.dependencies import Session, get_current_user_dependency
 from whombat.routes.dependencies.settings import WhombatSettings
-from whombat.routes.types import Limit, Offset
+from whombat.routes.types import Count, Cursor, Limit, Offset
 
 __all__ = [
     "get_user_runs_router",
@@ -28,19 +28,17 @@ def get_user_runs_router(settings: WhombatSettings) -> APIRouter:
         filter: Annotated[UserRunFilter, Depends(UserRunFilter)],  # type: ignore
         limit: Limit = 100,
         offset: Offset = 0,
+        cursor: Cursor = None,
+        count: Count = None,
     ) -> schemas.Page[schemas.UserRun]:
         """Get list of model runs."""
-        user_runs, total = await api.user_runs.get_many(
+        return await api.user_runs.get_page(
             session,
             limit=limit,
             offset=offset,
             filters=[filter],
-        )
-        return schemas.Page(
-            items=user_runs,
-            total=total,
-            offset=offset,
-            limit=limit,
+            cursor=cursor,
+            count_mode=count,
         )
 
     @user_runs_router.post("/", response_model=schemas.UserRun)
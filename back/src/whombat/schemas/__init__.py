@@ -26,11 +26,12 @@ from whombat.schemas.annotation_tasks import (
     AnnotationTaskUpdate,
 )
 from whombat.schemas.audio import AudioParameters
-from whombat.schemas.base import BaseSchema, Page
+from whombat.schemas.base import BaseSchema, BulkUpdate, Page
 from whombat.schemas.clip_annotations import (
     ClipAnnotation,
     ClipAnnotationCreate,
     ClipAnnotationNote,
+    ClipAnnotationSummary,
     ClipAnnotationTag,
     ClipAnnotationUpdate,
 )
@@ -42,16 +43,19 @@ from whombat.schemas.clip_evaluations import (
 from whombat.schemas.clip_predictions import (
     ClipPrediction,
     ClipPredictionCreate,
+    ClipPredictionSummary,
     ClipPredictionTag,
     ClipPredictionUpdate,
 )
-from whombat.schemas.clips import Clip, ClipCreate, ClipUpdate
+from whombat.schemas.clips import Clip, ClipCreate, ClipSummary, ClipUpdate
 from whombat.schemas.datasets import (
     Dataset,
     DatasetCreate,
     DatasetFile,
+    DatasetManifestEntry,
     DatasetRecording,
     DatasetRecordingCreate,
+    DatasetRegistration,
     DatasetUpdate,
     FileState,
 )
@@ -70,7 +74,9 @@ from whombat.schemas.features import (
     FeatureName,
     FeatureNameCreate,
     FeatureNameUpdate,
+    FeaturesAdd,
 )
+from whombat.schemas.jobs import Job, JobCreate, JobStatus, JobUpdate
 from whombat.schemas.model_runs import ModelRun, ModelRunCreate, ModelRunUpdate
 from whombat.schemas.notes import Note, NoteCreate, NoteUpdate
 from whombat.schemas.plugin import PluginInfo
@@ -78,6 +84,7 @@ from whombat.schemas.recordings import (
     Recording,
     RecordingCreate,
     RecordingNote,
+    RecordingSummary,
     RecordingTag,
     RecordingUpdate,
 )
@@ -85,6 +92,7 @@ from whombat.schemas.sound_event_annotations import (
     SoundEventAnnotation,
     SoundEventAnnotationCreate,
     SoundEventAnnotationNote,
+    SoundEventAnnotationSummary,
     SoundEventAnnotationTag,
     SoundEventAnnotationUpdate,
 )
@@ -108,6 +116,7 @@ from whombat.schemas.spectrograms import (
     AmplitudeParameters,
     Scale,
     SpectrogramParameters,
+    SpectrogramPyramid,
     STFTParameters,
     Window,
 )
@@ -116,6 +125,7 @@ from whombat.schemas.tags import (
     Tag,
     TagCount,
     TagCreate,
+    TagsAdd,
     TagUpdate,
 )
 from whombat.schemas.user_runs import UserRun, UserRunCreate, UserRunUpdate
@@ -134,10 +144,12 @@ __all__ = [
     "AnnotationTaskUpdate",
     "AudioParameters",
     "BaseSchema",
+    "BulkUpdate",
     "Clip",
     "ClipAnnotation",
     "ClipAnnotationCreate",
     "ClipAnnotationNote",
+    "ClipAnnotationSummary",
     "ClipAnnotationTag",
     "ClipAnnotationUpdate",
     "ClipCreate",
@@ -146,14 +158,18 @@ __all__ = [
     "ClipEvaluationUpdate",
     "ClipPrediction",
     "ClipPredictionCreate",
+    "ClipPredictionSummary",
     "ClipPredictionTag",
     "ClipPredictionUpdate",
+    "ClipSummary",
     "ClipUpdate",
     "Dataset",
     "DatasetCreate",
     "DatasetFile",
+    "DatasetManifestEntry",
     "DatasetRecording",
     "DatasetRecordingCreate",
+    "DatasetRegistration",
     "DatasetUpdate",
     "Evaluation",
     "EvaluationCreate",
@@ -165,7 +181,12 @@ __all__ = [
     "FeatureName",
     "FeatureNameCreate",
     "FeatureNameUpdate",
+    "FeaturesAdd",
     "FileState",
+    "Job",
+    "JobCreate",
+    "JobStatus",
+    "JobUpdate",
     "ModelRun",
     "ModelRunCreate",
     "ModelRunUpdate",
@@ -179,6 +200,7 @@ __all__ = [
     "Recording",
     "RecordingCreate",
     "RecordingNote",
+    "RecordingSummary",
     "RecordingTag",
     "RecordingUpdate",
     "STFTParameters",
@@ -188,6 +210,7 @@ __all__ = [
     "SoundEventAnnotation",
     "SoundEventAnnotationCreate",
     "SoundEventAnnotationNote",
+    "SoundEventAnnotationSummary",
     "SoundEventAnnotationTag",
     "SoundEventAnnotationUpdate",
     "SoundEventCreate",
@@ -200,9 +223,11 @@ __all__ = [
     "SoundEventPredictionUpdate",
     "SoundEventUpdate",
     "SpectrogramParameters",
+    "SpectrogramPyramid",
     "Tag",
     "TagCount",
     "TagCreate",
+    "TagsAdd",
     "TagUpdate",
     "User",
     "UserCreate",
@@ -5,7 +5,7 @@ from typing import Generic, Sequence, TypeVar
 
 from pydantic import BaseModel, ConfigDict, Field
 
-__all__ = ["BaseSchema", "Page"]
+__all__ = ["BaseSchema", "BulkUpdate", "Page"]
 
 
 class BaseSchema(BaseModel):
@@ -27,9 +27,33 @@ M = TypeVar("M")
 
 
 class Page(BaseModel, Generic[M]):
-    """A page of results."""
+    """A page of results.
+
+    Pages are either addressed by offset or, for cursor pagination, by
+    the cursor of the previous page. Cursor pages are not counted unless
+    requested, in which case `total` is None.
+    """
 
     items: Sequence[M]
-    total: int
+    total: int | None
     offset: int
     limit: int
+    next_cursor: str | None = None
+    """The cursor of the next page, or None if there are no more pages.
+
+    Only set when using cursor pagination.
+    """
+
+
+class BulkUpdate(BaseModel, Generic[M]):
+    """The result of updating several objects at once.
+
+    The updated objects are only loaded when requested, otherwise
+    `items` is None.
+    """
+
+    count: int
+    """The number of rows created by the update."""
+
+    items: Sequence[M] | None = None
+    """The updated objects, if requested."""
@@ -5,7 +5,7 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 from whombat.schemas.base import BaseSchema
-from whombat.schemas.clips import Clip
+from whombat.schemas.clips import Clip, ClipSummary
 from whombat.schemas.notes import Note
 from whombat.schemas.sound_event_annotations import SoundEventAnnotation
 from whombat.schemas.tags import Tag
@@ -16,6 +16,7 @@ __all__ = [
     "ClipAnnotationCreate",
     "ClipAnnotationTag",
     "ClipAnnotationNote",
+    "ClipAnnotationSummary",
 ]
 
 
@@ -38,6 +39,24 @@ class ClipAnnotationCreate(BaseModel):
     tags: list[Tag] = Field(default_factory=list)
 
 
+class ClipAnnotationSummary(BaseSchema):
+    """Schema for an ClipAnnotation returned in listings."""
+
+    uuid: UUID
+
+    id: int = Field(..., exclude=True)
+    """Database ID of this annotation."""
+
+    clip: ClipSummary
+    """Clip this annotation is attached to."""
+
+    tags: list[Tag] = Field(
+        default_factory=list,
+        description="Tags attached to this annotation.",
+        alias_priority=10000,
+    )
+
+
 class ClipAnnotation(BaseSchema):
     """Schema for an ClipAnnotation."""
 
@@ -5,13 +5,14 @@ from uuid import UUID
 from pydantic import BaseModel, Field
 
 from whombat.schemas.base import BaseSchema
-from whombat.schemas.clips import Clip
+from whombat.schemas.clips import Clip, ClipSummary
 from whombat.schemas.sound_event_predictions import SoundEventPrediction
 from whombat.schemas.tags import PredictedTag, Tag
 
 __all__ = [
     "ClipPrediction",
     "ClipPredictionCreate",
+    "ClipPredictionSummary",
     "ClipPredictionUpdate",
 ]
 
@@ -33,6 +34,22 @@ class ClipPredictionTag(BaseSchema):
     """Confidence of the prediction."""
 
 
+class ClipPredictionSummary(BaseSchema):
+    """Schema for a clip prediction returned in listings."""
+
+    uuid: UUID
+    """UUID of the prediction."""
+
+    id: int = Field(..., exclude=True)
+    """Database ID of the prediction."""
+
+    clip: ClipSummary
+    """Clip to which this prediction belongs."""
+
+    tags: list[ClipPredictionTag] = Field(default_factory=list)
+    """Tags of the prediction."""
+
+
 class ClipPrediction(BaseSchema):
     """Schema for a clip prediction."""
 
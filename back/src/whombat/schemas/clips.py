@@ -6,11 +6,12 @@ from pydantic import BaseModel, Field, model_validator
 
 from whombat.schemas.base import BaseSchema
 from whombat.schemas.features import Feature
-from whombat.schemas.recordings import Recording
+from whombat.schemas.recordings import Recording, RecordingSummary
 
 __all__ = [
     "Clip",
     "ClipCreate",
+    "ClipSummary",
     "ClipUpdate",
 ]
 
@@ -32,6 +33,25 @@ class ClipCreate(BaseModel):
         return values
 
 
+class ClipSummary(BaseSchema):
+    """Schema for Clip objects returned in listings."""
+
+    uuid: UUID
+    """The unique identifier of the clip."""
+
+    id: int = Field(..., exclude=True)
+    """The database id of the clip."""
+
+    start_time: float
+    """The start time of the clip."""
+
+    end_time: float
+    """The end time of the clip."""
+
+    recording: RecordingSummary
+    """Recording information for the clip."""
+
+
 class Clip(BaseSchema):
     """Schema for Clip objects returned to the user."""
 
@@ -1,7 +1,9 @@
 """Schemas for handling Datasets."""
 
+import datetime
 from enum import Enum
 from pathlib import Path
+from typing import Literal
 from uuid import UUID
 
 from pydantic import BaseModel, DirectoryPath, Field
@@ -14,7 +16,9 @@ __all__ = [
     "DatasetRecording",
     "DatasetCreate",
     "DatasetUpdate",
+    "DatasetManifestEntry",
     "DatasetRecordingCreate",
+    "DatasetRegistration",
     "FileState",
 ]
 
@@ -85,6 +89,9 @@ class FileState(Enum):
 
     - ``unregistered``: The file is not registered in the database but is
         present in the dataset directory.
+
+    - ``modified``: The file is registered in the database but has changed
+        since it was registered.
     """
 
     MISSING = "missing"
@@ -96,6 +103,9 @@ class FileState(Enum):
     UNREGISTERED = "unregistered"
     """If the recording is not registered but the file is present."""
 
+    MODIFIED = "modified"
+    """If the recording is registered but the file has changed."""
+
 
 class DatasetFile(BaseModel):
     """Schema for DatasetFile objects returned to the user."""
@@ -107,6 +117,22 @@ class DatasetFile(BaseModel):
     """The state of the file."""
 
 
+class DatasetManifestEntry(BaseSchema):
+    """Schema for an entry of the manifest of the files of a dataset."""
+
+    path: Path
+    """The path to the file within the dataset directory."""
+
+    size: int
+    """The size of the file in bytes."""
+
+    mtime_ns: int
+    """The modification time of the file in nanoseconds."""
+
+    hash: str | None = None
+    """The MD5 hash of the file contents, if known."""
+
+
 class DatasetRecordingCreate(BaseModel):
     """Schema for DatasetRecording objects created by the user."""
 
@@ -125,3 +151,33 @@ class DatasetRecording(BaseSchema):
 
     path: Path
     """The path to the recording in the dataset directory."""
+
+
+class DatasetRegistration(BaseModel):
+    """Progress of the registration of the audio files of a dataset."""
+
+    dataset_uuid: UUID
+    """The uuid of the dataset."""
+
+    status: Literal["running", "completed", "failed"] = "running"
+    """The status of the registration."""
+
+    total_files: int = 0
+    """The number of files to process."""
+
+    processed_files: int = 0
+    """The number of files processed so far, including skipped files."""
+
+    registered_files: int = 0
+    """The number of files registered as recordings of the dataset."""
+
+    error: str | None = None
+    """The error that stopped the registration, if it failed."""
+
+    started_on: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.timezone.utc),
+    )
+    """When the registration started."""
+
+    finished_on: datetime.datetime | None = None
+    """When the registration finished."""
@@ -1,5 +1,7 @@
 """Schemas for handling Features."""
 
+from uuid import UUID
+
 from pydantic import BaseModel, ConfigDict, Field
 
 from whombat.schemas.base import BaseSchema
@@ -9,6 +11,7 @@ __all__ = [
     "FeatureName",
     "FeatureNameCreate",
     "FeatureNameUpdate",
+    "FeaturesAdd",
 ]
 
 
@@ -50,3 +53,13 @@ class Feature(BaseModel):
     def __hash__(self):
         """Hash the Feature object."""
         return hash((self.name, self.value))
+
+
+class FeaturesAdd(BaseModel):
+    """Schema for adding several features to several objects."""
+
+    uuids: list[UUID] = Field(min_length=1)
+    """UUIDs of the objects to update."""
+
+    features: list[Feature] = Field(min_length=1)
+    """Features to add to every object."""
@@ -0,0 +1,100 @@
+"""Schemas for handling background jobs."""
+
+import datetime
+from typing import Any, Literal
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from whombat.schemas.base import BaseSchema
+
+__all__ = [
+    "Job",
+    "JobCreate",
+    "JobStatus",
+    "JobUpdate",
+]
+
+JobStatus = Literal["pending", "running", "completed", "failed", "cancelled"]
+"""The status of a job."""
+
+
+class JobCreate(BaseModel):
+    """Schema for submitting a job."""
+
+    kind: str
+    """The kind of job to run."""
+
+    arguments: dict[str, Any] = Field(default_factory=dict)
+    """The arguments passed to the job handler."""
+
+    created_by_id: UUID | None = None
+    """The id of the user who submitted the job."""
+
+
+class Job(BaseSchema):
+    """Schema of a job as returned to the user."""
+
+    uuid: UUID
+    """The uuid of the job."""
+
+    id: int = Field(..., exclude=True)
+    """The database id of the job."""
+
+    kind: str
+    """The kind of job."""
+
+    status: JobStatus
+    """The status of the job."""
+
+    arguments: dict[str, Any] = Field(default_factory=dict, exclude=True)
+    """The arguments passed to the job handler."""
+
+    result: dict[str, Any] | None = None
+    """The result of the job, once completed."""
+
+    error: str | None = None
+    """The error that stopped the job, if it failed."""
+
+    total: int = 0
+    """The number of items the job has to process, if known."""
+
+    processed: int = 0
+    """The number of items processed so far."""
+
+    cancel_requested: bool = False
+    """Whether the cancellation of the job has been requested."""
+
+    created_by_id: UUID | None = Field(default=None, exclude=True)
+    """The id of the user who submitted the job."""
+
+    started_on: datetime.datetime | None = None
+    """When a worker started running the job."""
+
+    finished_on: datetime.datetime | None = None
+    """When the job finished."""
+
+
+class JobUpdate(BaseModel):
+    """Schema for updating a job."""
+
+    status: JobStatus | None = None
+    """The status of the job."""
+
+    result: dict[str, Any] | None = None
+    """The result of the job."""
+
+    error: str | None = None
+    """The error that stopped the job."""
+
+    total: int | None = None
+    """The number of items the job has to process."""
+
+    processed: int | None = None
+    """The number of items processed so far."""
+
+    cancel_requested: bool | None = None
+    """Whether the cancellation of the job has been requested."""
+
+    finished_on: datetime.datetime | None = None
+    """When the job finished."""
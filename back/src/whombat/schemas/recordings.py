@@ -16,6 +16,7 @@ from whombat.schemas.users import SimpleUser
 __all__ = [
     "Recording",
     "RecordingCreate",
+    "RecordingSummary",
     "RecordingUpdate",
     "RecordingTag",
     "RecordingNote",
@@ -56,8 +57,8 @@ class RecordingCreate(BaseModel):
         return v
 
 
-class Recording(BaseSchema):
-    """Schema for Recording objects returned to the user."""
+class RecordingSummary(BaseSchema):
+    """Schema for Recording objects returned in listings."""
 
     uuid: UUID
     """The UUID of the recording."""
@@ -117,6 +118,10 @@ class Recording(BaseSchema):
     tags: list[Tag] = Field(default_factory=list)
     """The tags associated with the recording."""
 
+
+class Recording(RecordingSummary):
+    """Schema for Recording objects returned to the user."""
+
     features: list[Feature] = Field(default_factory=list)
     """The features associated with the recording."""
 
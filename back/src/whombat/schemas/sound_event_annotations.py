@@ -16,6 +16,7 @@ __all__ = [
     "SoundEventAnnotationUpdate",
     "SoundEventAnnotationTag",
     "SoundEventAnnotationNote",
+    "SoundEventAnnotationSummary",
 ]
 
 
@@ -42,8 +43,8 @@ class SoundEventAnnotationCreate(BaseModel):
     """Tags attached to this annotation."""
 
 
-class SoundEventAnnotation(BaseSchema):
-    """Schema for an SoundEventAnnotation."""
+class SoundEventAnnotationSummary(BaseSchema):
+    """Schema for an SoundEventAnnotation returned in listings."""
 
     uuid: UUID
     """UUID of this annotation."""
@@ -57,13 +58,17 @@ class SoundEventAnnotation(BaseSchema):
     sound_event: SoundEvent
     """Sound event this annotation is attached to."""
 
-    notes: list[Note] = Field(default_factory=list)
-    """Notes attached to this annotation."""
-
     tags: list[Tag] = Field(default_factory=list)
     """Tags attached to this annotation."""
 
 
+class SoundEventAnnotation(SoundEventAnnotationSummary):
+    """Schema for an SoundEventAnnotation."""
+
+    notes: list[Note] = Field(default_factory=list)
+    """Notes attached to this annotation."""
+
+
 class SoundEventAnnotationUpdate(BaseSchema):
     """Schema for data required to update an SoundEventAnnotation."""
 
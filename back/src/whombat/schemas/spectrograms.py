@@ -6,6 +6,7 @@ from pydantic import BaseModel, Field, field_validator, model_validator
 
 __all__ = [
     "SpectrogramParameters",
+    "SpectrogramPyramid",
     "STFTParameters",
     "AmplitudeParameters",
     "Scale",
@@ -114,3 +115,19 @@ class SpectrogramParameters(STFTParameters, AmplitudeParameters):
 
     cmap: str = "gray"
     """Colormap to use for spectrogram."""
+
+
+class SpectrogramPyramid(BaseModel):
+    """Status of the precomputed spectrogram pyramid of a recording."""
+
+    ready: bool = False
+    """Whether the pyramid has been built."""
+
+    num_levels: int = 0
+    """Number of resolution levels of the pyramid."""
+
+    num_frames: int = 0
+    """Number of STFT frames at the finest level."""
+
+    hop_duration: float | None = None
+    """Time in seconds between frames at the finest level."""
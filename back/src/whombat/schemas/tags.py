@@ -1,5 +1,7 @@
 """Schemas for handling Tags."""
 
+from uuid import UUID
+
 from pydantic import BaseModel, Field
 
 from whombat.schemas.base import BaseSchema
@@ -7,6 +9,7 @@ from whombat.schemas.base import BaseSchema
 __all__ = [
     "Tag",
     "TagCreate",
+    "TagsAdd",
     "TagUpdate",
     "TagCount",
     "PredictedTag",
@@ -23,6 +26,16 @@ class TagCreate(BaseModel):
     """Value of the tag."""
 
 
+class TagsAdd(BaseModel):
+    """Schema for adding several tags to several objects."""
+
+    uuids: list[UUID] = Field(min_length=1)
+    """UUIDs of the objects to tag."""
+
+    tags: list[TagCreate] = Field(min_length=1)
+    """Tags to add to every object."""
+
+
 class Tag(BaseSchema):
     """Schema for Tag objects returned to the user."""
 
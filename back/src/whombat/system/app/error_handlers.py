@@ -114,6 +114,90 @@ async def data_format_error_handler(
     )
 
 
+async def invalid_cursor_error_handler(
+    _,
+    exc: exceptions.InvalidCursorError,
+):
+    """Handle invalid pagination cursor errors.
+
+    Parameters
+    ----------
+    _ : Request
+        The request that caused the exception (unused).
+    exc : exceptions.InvalidCursorError
+        The exception that was raised.
+
+    Returns
+    -------
+    JSONResponse
+        A JSON response with a 400 status code and an error message.
+    """
+    return JSONResponse(
+        status_code=400,
+        content={
+            "error_type": "InvalidCursorError",
+            "message": str(exc),
+        },
+    )
+
+
+async def task_timeout_error_handler(
+    _,
+    exc: exceptions.TaskTimeoutError,
+):
+    """Handle task timeout errors.
+
+    Parameters
+    ----------
+    _ : Request
+        The request that caused the exception (unused).
+    exc : exceptions.TaskTimeoutError
+        The exception that was raised.
+
+    Returns
+    -------
+    JSONResponse
+        A JSON response with a 504 status code and an error message.
+    """
+    return JSONResponse(
+        status_code=504,
+        content={
+            "error_type": "TaskTimeoutError",
+            "message": str(exc),
+        },
+    )
+
+
+async def task_cancelled_error_handler(
+    _,
+    exc: exceptions.TaskCancelledError,
+):
+    """Handle task cancelled errors.
+
+    Tasks are cancelled when the client disconnects, so the response is
+    not expected to be read.
+
+    Parameters
+    ----------
+    _ : Request
+        The request that caused the exception (unused).
+    exc : exceptions.TaskCancelledError
+        The exception that was raised.
+
+    Returns
+    -------
+    JSONResponse
+        A JSON response with a 499 status code and an error message.
+    """
+    return JSONResponse(
+        status_code=499,
+        content={
+            "error_type": "TaskCancelledError",
+            "message": str(exc),
+        },
+    )
+
+
 def add_error_handlers(app: FastAPI, settings: Settings):
     """Add error handlers to the FastAPI application.
 
@@ -134,3 +218,12 @@ def add_error_handlers(app: FastAPI, settings: Settings):
     app.exception_handler(exceptions.DataFormatError)(
         data_format_error_handler
     )
+    app.exception_handler(exceptions.InvalidCursorError)(
+        invalid_cursor_error_handler
+    )
+    app.exception_handler(exceptions.TaskTimeoutError)(
+        task_timeout_error_handler
+    )
+    app.exception_handler(exceptions.TaskCancelledError)(
+        task_cancelled_error_handler
+    )
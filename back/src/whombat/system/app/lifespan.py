@@ -2,15 +2,87 @@ from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from whombat.core.disk_cache import DiskCache
+from whombat.core.executor import TaskExecutor
+from whombat.core.file_pool import SoundFilePool
 from whombat.system.boot import whombat_init
+from whombat.system.data import get_whombat_cache_dir
+from whombat.system.database import (
+    create_async_db_engine,
+    create_async_session_maker,
+    get_database_url,
+    get_engine_options,
+)
 from whombat.system.settings import Settings
 
 __all__ = ["lifespan"]
 
 
 @asynccontextmanager
-async def lifespan(settings: Settings, _: FastAPI):
-    """Context manager to run startup and shutdown events."""
+async def lifespan(settings: Settings, app: FastAPI):
+    """Context manager to run startup and shutdown events.
+
+    A single database engine, with its connection pool, is created on
+    startup and stored in the application state so that it can be
+    shared by all requests. The engine is disposed on shutdown.
+
+    Background jobs are run by a worker that runs inside the application
+    unless the `job_workers` setting is 0.
+    """
+    # NOTE: Import the API here to avoid circular imports
+    from whombat.api.common.cache import object_cache
+    from whombat.api.common.counts import count_cache
+    from whombat.api.evaluation_engine import ground_truth_cache
+    from whombat.system.jobs import JobWorker
+
     await whombat_init(settings)
 
-    yield
+    db_url = get_database_url(settings)
+    engine = create_async_db_engine(
+        db_url,
+        **get_engine_options(settings, db_url),
+    )
+    object_cache.configure(
+        maxsize=settings.object_cache_size,
+        ttl=settings.object_cache_ttl,
+    )
+    count_cache.configure(
+        maxsize=settings.count_cache_size,
+        ttl=settings.count_cache_ttl,
+    )
+    ground_truth_cache.configure(
+        maxsize=settings.evaluation_cache_size,
+        ttl=settings.evaluation_cache_ttl,
+    )
+    app.state.db_engine = engine
+    app.state.session_maker = create_async_session_maker(engine)
+    app.state.spectrogram_cache = create_spectrogram_cache(settings)
+    app.state.audio_file_pool = SoundFilePool(settings.audio_file_pool_size)
+    app.state.executor = TaskExecutor(
+        kind=settings.executor_type,
+        max_workers=settings.executor_workers,
+        max_concurrency=settings.executor_max_concurrency,
+    )
+    app.state.job_worker = JobWorker(app.state.session_maker, settings)
+    app.state.job_worker.start()
+
+    try:
+        yield
+    finally:
+        await app.state.job_worker.stop()
+        app.state.executor.shutdown()
+        app.state.audio_file_pool.clear()
+        await engine.dispose()
+
+
+def create_spectrogram_cache(settings: Settings) -> DiskCache:
+    """Create the on-disk cache of rendered spectrogram images."""
+    cache_dir = settings.spectrogram_cache_dir
+    if cache_dir is None:
+        cache_dir = get_whombat_cache_dir() / "spectrograms"
+
+    return DiskCache(
+        cache_dir,
+        max_size=settings.spectrogram_cache_size,
+        suffix=f".{settings.spectrogram_image_format}",
+    )
@@ -53,6 +53,7 @@ async def is_first_run(settings: Settings) -> bool:
     async with get_async_session(engine) as session:
         is_first_run = await is_first_user(session)
 
+    await engine.dispose()
     return is_first_run
 
 
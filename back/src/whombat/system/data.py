@@ -8,6 +8,9 @@ __all__ = [
     "get_app_data_dir",
     "get_whombat_settings_file",
     "get_whombat_db_file",
+    "get_whombat_cache_dir",
+    "get_whombat_pyramid_dir",
+    "get_whombat_job_dir",
 ]
 
 
@@ -60,3 +63,18 @@ def get_whombat_settings_file() -> Path:
 def get_whombat_db_file() -> Path:
     """Get the path to the Whombat database file."""
     return get_app_data_dir() / "whombat.db"
+
+
+def get_whombat_cache_dir() -> Path:
+    """Get the path to the Whombat cache directory."""
+    return get_app_data_dir() / "cache"
+
+
+def get_whombat_pyramid_dir() -> Path:
+    """Get the path to the spectrogram pyramid directory."""
+    return get_app_data_dir() / "pyramids"
+
+
+def get_whombat_job_dir() -> Path:
+    """Get the path to the directory of the files of background jobs."""
+    return get_app_data_dir() / "jobs"
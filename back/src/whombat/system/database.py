@@ -4,7 +4,7 @@ import logging
 from contextlib import asynccontextmanager
 from enum import Enum
 from pathlib import Path
-from typing import AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from alembic import script
 from alembic.command import stamp, upgrade
@@ -27,12 +27,14 @@ logger = logging.getLogger("whombat.database")
 
 __all__ = [
     "create_async_db_engine",
+    "create_async_session_maker",
     "create_db",
     "create_or_update_db",
     "create_async_db_engine",
     "create_sync_db_engine",
     "get_database_url",
     "get_db_state",
+    "get_engine_options",
     "init_database",
     "get_async_session",
     "models",
@@ -129,7 +131,53 @@ def get_database_url(
     return validate_database_url(url, is_async=is_async)
 
 
-def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
+def get_engine_options(
+    settings: Settings,
+    database_url: URL | None = None,
+) -> dict[str, Any]:
+    """Get the connection pool options for the database engine.
+
+    Parameters
+    ----------
+    settings : Settings
+        The settings for the application.
+    database_url : URL, optional
+        The url to the database. If not provided it will be computed
+        from the settings.
+
+    Returns
+    -------
+    dict[str, Any]
+        Keyword arguments to pass to the engine constructor.
+    """
+    if database_url is None:
+        database_url = get_database_url(settings)
+
+    options: dict[str, Any] = {
+        "pool_pre_ping": settings.db_pool_pre_ping,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+    # NOTE: In-memory SQLite databases use a static pool with a single
+    # connection, which does not accept sizing arguments.
+    if not is_memory_database(database_url):
+        options["pool_size"] = settings.db_pool_size
+        options["max_overflow"] = settings.db_max_overflow
+
+    return options
+
+
+def is_memory_database(database_url: URL) -> bool:
+    """Check if the url points to an in-memory SQLite database."""
+    return database_url.get_backend_name() == "sqlite" and (
+        database_url.database in (None, "", ":memory:")
+    )
+
+
+def create_async_db_engine(
+    database_url: str | URL,
+    **options: Any,
+) -> AsyncEngine:
     """Create the database engine.
 
     Parameters
@@ -138,6 +186,10 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         The url to the database. Defaults to `sqlite+aiosqlite://`. See
         https://docs.sqlalchemy.org/en/14/core/engines.html#database-urls for
         more information on the format.
+    **options
+        Additional keyword arguments passed to the engine constructor,
+        such as the connection pool options returned by
+        `get_engine_options`.
 
     Notes
     -----
@@ -153,7 +205,25 @@ def create_async_db_engine(database_url: str | URL) -> AsyncEngine:
         database_url = make_url(database_url)
 
     database_url = validate_database_url(database_url, is_async=True)
-    return create_async_engine(database_url)
+    return create_async_engine(database_url, **options)
+
+
+def create_async_session_maker(
+    engine: AsyncEngine,
+) -> async_sessionmaker[AsyncSession]:
+    """Create a session factory bound to the given engine.
+
+    Parameters
+    ----------
+    engine : AsyncEngine
+        The database engine.
+
+    Returns
+    -------
+    async_sessionmaker[AsyncSession]
+        The session factory.
+    """
+    return async_sessionmaker(engine, expire_on_commit=False)
 
 
 def create_sync_db_engine(database_url: str | URL) -> Engine:
@@ -260,7 +330,7 @@ async def get_async_session(
     engine: AsyncEngine,
 ) -> AsyncGenerator[AsyncSession, None]:
     """Get a session to the database asynchronously."""
-    async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
+    async_session_maker = create_async_session_maker(engine)
     async with async_session_maker() as session:
         yield session
 
@@ -288,3 +358,5 @@ async def init_database(settings: Settings) -> None:
     async with engine.begin() as conn:
         cfg = create_alembic_config(db_url, is_async=False)
         await conn.run_sync(create_or_update_db, cfg)
+
+    await engine.dispose()
@@ -0,0 +1,23 @@
+"""Background jobs.
+
+Long-running operations, such as imports, exports and evaluations, are
+submitted as jobs and run by workers outside of the HTTP requests that
+submit them.
+"""
+
+from whombat.system.jobs.context import (
+    JobContext,
+    JobHandler,
+    get_job_directory,
+)
+from whombat.system.jobs.handlers import JOB_HANDLERS
+from whombat.system.jobs.worker import JobWorker, run_worker
+
+__all__ = [
+    "JOB_HANDLERS",
+    "JobContext",
+    "JobHandler",
+    "JobWorker",
+    "get_job_directory",
+    "run_worker",
+]
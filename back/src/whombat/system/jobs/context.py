@@ -0,0 +1,92 @@
+"""Context in which job handlers run."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import schemas
+from whombat.api.io.aoef import ImportProgress
+from whombat.system.data import get_whombat_job_dir
+from whombat.system.settings import Settings
+
+__all__ = [
+    "JobContext",
+    "JobHandler",
+    "get_job_directory",
+]
+
+
+@dataclass
+class JobContext:
+    """The job being run and the progress reported by its handler."""
+
+    job: schemas.Job
+    """The job being run."""
+
+    settings: Settings
+    """The settings of the worker running the job."""
+
+    total: int = 0
+    """The number of items the job has to process, if known."""
+
+    processed: int = 0
+    """The number of items processed so far."""
+
+    cancel_requested: bool = False
+    """Whether the job was stopped because its cancellation was requested."""
+
+    done: bool = False
+    """Whether the handler of the job has returned."""
+
+    @property
+    def arguments(self) -> dict[str, Any]:
+        """The arguments of the job."""
+        return self.job.arguments
+
+    @property
+    def input_dir(self) -> Path:
+        """Directory of the files uploaded with the job.
+
+        It is removed once the job finishes.
+        """
+        return get_job_directory(self.settings, self.job.uuid) / "inputs"
+
+    @property
+    def output_dir(self) -> Path:
+        """Directory of the files produced by the job."""
+        return get_job_directory(self.settings, self.job.uuid) / "outputs"
+
+    def report(self, processed: int, total: int | None = None) -> None:
+        """Report the progress of the job.
+
+        The progress is stored in the job by the worker at regular
+        intervals, so handlers can report it as often as they like.
+        """
+        self.processed = processed
+        if total is not None:
+            self.total = total
+
+    def report_import(self, progress: ImportProgress) -> None:
+        """Report the progress of an AOEF import."""
+        self.report(progress.processed, progress.total)
+
+
+JobHandler = Callable[[AsyncSession, JobContext], Awaitable[dict | None]]
+"""A function that runs a kind of job.
+
+Handlers receive a session of their own and the context of the job. The
+session is committed once the handler returns, and the returned
+dictionary is stored as the result of the job.
+"""
+
+
+def get_job_directory(settings: Settings, job_uuid: UUID) -> Path:
+    """Get the directory of the files of a job."""
+    job_dir = settings.job_dir
+    if job_dir is None:
+        job_dir = get_whombat_job_dir()
+
+    return job_dir / str(job_uuid)
@@ -0,0 +1,183 @@
+"""Handlers of the kinds of background jobs.
+
+Each handler runs one kind of long-running operation with the arguments
+stored in the job. Files uploaded with a job are read from the input
+directory of the job, and the identifiers of the objects created by the
+job are returned as its result.
+"""
+
+import asyncio
+import datetime
+import gzip
+import json
+from pathlib import Path
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, schemas
+from whombat.api.io import aoef
+from whombat.system.jobs.context import JobContext, JobHandler
+
+__all__ = [
+    "JOB_HANDLERS",
+]
+
+
+async def create_dataset(session: AsyncSession, ctx: JobContext) -> dict:
+    """Create a dataset and register the audio files in its directory."""
+    dataset = await api.datasets.create(
+        session,
+        name=ctx.arguments["name"],
+        description=ctx.arguments.get("description"),
+        dataset_dir=Path(ctx.arguments["audio_dir"]),
+        audio_dir=ctx.settings.audio_dir,
+        on_progress=lambda registration: ctx.report(
+            registration.processed_files,
+            registration.total_files,
+        ),
+    )
+    return {"dataset_uuid": str(dataset.uuid)}
+
+
+async def import_dataset(session: AsyncSession, ctx: JobContext) -> dict:
+    """Import a dataset from an uploaded AOEF file."""
+    dataset = await api.datasets.import_dataset(
+        session,
+        ctx.input_dir / ctx.arguments["filename"],
+        dataset_audio_dir=Path(ctx.arguments["audio_dir"]),
+        audio_dir=ctx.settings.audio_dir,
+        on_progress=ctx.report_import,
+    )
+    return {"dataset_uuid": str(dataset.uuid)}
+
+
+async def import_annotation_project(
+    session: AsyncSession,
+    ctx: JobContext,
+) -> dict:
+    """Import an annotation project from an uploaded AOEF file."""
+    db_project = await aoef.import_annotation_project(
+        session,
+        ctx.input_dir / ctx.arguments["filename"],
+        audio_dir=ctx.settings.audio_dir,
+        base_audio_dir=ctx.settings.audio_dir,
+        imported_by=await _get_submitter(session, ctx),
+        on_progress=ctx.report_import,
+    )
+    return {"annotation_project_uuid": str(db_project.uuid)}
+
+
+async def import_evaluation_set(
+    session: AsyncSession,
+    ctx: JobContext,
+) -> dict:
+    """Import an evaluation set from an uploaded AOEF file."""
+    path = ctx.input_dir / ctx.arguments["filename"]
+    obj = json.loads(await asyncio.to_thread(path.read_bytes))
+    db_evaluation_set = await aoef.import_evaluation_set(
+        session,
+        obj,
+        audio_dir=ctx.settings.audio_dir,
+        base_audio_dir=ctx.settings.audio_dir,
+        task=ctx.arguments["task"],
+        imported_by=await _get_submitter(session, ctx),
+    )
+    return {"evaluation_set_uuid": str(db_evaluation_set.uuid)}
+
+
+async def import_model_run(session: AsyncSession, ctx: JobContext) -> dict:
+    """Import a model run and add it to an evaluation set."""
+    evaluation_set = await api.evaluation_sets.get(
+        session,
+        UUID(ctx.arguments["evaluation_set_uuid"]),
+    )
+    db_model_run = await aoef.import_model_run(
+        session,
+        ctx.input_dir / ctx.arguments["filename"],
+        audio_dir=ctx.settings.audio_dir,
+        base_audio_dir=ctx.settings.audio_dir,
+        on_progress=ctx.report_import,
+    )
+    await session.commit()
+    await session.refresh(db_model_run)
+    await api.evaluation_sets.add_model_run(
+        session,
+        evaluation_set,
+        schemas.ModelRun.model_validate(db_model_run),
+    )
+    return {"model_run_uuid": str(db_model_run.uuid)}
+
+
+async def export_annotation_project(
+    session: AsyncSession,
+    ctx: JobContext,
+) -> dict:
+    """Export an annotation project to a file in AOEF format."""
+    project = await api.annotation_projects.get(
+        session,
+        UUID(ctx.arguments["annotation_project_uuid"]),
+    )
+    compress = ctx.arguments.get("compress", False)
+
+    created_on = datetime.datetime.now().isoformat()
+    filename = f"{project.name}_{created_on}.json"
+    file = "export.json"
+    media_type = "application/json"
+    if compress:
+        filename = f"{filename}.gz"
+        file = f"{file}.gz"
+        media_type = "application/gzip"
+
+    ctx.output_dir.mkdir(parents=True, exist_ok=True)
+    path = ctx.output_dir / file
+    with gzip.open(path, "wb") if compress else open(path, "wb") as fp:
+        async for chunk in aoef.export_annotation_project(session, project):
+            await asyncio.to_thread(fp.write, chunk)
+
+    return {"file": file, "filename": filename, "media_type": media_type}
+
+
+async def evaluate_model_run(
+    session: AsyncSession,
+    ctx: JobContext,
+) -> dict:
+    """Evaluate a model run against an evaluation set."""
+    model_run = await api.model_runs.get(
+        session,
+        UUID(ctx.arguments["model_run_uuid"]),
+    )
+    evaluation_set = await api.evaluation_sets.get(
+        session,
+        UUID(ctx.arguments["evaluation_set_uuid"]),
+    )
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+    )
+    return {"evaluation_uuid": str(evaluation.uuid)}
+
+
+async def _get_submitter(
+    session: AsyncSession,
+    ctx: JobContext,
+) -> schemas.SimpleUser:
+    if ctx.job.created_by_id is None:
+        raise exceptions.NotFoundError(
+            f"Job {ctx.job.uuid} was not submitted by a user."
+        )
+
+    return await api.users.get(session, ctx.job.created_by_id)
+
+
+JOB_HANDLERS: dict[str, JobHandler] = {
+    "create_dataset": create_dataset,
+    "import_dataset": import_dataset,
+    "import_annotation_project": import_annotation_project,
+    "import_evaluation_set": import_evaluation_set,
+    "import_model_run": import_model_run,
+    "export_annotation_project": export_annotation_project,
+    "evaluate_model_run": evaluate_model_run,
+}
+"""The handlers of each kind of job."""
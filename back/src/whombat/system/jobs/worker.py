@@ -0,0 +1,297 @@
+"""Workers that run background jobs.
+
+A worker runs a number of loops that claim pending jobs from the jobs
+table and run them with the handler of their kind. While a job runs,
+the worker stores the progress reported by the handler in the job at
+regular intervals and checks whether the cancellation of the job has
+been requested, in which case the handler is cancelled.
+
+Workers run inside the application, or as separate processes started
+with `python -m whombat worker`. As the jobs table is the only state
+shared between them, any number of workers can serve the same database.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import shutil
+import signal
+import socket
+from typing import Any, Mapping
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from whombat import schemas
+from whombat.api.jobs import jobs
+from whombat.system.database import (
+    create_async_db_engine,
+    create_async_session_maker,
+    get_database_url,
+    get_engine_options,
+    init_database,
+)
+from whombat.system.jobs.context import JobContext, JobHandler
+from whombat.system.jobs.handlers import JOB_HANDLERS
+from whombat.system.settings import Settings
+
+__all__ = [
+    "JobWorker",
+    "run_worker",
+]
+
+logger = logging.getLogger(__name__)
+
+
+class JobWorker:
+    """Claims pending jobs and runs them.
+
+    Parameters
+    ----------
+    session_maker
+        Factory of the database sessions used to run the jobs.
+    settings
+        The application settings.
+    concurrency
+        The number of jobs run at the same time. By default, the
+        `job_workers` setting.
+    name
+        The name under which the worker claims jobs. By default, the host
+        name and process id.
+    handlers
+        The handler of each kind of job. By default, the handlers of all
+        the kinds of jobs of the application.
+    """
+
+    def __init__(
+        self,
+        session_maker: async_sessionmaker[AsyncSession],
+        settings: Settings,
+        concurrency: int | None = None,
+        name: str | None = None,
+        handlers: Mapping[str, JobHandler] | None = None,
+    ):
+        self.session_maker = session_maker
+        self.settings = settings
+        self.concurrency = (
+            settings.job_workers if concurrency is None else concurrency
+        )
+        self.name = name or f"{socket.gethostname()}:{os.getpid()}"
+        self.handlers = JOB_HANDLERS if handlers is None else handlers
+        self._wakeup = asyncio.Event()
+        self._loops: list[asyncio.Task] = []
+
+    def start(self) -> None:
+        """Start the loops that run jobs."""
+        for _ in range(self.concurrency):
+            self._loops.append(asyncio.create_task(self._run_forever()))
+
+    async def stop(self) -> None:
+        """Stop the loops that run jobs.
+
+        The jobs that are running are marked as failed.
+        """
+        for loop in self._loops:
+            loop.cancel()
+
+        await asyncio.gather(*self._loops, return_exceptions=True)
+        self._loops.clear()
+
+    def notify(self) -> None:
+        """Let the worker know that a job has been submitted."""
+        self._wakeup.set()
+
+    async def run_next(self) -> schemas.Job | None:
+        """Claim the oldest pending job and run it.
+
+        Returns
+        -------
+        schemas.Job | None
+            The finished job, or None if there were no pending jobs.
+        """
+        async with self.session_maker() as session:
+            failed = await jobs.fail_stale(
+                session,
+                self.settings.job_stale_timeout,
+            )
+            if failed:
+                logger.warning("Marked %d abandoned jobs as failed.", failed)
+
+            job = await jobs.claim(session, self.name)
+            await session.commit()
+
+        if job is None:
+            return None
+
+        return await self.run(job)
+
+    async def run(self, job: schemas.Job) -> schemas.Job:
+        """Run a claimed job and store its outcome.
+
+        Parameters
+        ----------
+        job
+            The job, already claimed by this worker.
+
+        Returns
+        -------
+        schemas.Job
+            The finished job.
+        """
+        ctx = JobContext(job=job, settings=self.settings)
+        task = asyncio.current_task()
+        assert task is not None
+        monitor = asyncio.create_task(self._monitor(ctx, task))
+
+        status: schemas.JobStatus = "completed"
+        result: dict[str, Any] | None = None
+        error: str | None = None
+
+        try:
+            handler = self.handlers.get(job.kind)
+            if handler is None:
+                raise ValueError(f"Unknown kind of job: {job.kind}")
+
+            async with self.session_maker() as session:
+                result = await handler(session, ctx)
+                await session.commit()
+
+            ctx.done = True
+        except asyncio.CancelledError:
+            ctx.done = True
+
+            if not ctx.cancel_requested:
+                # The worker is stopping.
+                await self._finish(
+                    ctx,
+                    "failed",
+                    error="The worker stopped before the job finished.",
+                )
+                raise
+
+            task.uncancel()
+            status = "cancelled"
+        except Exception as err:
+            ctx.done = True
+            logger.exception("Job %s (%s) failed.", job.uuid, job.kind)
+            status = "failed"
+            error = str(err) or type(err).__name__
+        finally:
+            monitor.cancel()
+            await asyncio.to_thread(
+                shutil.rmtree,
+                ctx.input_dir,
+                ignore_errors=True,
+            )
+
+        return await self._finish(ctx, status, result=result, error=error)
+
+    async def _finish(
+        self,
+        ctx: JobContext,
+        status: schemas.JobStatus,
+        result: dict[str, Any] | None = None,
+        error: str | None = None,
+    ) -> schemas.Job:
+        async with self.session_maker() as session:
+            job = await jobs.finish(
+                session,
+                ctx.job,
+                status,
+                result=result,
+                error=error,
+                processed=ctx.processed,
+                total=ctx.total,
+            )
+            await session.commit()
+
+        return job
+
+    async def _monitor(self, ctx: JobContext, task: asyncio.Task) -> None:
+        """Store the progress of a job and stop it when cancelled."""
+        while True:
+            await asyncio.sleep(self.settings.job_poll_interval)
+
+            try:
+                async with self.session_maker() as session:
+                    requested = await jobs.report(
+                        session,
+                        ctx.job,
+                        processed=ctx.processed,
+                        total=ctx.total,
+                    )
+                    await session.commit()
+            except Exception:
+                logger.warning(
+                    "Could not report on job %s.",
+                    ctx.job.uuid,
+                    exc_info=True,
+                )
+                continue
+
+            if requested and not ctx.done:
+                ctx.cancel_requested = True
+                task.cancel()
+                return
+
+    async def _run_forever(self) -> None:
+        while True:
+            try:
+                job = await self.run_next()
+            except Exception:
+                logger.exception("Could not run the next job.")
+                job = None
+
+            if job is None:
+                self._wakeup.clear()
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(
+                        self._wakeup.wait(),
+                        self.settings.job_poll_interval,
+                    )
+
+
+async def run_worker(
+    settings: Settings,
+    concurrency: int | None = None,
+) -> None:
+    """Run jobs until the process is interrupted.
+
+    Parameters
+    ----------
+    settings
+        The application settings.
+    concurrency
+        The number of jobs run at the same time. By default, the
+        `job_workers` setting, or 1 if it is 0.
+    """
+    await init_database(settings)
+
+    db_url = get_database_url(settings)
+    engine = create_async_db_engine(
+        db_url,
+        **get_engine_options(settings, db_url),
+    )
+    worker = JobWorker(
+        create_async_session_maker(engine),
+        settings,
+        concurrency=concurrency or settings.job_workers or 1,
+    )
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(signum, stop.set)
+
+    logger.info(
+        "Worker %s running %d jobs at a time.",
+        worker.name,
+        worker.concurrency,
+    )
+    worker.start()
+    try:
+        await stop.wait()
+    finally:
+        await worker.stop()
+        await engine.dispose()
@@ -6,9 +6,9 @@ We are using pydantic to define our settings.
 import warnings
 from functools import lru_cache
 from pathlib import Path
-from typing import Tuple, Type
+from typing import Literal, Tuple, Type
 
-from pydantic import ValidationError
+from pydantic import Field, ValidationError
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -70,6 +70,70 @@ class Settings(BaseSettings):
     Only use this if you know what you are doing.
     """
 
+    db_pool_size: int = 5
+    """Number of connections kept open in the database connection pool.
+
+    The pool is created once at application startup and shared by all
+    requests. Ignored for in-memory SQLite databases.
+    """
+
+    db_max_overflow: int = 10
+    """Number of connections that can be opened beyond the pool size.
+
+    Overflow connections are closed when they are returned to the pool.
+    Ignored for in-memory SQLite databases.
+    """
+
+    db_pool_pre_ping: bool = True
+    """Test connections for liveness before handing them out.
+
+    This avoids errors caused by connections that were closed by the
+    database server, for example after a PostgreSQL restart.
+    """
+
+    db_pool_recycle: int = 3600
+    """Seconds after which a pooled connection is replaced.
+
+    Set to -1 to never recycle connections.
+    """
+
+    object_cache_size: int = 1000
+    """Maximum number of objects kept in the in-memory API object cache.
+
+    Recordings, clips and sound events fetched by UUID are cached so
+    that hot lookups do not query the database every time. Set to 0 to
+    disable the cache.
+    """
+
+    object_cache_ttl: float = 60
+    """Seconds after which a cached API object is discarded.
+
+    This bounds how long changes made by other processes sharing the
+    same database can go unnoticed.
+    """
+
+    count_cache_size: int = 1000
+    """Maximum number of listing counts kept in memory.
+
+    Listings requested with the cached count mode reuse the total number
+    of items computed by a previous request until the underlying tables
+    are modified. Set to 0 to disable the cache.
+    """
+
+    count_cache_ttl: float = 30
+    """Seconds after which a cached listing count is discarded."""
+
+    evaluation_cache_size: int = 10000
+    """Maximum number of clip annotations kept in the evaluation cache.
+
+    The encoded annotations of evaluation sets are reused when more model
+    runs are evaluated against the same set. Set to 0 to disable the
+    cache.
+    """
+
+    evaluation_cache_ttl: float = 600
+    """Seconds after which a cached clip annotation is discarded."""
+
     audio_dir: Path = Path.home()
     """Directory where the all audio files are stored.
 
@@ -90,6 +154,111 @@ class Settings(BaseSettings):
     domain: str = "localhost"
     """Domain on which the backend is running."""
 
+    executor_type: Literal["thread", "process"] = "thread"
+    """Pool used to run blocking audio and spectrogram work.
+
+    Reading audio, computing spectrograms and encoding images run in this
+    pool instead of the event loop, so that a heavy request does not stall
+    the others. A process pool avoids contention on the GIL at the cost of
+    sending audio parameters and results between processes.
+    """
+
+    executor_workers: int | None = None
+    """Number of workers of the pool.
+
+    If not set, the defaults of the Python thread or process pool
+    executors are used.
+    """
+
+    executor_max_concurrency: int | None = None
+    """Maximum number of blocking tasks that can run at the same time.
+
+    Further tasks wait in a queue. If not set, it equals the number of
+    workers.
+    """
+
+    task_timeout: float | None = 30
+    """Seconds after which a pending audio or spectrogram task is cancelled.
+
+    The deadline includes the time spent waiting in the queue. Set to
+    None to disable the deadline.
+    """
+
+    audio_file_pool_size: int = 64
+    """Maximum number of audio files kept open for audio streaming.
+
+    Keeping files open avoids parsing their headers on every range
+    request made by the browser while playing audio. Set to 0 to open
+    the file on every request.
+    """
+
+    spectrogram_cache_dir: Path | None = None
+    """Directory where rendered spectrogram images are cached.
+
+    If not set, a `cache/spectrograms` directory inside the application
+    data directory is used.
+    """
+
+    spectrogram_cache_size: int = 512 * 1024 * 1024
+    """Maximum size of the spectrogram image cache in bytes.
+
+    The least recently used images are removed when the cache grows
+    beyond this size. Set to 0 to disable the cache.
+    """
+
+    spectrogram_image_format: Literal["png", "webp"] = "png"
+    """Format of spectrogram images.
+
+    Images are encoded as 8-bit grayscale or palette images. Lossless
+    WebP images are usually smaller than PNG images but slower to encode.
+    """
+
+    spectrogram_compression_level: int = Field(default=6, ge=0, le=9)
+    """Compression effort of spectrogram images.
+
+    Ranges from 0 (fastest encoding, largest images) to 9 (slowest
+    encoding, smallest images).
+    """
+
+    spectrogram_pyramid_dir: Path | None = None
+    """Directory where precomputed spectrogram pyramids are stored.
+
+    If not set, a `pyramids` directory inside the application data
+    directory is used.
+    """
+
+    spectrogram_max_frames: int = 4096
+    """Maximum number of STFT frames computed from audio for a spectrogram.
+
+    Spectrograms of longer time windows are read from the precomputed
+    spectrogram pyramid of the recording, if one has been built.
+    """
+
+    job_workers: int = Field(default=1, ge=0)
+    """Number of background jobs run at the same time by the application.
+
+    Set to 0 to leave the jobs to workers started separately with
+    `python -m whombat worker`.
+    """
+
+    job_poll_interval: float = 1
+    """Seconds between checks for new jobs and for cancellation requests."""
+
+    job_stale_timeout: float = 300
+    """Seconds after which a running job without progress reports fails.
+
+    Workers report on the jobs they run every `job_poll_interval`
+    seconds, so a job that is not reported on for longer was abandoned
+    by a worker that stopped.
+    """
+
+    job_dir: Path | None = None
+    """Directory where the uploaded and produced files of jobs are stored.
+
+    If not set, a `jobs` directory inside the application data directory
+    is used.
+    """
+
     log_config: Path = Path("logging.conf")
     """Path to the logging configuration file relative to the project root."""
 
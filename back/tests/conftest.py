@@ -102,6 +102,7 @@ def database_path(tmp_path: Path, database_template: Path) -> Path:
 
 @pytest.fixture(autouse=True)
 def settings(
+    tmp_path: Path,
     audio_dir: Path,
     database_path: Path,
 ) -> Settings:
@@ -110,6 +111,10 @@ def settings(
         db_dialect="sqlite",
         db_name=str(database_path),
         audio_dir=audio_dir,
+        spectrogram_cache_dir=tmp_path / "cache" / "spectrograms",
+        spectrogram_pyramid_dir=tmp_path / "pyramids",
+        job_dir=tmp_path / "jobs",
+        job_poll_interval=0.05,
         open_on_startup=False,
         log_to_file=False,
         log_to_stdout=True,
@@ -1,10 +1,17 @@
 from io import BytesIO
 from pathlib import Path
 
+import numpy as np
 import pytest
 import soundfile as sf
 
-from whombat.api.audio import HEADER_SIZE, load_clip_bytes
+from whombat.api.audio import (
+    HEADER_SIZE,
+    generate_wav_header,
+    get_pcm_layout,
+    load_clip_bytes,
+)
+from whombat.core.file_pool import SoundFilePool
 
 
 def test_load_clip_bytes(random_wav_factory):
@@ -209,3 +216,91 @@ def test_can_stream_a_real_audio_file(data_dir: Path):
     original_data = path.read_bytes()
 
     assert streamed_data == original_data
+
+
+def test_load_clip_bytes_with_file_pool(random_wav_factory):
+    path = random_wav_factory(samplerate=8_000, duration=1, fmt="flac")
+    pool = SoundFilePool()
+
+    expected = load_clip_bytes(path=path, start=HEADER_SIZE, frames=512)
+    first = load_clip_bytes(
+        path=path, start=HEADER_SIZE, frames=512, pool=pool
+    )
+    second = load_clip_bytes(
+        path=path, start=HEADER_SIZE, frames=512, pool=pool
+    )
+
+    assert first == expected
+    assert second == expected
+    assert pool.stats.hits == 1
+    assert pool.stats.misses == 1
+
+
+@pytest.mark.parametrize("bit_depth", [16, 24, 32])
+def test_get_pcm_layout_of_pcm_wav_files(bit_depth: int, random_wav_factory):
+    path = random_wav_factory(
+        samplerate=8_000,
+        duration=1,
+        channels=2,
+        bit_depth=bit_depth,
+    )
+
+    layout = get_pcm_layout(path)
+
+    assert layout is not None
+    assert layout.samplerate == 8_000
+    assert layout.channels == 2
+    assert layout.bit_depth == bit_depth
+    assert layout.frames == 8_000
+    assert layout.data_offset + 8_000 * 2 * bit_depth // 8 <= (
+        path.stat().st_size
+    )
+
+
+@pytest.mark.parametrize("subtype", ["FLOAT", "PCM_U8"])
+def test_get_pcm_layout_of_non_pcm_files(subtype: str, random_wav_factory):
+    path = random_wav_factory(subtype=subtype)
+    assert get_pcm_layout(path) is None
+
+
+def test_load_clip_bytes_skips_unknown_chunks(tmp_path: Path):
+    samples = np.arange(1_000, dtype="<i2")
+    header = generate_wav_header(
+        samplerate=8_000,
+        channels=1,
+        data_size=samples.nbytes,
+    )
+    # Insert an odd sized chunk between the fmt and data chunks.
+    extra = b"LIST" + (3).to_bytes(4, "little") + b"abc" + b"\x00"
+    path = tmp_path / "chunks.wav"
+    path.write_bytes(header[:36] + extra + header[36:] + samples.tobytes())
+
+    layout = get_pcm_layout(path)
+    assert layout is not None
+    assert layout.data_offset == HEADER_SIZE + len(extra)
+
+    data, _, _, _ = load_clip_bytes(
+        path=path,
+        start=HEADER_SIZE + 100,
+        frames=10,
+    )
+    assert data == samples[50:60].tobytes()
+
+
+def test_load_clip_bytes_copies_pcm_samples_unchanged(random_wav_factory):
+    path = random_wav_factory(samplerate=8_000, duration=1, bit_depth=16)
+
+    with sf.SoundFile(path) as f:
+        f.seek(4_000)
+        expected = f.read(4_000, dtype="int16").tobytes()
+
+    data, _, _, filesize = load_clip_bytes(
+        path=path,
+        start=0,
+        frames=8_000,
+        start_time=0.5,
+        end_time=1.5,
+    )
+
+    assert filesize == HEADER_SIZE + 8_000 * 2
+    assert data[HEADER_SIZE:] == expected + bytes(4_000 * 2)
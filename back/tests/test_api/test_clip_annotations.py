@@ -110,6 +110,29 @@ async def test_added_tag_is_stored_in_the_database(
     assert db_clip_annotation_tag.tag_id == tag.id
 
 
+async def test_can_add_tags_to_many_clip_annotations(
+    session: AsyncSession,
+    clip_annotation: schemas.ClipAnnotation,
+    clip: schemas.Clip,
+    tag: schemas.Tag,
+    user: schemas.SimpleUser,
+):
+    """Test that a tag is added to several clip annotations at once."""
+    other = await api.clip_annotations.create(session, clip=clip)
+
+    result = await api.clip_annotations.add_tags(
+        session,
+        [clip_annotation.uuid, other.uuid],
+        [tag],
+        user,
+    )
+    assert result.count == 2
+
+    for uuid in [clip_annotation.uuid, other.uuid]:
+        obj = await api.clip_annotations.get(session, uuid)
+        assert obj.tags == [tag]
+
+
 async def test_cannot_add_duplicate_tag_to_clip_annotation(
     session: AsyncSession,
     clip_annotation: schemas.ClipAnnotation,
@@ -0,0 +1,170 @@
+"""Test suite for the API object cache."""
+
+from uuid import uuid4
+
+from sqlalchemy import URL
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.api.common.cache import (
+    ObjectCache,
+    get_cache_namespace,
+    object_cache,
+)
+
+
+def test_invalidating_an_object_evicts_objects_that_embed_it(
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+):
+    cache = ObjectCache()
+    cache.set("recording", recording, recording.uuid)
+    cache.set("clip", clip, clip.uuid)
+    cache.set("other", recording, uuid4())
+
+    cache.invalidate(recording.uuid)
+
+    assert cache.get("recording") is None
+    assert cache.get("clip") is None
+    assert cache.get("other") is None
+    assert cache.stats.invalidations == 3
+
+
+def test_cache_evicts_least_recently_used_objects(
+    recording: schemas.Recording,
+):
+    cache = ObjectCache(maxsize=2)
+    cache.set("a", recording, 1)
+    cache.set("b", recording, 2)
+    cache.get("a")
+    cache.set("c", recording, 3)
+
+    assert cache.get("a") is recording
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+
+
+def test_cache_discards_expired_objects(recording: schemas.Recording):
+    cache = ObjectCache(ttl=-1)
+    cache.set("a", recording, 1)
+
+    assert cache.get("a") is None
+    assert cache.stats.size == 0
+
+
+async def test_get_recording_is_served_from_cache(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    await api.recordings.get(session, recording.uuid)
+    hits = object_cache.hits
+
+    retrieved = await api.recordings.get(session, recording.uuid)
+
+    assert retrieved == recording
+    assert object_cache.hits == hits + 1
+
+
+async def test_adding_a_tag_to_a_recording_updates_cached_clips(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+    tag: schemas.Tag,
+):
+    await api.recordings.get(session, recording.uuid)
+    await api.clips.get(session, clip.uuid)
+
+    await api.recordings.add_tag(session, recording, tag)
+
+    retrieved = await api.clips.get(session, clip.uuid)
+    assert retrieved.recording.tags == [tag]
+
+
+async def test_updating_a_recording_updates_cached_clips(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+):
+    await api.clips.get(session, clip.uuid)
+
+    await api.recordings.update(
+        session,
+        recording,
+        schemas.RecordingUpdate(rights="CC-BY"),
+    )
+
+    retrieved = await api.clips.get(session, clip.uuid)
+    assert retrieved.recording.rights == "CC-BY"
+
+
+async def test_updating_a_tag_updates_cached_recordings(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    tag: schemas.Tag,
+):
+    await api.recordings.add_tag(session, recording, tag)
+    await api.recordings.get(session, recording.uuid)
+
+    await api.tags.update(session, tag, schemas.TagUpdate(value="updated"))
+
+    retrieved = await api.recordings.get(session, recording.uuid)
+    assert [t.value for t in retrieved.tags] == ["updated"]
+
+
+async def test_updating_a_user_updates_cached_recordings(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    user: schemas.SimpleUser,
+):
+    await api.recordings.add_owner(session, recording, user)
+    await api.recordings.get(session, recording.uuid)
+
+    await api.users.update(session, user, schemas.UserUpdate(name="Renamed"))
+
+    retrieved = await api.recordings.get(session, recording.uuid)
+    assert [owner.name for owner in retrieved.owners] == ["Renamed"]
+
+
+async def test_cache_namespace_of_a_session_bound_to_a_connection(
+    session: AsyncSession,
+):
+    connection = await session.connection()
+
+    async with AsyncSession(connection) as bound:
+        assert get_cache_namespace(bound) == get_cache_namespace(session)
+
+
+async def test_objects_read_during_a_write_are_not_cached(
+    session: AsyncSession,
+    database_url: URL,
+    recording: schemas.Recording,
+):
+    async with api.create_session(db_url=database_url) as reader:
+        await api.recordings.update(
+            session,
+            recording,
+            schemas.RecordingUpdate(rights="NEW"),
+        )
+
+        # The reader still sees the committed row while the writer has
+        # not committed.
+        retrieved = await api.recordings.get(reader, recording.uuid)
+        assert retrieved.rights is None
+        await reader.commit()
+
+        await session.commit()
+
+        retrieved = await api.recordings.get(reader, recording.uuid)
+        assert retrieved.rights == "NEW"
+
+
+async def test_rollback_clears_the_cache(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    await api.recordings.get(session, recording.uuid)
+    assert object_cache.stats.size > 0
+
+    await session.rollback()
+
+    assert object_cache.stats.size == 0
@@ -0,0 +1,102 @@
+"""Test suite for the count modes of paginated listings."""
+
+import datetime
+
+import pytest
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models
+from whombat.api.common.counts import count_cache, count_objects
+
+
+@pytest.fixture(autouse=True)
+def clear_count_cache():
+    count_cache.clear()
+    yield
+    count_cache.clear()
+
+
+async def test_cached_count_is_reused(session: AsyncSession):
+    await api.tags.create(session, key="key", value="a")
+
+    _, first = await api.tags.get_many(session, count_mode="cached")
+    hits = count_cache.stats.hits
+    _, second = await api.tags.get_many(session, count_mode="cached")
+
+    assert first == second == 1
+    assert count_cache.stats.hits == hits + 1
+
+
+async def test_cached_count_is_invalidated_on_flush(session: AsyncSession):
+    await api.tags.create(session, key="key", value="a")
+    _, before = await api.tags.get_many(session, count_mode="cached")
+
+    await api.tags.create(session, key="key", value="b")
+    _, after = await api.tags.get_many(session, count_mode="cached")
+
+    assert before == 1
+    assert after == 2
+
+
+async def test_cached_count_is_invalidated_by_bulk_insert(
+    session: AsyncSession,
+):
+    query = select(models.Tag)
+    assert await count_objects(session, models.Tag, query, "cached") == 0
+
+    await session.execute(
+        insert(models.Tag).values(
+            key="key",
+            value="a",
+            created_on=datetime.datetime.now(datetime.UTC),
+        )
+    )
+
+    assert await count_objects(session, models.Tag, query, "cached") == 1
+
+
+async def test_cached_counts_depend_on_filters(session: AsyncSession):
+    await api.tags.create(session, key="key", value="a")
+    await api.tags.create(session, key="key", value="b")
+
+    _, total = await api.tags.get_many(
+        session,
+        filters=[models.Tag.value == "a"],
+        count_mode="cached",
+    )
+    _, unfiltered = await api.tags.get_many(session, count_mode="cached")
+
+    assert total == 1
+    assert unfiltered == 2
+
+
+async def test_estimated_count_uses_sqlite_statistics(session: AsyncSession):
+    for value in ["a", "b", "c"]:
+        await api.tags.create(session, key="key", value=value)
+
+    await session.execute(text("ANALYZE"))
+    await api.tags.create(session, key="key", value="d")
+
+    _, estimate = await api.tags.get_many(session, count_mode="estimated")
+    _, exact = await api.tags.get_many(session, count_mode="exact")
+
+    assert estimate == 3
+    assert exact == 4
+
+
+async def test_estimated_count_of_filtered_listing_is_exact(
+    session: AsyncSession,
+):
+    for value in ["a", "b", "c"]:
+        await api.tags.create(session, key="key", value=value)
+
+    await session.execute(text("ANALYZE"))
+
+    _, estimate = await api.tags.get_many(
+        session,
+        filters=[models.Tag.value != "a"],
+        count_mode="estimated",
+    )
+
+    assert estimate == 2
@@ -0,0 +1,149 @@
+"""Test suite for keyset pagination."""
+
+import datetime
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, exceptions, models, schemas
+
+
+async def _get_all_pages(
+    session: AsyncSession,
+    api_: api.common.BaseAPI,
+    limit: int,
+    **kwargs,
+) -> list:
+    items = []
+    cursor = ""
+    while cursor is not None:
+        page = await api_.get_page(
+            session,
+            limit=limit,
+            cursor=cursor,
+            **kwargs,
+        )
+        assert len(page.items) <= limit
+        items.extend(page.items)
+        cursor = page.next_cursor
+    return items
+
+
+async def test_cursor_pages_match_offset_listing(session: AsyncSession):
+    for key in ["a", "b", "c"]:
+        for value in ["x", "y"]:
+            await api.tags.create(session, key=key, value=value)
+
+    items = await _get_all_pages(session, api.tags, limit=2, sort_by="value")
+
+    assert [tag.value for tag in items] == ["x", "x", "x", "y", "y", "y"]
+    assert len({tag.id for tag in items}) == 6
+
+    tags, _ = await api.tags.get_many(session, limit=-1, sort_by="value")
+    assert {tag.id for tag in items} == {tag.id for tag in tags}
+
+
+async def test_cursor_pages_break_ties_by_primary_key(session: AsyncSession):
+    created_on = datetime.datetime(2024, 1, 1, tzinfo=datetime.UTC)
+    for value in range(5):
+        await api.tags.create(
+            session,
+            key="key",
+            value=str(value),
+            created_on=created_on,
+        )
+
+    items = await _get_all_pages(
+        session,
+        api.tags,
+        limit=2,
+        sort_by="-created_on",
+    )
+
+    ids = [tag.id for tag in items]
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 5
+
+
+@pytest.mark.parametrize("sort_by", ["date", "-date"])
+async def test_cursor_pages_sort_null_values_last(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+    sort_by: str,
+):
+    dates = [
+        datetime.date(2024, 1, 2),
+        None,
+        datetime.date(2024, 1, 1),
+        None,
+        datetime.date(2024, 1, 3),
+    ]
+    for date in dates:
+        await api.recordings.create(
+            session,
+            path=random_wav_factory(),
+            date=date,
+            audio_dir=audio_dir,
+        )
+
+    items = await _get_all_pages(
+        session,
+        api.recordings,
+        limit=2,
+        sort_by=sort_by,
+    )
+
+    retrieved = [recording.date for recording in items]
+    expected = sorted(
+        [date for date in dates if date is not None],
+        reverse=sort_by.startswith("-"),
+    )
+    assert retrieved == [*expected, None, None]
+
+
+async def test_cursor_page_is_only_counted_on_request(
+    session: AsyncSession,
+    tag: schemas.Tag,
+):
+    page = await api.tags.get_page(session, cursor="")
+    assert page.total is None
+    assert page.next_cursor is None
+
+    page = await api.tags.get_page(session, cursor="", count_mode="exact")
+    assert page.total == 1
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "WzFd"])
+async def test_invalid_cursor_raises_error(
+    session: AsyncSession,
+    cursor: str,
+):
+    with pytest.raises(exceptions.InvalidCursorError):
+        await api.common.get_objects_by_cursor(
+            session,
+            models.Tag,
+            cursor=cursor,
+            sort_by="value",
+        )
+
+
+@pytest.mark.parametrize("limit", [None, -1])
+async def test_cursor_listing_without_limit_returns_all_objects(
+    session: AsyncSession,
+    limit: int | None,
+):
+    for value in ["x", "y", "z"]:
+        await api.tags.create(session, key="key", value=value)
+
+    objs, next_cursor, _ = await api.common.get_objects_by_cursor(
+        session,
+        models.Tag,
+        limit=limit,
+        sort_by="value",
+    )
+
+    assert [tag.value for tag in objs] == ["x", "y", "z"]
+    assert next_cursor is None
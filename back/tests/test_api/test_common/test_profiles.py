@@ -0,0 +1,101 @@
+"""Test suite for the loading profiles of the API."""
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+
+
+async def test_summary_profile_returns_lighter_schema(
+    session: AsyncSession,
+    clip_annotation: schemas.ClipAnnotation,
+    note: schemas.Note,
+    tag: schemas.Tag,
+):
+    await api.clip_annotations.add_note(session, clip_annotation, note)
+    await api.clip_annotations.add_tag(session, clip_annotation, tag)
+    session.expunge_all()
+
+    objs, count = await api.clip_annotations.get_many(
+        session,
+        profile="summary",
+    )
+
+    assert count == 1
+    obj = objs[0]
+    assert isinstance(obj, schemas.ClipAnnotationSummary)
+    assert not isinstance(obj, schemas.ClipAnnotation)
+    assert isinstance(obj.clip.recording, schemas.RecordingSummary)
+    assert obj.tags == [tag]
+    assert "notes" not in obj.model_dump()
+
+
+async def test_detail_profile_returns_full_schema(
+    session: AsyncSession,
+    clip_annotation: schemas.ClipAnnotation,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    note: schemas.Note,
+    tag: schemas.Tag,
+):
+    await api.clip_annotations.add_note(session, clip_annotation, note)
+    await api.clip_annotations.add_tag(session, clip_annotation, tag)
+    session.expunge_all()
+
+    obj = await api.clip_annotations.get(session, clip_annotation.uuid)
+
+    assert isinstance(obj, schemas.ClipAnnotation)
+    assert obj.notes == [note]
+    assert obj.tags == [tag]
+    assert [se.uuid for se in obj.sound_events] == [
+        sound_event_annotation.uuid
+    ]
+
+
+async def test_detail_profile_does_not_join_collections(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    feature: schemas.Feature,
+    tag_factory,
+):
+    recording = await api.recordings.add_feature(session, recording, feature)
+    for value in ["a", "b", "c"]:
+        recording = await api.recordings.add_tag(
+            session,
+            recording,
+            await tag_factory("key", value),
+        )
+    session.expunge_all()
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        obj = await api.recordings.get(session, recording.uuid)
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert obj == recording
+    assert statements
+    assert not any(
+        "recording_tag" in stmt and "recording_feature" in stmt
+        for stmt in statements
+    )
+
+
+async def test_apis_without_profiles_use_the_main_schema(
+    session: AsyncSession,
+    tag: schemas.Tag,
+):
+    objs, _ = await api.tags.get_many(session, profile="summary")
+    assert objs == [tag]
+    assert api.tags.get_profile("summary").schema is schemas.Tag
+
+
+def test_missing_profiles_fall_back_to_detail():
+    detail = api.sound_events.get_profile("detail")
+    assert api.sound_events.get_profile("summary") is detail
+    assert api.recordings.get_profile("export").schema is schemas.Recording
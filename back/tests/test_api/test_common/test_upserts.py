@@ -0,0 +1,256 @@
+"""Test suite for the bulk upsert of objects."""
+
+import datetime
+from uuid import uuid4
+
+import pytest
+from soundevent import data
+from soundevent.io.aoef.sound_event import SoundEventObject
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.api.common import upserts
+from whombat.api.common.upserts import upsert_objects
+from whombat.api.io.aoef.sound_events import import_sound_events
+from whombat.models.sound_event import compute_geometry_bounds
+
+
+def tag_values(*values: str) -> list[dict]:
+    now = datetime.datetime.now()
+    return [
+        {"key": "species", "value": value, "created_on": now}
+        for value in values
+    ]
+
+
+async def test_upsert_returns_ids_of_created_and_existing_objects(
+    session: AsyncSession,
+):
+    existing = await api.tags.create(session, key="species", value="a")
+
+    mapping = await upsert_objects(
+        session,
+        models.Tag,
+        tag_values("a", "b", "c"),
+        keys=[models.Tag.key, models.Tag.value],
+        returning=models.Tag.id,
+    )
+
+    assert set(mapping) == {
+        ("species", "a"),
+        ("species", "b"),
+        ("species", "c"),
+    }
+    assert mapping[("species", "a")] == existing.id
+
+    result = await session.execute(
+        select(models.Tag.key, models.Tag.value, models.Tag.id)
+    )
+    assert {(key, value): id for key, value, id in result.all()} == mapping
+
+
+async def test_upsert_removes_duplicated_keys(session: AsyncSession):
+    mapping = await upsert_objects(
+        session,
+        models.Tag,
+        tag_values("a", "a", "b"),
+        keys=[models.Tag.key, models.Tag.value],
+        returning=models.Tag.id,
+    )
+
+    count = await session.scalar(select(func.count()).select_from(models.Tag))
+    assert count == len(mapping) == 2
+
+
+async def test_upsert_writes_a_single_statement_per_batch(
+    session: AsyncSession,
+):
+    await api.tags.create(session, key="species", value="a")
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        await upsert_objects(
+            session,
+            models.Tag,
+            tag_values("b", "c"),
+            keys=[models.Tag.key, models.Tag.value],
+            returning=models.Tag.id,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert len(statements) == 1
+    assert "ON CONFLICT DO NOTHING" in statements[0]
+    assert "RETURNING" in statements[0]
+
+
+async def test_upsert_splits_rows_in_batches(
+    session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(upserts, "MAX_BATCH_ROWS", 7)
+
+    values = tag_values(*[str(index) for index in range(30)])
+    mapping = await upsert_objects(
+        session,
+        models.Tag,
+        values,
+        keys=[models.Tag.key, models.Tag.value],
+        returning=models.Tag.id,
+    )
+
+    assert len(mapping) == 30
+    assert len(set(mapping.values())) == 30
+
+
+async def test_upsert_checks_keys_without_unique_constraint(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    sound_event: schemas.SoundEvent,
+):
+    """Sound event UUIDs are not unique in the database."""
+    new_uuid = uuid4()
+    values = [
+        {
+            "uuid": uuid,
+            "recording_id": recording.id,
+            "geometry_type": sound_event.geometry.type,
+            "geometry": sound_event.geometry,
+        }
+        for uuid in [sound_event.uuid, new_uuid]
+    ]
+
+    mapping = await upsert_objects(
+        session,
+        models.SoundEvent,
+        values,
+        keys=[models.SoundEvent.uuid],
+        returning=models.SoundEvent.id,
+    )
+
+    assert mapping[sound_event.uuid] == sound_event.id
+    count = await session.scalar(
+        select(func.count())
+        .select_from(models.SoundEvent)
+        .where(models.SoundEvent.uuid.in_([sound_event.uuid, new_uuid]))
+    )
+    assert count == 2
+
+
+async def test_upsert_can_raise_on_conflicts(session: AsyncSession):
+    await api.tags.create(session, key="species", value="a")
+
+    with pytest.raises(IntegrityError):
+        await upsert_objects(
+            session,
+            models.Tag,
+            tag_values("a"),
+            keys=[models.Tag.key, models.Tag.value],
+            returning=models.Tag.id,
+            on_conflict="raise",
+        )
+
+
+async def test_upsert_without_returning_creates_objects(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    tag: schemas.Tag,
+):
+    values = [{"recording_id": recording.id, "tag_id": tag.id}] * 2
+
+    for _ in range(2):
+        mapping = await upsert_objects(
+            session,
+            models.RecordingTag,
+            values,
+            keys=[
+                models.RecordingTag.recording_id,
+                models.RecordingTag.tag_id,
+            ],
+        )
+        assert mapping == {}
+
+    count = await session.scalar(
+        select(func.count()).select_from(models.RecordingTag)
+    )
+    assert count == 1
+
+
+async def test_upsert_can_update_conflicting_rows(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    feature_name = await api.features.create(session, name="duration")
+    value = {
+        "recording_id": recording.id,
+        "feature_name_id": feature_name.id,
+    }
+    keys = [
+        models.RecordingFeature.recording_id,
+        models.RecordingFeature.feature_name_id,
+    ]
+
+    for number in [1.0, 2.0]:
+        await upsert_objects(
+            session,
+            models.RecordingFeature,
+            [{**value, "value": number}],
+            keys=keys,
+            on_conflict="update",
+            update_columns=[models.RecordingFeature.value],
+        )
+
+    result = await session.execute(select(models.RecordingFeature.value))
+    assert result.scalars().all() == [2.0]
+
+
+async def test_bulk_imported_sound_events_store_their_bounds(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    geometries = [
+        data.BoundingBox(coordinates=[0.5, 1000, 1.5, 2000]),
+        data.TimeInterval(coordinates=[2.0, 3.0]),
+        data.Point(coordinates=[4.0, 5000]),
+    ]
+
+    mapping = await import_sound_events(
+        session,
+        [
+            SoundEventObject(
+                uuid=uuid4(),
+                recording=recording.uuid,
+                geometry=geometry,
+            )
+            for geometry in geometries
+        ],
+        recordings={recording.uuid: recording.id},
+        feature_names={},
+    )
+
+    rows = await session.execute(
+        select(
+            models.SoundEvent.start_time,
+            models.SoundEvent.end_time,
+            models.SoundEvent.low_freq,
+            models.SoundEvent.high_freq,
+        )
+        .where(models.SoundEvent.id.in_(mapping.values()))
+        .order_by(models.SoundEvent.start_time)
+    )
+    assert [tuple(row) for row in rows] == [
+        (
+            bounds["start_time"],
+            bounds["end_time"],
+            bounds["low_freq"],
+            bounds["high_freq"],
+        )
+        for bounds in map(compute_geometry_bounds, geometries)
+    ]
@@ -1,5 +1,7 @@
 """Test suite for the datasets API module."""
 
+import importlib
+import os
 import uuid
 from collections.abc import Callable
 from pathlib import Path
@@ -351,6 +353,138 @@ async def test_get_dataset_files_with_missing_files(
     assert retrieved_files[0].state == schemas.FileState.MISSING
 
 
+async def test_update_manifest_only_rehashes_changed_files(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    dataset_audio_dir = audio_dir / dataset.audio_dir
+    path_1 = random_wav_factory(dataset_audio_dir / "audio_file_1.wav")
+    random_wav_factory(dataset_audio_dir / "audio_file_2.wav")
+    await api.datasets.register_files(session, dataset, audio_dir=audio_dir)
+
+    datasets_api = importlib.import_module("whombat.api.datasets")
+    hashed = []
+    compute_md5_checksum = datasets_api.compute_md5_checksum
+
+    def count_hashes(path: Path) -> str:
+        hashed.append(path)
+        return compute_md5_checksum(path)
+
+    monkeypatch.setattr(datasets_api, "compute_md5_checksum", count_hashes)
+
+    manifest = await api.datasets.update_manifest(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+    )
+    assert len(manifest) == 2
+    assert all(entry.hash is not None for entry in manifest)
+    assert hashed == []
+
+    random_wav_factory(path_1, duration=0.5)
+    stat = path_1.stat()
+    os.utime(path_1, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    await api.datasets.update_manifest(session, dataset, audio_dir=audio_dir)
+    assert hashed == [path_1]
+
+    files = await api.datasets.get_state(session, dataset, audio_dir=audio_dir)
+    states = {file.path: file.state for file in files}
+    assert states == {
+        Path("audio_file_1.wav"): schemas.FileState.MODIFIED,
+        Path("audio_file_2.wav"): schemas.FileState.REGISTERED,
+    }
+
+
+async def test_files_changed_after_registration_are_modified(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    path = random_wav_factory(audio_dir / dataset.audio_dir / "audio.wav")
+    await api.datasets.register_files(session, dataset, audio_dir=audio_dir)
+
+    manifest = await api.datasets.get_manifest(session, dataset)
+    assert all(entry.hash is not None for entry in manifest)
+
+    random_wav_factory(path, duration=0.5)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    files = await api.datasets.get_state(session, dataset, audio_dir=audio_dir)
+    assert [(file.path, file.state) for file in files] == [
+        (Path("audio.wav"), schemas.FileState.MODIFIED),
+    ]
+
+
+async def test_update_manifest_removes_deleted_files(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    dataset_audio_dir = audio_dir / dataset.audio_dir
+    path = random_wav_factory(dataset_audio_dir / "audio_file_1.wav")
+    random_wav_factory(dataset_audio_dir / "audio_file_2.wav")
+    await api.datasets.update_manifest(session, dataset, audio_dir=audio_dir)
+
+    path.unlink()
+    await api.datasets.update_manifest(session, dataset, audio_dir=audio_dir)
+
+    manifest = await api.datasets.get_manifest(session, dataset)
+    assert [entry.path for entry in manifest] == [Path("audio_file_2.wav")]
+    assert manifest[0].hash is None
+
+
+async def test_quick_state_compares_files_to_manifest(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    dataset_audio_dir = audio_dir / dataset.audio_dir
+    path = random_wav_factory(dataset_audio_dir / "audio_file_1.wav")
+    await api.datasets.register_files(session, dataset, audio_dir=audio_dir)
+    manifest = await api.datasets.get_manifest(session, dataset)
+
+    random_wav_factory(dataset_audio_dir / "audio_file_2.wav")
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    files = await api.datasets.get_state(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+        quick=True,
+    )
+
+    states = {file.path: file.state for file in files}
+    assert states == {
+        Path("audio_file_1.wav"): schemas.FileState.MODIFIED,
+        Path("audio_file_2.wav"): schemas.FileState.UNREGISTERED,
+    }
+    assert await api.datasets.get_manifest(session, dataset) == manifest
+
+
+async def test_delete_dataset_deletes_manifest(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    random_wav_factory(audio_dir / dataset.audio_dir / "audio_file.wav")
+    await api.datasets.update_manifest(session, dataset, audio_dir=audio_dir)
+
+    await api.datasets.delete(session, dataset)
+
+    result = await session.execute(select(models.DatasetManifestEntry))
+    assert result.scalars().all() == []
+
+
 async def test_add_recording_to_dataset(
     session: AsyncSession,
     dataset: schemas.Dataset,
@@ -821,3 +955,60 @@ async def test_recordings_belonging_to_multiple_datastes_are_not_deleted(
     await api.datasets.add_recording(session, dataset2, dataset_recording)
 
     await api.recordings.get(session, dataset_recording.uuid)
+
+
+async def test_create_dataset_registers_files_in_batches(
+    session: AsyncSession,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    dataset_audio_dir = audio_dir / "dataset_audio_dir"
+    for index in range(5):
+        random_wav_factory(dataset_audio_dir / f"audio_{index}.wav")
+
+    dataset = await api.datasets.create(
+        session,
+        name="test_dataset",
+        dataset_dir=dataset_audio_dir,
+        audio_dir=audio_dir,
+    )
+
+    assert dataset.recording_count == 5
+    registration = api.datasets.get_registration(dataset)
+    assert registration.status == "completed"
+    assert registration.total_files == 5
+    assert registration.processed_files == 5
+    assert registration.registered_files == 5
+
+
+async def test_register_files_only_processes_unregistered_files(
+    session: AsyncSession,
+    dataset: schemas.Dataset,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+):
+    dataset_audio_dir = audio_dir / dataset.audio_dir
+    random_wav_factory(dataset_audio_dir / "audio_file_1.wav")
+    await api.datasets.register_files(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+        batch_size=1,
+    )
+
+    random_wav_factory(dataset_audio_dir / "audio_file_2.wav")
+    updated = await api.datasets.register_files(
+        session,
+        dataset,
+        audio_dir=audio_dir,
+        batch_size=1,
+    )
+
+    registration = api.datasets.get_registration(dataset)
+    assert registration.total_files == 1
+    assert registration.registered_files == 1
+    assert updated.recording_count == 1
+
+    files = await api.datasets.get_state(session, dataset, audio_dir=audio_dir)
+    assert {file.state for file in files} == {schemas.FileState.REGISTERED}
+    assert len(files) == 2
@@ -0,0 +1,418 @@
+"""Test suite for the evaluation of model runs."""
+
+import random
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from soundevent import data
+from soundevent.io.aoef import to_aeof
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.api.evaluation_engine import ground_truth_cache
+from whombat.api.evaluations import evaluate_predictions
+from whombat.api.io.aoef.evaluation_sets import import_evaluation_set
+from whombat.api.io.aoef.model_runs import import_model_run
+from whombat.schemas.evaluation_sets import PredictionTypes
+
+SPECIES = [data.Tag(key="species", value=name) for name in "ABC"]
+
+OTHER_TAG = data.Tag(key="quality", value="good")
+
+
+def random_geometry(rng: random.Random, start: float) -> data.Geometry:
+    end = start + rng.uniform(0.05, 0.3)
+    low = rng.uniform(1000, 5000)
+    high = low + rng.uniform(500, 5000)
+    kind = rng.choice(["interval", "box", "box", "stamp", "polygon"])
+    if kind == "interval":
+        return data.TimeInterval(coordinates=[start, end])
+    if kind == "stamp":
+        return data.TimeStamp(coordinates=start)
+    if kind == "polygon":
+        return data.Polygon(
+            coordinates=[
+                [[start, low], [end, low], [end, high], [start, low]],
+            ]
+        )
+    return data.BoundingBox(coordinates=[start, low, end, high])
+
+
+def random_tags(rng: random.Random) -> list[data.Tag]:
+    return rng.sample([*SPECIES, OTHER_TAG], k=rng.randint(0, 2))
+
+
+def random_predicted_tags(rng: random.Random) -> list[data.PredictedTag]:
+    return [
+        data.PredictedTag(tag=tag, score=round(rng.uniform(0, 0.5), 3))
+        for tag in rng.sample([*SPECIES, OTHER_TAG], k=rng.randint(0, 3))
+    ]
+
+
+def jitter(rng: random.Random, geometry: data.Geometry) -> data.Geometry:
+    shift = rng.uniform(-0.02, 0.02)
+    if isinstance(geometry, data.TimeStamp):
+        return data.TimeStamp(coordinates=max(geometry.coordinates + shift, 0))
+    if isinstance(geometry, data.TimeInterval):
+        start, end = geometry.coordinates
+        return data.TimeInterval(
+            coordinates=[max(start + shift, 0), end + shift]
+        )
+    if isinstance(geometry, data.BoundingBox):
+        start, low, end, high = geometry.coordinates
+        return data.BoundingBox(
+            coordinates=[max(start + shift, 0), low, end + shift, high + 50]
+        )
+    return geometry
+
+
+def create_evaluation_data(
+    recording: schemas.Recording,
+    task: PredictionTypes,
+    seed: int = 0,
+) -> tuple[list[data.ClipAnnotation], list[data.ClipPrediction]]:
+    """Create random annotations and predictions for a task.
+
+    Soundevent requires every annotated sound event to be evaluated, so
+    clips are not annotated with sound events for clip tasks, and all
+    annotated sound events are predicted for sound event tagging.
+    """
+    rng = random.Random(seed)
+    max_sound_events = (
+        5
+        if task
+        in (
+            PredictionTypes.sound_event_detection,
+            PredictionTypes.sound_event_tagging,
+        )
+        else 0
+    )
+    is_detection = task == PredictionTypes.sound_event_detection
+    rec = data.Recording.model_validate(recording.model_dump())
+
+    clip_annotations = []
+    clip_predictions = []
+    for index in range(6):
+        clip = data.Clip(
+            recording=rec,
+            start_time=index * 0.1,
+            end_time=index * 0.1 + 1,
+        )
+        sound_events = [
+            data.SoundEventAnnotation(
+                sound_event=data.SoundEvent(
+                    recording=rec,
+                    geometry=random_geometry(rng, rng.uniform(0, 1)),
+                ),
+                tags=random_tags(rng),
+            )
+            for _ in range(rng.randint(0, max_sound_events))
+        ]
+        clip_annotations.append(
+            data.ClipAnnotation(
+                clip=clip,
+                tags=random_tags(rng),
+                sound_events=sound_events,
+            )
+        )
+
+        predictions = []
+        for annotation in sound_events:
+            if is_detection and rng.random() < 0.2:
+                continue
+
+            if not is_detection or rng.random() < 0.5:
+                # Predict the annotated sound event itself
+                sound_event = annotation.sound_event
+            else:
+                sound_event = data.SoundEvent(
+                    recording=rec,
+                    geometry=jitter(rng, annotation.sound_event.geometry),  # type: ignore
+                )
+
+            predictions.append(
+                data.SoundEventPrediction(
+                    sound_event=sound_event,
+                    score=rng.random(),
+                    tags=random_predicted_tags(rng),
+                )
+            )
+
+        for _ in range(rng.randint(0, 3) if is_detection else 0):
+            predictions.append(
+                data.SoundEventPrediction(
+                    sound_event=data.SoundEvent(
+                        recording=rec,
+                        geometry=random_geometry(rng, rng.uniform(0, 1)),
+                    ),
+                    score=rng.random(),
+                    tags=random_predicted_tags(rng),
+                )
+            )
+
+        clip_predictions.append(
+            data.ClipPrediction(
+                clip=clip,
+                tags=random_predicted_tags(rng),
+                sound_events=predictions,
+            )
+        )
+
+    return clip_annotations, clip_predictions
+
+
+async def import_model_run_data(
+    session: AsyncSession,
+    tmp_path: Path,
+    audio_dir: Path,
+    clip_predictions: list[data.ClipPrediction],
+    version: str = "1.0.0",
+) -> models.ModelRun:
+    model_run = data.ModelRun(
+        name="test_model",
+        model=data.Model(
+            info=data.ModelInfo(name="test_model"),
+            version=version,
+        ),
+        clip_predictions=clip_predictions,
+    )
+    path = tmp_path / f"{model_run.uuid}.json"
+    path.write_text(to_aeof(model_run).model_dump_json())
+    return await import_model_run(
+        session,
+        path,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+    )
+
+
+def copy_predictions(
+    clip_predictions: list[data.ClipPrediction],
+) -> list[data.ClipPrediction]:
+    return [
+        clip_prediction.model_copy(
+            update=dict(
+                uuid=uuid4(),
+                sound_events=[
+                    prediction.model_copy(update=dict(uuid=uuid4()))
+                    for prediction in clip_prediction.sound_events
+                ],
+            )
+        )
+        for clip_prediction in clip_predictions
+    ]
+
+
+async def import_evaluation_data(
+    session: AsyncSession,
+    tmp_path: Path,
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+    task: PredictionTypes,
+    clip_annotations: list[data.ClipAnnotation],
+    clip_predictions: list[data.ClipPrediction],
+) -> tuple[schemas.ModelRun, schemas.EvaluationSet]:
+    evaluation_set = data.EvaluationSet(
+        name=f"test_{task.name}",
+        description="test_description",
+        clip_annotations=clip_annotations,
+        evaluation_tags=SPECIES,
+    )
+    db_evaluation_set = await import_evaluation_set(
+        session,
+        to_aeof(evaluation_set).model_dump(mode="json"),
+        task=task.value,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+        imported_by=user,
+    )
+
+    db_model_run = await import_model_run_data(
+        session,
+        tmp_path,
+        audio_dir,
+        clip_predictions,
+    )
+    await session.commit()
+
+    # The evaluation set was loaded before its tags were inserted
+    model_run_uuid = db_model_run.uuid
+    evaluation_set_uuid = db_evaluation_set.uuid
+    session.expire_all()
+
+    return (
+        await api.model_runs.get(session, model_run_uuid),
+        await api.evaluation_sets.get(session, evaluation_set_uuid),
+    )
+
+
+@pytest.mark.parametrize("task", list(PredictionTypes))
+async def test_evaluate_model_run_matches_soundevent_evaluation(
+    session: AsyncSession,
+    tmp_path: Path,
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    task: PredictionTypes,
+):
+    clip_annotations, clip_predictions = create_evaluation_data(
+        recording,
+        task,
+    )
+    model_run, evaluation_set = await import_evaluation_data(
+        session,
+        tmp_path,
+        audio_dir,
+        user,
+        task,
+        clip_annotations,
+        clip_predictions,
+    )
+    expected = evaluate_predictions(
+        clip_predictions,
+        clip_annotations,
+        SPECIES,
+        task,
+    )
+
+    evaluation = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+    )
+    await session.commit()
+
+    assert evaluation.task == expected.evaluation_task
+    assert evaluation.score == pytest.approx(expected.score)
+    assert {m.name: m.value for m in evaluation.metrics} == pytest.approx(
+        {m.name: m.value for m in expected.metrics}
+    )
+
+    clip_evaluations, _ = await api.evaluations.get_clip_evaluations(
+        session,
+        evaluation,
+        limit=-1,
+    )
+    assert len(clip_evaluations) == len(expected.clip_evaluations)
+
+    expected_clips = {
+        ce.annotations.uuid: ce for ce in expected.clip_evaluations
+    }
+    for clip_evaluation in clip_evaluations:
+        expected_clip = expected_clips[clip_evaluation.clip_annotation.uuid]
+        assert (
+            clip_evaluation.clip_prediction.uuid
+            == expected_clip.predictions.uuid
+        )
+        assert clip_evaluation.score == pytest.approx(expected_clip.score)
+        assert {
+            m.name: m.value for m in clip_evaluation.metrics
+        } == pytest.approx({m.name: m.value for m in expected_clip.metrics})
+
+        matches = {
+            (
+                m.source.uuid if m.source else None,
+                m.target.uuid if m.target else None,
+            ): m
+            for m in clip_evaluation.sound_event_evaluations
+        }
+        expected_matches = {
+            (
+                m.source.uuid if m.source else None,
+                m.target.uuid if m.target else None,
+            ): m
+            for m in expected_clip.matches
+        }
+        assert matches.keys() == expected_matches.keys()
+        for key, match in matches.items():
+            expected_match = expected_matches[key]
+            assert match.score == pytest.approx(expected_match.score)
+            assert {m.name: m.value for m in match.metrics} == pytest.approx(
+                {m.name: m.value for m in expected_match.metrics}
+            )
+
+
+async def test_ground_truth_is_cached_across_model_runs(
+    session: AsyncSession,
+    tmp_path: Path,
+    audio_dir: Path,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+):
+    clip_annotations, clip_predictions = create_evaluation_data(
+        recording,
+        PredictionTypes.sound_event_detection,
+    )
+    model_run, evaluation_set = await import_evaluation_data(
+        session,
+        tmp_path,
+        audio_dir,
+        user,
+        PredictionTypes.sound_event_detection,
+        clip_annotations,
+        clip_predictions,
+    )
+    ground_truth_cache.clear()
+
+    first = await api.evaluations.evaluate_model_run(
+        session,
+        model_run,
+        evaluation_set,
+    )
+    await session.commit()
+    hits = ground_truth_cache.hits
+
+    db_model_run = await import_model_run_data(
+        session,
+        tmp_path,
+        audio_dir,
+        copy_predictions(clip_predictions),
+        version="2.0.0",
+    )
+    await session.commit()
+    other_run = await api.model_runs.get(session, db_model_run.uuid)
+
+    second = await api.evaluations.evaluate_model_run(
+        session,
+        other_run,
+        evaluation_set,
+    )
+    await session.commit()
+    assert ground_truth_cache.hits == hits + len(clip_annotations)
+    assert second.score == first.score
+
+    # Editing an annotation discards the cached ground truth
+    sound_event_annotation = await api.sound_event_annotations.get(
+        session,
+        next(
+            sea.uuid
+            for clip_annotation in clip_annotations
+            for sea in clip_annotation.sound_events
+        ),
+    )
+    await api.sound_event_annotations.add_tag(
+        session,
+        sound_event_annotation,
+        await api.tags.get_or_create(session, "species", "A"),
+        user,
+    )
+    await session.commit()
+    assert ground_truth_cache.stats.size == 0
+
+    count = await session.scalar(
+        select(func.count()).select_from(models.SoundEventEvaluation)
+    )
+    expected = sum(
+        len(ce.matches)
+        for ce in evaluate_predictions(
+            clip_predictions,
+            clip_annotations,
+            SPECIES,
+            PredictionTypes.sound_event_detection,
+        ).clip_evaluations
+    )
+    assert count == 2 * expected
+    assert np.isfinite(second.score)
@@ -3,7 +3,7 @@
 import datetime
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import exceptions, models, schemas
@@ -230,3 +230,40 @@ async def test_get_features_with_return_all(
 
     # Assert.
     assert [feat.name for feat in result] == names[::-1]
+
+
+async def test_get_ids_creates_missing_feature_names(
+    session: AsyncSession,
+) -> None:
+    """Test getting the ids of existing and new feature names."""
+    existing = await features.create(session, name="duration")
+
+    ids = await features.get_ids(session, ["duration", "bandwidth"])
+
+    result = await session.execute(
+        select(models.FeatureName.name, models.FeatureName.id)
+    )
+    assert ids == dict(result.all())
+    assert ids["duration"] == existing.id
+
+
+async def test_get_ids_resolves_cached_names_without_queries(
+    session: AsyncSession,
+) -> None:
+    """Test that feature names are resolved once."""
+    ids = await features.get_ids(session, ["duration", "bandwidth"])
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        assert await features.get_ids(session, ["bandwidth"]) == {
+            "bandwidth": ids["bandwidth"]
+        }
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert statements == []
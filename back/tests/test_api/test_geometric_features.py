@@ -0,0 +1,63 @@
+"""Test suite for the vectorized computation of geometric features."""
+
+import numpy as np
+import pytest
+from soundevent import data
+from soundevent.geometry import compute_geometric_features as compute_one
+
+from whombat.api.geometric_features import (
+    FEATURE_NAMES,
+    compute_geometric_features,
+)
+
+GEOMETRIES = [
+    data.TimeStamp(coordinates=1.5),
+    data.TimeInterval(coordinates=[1, 2.5]),
+    data.BoundingBox(coordinates=[1, 100, 2, 300]),
+    data.Point(coordinates=[1, 200]),
+    data.LineString(coordinates=[[1, 100], [2, 400]]),
+    data.Polygon(coordinates=[[[1, 100], [2, 400], [3, 100], [1, 100]]]),
+    data.MultiPoint(coordinates=[[1, 2], [3, 4]]),
+    data.MultiLineString(
+        coordinates=[[[1, 100], [2, 400]], [[3, 100], [4, 400]]],
+    ),
+    data.MultiPolygon(
+        coordinates=[[[[1, 100], [2, 400], [3, 100], [1, 100]]]],
+    ),
+]
+
+
+@pytest.mark.parametrize("geometry", GEOMETRIES, ids=lambda g: g.type)
+def test_features_match_soundevent(geometry: data.Geometry):
+    computed = compute_geometric_features([geometry])
+
+    assert computed.get(0) == [
+        (feature.name, feature.value) for feature in compute_one(geometry)
+    ]
+
+
+def test_features_of_many_geometries():
+    computed = compute_geometric_features(GEOMETRIES)
+
+    assert len(computed) == len(GEOMETRIES)
+    assert computed.names == list(FEATURE_NAMES)
+    assert list(computed.items()) == [
+        (index, name, value)
+        for index in range(len(GEOMETRIES))
+        for name, value in computed.get(index)
+    ]
+
+
+def test_features_of_time_geometries_have_no_frequencies():
+    computed = compute_geometric_features(GEOMETRIES[:2])
+
+    assert computed.names == [FEATURE_NAMES[0]]
+    np.testing.assert_allclose(computed.values[:, 0], [0, 1.5])
+
+
+def test_features_of_no_geometries():
+    computed = compute_geometric_features([])
+
+    assert len(computed) == 0
+    assert computed.names == []
+    assert list(computed.items()) == []
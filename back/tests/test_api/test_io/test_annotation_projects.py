@@ -3,11 +3,14 @@ from pathlib import Path
 
 import pytest
 from soundevent import data, io, terms
-from soundevent.io.aoef import to_aeof
+from soundevent.io.aoef import AOEFObject, to_aeof
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, filters, schemas
-from whombat.api.io.aoef.annotation_projects import import_annotation_project
+from whombat.api.io.aoef.annotation_projects import (
+    export_annotation_project,
+    import_annotation_project,
+)
 from whombat.api.io.aoef.datasets import import_dataset
 
 
@@ -270,3 +273,194 @@ async def test_can_import_example_annotation_project(
         ],
     )
     assert count == 3
+
+
+async def test_streamed_export_matches_project_contents(
+    session: AsyncSession,
+    example_dataset_path: Path,
+    example_audio_dir: Path,
+    example_annotation_project_path: Path,
+    user: schemas.SimpleUser,
+):
+    await import_dataset(
+        session,
+        example_dataset_path,
+        dataset_dir=example_audio_dir,
+        audio_dir=example_audio_dir,
+    )
+    db_project = await import_annotation_project(
+        session,
+        example_annotation_project_path,
+        audio_dir=example_audio_dir,
+        base_audio_dir=example_audio_dir,
+        imported_by=user,
+    )
+    project = await api.annotation_projects.get(session, db_project.uuid)
+
+    chunks = [
+        chunk
+        async for chunk in export_annotation_project(
+            session,
+            project,
+            batch_size=3,
+        )
+    ]
+    streamed = AOEFObject.model_validate_json(b"".join(chunks)).data
+    # Recording paths are exported relative to the audio directory, as
+    # the previous exporter did.
+    expected = to_aeof(
+        await api.annotation_projects.to_soundevent(
+            session,
+            project,
+            audio_dir=example_audio_dir,
+        ),
+        audio_dir=example_audio_dir,
+    ).data
+
+    assert len(chunks) > 10
+    assert streamed.collection_type == "annotation_project"
+    assert streamed.uuid == project.uuid
+    assert streamed.name == project.name
+
+    for key in [
+        "tasks",
+        "clip_annotations",
+        "sound_event_annotations",
+        "sound_events",
+        "clips",
+        "recordings",
+        "users",
+    ]:
+        assert {obj.uuid for obj in getattr(streamed, key)} == {
+            obj.uuid for obj in getattr(expected, key)
+        }
+
+    def resolve(obj, tag_ids):
+        tags = {tag.id: (tag.key, tag.value) for tag in obj.tags}
+        return sorted(tags[tag_id] for tag_id in tag_ids or [])
+
+    assert resolve(streamed, streamed.project_tags) == resolve(
+        expected,
+        expected.project_tags,
+    )
+
+    expected_annotations = {
+        annotation.uuid: annotation
+        for annotation in expected.sound_event_annotations
+    }
+    for annotation in streamed.sound_event_annotations:
+        other = expected_annotations[annotation.uuid]
+        assert resolve(streamed, annotation.tags) == resolve(
+            expected,
+            other.tags,
+        )
+        assert annotation.notes == other.notes
+        assert annotation.created_by == other.created_by
+
+    expected_recordings = {
+        recording.uuid: recording for recording in expected.recordings
+    }
+    for recording in streamed.recordings:
+        other = expected_recordings[recording.uuid]
+        assert (example_audio_dir / recording.path).exists()
+        assert resolve(streamed, recording.tags) == resolve(
+            expected,
+            other.tags,
+        )
+        # The previous exporter did not include the hash of recordings.
+        stored = await api.recordings.get(session, recording.uuid)
+        assert recording.hash == stored.hash
+        assert recording.model_dump(
+            exclude={"tags", "hash"}
+        ) == other.model_dump(exclude={"tags", "hash"})
+
+
+async def test_imports_annotation_project_in_batches(
+    session: AsyncSession,
+    example_dataset_path: Path,
+    example_audio_dir: Path,
+    example_annotation_project_path: Path,
+    user: schemas.SimpleUser,
+):
+    await import_dataset(
+        session,
+        example_dataset_path,
+        dataset_dir=example_audio_dir,
+        audio_dir=example_audio_dir,
+    )
+
+    reports = []
+    db_project = await import_annotation_project(
+        session,
+        example_annotation_project_path,
+        audio_dir=example_audio_dir,
+        base_audio_dir=example_audio_dir,
+        imported_by=user,
+        batch_size=50,
+        on_progress=lambda progress: reports.append(
+            (progress.processed, progress.total)
+        ),
+    )
+
+    assert reports[-1] == (975, 975)
+    assert [processed for processed, _ in reports] == sorted(
+        processed for processed, _ in reports
+    )
+
+    project = await api.annotation_projects.get(session, db_project.uuid)
+    _, tasks = await api.annotation_tasks.get_many(
+        session,
+        limit=0,
+        filters=[
+            filters.AnnotationTaskFilter.model_validate(
+                dict(annotation_project=dict(eq=project.uuid))
+            )
+        ],
+    )
+    assert tasks == 33
+
+    annotations = await api.annotation_projects.to_soundevent(session, project)
+    assert len(annotations.clip_annotations) == 33
+    assert (
+        sum(
+            len(annotation.sound_events)
+            for annotation in annotations.clip_annotations
+        )
+        == 433
+    )
+
+
+async def test_import_updates_cached_recordings(
+    audio_dir: Path,
+    sample_dataset_recording: data.Recording,
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+):
+    await session.commit()
+    cached = await api.recordings.get(session, sample_dataset_recording.uuid)
+    assert cached.tags == []
+
+    tag = data.Tag(term=terms.scientific_name, value="Test species")
+    recording = sample_dataset_recording.model_copy(update={"tags": [tag]})
+    clip = data.Clip(recording=recording, start_time=0, end_time=1)
+    annotation_project = data.AnnotationProject(
+        name="Test project",
+        description="Test description",
+        tasks=[data.AnnotationTask(clip=clip)],
+        clip_annotations=[data.ClipAnnotation(clip=clip)],
+    )
+
+    aoef_file = "test_annotation_project.aoef"
+    io.save(annotation_project, audio_dir / aoef_file, audio_dir=audio_dir)
+
+    await import_annotation_project(
+        session,
+        audio_dir / aoef_file,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+        imported_by=user,
+    )
+    await session.commit()
+
+    retrieved = await api.recordings.get(session, recording.uuid)
+    assert [(t.key, t.value) for t in retrieved.tags] == [(tag.key, tag.value)]
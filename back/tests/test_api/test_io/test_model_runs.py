@@ -0,0 +1,108 @@
+from pathlib import Path
+
+from soundevent import data
+from soundevent.io.aoef import to_aeof
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import models, schemas
+from whombat.api.io.aoef.model_runs import import_model_run
+from whombat.api.io.aoef.staging import ImportProgress
+
+
+async def test_can_import_model_run_in_batches(
+    session: AsyncSession,
+    audio_dir: Path,
+    recording: schemas.Recording,
+    clip: schemas.Clip,
+):
+    rec = data.Recording.model_validate(recording.model_dump())
+    se_clip = data.Clip(
+        uuid=clip.uuid,
+        recording=rec,
+        start_time=clip.start_time,
+        end_time=clip.end_time,
+    )
+    model_run = data.ModelRun(
+        name="test_model",
+        model=data.Model(
+            info=data.ModelInfo(name="test_model"),
+            version="1.0.0",
+        ),
+        clip_predictions=[
+            data.ClipPrediction(
+                clip=se_clip,
+                tags=[
+                    data.PredictedTag(
+                        tag=data.Tag(key="clip", value=str(index)),
+                        score=0.5,
+                    )
+                ],
+                sound_events=[
+                    data.SoundEventPrediction(
+                        sound_event=data.SoundEvent(
+                            recording=rec,
+                            geometry=data.TimeInterval(
+                                coordinates=[start, start + 0.1]
+                            ),
+                        ),
+                        score=0.9,
+                        tags=[
+                            data.PredictedTag(
+                                tag=data.Tag(key="species", value="Myotis"),
+                                score=0.8,
+                            )
+                        ],
+                    )
+                    for start in [0.1, 0.2]
+                ],
+            )
+            for index in range(3)
+        ],
+    )
+    path = audio_dir / "model_run.json"
+    path.write_text(to_aeof(model_run).model_dump_json())
+
+    reports: list[tuple[int, int]] = []
+
+    def on_progress(progress: ImportProgress) -> None:
+        reports.append((progress.processed, progress.total))
+
+    db_model_run = await import_model_run(
+        session,
+        path,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+        batch_size=2,
+        on_progress=on_progress,
+    )
+    assert db_model_run.uuid == model_run.uuid
+    assert reports[-1] == (15, 15)
+    assert len(reports) == 8
+
+    async def count(model: type[models.Base]) -> int:
+        result = await session.execute(select(func.count()).select_from(model))
+        return result.scalar_one()
+
+    assert await count(models.ClipPrediction) == 3
+    assert await count(models.ModelRunPrediction) == 3
+    assert await count(models.SoundEventPrediction) == 6
+    assert await count(models.SoundEventPredictionTag) == 6
+
+    stmt = (
+        select(func.count())
+        .select_from(models.SoundEventPrediction)
+        .group_by(models.SoundEventPrediction.clip_prediction_id)
+    )
+    assert (await session.execute(stmt)).scalars().all() == [2, 2, 2]
+
+    # Importing the file again does not duplicate any object
+    await import_model_run(
+        session,
+        path,
+        audio_dir=audio_dir,
+        base_audio_dir=audio_dir,
+        batch_size=4,
+    )
+    assert await count(models.ClipPrediction) == 3
+    assert await count(models.SoundEventPrediction) == 6
@@ -0,0 +1,119 @@
+import json
+from io import BytesIO
+from uuid import uuid4
+
+import pytest
+from soundevent.io.aoef.clip_annotations import ClipAnnotationsObject
+from soundevent.io.aoef.sound_event_annotation import (
+    SoundEventAnnotationObject,
+)
+
+from whombat import exceptions
+from whombat.api.io.aoef import staging
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch: pytest.MonkeyPatch):
+    # Values are split across chunks, as when reading large files.
+    monkeypatch.setattr(staging, "_CHUNK_SIZE", 7)
+
+
+def test_stages_arrays_in_any_order():
+    clip_uuid = uuid4()
+    clip_annotation_uuid = uuid4()
+    sound_event_annotation_uuids = [uuid4(), uuid4(), uuid4()]
+    document = {
+        "version": "1.1.0",
+        "data": {
+            "uuid": str(uuid4()),
+            "name": "Ünïcode project",
+            "sound_event_annotations": [
+                {"uuid": str(uuid), "sound_event": str(uuid4()), "tags": []}
+                for uuid in sound_event_annotation_uuids
+            ],
+            "clip_annotations": [
+                {
+                    "uuid": str(clip_annotation_uuid),
+                    "clip": str(clip_uuid),
+                    "sound_events": [
+                        str(uuid) for uuid in sound_event_annotation_uuids
+                    ],
+                }
+            ],
+            "tags": [{"id": 0, "key": "species", "value": "Myotis"}],
+            "score": 1.25,
+        },
+    }
+    src = BytesIO(json.dumps(document, indent=2).encode("utf-8"))
+
+    with staging.AOEFStage() as stage:
+        data = staging.stage_aoef_document(src, stage)
+
+        assert data["version"] == "1.1.0"
+        assert data["data"]["name"] == "Ünïcode project"
+        assert data["data"]["score"] == 1.25
+        assert data["data"]["tags"] == document["data"]["tags"]
+        assert data["data"]["sound_event_annotations"] == []
+        assert data["data"]["clip_annotations"] == []
+
+        assert stage.count("sound_event_annotations") == 3
+        batches = list(
+            stage.iter_batches(
+                "sound_event_annotations",
+                SoundEventAnnotationObject,
+                batch_size=2,
+            )
+        )
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert [obj.uuid for batch in batches for obj in batch] == (
+            sound_event_annotation_uuids
+        )
+
+        [[clip_annotation]] = stage.iter_batches(
+            "clip_annotations",
+            ClipAnnotationsObject,
+        )
+        assert clip_annotation.uuid == clip_annotation_uuid
+
+        parents = stage.get_parents(
+            "sound_event_annotations",
+            sound_event_annotation_uuids,
+        )
+        assert parents == {
+            uuid: clip_annotation_uuid for uuid in sound_event_annotation_uuids
+        }
+        assert stage.get_parents("clips", [clip_uuid]) == {
+            clip_uuid: clip_annotation_uuid
+        }
+
+
+def test_skips_arrays_that_are_not_requested():
+    document = {
+        "data": {
+            "clips": [{"uuid": str(uuid4())}],
+            "recordings": [{"uuid": str(uuid4())}],
+        }
+    }
+    src = BytesIO(json.dumps(document).encode("utf-8"))
+
+    with staging.AOEFStage() as stage:
+        staging.stage_aoef_document(src, stage, keys={"clips"})
+
+        assert stage.count("clips") == 1
+        assert stage.count("recordings") == 0
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        b"",
+        b'{"data": {"clips": [{"uuid": 1},]}}',
+        b'{"data": {"clips": [{"uuid": 1}',
+        b'{"data": {}} extra',
+        b"[]",
+    ],
+)
+def test_invalid_json_raises_data_format_error(content: bytes):
+    with staging.AOEFStage() as stage:
+        with pytest.raises(exceptions.DataFormatError):
+            staging.stage_aoef_document(BytesIO(content), stage)
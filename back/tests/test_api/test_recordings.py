@@ -483,6 +483,68 @@ async def test_add_existing_tag_to_recording_fails(
         recording = await api.recordings.add_tag(session, recording, tag)
 
 
+async def test_add_tags_to_many_recordings(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+    tag: schemas.Tag,
+):
+    """Test adding a tag to several recordings at once."""
+    other = await api.recordings.create(
+        session,
+        path=random_wav_factory(),
+        audio_dir=audio_dir,
+    )
+    await api.recordings.add_tag(session, recording, tag)
+
+    result = await api.recordings.add_tags(
+        session,
+        [recording.uuid, other.uuid],
+        [tag],
+    )
+
+    assert result.count == 1
+    other = await api.recordings.get(session, other.uuid)
+    assert other.tags == [tag]
+
+
+async def test_add_features_to_many_recordings(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    random_wav_factory: Callable[..., Path],
+    audio_dir: Path,
+    feature: schemas.Feature,
+):
+    """Test adding features to several recordings at once."""
+    other = await api.recordings.create(
+        session,
+        path=random_wav_factory(),
+        audio_dir=audio_dir,
+    )
+    recording = await api.recordings.add_feature(session, recording, feature)
+    new_feature = schemas.Feature(name="new_feature", value=2)
+
+    result = await api.recordings.add_features(
+        session,
+        [recording.uuid, other.uuid],
+        [feature.model_copy(update=dict(value=1)), new_feature],
+        return_objects=True,
+    )
+
+    # Existing features keep their value
+    assert result.count == 3
+    assert result.items is not None
+    features = {
+        obj.uuid: {f.name: f.value for f in obj.features}
+        for obj in result.items
+    }
+    assert features == {
+        recording.uuid: {feature.name: feature.value, "new_feature": 2},
+        other.uuid: {feature.name: 1, "new_feature": 2},
+    }
+
+
 async def test_add_note_to_recording(
     session: AsyncSession,
     recording: schemas.Recording,
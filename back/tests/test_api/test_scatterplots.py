@@ -0,0 +1,170 @@
+"""Test suite for the scatter plot data of sound event annotations."""
+
+import json
+import struct
+from uuid import UUID
+
+import numpy as np
+from soundevent import data
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+from whombat.api.scatterplots.columns import encode_columns
+from whombat.api.scatterplots.sound_event_annotations import (
+    iter_scatterplot_columns,
+)
+from whombat.filters import sound_event_annotations as filters
+
+
+def decode_frames(content: bytes) -> list[dict]:
+    """Decode a stream of columnar frames."""
+    frames = []
+    position = 0
+    while position < len(content):
+        (length,) = struct.unpack_from("<I", content, position)
+        position += 4
+        header = json.loads(content[position : position + length])
+        position += length
+        position += -position % 8
+
+        buffers = {}
+        for buffer in header["buffers"]:
+            buffers[buffer["name"]] = np.frombuffer(
+                content,
+                dtype=buffer["dtype"],
+                count=buffer["length"] // np.dtype(buffer["dtype"]).itemsize,
+                offset=position,
+            )
+            position += buffer["length"]
+            position += -position % 8
+
+        frames.append({**header, "buffers": buffers})
+    return frames
+
+
+def get_tags(
+    buffers: dict[str, np.ndarray],
+    kind: str,
+    row: int,
+    dictionary: list[tuple[str, str]],
+) -> set[tuple[str, str]]:
+    """Get the decoded tags of a point."""
+    offsets = buffers[f"{kind}.offsets"]
+    indices = buffers[f"{kind}.indices"]
+    return {
+        dictionary[index] for index in indices[offsets[row] : offsets[row + 1]]
+    }
+
+
+def get_points(frames: list[dict]) -> dict[UUID, dict]:
+    """Get the features and tags of each point of decoded frames."""
+    dictionary = []
+    points = {}
+    for frame in frames:
+        dictionary.extend(tuple(tag) for tag in frame["tags"])
+        rows = frame["rows"]
+        buffers = frame["buffers"]
+        features = buffers["features"].reshape(-1, rows)
+        uuids = buffers["uuid"].reshape(rows, 16)
+
+        for row in range(rows):
+            points[UUID(bytes=uuids[row].tobytes())] = {
+                "features": {
+                    name: float(features[index, row])
+                    for index, name in enumerate(frame["features"])
+                    if not np.isnan(features[index, row])
+                },
+                "tags": get_tags(buffers, "tags", row, dictionary),
+                "recording_tags": get_tags(
+                    buffers,
+                    "recording_tags",
+                    row,
+                    dictionary,
+                ),
+            }
+    return points
+
+
+async def create_annotation(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+    duration: float,
+) -> schemas.SoundEventAnnotation:
+    sound_event = await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=data.TimeInterval(coordinates=[0, duration]),
+    )
+    return await api.sound_event_annotations.create(
+        session,
+        sound_event=sound_event,
+        clip_annotation=clip_annotation,
+    )
+
+
+async def test_scatterplot_columns_have_features_and_tags(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    species = await api.tags.create(session, key="species", value="owl")
+    site = await api.tags.create(session, key="site", value="forest")
+    await api.recordings.add_tag(session, recording, site)
+
+    annotations = [
+        await create_annotation(session, recording, clip_annotation, value)
+        for value in [1.0, 2.0, 3.0]
+    ]
+    await api.sound_event_annotations.add_tag(
+        session,
+        annotations[1],
+        species,
+    )
+
+    batches = [
+        columns
+        async for columns in iter_scatterplot_columns(session, batch_size=2)
+    ]
+
+    assert [len(columns) for columns in batches] == [2, 1]
+    frames = decode_frames(b"".join(map(encode_columns, batches)))
+    assert get_points(frames) == {
+        annotation.uuid: {
+            "features": {"ac:mediaDuration": duration},
+            "tags": {("species", "owl")} if index == 1 else set(),
+            "recording_tags": {("site", "forest")},
+        }
+        for index, (annotation, duration) in enumerate(
+            zip(annotations, [1.0, 2.0, 3.0], strict=True)
+        )
+    }
+
+
+async def test_scatterplot_columns_can_be_filtered(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+):
+    species = await api.tags.create(session, key="species", value="owl")
+    annotations = [
+        await create_annotation(session, recording, clip_annotation, value)
+        for value in [1.0, 2.0, 3.0]
+    ]
+    for annotation in annotations[1:]:
+        await api.sound_event_annotations.add_tag(session, annotation, species)
+
+    batches = [
+        columns
+        async for columns in iter_scatterplot_columns(
+            session,
+            filters=[filters.TagFilter(key="species", value="owl")],
+            batch_size=1,
+        )
+    ]
+
+    frames = decode_frames(b"".join(map(encode_columns, batches)))
+    assert set(get_points(frames)) == {
+        annotation.uuid for annotation in annotations[1:]
+    }
+    assert [frame["tags"] for frame in frames] == [[["species", "owl"]], []]
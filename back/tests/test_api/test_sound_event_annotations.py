@@ -3,7 +3,8 @@
 from uuid import uuid4
 
 import pytest
-from sqlalchemy import select
+from soundevent import data
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, exceptions, models, schemas
@@ -83,3 +84,117 @@ async def test_can_get_annotations(
     """Test that all annotations can be retrieved."""
     annotations, _ = await api.sound_event_annotations.get_many(session)
     assert sound_event_annotation in annotations
+
+
+async def test_can_add_tags_to_many_annotations(
+    session: AsyncSession,
+    user: schemas.SimpleUser,
+    recording: schemas.Recording,
+    clip_annotation: schemas.ClipAnnotation,
+    tag_factory,
+) -> None:
+    """Test that several tags are added to several annotations at once."""
+    annotations = []
+    for index in range(5):
+        sound_event = await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=data.TimeStamp(coordinates=index / 10),
+        )
+        annotations.append(
+            await api.sound_event_annotations.create(
+                session,
+                clip_annotation=clip_annotation,
+                sound_event=sound_event,
+            )
+        )
+    tags = [
+        await tag_factory("species", "a"),
+        await tag_factory("species", "b"),
+    ]
+    await api.sound_event_annotations.add_tag(
+        session,
+        annotations[0],
+        tags[0],
+    )
+
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        result = await api.sound_event_annotations.add_tags(
+            session,
+            [annotation.uuid for annotation in annotations],
+            tags,
+            user,
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    # Existing tags are skipped and no annotation is loaded
+    assert result.count == 9
+    assert result.items is None
+    assert len(statements) == 1
+
+    count = await session.scalar(
+        select(func.count())
+        .select_from(models.SoundEventAnnotationTag)
+        .where(models.SoundEventAnnotationTag.created_by_id == user.id)
+    )
+    assert count == 9
+
+    annotation = await api.sound_event_annotations.get(
+        session,
+        annotations[1].uuid,
+    )
+    assert {tag.value for tag in annotation.tags} == {"a", "b"}
+
+
+async def test_add_tags_returns_annotations_if_requested(
+    session: AsyncSession,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    tag: schemas.Tag,
+) -> None:
+    """Test that the updated annotations are returned when requested."""
+    result = await api.sound_event_annotations.add_tags(
+        session,
+        [sound_event_annotation.uuid],
+        [tag],
+        return_objects=True,
+    )
+
+    assert result.count == 1
+    assert result.items is not None
+    assert [annotation.uuid for annotation in result.items] == [
+        sound_event_annotation.uuid
+    ]
+    assert result.items[0].tags == [tag]
+
+
+async def test_can_get_overlapping_annotations(
+    session: AsyncSession,
+    recording: schemas.Recording,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+) -> None:
+    """Test getting the annotations that overlap a region."""
+    annotations, count = await api.sound_event_annotations.get_overlapping(
+        session,
+        recording,
+        start_time=0.5,
+        end_time=2.0,
+    )
+    assert count == 1
+    assert annotations[0].uuid == sound_event_annotation.uuid
+
+    annotations, count = await api.sound_event_annotations.get_overlapping(
+        session,
+        recording,
+        start_time=2.0,
+        end_time=3.0,
+    )
+    assert count == 0
+    assert annotations == []
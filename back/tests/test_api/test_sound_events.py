@@ -8,7 +8,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from whombat import api, models, schemas
-from whombat.filters.sound_events import RecordingFilter
+from whombat.filters.sound_events import RecordingFilter, SoundEventFilter
 
 
 async def test_create_a_timestamp_sound_event(
@@ -207,3 +207,141 @@ async def test_create_sound_events_with_different_geometries(
     assert len(sound_events) == 2
     assert sound_events[0].geometry_type == "Point"
     assert sound_events[1].geometry_type == "TimeStamp"
+
+
+async def test_sound_event_bounds_follow_the_geometry(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    """Test that the bounds of a sound event are kept in sync."""
+    sound_event = await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=geometries.BoundingBox(coordinates=[0.1, 1000, 0.4, 2000]),
+    )
+
+    await api.sound_events.update(
+        session,
+        sound_event,
+        schemas.SoundEventUpdate(
+            geometry=geometries.TimeInterval(coordinates=[1.0, 1.5]),
+        ),
+    )
+
+    db_sound_event = await session.get(models.SoundEvent, sound_event.id)
+    assert db_sound_event is not None
+    await session.refresh(db_sound_event)
+    assert db_sound_event.start_time == 1.0
+    assert db_sound_event.end_time == 1.5
+    assert db_sound_event.low_freq is not None
+    assert db_sound_event.high_freq is not None
+
+
+async def test_get_overlapping_sound_events(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    """Test getting the sound events that overlap a region."""
+    await api.sound_events.create_many(
+        session,
+        data=[
+            dict(
+                recording_id=recording.id,
+                geometry=geometry,
+                geometry_type=geometry.type,
+            )
+            for geometry in [
+                geometries.BoundingBox(coordinates=[2.0, 1000, 3.0, 2000]),
+                geometries.BoundingBox(coordinates=[0.5, 1000, 1.5, 2000]),
+                geometries.BoundingBox(coordinates=[1.2, 5000, 1.8, 6000]),
+                geometries.TimeStamp(coordinates=4.0),
+            ]
+        ],
+    )
+
+    sound_events, count = await api.sound_events.get_overlapping(
+        session,
+        recording,
+        start_time=1.0,
+        end_time=2.5,
+    )
+    assert count == 3
+    assert [
+        sound_event.geometry.coordinates for sound_event in sound_events
+    ] == [
+        [0.5, 1000, 1.5, 2000],
+        [1.2, 5000, 1.8, 6000],
+        [2.0, 1000, 3.0, 2000],
+    ]
+
+    sound_events, count = await api.sound_events.get_overlapping(
+        session,
+        recording,
+        start_time=1.0,
+        end_time=2.5,
+        low_freq=4000,
+    )
+    assert count == 1
+    assert sound_events[0].geometry.coordinates == [1.2, 5000, 1.8, 6000]
+
+
+async def test_filter_sound_events_by_overlap(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    """Test filtering sound events by the region they overlap."""
+    inside = await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=geometries.TimeInterval(coordinates=[1.0, 2.0]),
+    )
+    await api.sound_events.create(
+        session,
+        recording=recording,
+        geometry=geometries.TimeInterval(coordinates=[3.0, 4.0]),
+    )
+
+    sound_events, _ = await api.sound_events.get_many(
+        session,
+        filters=[
+            SoundEventFilter(
+                overlaps__start_time=1.5,
+                overlaps__end_time=2.5,
+            ),
+        ],
+    )
+
+    assert [sound_event.uuid for sound_event in sound_events] == [inside.uuid]
+
+
+async def test_create_geometric_features_of_many_sound_events(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    """Test that the geometric features are written and overwritten."""
+    sound_events = [
+        await api.sound_events.create(
+            session,
+            recording=recording,
+            geometry=geometries.TimeInterval(coordinates=[0, duration]),
+        )
+        for duration in [1.0, 2.0]
+    ]
+    moved = [
+        sound_event.model_copy(
+            update=dict(
+                geometry=geometries.TimeInterval(coordinates=[0, 3.0]),
+            )
+        )
+        for sound_event in sound_events
+    ]
+
+    await api.sound_events.create_geometric_features(session, moved)
+
+    stmt = (
+        select(models.SoundEventFeature.value)
+        .join(models.FeatureName)
+        .where(models.FeatureName.name == "ac:mediaDuration")
+    )
+    result = await session.execute(stmt)
+    assert result.scalars().all() == [3.0, 3.0]
@@ -0,0 +1,114 @@
+"""Test suite for the spectrogram API functions."""
+
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, schemas
+
+
+@pytest.mark.parametrize("pcen", [False, True])
+async def test_adjacent_tiles_join_without_seams(
+    session: AsyncSession,
+    audio_dir: Path,
+    random_wav_factory: Callable[..., Path],
+    pcen: bool,
+):
+    recording = await api.recordings.create(
+        session,
+        path=random_wav_factory(duration=1),
+        audio_dir=audio_dir,
+    )
+    audio_parameters = schemas.AudioParameters()
+    spectrogram_parameters = schemas.SpectrogramParameters(
+        normalize=False,
+        pcen=pcen,
+    )
+    padding = api.get_tile_padding(spectrogram_parameters)
+
+    tiles = [
+        api.compute_spectrogram(
+            recording,
+            *api.get_tile_bounds(-3, index),
+            audio_parameters,
+            spectrogram_parameters,
+            audio_dir=audio_dir,
+            padding=padding,
+        )
+        for index in range(2)
+    ]
+    parent = api.compute_spectrogram(
+        recording,
+        *api.get_tile_bounds(-2, 0),
+        audio_parameters,
+        spectrogram_parameters,
+        audio_dir=audio_dir,
+        padding=padding,
+    )
+
+    assert np.allclose(np.concatenate(tiles, axis=1), parent)
+
+
+def test_tile_bounds_lie_on_a_fixed_grid():
+    assert api.get_tile_bounds(0, 0) == (0, 1)
+    assert api.get_tile_bounds(1, 3) == (6, 8)
+    assert api.get_tile_bounds(-1, 1) == (0.5, 1)
+
+    with pytest.raises(ValueError):
+        api.get_tile_bounds(0, -1)
+
+
+async def test_zoomed_out_spectrograms_are_read_from_the_pyramid(
+    session: AsyncSession,
+    audio_dir: Path,
+    tmp_path: Path,
+    random_wav_factory: Callable[..., Path],
+):
+    recording = await api.recordings.create(
+        session,
+        path=random_wav_factory(duration=20, samplerate=8000),
+        audio_dir=audio_dir,
+    )
+    audio_parameters = schemas.AudioParameters()
+    spectrogram_parameters = schemas.SpectrogramParameters()
+    pyramid_dir = tmp_path / "pyramids"
+
+    pyramid = api.build_spectrogram_pyramid(
+        recording,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir=pyramid_dir,
+        audio_dir=audio_dir,
+        chunk_duration=7,
+    )
+    assert pyramid.info.num_frames == 1600
+    assert pyramid.info.num_levels == 3
+
+    data = api.spectrograms.read_spectrogram_pyramid(
+        recording,
+        0,
+        20,
+        audio_parameters,
+        spectrogram_parameters,
+        pyramid_dir=pyramid_dir,
+        max_frames=400,
+    )
+    assert data is not None
+    assert data.shape[1] == 400
+
+    # Short windows are computed from the audio.
+    assert (
+        api.spectrograms.read_spectrogram_pyramid(
+            recording,
+            0,
+            2,
+            audio_parameters,
+            spectrogram_parameters,
+            pyramid_dir=pyramid_dir,
+            max_frames=400,
+        )
+        is None
+    )
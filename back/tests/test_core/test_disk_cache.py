@@ -0,0 +1,46 @@
+"""Test suite for the on-disk cache."""
+
+from pathlib import Path
+
+from whombat.core.disk_cache import DiskCache
+
+
+def test_can_store_and_retrieve_content(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_size=1024)
+    cache.set("abcdef", b"content")
+    assert cache.get("abcdef") == b"content"
+    assert cache.get("missing") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_size=20)
+    cache.set("aa", b"x" * 8)
+    cache.set("bb", b"x" * 8)
+
+    # Access the first entry so that the second one is the oldest.
+    assert cache.get("aa") is not None
+
+    cache.set("cc", b"x" * 8)
+
+    assert "bb" not in cache
+    assert cache.get("bb") is None
+    assert cache.get("aa") is not None
+    assert cache.get("cc") is not None
+    assert cache.size == 16
+
+
+def test_cache_index_is_restored_from_disk(tmp_path: Path):
+    cache = DiskCache(tmp_path, max_size=1024, suffix=".png")
+    cache.set("abcdef", b"content")
+
+    restored = DiskCache(tmp_path, max_size=1024, suffix=".png")
+    assert "abcdef" in restored
+    assert restored.size == len(b"content")
+    assert restored.get("abcdef") == b"content"
+
+
+def test_disabled_cache_does_not_store_anything(tmp_path: Path):
+    cache = DiskCache(tmp_path / "cache", max_size=0)
+    cache.set("abcdef", b"content")
+    assert cache.get("abcdef") is None
+    assert not (tmp_path / "cache").exists()
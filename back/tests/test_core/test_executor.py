@@ -0,0 +1,107 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from whombat import exceptions
+from whombat.core.executor import TaskExecutor
+
+
+def add(a: int, b: int) -> int:
+    return a + b
+
+
+async def test_executor_runs_functions_off_the_event_loop():
+    executor = TaskExecutor(max_workers=2)
+
+    thread = await executor.run(threading.get_ident)
+    result = await executor.run(add, 1, b=2)
+
+    assert thread != threading.get_ident()
+    assert result == 3
+    assert executor.stats.completed == 2
+    executor.shutdown()
+
+
+async def test_executor_limits_concurrency():
+    executor = TaskExecutor(max_workers=4, max_concurrency=1)
+    event = threading.Event()
+
+    first = asyncio.ensure_future(executor.run(event.wait, 5))
+    second = asyncio.ensure_future(executor.run(add, 1, 2))
+    await asyncio.sleep(0.05)
+
+    assert executor.stats.running == 1
+    assert executor.stats.queued == 1
+
+    event.set()
+    await asyncio.gather(first, second)
+
+    assert executor.stats.running == 0
+    assert executor.stats.queued == 0
+    executor.shutdown()
+
+
+async def test_executor_cancels_queued_tasks_after_deadline():
+    executor = TaskExecutor(max_workers=1)
+    event = threading.Event()
+    calls = []
+
+    first = asyncio.ensure_future(executor.run(event.wait, 5))
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(exceptions.TaskTimeoutError):
+        await executor.run(calls.append, 1, timeout=0.05)
+
+    event.set()
+    await first
+    await asyncio.sleep(0.05)
+
+    assert calls == []
+    assert executor.stats.timed_out == 1
+    executor.shutdown()
+
+
+async def test_executor_keeps_slot_of_timed_out_running_tasks():
+    executor = TaskExecutor(max_workers=2, max_concurrency=1)
+    event = threading.Event()
+
+    with pytest.raises(exceptions.TaskTimeoutError):
+        await executor.run(event.wait, 5, timeout=0.05)
+
+    second = asyncio.ensure_future(executor.run(add, 1, 2))
+    await asyncio.sleep(0.05)
+
+    assert executor.stats.running == 1
+    assert executor.stats.queued == 1
+    assert not second.done()
+
+    event.set()
+
+    assert await second == 3
+    assert executor.stats.running == 0
+    assert executor.stats.completed == 1
+    executor.shutdown()
+
+
+async def test_executor_cancels_abandoned_tasks():
+    executor = TaskExecutor(max_workers=1)
+
+    async def is_abandoned() -> bool:
+        return True
+
+    with pytest.raises(exceptions.TaskCancelledError):
+        await executor.run(time.sleep, 1, is_abandoned=is_abandoned)
+
+    assert executor.stats.abandoned == 1
+    executor.shutdown()
+
+
+async def test_executor_can_use_a_process_pool():
+    executor = TaskExecutor(kind="process", max_workers=1)
+
+    result = await executor.run(add, 1, 2)
+
+    assert result == 3
+    executor.shutdown()
@@ -0,0 +1,76 @@
+import os
+
+from whombat.core.file_pool import SoundFilePool
+
+
+def test_file_pool_reuses_open_handles(random_wav_factory):
+    path = random_wav_factory()
+    pool = SoundFilePool(maxsize=2)
+
+    with pool.open(path) as first:
+        data = first.read(10)
+
+    with pool.open(path) as second:
+        assert second is first
+        second.seek(0)
+        assert (second.read(10) == data).all()
+
+    assert pool.stats.hits == 1
+    assert pool.stats.misses == 1
+    assert pool.stats.size == 1
+
+
+def test_file_pool_closes_least_recently_used_handles(random_wav_factory):
+    paths = [random_wav_factory() for _ in range(3)]
+    pool = SoundFilePool(maxsize=2)
+
+    with pool.open(paths[0]) as first:
+        pass
+
+    for path in paths[1:]:
+        with pool.open(path):
+            pass
+
+    assert first.closed
+    assert pool.stats.size == 2
+    assert pool.stats.evictions == 1
+
+
+def test_file_pool_reopens_modified_files(random_wav_factory):
+    path = random_wav_factory()
+    pool = SoundFilePool()
+
+    with pool.open(path) as first:
+        pass
+
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    with pool.open(path) as second:
+        assert second is not first
+
+    assert pool.stats.misses == 2
+
+
+def test_file_pool_can_be_disabled(random_wav_factory):
+    path = random_wav_factory()
+    pool = SoundFilePool(maxsize=0)
+
+    with pool.open(path) as sf_file:
+        assert not sf_file.closed
+
+    assert sf_file.closed
+    assert pool.stats.size == 0
+
+
+def test_file_pool_clear_closes_handles(random_wav_factory):
+    path = random_wav_factory()
+    pool = SoundFilePool()
+
+    with pool.open(path) as sf_file:
+        pass
+
+    pool.clear()
+
+    assert sf_file.closed
+    assert pool.stats.size == 0
@@ -72,3 +72,22 @@ def test_get_audio_files_in_folder(
         Path("wav2.WAV"),
         Path("foo") / "wav3.wav",
     }
+
+
+def test_scan_audio_files(
+    tmp_path: Path,
+    random_wav_factory: Callable[..., Path],
+):
+    """Test the function to get the size and mtime of audio files."""
+    wav_path = random_wav_factory(path=tmp_path / "wav1.wav")
+    nested_dir = tmp_path / "foo"
+    nested_dir.mkdir()
+    random_wav_factory(path=nested_dir / "wav2.wav")
+    (tmp_path / "text.txt").touch()
+
+    scanned = {stat.path: stat for stat in files.scan_audio_files(tmp_path)}
+
+    assert set(scanned) == {Path("wav1.wav"), Path("foo") / "wav2.wav"}
+    stat = wav_path.stat()
+    assert scanned[Path("wav1.wav")].size == stat.st_size
+    assert scanned[Path("wav1.wav")].mtime_ns == stat.st_mtime_ns
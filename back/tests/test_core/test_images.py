@@ -0,0 +1,48 @@
+from io import BytesIO
+
+import numpy as np
+import pytest
+from matplotlib import colormaps
+from PIL import Image
+
+from whombat.core.images import array_to_image, image_to_buffer
+
+
+@pytest.mark.parametrize("cmap", ["gray", "viridis", "magma"])
+def test_array_to_image_matches_matplotlib_colormap(cmap: str):
+    array = np.random.random((64, 128))
+    expected = np.uint8(colormaps.get_cmap(cmap)(np.flipud(array)) * 255)
+
+    image = array_to_image(array, cmap)
+
+    assert image.size == (128, 64)
+    assert (np.asarray(image.convert("RGBA")) == expected).all()
+
+
+def test_array_to_image_uses_compact_image_modes():
+    array = np.random.random((16, 16))
+
+    assert array_to_image(array, "gray").mode == "L"
+    assert array_to_image(array, "viridis").mode == "P"
+
+
+def test_array_to_image_clips_values_out_of_range():
+    array = np.array([[-1.0, 0.0, 1.0, 2.0, np.nan]])
+
+    image = array_to_image(array, "gray")
+
+    assert list(np.asarray(image)[0]) == [0, 0, 255, 255, 0]
+
+
+@pytest.mark.parametrize("fmt", ["png", "webp"])
+def test_image_to_buffer_is_lossless(fmt: str):
+    array = np.random.random((32, 32))
+    image = array_to_image(array, "viridis")
+
+    buffer = image_to_buffer(image, fmt=fmt, compression_level=1)
+
+    decoded = Image.open(BytesIO(buffer.read()))
+    assert decoded.format == fmt.upper()
+    assert (
+        np.asarray(decoded.convert("RGB")) == np.asarray(image.convert("RGB"))
+    ).all()
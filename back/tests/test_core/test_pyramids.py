@@ -0,0 +1,43 @@
+"""Test suite for the spectrogram pyramids."""
+
+from pathlib import Path
+
+import numpy as np
+
+from whombat.core.pyramids import PyramidWriter, SpectrogramPyramid
+
+
+def test_pyramid_levels_halve_the_number_of_frames(tmp_path: Path):
+    path = tmp_path / "pyramid"
+    writer = PyramidWriter(path, hop_duration=0.01)
+    data = np.random.random((16, 3000))
+    writer.append(data[:, :1000])
+    writer.append(data[:, 1000:])
+    pyramid = writer.finish()
+
+    assert SpectrogramPyramid.exists(path)
+    assert pyramid.info.num_frames == 3000
+    assert pyramid.info.num_levels == 4
+    assert pyramid.get_level(1).shape == (1500, 16)
+    assert pyramid.get_level(3).shape == (375, 16)
+
+    # Coarser levels keep the maximum of each pair of frames.
+    expected = data[:, :2].max(axis=1)
+    assert np.allclose(pyramid.get_level(1)[0], expected, atol=1e-3)
+
+
+def test_pyramid_reads_time_windows_from_the_right_level(tmp_path: Path):
+    writer = PyramidWriter(tmp_path / "pyramid", hop_duration=0.01)
+    writer.append(np.random.random((16, 3000)))
+    pyramid = writer.finish()
+
+    level = pyramid.get_level_for(0, 30, max_frames=1000)
+    assert level == 2
+
+    data = pyramid.read(10, 20, level)
+    assert data.shape == (16, 250)
+
+    # Frames outside the recording are filled with zeros.
+    data = pyramid.read(-10, 10, level)
+    assert data.shape == (16, 500)
+    assert (data[:, :250] == 0).all()
@@ -3,10 +3,12 @@
 import inspect
 
 import sqlalchemy
+from soundevent import data
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from whombat import models
+from whombat import models, schemas
+from whombat.models.base import decode_geometry
 
 
 def check_all_tables_exist(session: Session):
@@ -22,3 +24,22 @@ def check_all_tables_exist(session: Session):
 async def test_can_create_all_models(session: AsyncSession):
     """Test that all models can be created."""
     await session.run_sync(check_all_tables_exist)
+
+
+async def test_geometries_are_decoded_once(
+    session: AsyncSession,
+    sound_event: schemas.SoundEvent,
+):
+    """Test that loading the same geometry again reuses the decoding."""
+    stmt = sqlalchemy.select(models.SoundEvent.geometry).where(
+        models.SoundEvent.id == sound_event.id
+    )
+    decode_geometry.cache_clear()
+
+    first = await session.scalar(stmt)
+    second = await session.scalar(stmt)
+
+    assert isinstance(first, data.Polygon)
+    assert first == sound_event.geometry
+    assert second is first
+    assert decode_geometry.cache_info().hits == 1
@@ -3,6 +3,8 @@
 from pathlib import Path
 
 import pytest
+from alembic.command import downgrade, upgrade
+from sqlalchemy import inspect, text
 from sqlalchemy.engine import URL
 
 from whombat.system import database
@@ -66,3 +68,71 @@ def test_can_create_database(
 
     # Check that the database file exists
     assert db_path.exists()
+
+
+def test_search_migration_indexes_existing_rows(db_path: Path, db_url: URL):
+    """Test that the search migration indexes rows created before it."""
+    cfg = database.create_alembic_config(db_url, is_async=False)
+    engine = database.create_sync_db_engine(db_url)
+
+    with engine.connect() as conn:
+        database.create_or_update_db(conn, cfg)
+
+    downgrade(cfg, "c3e91b7d5a20")
+
+    with engine.begin() as conn:
+        assert not inspect(conn).has_table("tag_search")
+        conn.execute(
+            text(
+                "INSERT INTO tag (key, value, created_on) "
+                "VALUES ('species', 'Barn Owl', CURRENT_TIMESTAMP)"
+            )
+        )
+
+    upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        result = conn.execute(
+            text("SELECT rowid FROM tag_search WHERE tag_search MATCH 'owl'")
+        )
+        assert len(result.all()) == 1
+
+
+def test_bounds_migration_fills_existing_sound_events(
+    db_path: Path,
+    db_url: URL,
+):
+    """Test that the bounds migration fills in existing sound events."""
+    cfg = database.create_alembic_config(db_url, is_async=False)
+    engine = database.create_sync_db_engine(db_url)
+
+    with engine.connect() as conn:
+        database.create_or_update_db(conn, cfg)
+
+    downgrade(cfg, "e7a4c2d9f1b6")
+
+    with engine.begin() as conn:
+        conn.execute(text("PRAGMA foreign_keys=OFF"))
+        conn.execute(
+            text(
+                "INSERT INTO sound_event "
+                "(uuid, recording_id, geometry_type, geometry, created_on) "
+                "VALUES ('a8b3e9f2c1d44e5f9a7b6c5d4e3f2a1b', 1, "
+                "'BoundingBox', :geometry, CURRENT_TIMESTAMP)"
+            ),
+            {
+                "geometry": '{"type": "BoundingBox", '
+                '"coordinates": [0.5, 1000, 1.5, 2000]}'
+            },
+        )
+
+    upgrade(cfg, "head")
+
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(
+                "SELECT start_time, end_time, low_freq, high_freq "
+                "FROM sound_event"
+            )
+        )
+        assert result.all() == [(0.5, 1.5, 1000, 2000)]
@@ -0,0 +1,133 @@
+"""Test suite for the search filters and their indexes."""
+
+from sqlalchemy import delete, event, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from whombat import api, models, schemas
+from whombat.filters import recordings as recording_filters
+from whombat.filters import tags as tag_filters
+
+
+async def search_tags(
+    session: AsyncSession,
+    term: str,
+    rank: bool = False,
+) -> list[str]:
+    tags, _ = await api.tags.get_many(
+        session,
+        filters=[tag_filters.SearchFilter(search=term, search_rank=rank)],
+        sort_by=None,
+    )
+    return [tag.value for tag in tags]
+
+
+async def test_search_uses_the_search_index(session: AsyncSession):
+    await api.tags.create(session, key="species", value="Barn Owl")
+    statements = []
+
+    def record(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    engine = session.bind.sync_engine  # type: ignore
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        values = await search_tags(session, "owl")
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert values == ["Barn Owl"]
+    assert any("tag_search MATCH" in statement for statement in statements)
+
+
+async def test_search_index_is_kept_in_sync(session: AsyncSession):
+    tag = await api.tags.create(session, key="species", value="Barn Owl")
+    assert await search_tags(session, "owl") == ["Barn Owl"]
+
+    await session.execute(
+        update(models.Tag)
+        .where(models.Tag.id == tag.id)
+        .values(value="Tawny Owlet")
+    )
+    assert await search_tags(session, "barn") == []
+    assert await search_tags(session, "owlet") == ["Tawny Owlet"]
+
+    await session.execute(delete(models.Tag).where(models.Tag.id == tag.id))
+    assert await search_tags(session, "owl") == []
+
+
+async def test_short_terms_are_searched_without_the_index(
+    session: AsyncSession,
+):
+    await api.tags.create(session, key="species", value="Owl")
+    await api.tags.create(session, key="species", value="Frog")
+
+    assert await search_tags(session, "ow") == ["Owl"]
+
+
+async def test_search_escapes_fts_syntax(session: AsyncSession):
+    await api.tags.create(session, key="note", value='say "hi" OR bye')
+
+    assert await search_tags(session, '"hi" OR') == ['say "hi" OR bye']
+    assert await search_tags(session, "hi* AND") == []
+
+
+async def test_search_results_can_be_ranked(session: AsyncSession):
+    for value in [
+        "Owl seen near the old barn at dusk",
+        "Owl",
+        "Owl calling",
+    ]:
+        await api.tags.create(session, key="species", value=value)
+
+    assert await search_tags(session, "owl", rank=True) == [
+        "Owl",
+        "Owl calling",
+        "Owl seen near the old barn at dusk",
+    ]
+
+
+async def test_can_search_recordings_by_path(
+    session: AsyncSession,
+    recording: schemas.Recording,
+):
+    recordings, _ = await api.recordings.get_many(
+        session,
+        filters=[
+            recording_filters.SearchFilter(search=recording.path.stem[2:]),
+        ],
+    )
+    assert [obj.uuid for obj in recordings] == [recording.uuid]
+
+    recordings, _ = await api.recordings.get_many(
+        session,
+        filters=[recording_filters.SearchFilter(search="not-a-path")],
+    )
+    assert recordings == []
+
+
+async def test_ranking_is_ignored_by_cursor_pages(session: AsyncSession):
+    for value in [
+        "Owl seen near the old barn at dusk",
+        "Owl",
+        "Owl calling",
+    ]:
+        await api.tags.create(session, key="species", value=value)
+
+    values = []
+    cursor = ""
+    while cursor is not None:
+        page = await api.tags.get_page(
+            session,
+            limit=1,
+            cursor=cursor,
+            filters=[tag_filters.SearchFilter(search="owl", search_rank=True)],
+            sort_by="-value",
+        )
+        values.extend(tag.value for tag in page.items)
+        cursor = page.next_cursor
+
+    assert values == [
+        "Owl seen near the old barn at dusk",
+        "Owl calling",
+        "Owl",
+    ]
@@ -1,5 +1,6 @@
 """Test the Annotation Project endpoints."""
 
+import gzip
 import json
 from io import BytesIO
 from pathlib import Path
@@ -92,6 +93,40 @@ class TestExportAnnotationProject:
         )
         assert response.status_code == 200
 
+    def test_can_export_compressed_annotation_project(
+        self,
+        client: TestClient,
+        annotation_project: schemas.AnnotationProject,
+        clip: schemas.Clip,
+        cookies: dict[str, str],
+    ):
+        response = client.post(
+            "/api/v1/annotation_tasks/",
+            params={"annotation_project_uuid": str(annotation_project.uuid)},
+            json=[str(clip.uuid)],
+            cookies=cookies,
+        )
+        assert response.status_code == 200
+
+        response = client.get(
+            "/api/v1/annotation_projects/detail/download/",
+            params={
+                "annotation_project_uuid": str(annotation_project.uuid),
+                "compress": True,
+            },
+            cookies=cookies,
+        )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert ".json.gz" in response.headers["content-disposition"]
+
+        content = aoef.AOEFObject.model_validate_json(
+            gzip.decompress(response.content)
+        )
+        assert content.data.uuid == annotation_project.uuid
+        assert [task.clip for task in content.data.tasks] == [clip.uuid]
+
 
 class TestAnnotationProjectImport:
     def test_can_import_annotation_project(
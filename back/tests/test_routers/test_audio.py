@@ -0,0 +1,41 @@
+"""Test suite for the audio endpoints."""
+
+from fastapi.testclient import TestClient
+
+from whombat import schemas
+
+
+def test_can_stream_recording_audio(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/audio/stream/",
+        params={"recording_uuid": str(recording.uuid)},
+        headers={"Range": "bytes=0-"},
+        cookies=cookies,
+    )
+    assert response.status_code == 206
+    assert response.headers["content-range"].startswith("bytes 0-")
+
+    # PCM WAV files are read without opening them with soundfile.
+    response = client.get("/api/v1/audio/stream/pool/", cookies=cookies)
+    assert response.json()["misses"] == 0
+
+
+def test_can_download_recording_audio(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/audio/download/",
+        params={"recording_uuid": str(recording.uuid)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == (
+        f"attachment; filename={recording.uuid}.wav"
+    )
+    assert response.content.startswith(b"RIFF")
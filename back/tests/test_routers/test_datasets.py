@@ -247,3 +247,30 @@ class TestExportDataset:
             "Detected object type: 'annotation_project'"
             in response.json()["message"]
         )
+
+
+def test_can_register_dataset_files_in_the_background(
+    client: TestClient,
+    cookies: dict[str, str],
+    dataset: schemas.Dataset,
+    dataset_dir: Path,
+    random_wav_factory: Callable[..., Path],
+):
+    random_wav_factory(dataset_dir / "new.wav")
+
+    response = client.post(
+        "/api/v1/datasets/detail/registration/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+    assert response.status_code == 202
+
+    response = client.get(
+        "/api/v1/datasets/detail/registration/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    registration = response.json()
+    assert registration["status"] == "completed"
+    assert registration["registered_files"] == 1
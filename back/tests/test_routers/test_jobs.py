@@ -0,0 +1,162 @@
+import gzip
+import time
+from collections.abc import Callable
+from io import BytesIO
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+from soundevent import data
+from soundevent.io import aoef
+
+from whombat import schemas
+from whombat.system.settings import Settings
+
+
+def wait_for_job(
+    client: TestClient,
+    job_uuid: str,
+    cookies: dict[str, str],
+    timeout: float = 10,
+) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(
+            "/api/v1/jobs/detail/",
+            params={"job_uuid": job_uuid},
+            cookies=cookies,
+        )
+        assert response.status_code == 200
+        job = response.json()
+        if job["status"] not in ("pending", "running"):
+            return job
+
+        assert time.monotonic() < deadline, "The job did not finish in time."
+        time.sleep(0.05)
+
+
+def test_can_import_dataset_in_a_job(
+    client: TestClient,
+    dataset_dir: Path,
+    random_wav_factory: Callable[..., Path],
+    cookies: dict[str, str],
+    settings: Settings,
+):
+    recording = data.Recording.from_file(
+        random_wav_factory(dataset_dir / "test.wav")
+    )
+    dataset = data.Dataset(
+        name="test_dataset",
+        description="test_description",
+        recordings=[recording],
+    )
+    dataset_file = BytesIO(
+        aoef.to_aeof(dataset).model_dump_json().encode("utf-8")
+    )
+
+    response = client.post(
+        "/api/v1/datasets/import/job/",
+        files={"dataset": dataset_file},
+        data={"audio_dir": str(dataset_dir)},
+        cookies=cookies,
+    )
+    assert response.status_code == 202
+    job = response.json()
+    assert job["kind"] == "import_dataset"
+    assert "arguments" not in job
+
+    job = wait_for_job(client, job["uuid"], cookies)
+    assert job["status"] == "completed", job["error"]
+    assert job["result"] == {"dataset_uuid": str(dataset.uuid)}
+    assert job["processed"] == job["total"] == 1
+
+    response = client.get(
+        "/api/v1/datasets/detail/",
+        params={"dataset_uuid": str(dataset.uuid)},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["recording_count"] == 1
+
+    # The uploaded file is removed once the job finishes
+    assert not (settings.job_dir / job["uuid"] / "inputs").exists()
+
+
+def test_can_download_annotation_project_exported_in_a_job(
+    client: TestClient,
+    annotation_project: schemas.AnnotationProject,
+    cookies: dict[str, str],
+):
+    response = client.post(
+        "/api/v1/annotation_projects/detail/download/job/",
+        params={
+            "annotation_project_uuid": str(annotation_project.uuid),
+            "compress": True,
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 202
+
+    job = wait_for_job(client, response.json()["uuid"], cookies)
+    assert job["status"] == "completed", job["error"]
+
+    response = client.get(
+        "/api/v1/jobs/detail/download/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/gzip"
+    assert ".json.gz" in response.headers["content-disposition"]
+
+    content = aoef.AOEFObject.model_validate_json(
+        gzip.decompress(response.content)
+    )
+    assert content.data.uuid == annotation_project.uuid
+
+    response = client.delete(
+        "/api/v1/jobs/detail/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+
+    response = client.get(
+        "/api/v1/jobs/detail/download/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 404
+
+
+def test_failed_jobs_report_their_error(
+    client: TestClient,
+    cookies: dict[str, str],
+):
+    response = client.post(
+        "/api/v1/datasets/import/job/",
+        files={"dataset": BytesIO(b"not json")},
+        data={"audio_dir": "/"},
+        cookies=cookies,
+    )
+    assert response.status_code == 202
+
+    job = wait_for_job(client, response.json()["uuid"], cookies)
+    assert job["status"] == "failed"
+    assert "Invalid JSON file" in job["error"]
+
+    response = client.get(
+        "/api/v1/jobs/",
+        params={"status__eq": "failed"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert [item["uuid"] for item in response.json()["items"]] == [job["uuid"]]
+
+    # Finished jobs are not changed when cancelled
+    response = client.post(
+        "/api/v1/jobs/detail/cancel/",
+        params={"job_uuid": job["uuid"]},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
@@ -1,9 +1,13 @@
 """Test the Sound Event Annotation endpoints."""
 
+import json
+import struct
+
 from fastapi.testclient import TestClient
 from soundevent import data
 
 from whombat import schemas
+from whombat.api.scatterplots.columns import COLUMNS_MEDIA_TYPE
 
 
 async def test_can_create_a_sound_event_annotation(
@@ -35,3 +39,85 @@ async def test_can_create_a_sound_event_annotation(
     assert obj["total"] == 1
     item = obj["items"][0]
     assert item["sound_event"]["geometry"]["coordinates"] == [0, 1000, 1, 2000]
+
+
+async def test_can_list_sound_event_annotation_summaries(
+    client: TestClient,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/sound_event_annotations/",
+        params={"profile": "summary"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["uuid"] == str(sound_event_annotation.uuid)
+    assert "notes" not in item
+
+    response = client.get(
+        "/api/v1/sound_event_annotations/",
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    item = response.json()["items"][0]
+    assert item["notes"] == []
+
+
+async def test_can_add_tags_to_many_sound_event_annotations(
+    client: TestClient,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    cookies: dict[str, str],
+):
+    tag = {"key": "species", "value": "a"}
+    client.post("/api/v1/tags/", json=tag, cookies=cookies)
+
+    response = client.post(
+        "/api/v1/sound_event_annotations/tags/",
+        json={
+            "uuids": [str(sound_event_annotation.uuid)],
+            "tags": [tag],
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"count": 1, "items": None}
+
+    response = client.post(
+        "/api/v1/sound_event_annotations/tags/",
+        params={"return_objects": True},
+        json={
+            "uuids": [str(sound_event_annotation.uuid)],
+            "tags": [tag],
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 0
+    assert [item["uuid"] for item in content["items"]] == [
+        str(sound_event_annotation.uuid)
+    ]
+    assert content["items"][0]["tags"][0]["value"] == "a"
+
+
+async def test_can_stream_scatter_plot_columns(
+    client: TestClient,
+    sound_event_annotation: schemas.SoundEventAnnotation,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/sound_event_annotations/scatter_plot/columns/",
+        cookies=cookies,
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == COLUMNS_MEDIA_TYPE
+
+    content = response.content
+    (length,) = struct.unpack_from("<I", content)
+    header = json.loads(content[4 : 4 + length])
+    assert header["rows"] == 1
+    start = 4 + length + (-(4 + length) % 8)
+    assert content[start : start + 16] == sound_event_annotation.uuid.bytes
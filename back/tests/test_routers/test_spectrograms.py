@@ -0,0 +1,135 @@
+"""Test suite for the spectrogram endpoints."""
+
+from fastapi.testclient import TestClient
+
+from whombat import schemas
+
+
+def test_spectrogram_is_cached_and_can_be_revalidated(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    params = {
+        "recording_uuid": str(recording.uuid),
+        "start_time": 0,
+        "end_time": 0.05,
+    }
+    response = client.get(
+        "/api/v1/spectrograms/",
+        params=params,
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    etag = response.headers["etag"]
+
+    cache = client.app.state.spectrogram_cache  # type: ignore
+    assert etag.strip('"') in cache
+
+    response = client.get(
+        "/api/v1/spectrograms/",
+        params=params,
+        headers={"If-None-Match": etag},
+        cookies=cookies,
+    )
+    assert response.status_code == 304
+
+    response = client.get(
+        "/api/v1/spectrograms/",
+        params={**params, "end_time": 0.06},
+        headers={"If-None-Match": etag},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+def test_spectrogram_tiles_can_be_prefetched(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    # The recording lasts 0.1 seconds, so there are 4 tiles of 1/32 s.
+    response = client.get(
+        "/api/v1/spectrograms/tiles/",
+        params={
+            "recording_uuid": str(recording.uuid),
+            "level": -5,
+            "index": 0,
+            "prefetch": 8,
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert response.headers["x-tile-count"] == "4"
+
+    # The current tile and the 3 remaining ones are cached.
+    cache = client.app.state.spectrogram_cache  # type: ignore
+    assert len(cache) == 4
+
+    response = client.get(
+        "/api/v1/spectrograms/tiles/",
+        params={
+            "recording_uuid": str(recording.uuid),
+            "level": -5,
+            "index": 4,
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 404
+
+
+def test_spectrogram_pyramid_can_be_built(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    params = {"recording_uuid": str(recording.uuid)}
+    response = client.get(
+        "/api/v1/spectrograms/pyramids/",
+        params=params,
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert not response.json()["ready"]
+
+    response = client.post(
+        "/api/v1/spectrograms/pyramids/",
+        params=params,
+        cookies=cookies,
+    )
+    assert response.status_code == 202
+
+    response = client.get(
+        "/api/v1/spectrograms/pyramids/",
+        params=params,
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert response.json()["ready"]
+
+
+def test_spectrograms_are_computed_in_the_executor(
+    client: TestClient,
+    recording: schemas.Recording,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/spectrograms/",
+        params={
+            "recording_uuid": str(recording.uuid),
+            "start_time": 0,
+            "end_time": 0.05,
+        },
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/system/executor/", cookies=cookies)
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["completed"] == 1
+    assert stats["running"] == 0
+    assert stats["queued"] == 0
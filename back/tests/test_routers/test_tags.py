@@ -29,3 +29,64 @@ async def test_create_tag_returns_existing_tag_if_duplicate(
         cookies=cookies,
     )
     assert response.status_code == 200
+
+
+def test_can_list_tags_with_cursor_pagination(
+    client: TestClient,
+    cookies: dict[str, str],
+):
+    for value in ["a", "b", "c"]:
+        client.post(
+            "/api/v1/tags/",
+            json={"key": "cursor", "value": value},
+            cookies=cookies,
+        )
+
+    values = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            "/api/v1/tags/",
+            params={"cursor": cursor, "limit": 2, "search": "cursor"},
+            cookies=cookies,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        assert content["total"] is None
+        values.extend(tag["value"] for tag in content["items"])
+        cursor = content["next_cursor"]
+
+    assert values == ["a", "b", "c"]
+
+
+def test_invalid_cursor_returns_bad_request(
+    client: TestClient,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/tags/",
+        params={"cursor": "not a cursor"},
+        cookies=cookies,
+    )
+    assert response.status_code == 400
+    assert response.json()["error_type"] == "InvalidCursorError"
+
+
+def test_can_choose_how_to_count_tags(
+    client: TestClient,
+    cookies: dict[str, str],
+):
+    response = client.get(
+        "/api/v1/tags/",
+        params={"count": "cached"},
+        cookies=cookies,
+    )
+    assert response.status_code == 200
+    assert isinstance(response.json()["total"], int)
+
+    response = client.get(
+        "/api/v1/tags/",
+        params={"count": "unknown"},
+        cookies=cookies,
+    )
+    assert response.status_code == 422
@@ -19,6 +19,7 @@ def test_audio_dir(tmp_path: Path) -> Path:
 
 @pytest.fixture
 def test_settings(
+    tmp_path: Path,
     test_db_path: str,
     test_audio_dir: Path,
 ) -> Settings:
@@ -27,6 +28,8 @@ def test_settings(
         db_dialect="sqlite",
         db_name=test_db_path,
         audio_dir=test_audio_dir,
+        spectrogram_cache_dir=tmp_path / "cache" / "spectrograms",
+        spectrogram_pyramid_dir=tmp_path / "pyramids",
         log_to_file=False,
         log_to_stdout=True,
         log_level="debug",
@@ -2,6 +2,7 @@ import asyncio
 
 import pytest
 import uvicorn
+from fastapi.testclient import TestClient
 
 from whombat.system import create_app
 from whombat.system.settings import Settings
@@ -22,3 +23,12 @@ async def test_can_instantiate_app(test_settings: Settings):
         async with asyncio.timeout(5):
             await server.serve()
             assert server.started
+
+
+def test_app_shares_a_single_database_engine(test_settings: Settings):
+    app = create_app(test_settings)
+
+    with TestClient(app):
+        engine = app.state.db_engine
+        assert engine.pool.size() == test_settings.db_pool_size
+        assert app.state.session_maker.kw["bind"] is engine
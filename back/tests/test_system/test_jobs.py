@@ -0,0 +1,171 @@
+"""Test suite for the background job workers."""
+
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+from sqlalchemy.engine import URL
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from whombat import api
+from whombat.system.database import (
+    create_async_db_engine,
+    create_async_session_maker,
+)
+from whombat.system.jobs import JobContext, JobWorker
+from whombat.system.settings import Settings
+
+
+@pytest.fixture
+async def session_maker(
+    database_url: URL,
+) -> AsyncGenerator[async_sessionmaker[AsyncSession], None]:
+    engine = create_async_db_engine(database_url)
+    yield create_async_session_maker(engine)
+    await engine.dispose()
+
+
+async def count_items(session: AsyncSession, ctx: JobContext) -> dict:
+    total = ctx.arguments["total"]
+    for index in range(total):
+        ctx.report(index + 1, total)
+    return {"counted": total}
+
+
+async def fail(session: AsyncSession, ctx: JobContext) -> dict:
+    raise ValueError("Something went wrong")
+
+
+async def wait_forever(session: AsyncSession, ctx: JobContext) -> dict:
+    ctx.report(1, 2)
+    await asyncio.Event().wait()
+    return {}
+
+
+HANDLERS = {
+    "count": count_items,
+    "fail": fail,
+    "wait": wait_forever,
+}
+
+
+async def test_jobs_are_claimed_once_in_submission_order(
+    session: AsyncSession,
+):
+    first = await api.jobs.submit(session, "count")
+    second = await api.jobs.submit(session, "count")
+    await session.commit()
+
+    claimed = await api.jobs.claim(session, "worker-1")
+    assert claimed is not None
+    assert claimed.uuid == first.uuid
+    assert claimed.status == "running"
+
+    claimed = await api.jobs.claim(session, "worker-2")
+    assert claimed is not None
+    assert claimed.uuid == second.uuid
+
+    assert await api.jobs.claim(session, "worker-1") is None
+
+
+async def test_cancelling_a_pending_job_stops_it_right_away(
+    session: AsyncSession,
+):
+    job = await api.jobs.submit(session, "count")
+    cancelled = await api.jobs.cancel(session, job)
+    await session.commit()
+
+    assert cancelled.status == "cancelled"
+    assert cancelled.finished_on is not None
+    assert await api.jobs.claim(session, "worker") is None
+
+
+async def test_worker_stores_progress_and_result(
+    session: AsyncSession,
+    session_maker: async_sessionmaker[AsyncSession],
+    settings: Settings,
+):
+    job = await api.jobs.submit(session, "count", arguments={"total": 5})
+    await session.commit()
+
+    worker = JobWorker(session_maker, settings, handlers=HANDLERS)
+    finished = await worker.run_next()
+
+    assert finished is not None
+    assert finished.uuid == job.uuid
+    assert finished.status == "completed"
+    assert finished.result == {"counted": 5}
+    assert (finished.processed, finished.total) == (5, 5)
+    assert await worker.run_next() is None
+
+
+async def test_worker_stores_errors_of_failed_jobs(
+    session: AsyncSession,
+    session_maker: async_sessionmaker[AsyncSession],
+    settings: Settings,
+):
+    await api.jobs.submit(session, "fail")
+    await api.jobs.submit(session, "unknown")
+    await session.commit()
+
+    worker = JobWorker(session_maker, settings, handlers=HANDLERS)
+
+    failed = await worker.run_next()
+    assert failed is not None
+    assert failed.status == "failed"
+    assert failed.error == "Something went wrong"
+
+    unknown = await worker.run_next()
+    assert unknown is not None
+    assert unknown.status == "failed"
+    assert unknown.error == "Unknown kind of job: unknown"
+
+
+async def test_worker_stops_running_jobs_when_cancelled(
+    session: AsyncSession,
+    session_maker: async_sessionmaker[AsyncSession],
+    settings: Settings,
+):
+    job = await api.jobs.submit(session, "wait")
+    await session.commit()
+
+    worker = JobWorker(session_maker, settings, handlers=HANDLERS)
+    run = asyncio.create_task(worker.run_next())
+
+    async with asyncio.timeout(5):
+        while (await api.jobs.get(session, job.uuid)).processed != 1:
+            session.expire_all()
+            await asyncio.sleep(0.05)
+
+    await api.jobs.cancel(session, job)
+    await session.commit()
+
+    async with asyncio.timeout(5):
+        finished = await run
+
+    assert finished is not None
+    assert finished.status == "cancelled"
+    assert (finished.processed, finished.total) == (1, 2)
+
+
+async def test_abandoned_jobs_are_marked_as_failed(
+    session: AsyncSession,
+    session_maker: async_sessionmaker[AsyncSession],
+    settings: Settings,
+):
+    job = await api.jobs.submit(session, "count")
+    await session.commit()
+    await api.jobs.claim(session, "stopped-worker")
+    await session.commit()
+
+    worker = JobWorker(
+        session_maker,
+        settings.model_copy(update=dict(job_stale_timeout=0)),
+        handlers=HANDLERS,
+    )
+    await asyncio.sleep(0.01)
+    assert await worker.run_next() is None
+
+    session.expire_all()
+    abandoned = await api.jobs.get(session, job.uuid)
+    assert abandoned.status == "failed"
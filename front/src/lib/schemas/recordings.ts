@@ -10,6 +10,7 @@ export const FileStateSchema = z.enum([
   "missing",
   "registered",
   "unregistered",
+  "modified",
 ]);
 
 export const RecordingSchema = z.object({